@@ -21,7 +21,7 @@ from juthoor_arabicgenome_lv1.factory.feature_store import (  # noqa: E402
     FEATURES_DIR,
     save_feature,
 )
-from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Embedder  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import get_embedder  # noqa: E402
 
 
 @dataclass(frozen=True)
@@ -78,7 +78,7 @@ def compute_and_save_embeddings(
     embedder: Any | None = None,
     features_dir: Path | None = None,
 ) -> list[dict[str, Any]]:
-    embedder = embedder or BgeM3Embedder()
+    embedder = embedder or get_embedder("semantic")  # running embedding service if any, else local
     summaries: list[dict[str, Any]] = []
     for job in build_embedding_jobs():
         vectors = embedder.embed(job.texts)
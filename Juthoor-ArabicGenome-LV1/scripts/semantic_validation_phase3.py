@@ -133,9 +133,9 @@ def load_muajam_records() -> list[dict]:
 
 def embed_texts(texts: list[str]) -> np.ndarray:
     """Embed a list of texts using BGE-M3. Returns (N, 1024) L2-normalized."""
-    from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Embedder
+    from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import get_embedder
 
-    embedder = BgeM3Embedder()
+    embedder = get_embedder("semantic")  # running embedding service if any, else local
     return embedder.embed(texts)
 
 
@@ -20,7 +20,14 @@ def _ensure_dir(directory: Path) -> None:
     directory.mkdir(parents=True, exist_ok=True)
 
 
-def save_feature(name: str, array: np.ndarray, meta: dict, *, features_dir: Path | None = None) -> None:
+def save_feature(
+    name: str,
+    array: np.ndarray,
+    meta: dict,
+    *,
+    features_dir: Path | None = None,
+    dtype: str | None = None,
+) -> None:
     """Save a numpy array and metadata JSON to the feature store.
 
     Saves:
@@ -33,10 +40,17 @@ def save_feature(name: str, array: np.ndarray, meta: dict, *, features_dir: Path
         meta: Metadata dict. Should include entity_ids (list), model_used (str).
               timestamp and shape are added automatically if not present.
         features_dir: Override storage directory (used in tests).
+        dtype: Optional on-disk dtype, e.g. "float16" to halve the size of
+               embedding matrices. Recorded in meta as ``dtype``.
     """
     store = features_dir if features_dir is not None else FEATURES_DIR
     _ensure_dir(store)
 
+    if dtype is not None:
+        array = np.asarray(array).astype(dtype, copy=False)
+    if "dtype" not in meta:
+        meta = {**meta, "dtype": str(array.dtype)}
+
     # Augment metadata with auto-fields
     if "timestamp" not in meta:
         meta = {**meta, "timestamp": datetime.now(timezone.utc).isoformat()}
@@ -50,12 +64,23 @@ def save_feature(name: str, array: np.ndarray, meta: dict, *, features_dir: Path
     meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def load_feature(name: str, *, features_dir: Path | None = None) -> tuple[np.ndarray, dict]:
+def load_feature(
+    name: str,
+    *,
+    features_dir: Path | None = None,
+    mmap_mode: str | None = None,
+    as_float32: bool = False,
+) -> tuple[np.ndarray, dict]:
     """Load a feature array and its metadata.
 
     Args:
         name: Feature identifier (no extension).
         features_dir: Override storage directory (used in tests).
+        mmap_mode: Passed to ``np.load`` (e.g. "r") to memory-map the array
+                   instead of reading it into RAM.
+        as_float32: Upcast reduced-precision floats (float16) to float32.
+                    This materializes the array, so leave it off with mmap_mode
+                    and upcast the rows you use.
 
     Returns:
         Tuple of (array, meta_dict).
@@ -71,7 +96,9 @@ def load_feature(name: str, *, features_dir: Path | None = None) -> tuple[np.nda
     if not npy_path.exists():
         raise FileNotFoundError(f"Feature '{name}' not found in store: {npy_path}")
 
-    array = np.load(str(npy_path))
+    array = np.load(str(npy_path), mmap_mode=mmap_mode)
+    if as_float32 and array.dtype.kind == "f" and array.dtype != np.float32:
+        array = array.astype(np.float32)
     meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
     return array, meta
 
@@ -138,3 +138,27 @@ def test_dtype_preserved(tmp_path, dtype):
     save_feature(f"dtype_{dtype.__name__}", arr, {}, features_dir=store)
     loaded, _ = load_feature(f"dtype_{dtype.__name__}", features_dir=store)
     assert loaded.dtype == dtype
+
+
+# ---------------------------------------------------------------------------
+# Reduced precision / memory mapping
+# ---------------------------------------------------------------------------
+
+def test_float16_storage_and_upcast(tmp_path):
+    store = _store(tmp_path)
+    arr = np.random.default_rng(0).standard_normal((4, 8)).astype(np.float32)
+    save_feature("emb16", arr, {}, features_dir=store, dtype="float16")
+    loaded, meta = load_feature("emb16", features_dir=store)
+    assert loaded.dtype == np.float16 and meta["dtype"] == "float16"
+    upcast, _ = load_feature("emb16", features_dir=store, as_float32=True)
+    assert upcast.dtype == np.float32
+    np.testing.assert_allclose(upcast, arr, atol=2e-3)
+
+
+def test_mmap_mode(tmp_path):
+    store = _store(tmp_path)
+    arr = np.arange(12, dtype=np.float32).reshape(3, 4)
+    save_feature("mm", arr, {}, features_dir=store)
+    loaded, _ = load_feature("mm", features_dir=store, mmap_mode="r")
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded[1], arr[1])
@@ -28,7 +28,7 @@ from juthoor_cognatediscovery_lv2.discovery.corpora import (
     CorpusSpec, discover_corpora
 )
 from juthoor_cognatediscovery_lv2.discovery.retrieval import (
-    load_lexemes, embed_corpus, build_or_load_index, search_index
+    load_lexemes, embed_corpus, build_or_load_index, search_index, snapshot_config
 )
 from juthoor_cognatediscovery_lv2.discovery.genome_scoring import GenomeScorer
 from juthoor_cognatediscovery_lv2.discovery.phonetic_law_scorer import PhoneticLawScorer
@@ -167,6 +167,7 @@ def main() -> int:
                 vectors=vecs,
                 rows=cached_rows,
                 rebuild_index=args.rebuild_index,
+                config=snapshot_config(model, args.backend),
             )
             target_data[model].append((spec, index, cached_rows))
 
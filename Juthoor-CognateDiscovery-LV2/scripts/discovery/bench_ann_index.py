@@ -0,0 +1,163 @@
+"""
+Juthoor LV2 — ANN index benchmark
+
+Builds each FAISS recipe (see lv3.discovery.index.IndexSpec) over one vector
+matrix and reports, against exact inner-product search (IndexFlatIP):
+
+  recall@k   mean fraction of the exact top-k that the ANN index returns
+  QPS        single-process queries per second for the whole query batch
+  memory     serialized index size (what write_index puts on disk)
+  build      train + add wall time
+
+Search knobs can be swept: every --nprobe value is tried on IVF recipes,
+every --ef-search value on HNSW and every --threads value on the FAISS-free
+"numpy" engine (exact blocked search; memory column = the matrix it scans).
+Without faiss installed only the numpy engine runs, against itself.
+
+Usage:
+  # cached corpus embeddings (outputs/embeddings/.../vectors.npy)
+  python scripts/discovery/bench_ann_index.py --vectors path/to/vectors.npy
+  # synthetic clustered data
+  python scripts/discovery/bench_ann_index.py --synthetic 200000 --dim 1024
+  python scripts/discovery/bench_ann_index.py --synthetic 50000 \\
+      --recipes ivf_flat hnsw "ivf_pq:pq_m=64" "opq_ivf_pq:pq_m=64" --nprobe 8 32 128
+  # NumPy engine vs IndexFlatIP on a small corpus
+  python scripts/discovery/bench_ann_index.py --synthetic 20000 --recipes numpy --threads 1 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import l2_normalize  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.index import (  # noqa: E402
+    IndexSpec,
+    build_flat_ip,
+    build_index,
+    faiss_available,
+    set_search_params,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.numpy_index import NumpyFlatIndex  # noqa: E402
+
+DEFAULT_RECIPES = ["ivf_flat", "ivf_pq", "opq_ivf_pq", "hnsw", "numpy"]
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0, n_clusters: int = 256) -> np.ndarray:
+    """Clustered unit vectors — closer to real embedding geometry than pure noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)).astype("float32")
+    labels = rng.integers(0, n_clusters, size=n)
+    vecs = centers[labels] + 0.35 * rng.standard_normal((n, dim)).astype("float32")
+    return l2_normalize(vecs)
+
+
+def recall_at_k(exact: np.ndarray, approx: np.ndarray) -> float:
+    hits = sum(len(set(e[e >= 0]) & set(a[a >= 0])) for e, a in zip(exact, approx))
+    return hits / max(int((exact >= 0).sum()), 1)
+
+
+def index_bytes(index) -> int:
+    if isinstance(index, NumpyFlatIndex):
+        return index.nbytes
+    import faiss
+
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def timed_search(index, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    t0 = time.perf_counter()
+    _, idxs = index.search(queries, k)
+    elapsed = time.perf_counter() - t0
+    return idxs, len(queries) / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark FAISS ANN recipes against the flat index")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--vectors", type=Path, help=".npy matrix of corpus vectors")
+    src.add_argument("--synthetic", type=int, metavar="N", help="Generate N synthetic vectors")
+    p.add_argument("--dim", type=int, default=1024, help="Synthetic dimension (default 1024)")
+    p.add_argument("--queries", type=int, default=1000, help="Query count, drawn from the corpus")
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--recipes", nargs="+", default=DEFAULT_RECIPES, help="IndexSpec strings")
+    p.add_argument("--nprobe", type=int, nargs="+", default=[16], help="IVF nprobe values to sweep")
+    p.add_argument("--ef-search", type=int, nargs="+", default=[128], help="HNSW efSearch values")
+    p.add_argument("--threads", type=int, nargs="+", default=[0], help="numpy engine thread counts (0 = auto)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--json", type=Path, default=None, help="Also write results as JSON")
+    args = p.parse_args()
+
+    if args.vectors:
+        corpus = l2_normalize(np.load(args.vectors, mmap_mode="r"))
+    else:
+        corpus = synthetic_vectors(args.synthetic, args.dim, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    q_idx = rng.choice(len(corpus), size=min(args.queries, len(corpus)), replace=False)
+    queries = l2_normalize(corpus[q_idx] + 0.05 * rng.standard_normal((len(q_idx), corpus.shape[1])))
+    print(f"corpus {corpus.shape[0]:,} × {corpus.shape[1]}, {len(queries):,} queries, k={args.k}")
+
+    has_faiss = faiss_available()
+    t0 = time.perf_counter()
+    flat = build_flat_ip(corpus)[0] if has_faiss else NumpyFlatIndex.from_vectors(corpus)
+    flat_build = time.perf_counter() - t0
+    exact, flat_qps = timed_search(flat, queries, args.k)
+
+    results = [{
+        "recipe": "flat" if has_faiss else "numpy",
+        "factory": "Flat" if has_faiss else "NumpyFlatIP", "knob": "reference", "recall": 1.0,
+        "qps": flat_qps, "mbytes": index_bytes(flat) / 2**20, "build_s": flat_build,
+    }]
+    for text in args.recipes:
+        spec = IndexSpec.from_string(text)
+        if spec.kind != "numpy" and not has_faiss:
+            print(f"[skip] {text}: faiss is not installed")
+            continue
+        t0 = time.perf_counter()
+        index, _dim, spec = build_index(corpus, spec)
+        build_s = time.perf_counter() - t0
+        mbytes = index_bytes(index) / 2**20
+        if spec.is_ivf:
+            knobs = [("nprobe", v, replace(spec, nprobe=v)) for v in args.nprobe]
+        elif spec.kind == "hnsw":
+            knobs = [("efSearch", v, replace(spec, ef_search=v)) for v in args.ef_search]
+        elif spec.kind == "numpy":
+            knobs = [("threads", v or index.threads, replace(spec, threads=v)) for v in args.threads]
+        else:
+            knobs = [("", "", spec)]
+        for knob, value, tuned in knobs:
+            if spec.kind == "numpy":
+                index.threads = value
+            set_search_params(index, nprobe=tuned.nprobe, ef_search=tuned.ef_search)
+            approx, qps = timed_search(index, queries, args.k)
+            results.append({
+                "recipe": text, "factory": spec.factory_string(),
+                "knob": f"{knob}={value}" if knob else "",
+                "recall": recall_at_k(exact, approx), "qps": qps,
+                "mbytes": mbytes, "build_s": build_s,
+            })
+
+    print(f"\n{'factory':<28} {'knob':<14} {'recall@' + str(args.k):>9} {'QPS':>10} {'MiB':>9} {'build s':>8}")
+    for r in results:
+        print(
+            f"{r['factory']:<28} {r['knob']:<14} {r['recall']:>9.3f} {r['qps']:>10.0f} "
+            f"{r['mbytes']:>9.1f} {r['build_s']:>8.1f}"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
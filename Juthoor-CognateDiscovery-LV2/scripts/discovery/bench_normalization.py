@@ -0,0 +1,183 @@
+"""
+Juthoor LV2 — Normalization / skeleton micro-benchmarks
+
+Times each memoized primitive in discovery/normalization.py against the
+uncached implementation it replaced, on inputs drawn from the shipped sample
+corpora and repeated the way a discovery run repeats them (every root is
+normalized once per candidate pair, not once per run).
+
+Usage:
+  python scripts/discovery/bench_normalization.py
+  python scripts/discovery/bench_normalization.py --repeat 200 --number 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+SAMPLES = LV2_ROOT / "resources" / "samples" / "processed"
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.discovery import normalization as norm  # noqa: E402
+
+# ---------------------------------------------------------------------------
+# Uncached reference implementations (as they stood before normalization.py)
+# ---------------------------------------------------------------------------
+
+_DIAC_RE = re.compile(r"[\u064B-\u065F\u0670\u0640]")
+_HAMZA_TR = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ء": "ا",
+})
+_ENG_CONSONANTS_RE = re.compile(r"[bcdfghjklmnpqrstvwxyz]")
+_ARABIC_WEAK = set("اويى")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+_IPA_VOWEL_RE = re.compile(r"[aeiouɪɛæʌɒɔʊəɑɜɐɵøœɶɯɤɨʉyˈˌː\.ʔ̃]")
+
+
+def _legacy_norm_arabic(text: str) -> str:
+    text = _DIAC_RE.sub("", text)
+    text = text.translate(_HAMZA_TR).strip()
+    if text.startswith("ال") and len(text) >= 4:
+        text = text[2:]
+    return text
+
+
+def _legacy_arabic_skeleton(text: str) -> str:
+    return "".join(ch for ch in norm._lv1_normalize_arabic_root(text) if ch not in _ARABIC_WEAK)
+
+
+def _legacy_english_skeleton(word: str) -> str:
+    return "".join(_ENG_CONSONANTS_RE.findall(word.lower()))
+
+
+def _legacy_ipa_skeleton(ipa: str) -> str:
+    collapsed = _PARENS_RE.sub("", str(ipa or "").strip().lower())
+    collapsed = collapsed.replace("/", "").replace("[", "").replace("]", "").replace(",", "")
+    return _IPA_VOWEL_RE.sub("", collapsed).strip()
+
+
+def _legacy_consonant_class(ch: str) -> str:
+    classes = [
+        frozenset("pbfv"), frozenset("tdszθðʃʒ"), frozenset("kg"),
+        frozenset("mn"), frozenset("lr"), frozenset("hw"),
+    ]
+    for cls in classes:
+        if ch in cls:
+            return str(id(cls))
+    return ch
+
+
+# ---------------------------------------------------------------------------
+# Inputs
+# ---------------------------------------------------------------------------
+
+def _read_field(path: Path, *keys: str) -> list[str]:
+    values: list[str] = []
+    if not path.exists():
+        return values
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            for key in keys:
+                value = row.get(key)
+                if isinstance(value, str) and value:
+                    values.append(value)
+                    break
+    return values
+
+
+def load_inputs() -> dict[str, list[str]]:
+    arabic = (
+        _read_field(SAMPLES / "hf_roots_sample.jsonl", "root", "lemma")
+        + _read_field(SAMPLES / "quran_lemmas_enriched_sample.jsonl", "lemma", "root")
+    )
+    english = _read_field(SAMPLES / "english_ipa_merged_pos_sample.jsonl", "lemma")
+    ipa = _read_field(SAMPLES / "english_ipa_merged_pos_sample.jsonl", "ipa")
+    latin = _read_field(
+        SAMPLES / "Latin-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl", "lemma"
+    )
+    return {
+        "arabic": arabic or ["كتب", "الكتاب", "قَمَر"],
+        "english": (english + latin) or ["camera", "number"],
+        "ipa": ipa or ["/ˈkæməɹə/"],
+        "letters": list("pbfvtdszkgmnlrhwxyqcj"),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+BENCHES: list[tuple[str, str, Callable[[str], str], Callable[[str], str]]] = [
+    ("normalize_arabic", "arabic", _legacy_norm_arabic, norm.normalize_arabic),
+    ("arabic_consonant_skeleton", "arabic", _legacy_arabic_skeleton, norm.arabic_consonant_skeleton),
+    ("english_consonant_skeleton", "english", _legacy_english_skeleton, norm.english_consonant_skeleton),
+    ("english_ipa_skeleton", "ipa", _legacy_ipa_skeleton, norm.english_ipa_skeleton),
+    ("consonant_class", "letters", _legacy_consonant_class, norm.consonant_class),
+]
+
+LIST_BENCHES: list[tuple[str, str, Callable[[str], str], Callable]] = [
+    ("arabic_consonant_skeletons", "arabic", norm.arabic_consonant_skeleton, norm.arabic_consonant_skeletons),
+    ("english_ipa_skeletons", "ipa", norm.english_ipa_skeleton, norm.english_ipa_skeletons),
+]
+
+
+def _per_call_us(fn: Callable, items: list[str], number: int) -> float:
+    def run() -> None:
+        for item in items:
+            fn(item)
+    best = min(timeit.repeat(run, number=number, repeat=3))
+    return best / number / len(items) * 1e6
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Micro-benchmarks for discovery.normalization")
+    p.add_argument("--repeat", type=int, default=50,
+                   help="How many times each distinct input recurs (default 50)")
+    p.add_argument("--number", type=int, default=3, help="timeit iterations (default 3)")
+    args = p.parse_args()
+
+    inputs = load_inputs()
+    print(f"{'primitive':<28} {'distinct':>8} {'legacy µs':>10} {'cached µs':>10} {'speedup':>8}")
+    for name, kind, legacy, cached in BENCHES:
+        items = inputs[kind] * args.repeat
+        norm.clear_caches()
+        old_us = _per_call_us(legacy, items, args.number)
+        new_us = _per_call_us(cached, items, args.number)
+        print(
+            f"{name:<28} {len(set(inputs[kind])):>8} {old_us:>10.3f} {new_us:>10.3f} "
+            f"{old_us / new_us if new_us else 0:>7.1f}x"
+        )
+
+    print()
+    print(f"{'list variant':<28} {'items':>8} {'loop ms':>10} {'list ms':>10} {'speedup':>8}")
+    for name, kind, scalar, many in LIST_BENCHES:
+        items = inputs[kind] * args.repeat
+        norm.clear_caches()
+        loop_s = min(timeit.repeat(lambda: [scalar(x) for x in items], number=args.number, repeat=3))
+        list_s = min(timeit.repeat(lambda: many(items), number=args.number, repeat=3))
+        print(
+            f"{name:<28} {len(items):>8} {loop_s / args.number * 1e3:>10.2f} "
+            f"{list_s / args.number * 1e3:>10.2f} {loop_s / list_s if list_s else 0:>7.1f}x"
+        )
+
+    print()
+    for name, stats in norm.cache_stats().items():
+        print(f"  cache {name:<28} size={stats['size']:<6} hits={stats['hits']:<9} misses={stats['misses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Juthoor LV2 — int8 vs fp32 embedder benchmark and accuracy guard
+
+Embeds the same texts with the fp32 model and with ``quantize="int8"`` (dynamic
+int8 linear layers; see lv3.discovery.quantization) on CPU, then reports:
+
+  tok/s        encoder throughput for each precision (batching.InferenceStats)
+  cos mean/p01 per-text cosine between the fp32 and the int8 vector
+  recall@k     overlap of each text's fp32 top-k neighbours with its int8 top-k
+  gold hit@k   share of benchmark pairs whose target is in the source's top-k,
+               for fp32 and for int8 (only when the texts come from a benchmark)
+
+The default texts are the source/target sides of the benchmark pairs in
+resources/benchmarks: lemmas for the form model, glosses for the semantic
+model. Lexeme JSONL corpora can be added with --corpus. The exit status is 1
+if the int8 model misses any AccuracyGuard threshold.
+
+Usage:
+  python scripts/discovery/bench_quantized_embedders.py --model form --threads 8
+  python scripts/discovery/bench_quantized_embedders.py --model semantic \\
+      --corpus data/processed/english/english_lexemes.jsonl --limit 20000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.discovery.retrieval import corpus_texts  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import (  # noqa: E402
+    BgeM3Config,
+    BgeM3Embedder,
+    ByT5Config,
+    ByT5Embedder,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import read_jsonl_rows  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.quantization import (  # noqa: E402
+    AccuracyGuard,
+    agreement_report,
+)
+
+DEFAULT_BENCHMARKS = [
+    LV2_ROOT / "resources/benchmarks/cognate_gold.jsonl",
+    LV2_ROOT / "resources/benchmarks/cognate_silver.jsonl",
+    LV2_ROOT / "resources/benchmarks/non_cognate_negatives.jsonl",
+]
+
+
+def benchmark_texts(paths: list[Path], model: str) -> tuple[list[str], list[tuple[int, int]]]:
+    """Unique texts from benchmark pairs plus (source, target) text indices of cognate pairs."""
+    field = "gloss" if model == "semantic" else "lemma"
+    index: dict[str, int] = {}
+    pairs: list[tuple[int, int]] = []
+    for path in paths:
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                a = " ".join(str((rec.get("source") or {}).get(field) or "").split())
+                b = " ".join(str((rec.get("target") or {}).get(field) or "").split())
+                if not a or not b:
+                    continue
+                ia = index.setdefault(a, len(index))
+                ib = index.setdefault(b, len(index))
+                if rec.get("relation") == "cognate" and ia != ib:
+                    pairs.append((ia, ib))
+    return list(index), pairs
+
+
+def gold_hit_rate(vecs: np.ndarray, pairs: list[tuple[int, int]], k: int) -> float:
+    if not pairs:
+        return float("nan")
+    src = np.array([a for a, _ in pairs])
+    tgt = np.array([b for _, b in pairs])
+    scores = vecs[src] @ vecs.T
+    scores[np.arange(len(src)), src] = -np.inf
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return float(np.mean([t in row for t, row in zip(tgt, top)]))
+
+
+def make_embedder(model: str, quantize: str, threads: int, cache_dir: Path):
+    if model == "semantic":
+        return BgeM3Embedder(config=BgeM3Config(quantize=quantize, num_threads=threads), cache_dir=cache_dir)
+    return ByT5Embedder(config=ByT5Config(quantize=quantize, num_threads=threads), cache_dir=cache_dir)
+
+
+def timed_embed(embedder, texts: list[str]) -> tuple[np.ndarray, float, float]:
+    t0 = time.perf_counter()
+    embedder.embed(texts[:8])  # warm-up + model load (and int8 cache build)
+    load_s = time.perf_counter() - t0
+    vecs = embedder.embed(texts)
+    return vecs, load_s, embedder.last_stats.tokens_per_sec
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Compare fp32 and int8 CPU embedders; exit 1 if the guard fails")
+    p.add_argument("--model", choices=["form", "semantic"], default="form")
+    p.add_argument("--benchmark", type=Path, nargs="*", default=DEFAULT_BENCHMARKS)
+    p.add_argument("--corpus", type=Path, nargs="*", default=[], help="Extra lexeme JSONL corpora")
+    p.add_argument("--limit", type=int, default=5000, help="Rows read per corpus (0 = all)")
+    p.add_argument("--threads", type=int, default=0)
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--cache-dir", type=Path, default=None, help="Quantized-model cache (default: temp dir)")
+    p.add_argument("--min-mean-cosine", type=float, default=AccuracyGuard.min_mean_cosine)
+    p.add_argument("--min-p01-cosine", type=float, default=AccuracyGuard.min_p01_cosine)
+    p.add_argument("--min-recall", type=float, default=AccuracyGuard.min_recall)
+    args = p.parse_args()
+
+    texts, pairs = benchmark_texts(args.benchmark, args.model)
+    seen = set(texts)
+    for path in args.corpus:
+        for text in corpus_texts(read_jsonl_rows(path, limit=args.limit), args.model):
+            if text not in seen:
+                seen.add(text)
+                texts.append(text)
+    print(f"{args.model}: {len(texts):,} texts, {len(pairs):,} benchmark pairs")
+
+    guard = AccuracyGuard(args.min_mean_cosine, args.min_p01_cosine, args.min_recall, args.k)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or Path(tmp)
+        ref, ref_load, ref_tps = timed_embed(make_embedder(args.model, "none", args.threads, cache_dir), texts)
+        q8, q8_load, q8_tps = timed_embed(make_embedder(args.model, "int8", args.threads, cache_dir), texts)
+
+    report = agreement_report(ref, q8, k=args.k)
+    print(f"\n{'precision':<10} {'load s':>8} {'tok/s':>10} {'gold hit@' + str(args.k):>12}")
+    for name, vecs, load_s, tps in (("fp32", ref, ref_load, ref_tps), ("int8", q8, q8_load, q8_tps)):
+        print(f"{name:<10} {load_s:>8.1f} {tps:>10,.0f} {gold_hit_rate(vecs, pairs, args.k):>12.3f}")
+    print(f"\nspeed-up {q8_tps / ref_tps if ref_tps else float('nan'):.2f}x")
+    print(
+        f"cosine mean {report['mean_cosine']:.4f}  p01 {report['p01_cosine']:.4f}  "
+        f"min {report['min_cosine']:.4f}  recall@{args.k} {report[f'recall@{args.k}']:.3f}"
+    )
+
+    failed = guard.failures(report)
+    for reason in failed:
+        print(f"[guard] FAIL: {reason}")
+    if not failed:
+        print("[guard] OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
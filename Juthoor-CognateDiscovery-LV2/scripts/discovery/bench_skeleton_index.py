@@ -0,0 +1,120 @@
+"""
+Juthoor LV2 — Skeleton candidate-engine benchmark
+
+Compares the candidate engines Eye 1 can use to shortlist target lemmas for an
+Arabic root, on the shipped sample corpora:
+
+  scan   brute force: every target skeleton vs every root projection
+         (ground truth for "some skeleton within k edits")
+  pairs  the sorted-consonant-pair inverted index (>= 2 shared pairs)
+  edit   SkeletonIndex symmetric-deletion lookup
+
+For each engine it reports recall against the within-k truth, the average
+candidate-set size, and milliseconds per root.
+
+Usage:
+  python scripts/discovery/bench_skeleton_index.py
+  python scripts/discovery/bench_skeleton_index.py --lang grc --max-edit 2
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+SAMPLES = LV2_ROOT / "resources" / "samples" / "processed"
+sys.path.insert(0, str(LV2_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import run_eye1_full_scale as eye1  # noqa: E402
+from juthoor_cognatediscovery_lv2.discovery.skeleton_index import (  # noqa: E402
+    bounded_edit_distance,
+)
+
+SAMPLE_TARGETS = {
+    "lat": "Latin-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl",
+    "grc": "Ancient_Greek-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl",
+}
+
+
+def _queries(ar_entry: dict) -> list[str]:
+    return [s for s in ar_entry["all_skeletons"][:4] if len(s) >= 2]
+
+
+def scan_candidates(queries: list[str], target_entries: list[dict], k: int) -> set[int]:
+    out: set[int] = set()
+    for idx, entry in enumerate(target_entries):
+        for skel in entry["all_skeletons"]:
+            if any(bounded_edit_distance(q, skel, k) <= k for q in queries):
+                out.add(idx)
+                break
+    return out
+
+
+def pair_candidates(queries: list[str], inv_index: dict[str, list[int]]) -> set[int]:
+    pairs: set[str] = set()
+    for q in queries:
+        pairs.update(eye1._sorted_pairs(q))
+    counts: dict[int, int] = defaultdict(int)
+    for pair in pairs:
+        for idx in inv_index.get(pair, ()):
+            counts[idx] += 1
+    return {idx for idx, cnt in counts.items() if cnt >= 2}
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark skeleton candidate engines")
+    p.add_argument("--lang", choices=sorted(SAMPLE_TARGETS), default="lat")
+    p.add_argument("--max-edit", type=int, default=1)
+    p.add_argument("--limit", type=int, default=0, help="Cap Arabic roots (0 = all)")
+    args = p.parse_args()
+
+    roots = eye1.build_arabic_skeleton_index(
+        eye1.load_arabic_roots(SAMPLES / "hf_roots_sample.jsonl", args.limit, args.lang), args.lang
+    )
+    lemmas = eye1.load_target_lemmas(args.lang, SAMPLES / SAMPLE_TARGETS[args.lang])
+    targets = eye1.build_target_skeleton_index(lemmas, args.lang)
+    print(f"{len(roots):,} roots × {len(targets):,} targets (k={args.max_edit})")
+
+    t0 = time.perf_counter()
+    inv_index = eye1.build_inverted_index(targets)
+    pairs_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    edit_index = eye1.build_edit_index(targets, args.max_edit)
+    edit_build = time.perf_counter() - t0
+    print(f"  build: pairs {pairs_build * 1e3:.1f} ms ({len(inv_index):,} keys), "
+          f"edit {edit_build * 1e3:.1f} ms ({edit_index.n_keys:,} keys)")
+
+    queries = [_queries(r) for r in roots]
+    engines = {
+        "scan": lambda q: scan_candidates(q, targets, args.max_edit),
+        "pairs": lambda q: pair_candidates(q, inv_index),
+        "edit": lambda q: set(edit_index.search(q)),
+    }
+    results: dict[str, list[set[int]]] = {}
+    timings: dict[str, float] = {}
+    for name, fn in engines.items():
+        t0 = time.perf_counter()
+        results[name] = [fn(q) for q in queries]
+        timings[name] = time.perf_counter() - t0
+
+    truth = results["scan"]
+    n_true = sum(len(t) for t in truth)
+    print(f"\n{'engine':<8} {'recall':>8} {'avg cands':>10} {'ms/root':>9}")
+    for name, cands in results.items():
+        hit = sum(len(t & c) for t, c in zip(truth, cands))
+        recall = hit / n_true if n_true else 1.0
+        avg = sum(len(c) for c in cands) / max(len(cands), 1)
+        ms = timings[name] / max(len(queries), 1) * 1e3
+        print(f"{name:<8} {recall:>8.3f} {avg:>10.1f} {ms:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Juthoor LV2 — Embedding storage format benchmark
+
+Writes one matrix in each on-disk format of lv3.discovery.vector_store
+(float32, float16, int8 with per-row scales), reopens it memory-mapped, and
+scores queries against it block by block with dequantize-on-read. Reports:
+
+  MiB          bytes on disk (= page-cache footprint when fully touched)
+  peak MiB     peak resident-set growth while scoring (fresh process per format)
+  recall@k     overlap with the float32 top-k
+  max |Δcos|   worst score error against float32
+  ms           scoring wall time
+
+Usage:
+  python scripts/discovery/bench_vector_formats.py --synthetic 200000 --dim 1024
+  python scripts/discovery/bench_vector_formats.py --vectors outputs/embeddings/.../vectors.npy
+"""
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import l2_normalize  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.vector_store import (  # noqa: E402
+    VECTOR_FORMATS,
+    open_vectors,
+    save_vectors,
+    scales_path,
+)
+
+
+def _peak_rss_mib() -> float:
+    """Peak resident set of this process (Linux VmHWM, else ru_maxrss; 0.0 if unknown)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 2**10
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def blocked_topk(matrix, queries: np.ndarray, k: int, block_rows: int) -> tuple[np.ndarray, np.ndarray]:
+    """Exact inner-product top-k, reading ``matrix`` one block at a time."""
+    best_s = np.full((len(queries), k), -np.inf, dtype="float32")
+    best_i = np.full((len(queries), k), -1, dtype="int64")
+    for start, block in matrix.iter_blocks(block_rows):
+        scores = queries @ block.T
+        ids = np.broadcast_to(np.arange(start, start + len(block)), scores.shape)
+        all_s = np.concatenate([best_s, scores], axis=1)
+        all_i = np.concatenate([best_i, ids], axis=1)
+        top = np.argpartition(-all_s, k - 1, axis=1)[:, :k]
+        best_s = np.take_along_axis(all_s, top, axis=1)
+        best_i = np.take_along_axis(all_i, top, axis=1)
+    order = np.argsort(-best_s, axis=1)
+    return np.take_along_axis(best_s, order, axis=1), np.take_along_axis(best_i, order, axis=1)
+
+
+def _score_file(path: Path, queries: np.ndarray, k: int, block_rows: int) -> tuple:
+    """Runs in a fresh process so peak RSS reflects this format alone."""
+    matrix = open_vectors(path, mmap=True)
+    base = _peak_rss_mib()
+    t0 = time.perf_counter()
+    scores, ids = blocked_topk(matrix, queries, k, block_rows)
+    elapsed = time.perf_counter() - t0
+    return scores, ids, elapsed, _peak_rss_mib() - base
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Compare float32 / float16 / int8 vector storage")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--vectors", type=Path)
+    src.add_argument("--synthetic", type=int, metavar="N")
+    p.add_argument("--dim", type=int, default=1024)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--k", type=int, default=10)
+    p.add_argument("--block-rows", type=int, default=32_768)
+    p.add_argument("--seed", type=int, default=0)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    if args.vectors:
+        corpus = l2_normalize(np.load(args.vectors, mmap_mode="r"))
+    else:
+        corpus = l2_normalize(rng.standard_normal((args.synthetic, args.dim)))
+    queries = l2_normalize(corpus[rng.choice(len(corpus), size=min(args.queries, len(corpus)), replace=False)])
+    print(f"corpus {corpus.shape[0]:,} × {corpus.shape[1]}, {len(queries)} queries, k={args.k}")
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {fmt: save_vectors(Path(tmp) / f"vectors_{fmt}.npy", corpus, fmt) for fmt in VECTOR_FORMATS}
+        del corpus
+        ref_scores = ref_ids = None
+        print(f"\n{'format':<8} {'MiB':>9} {'peak MiB':>9} {'recall@' + str(args.k):>9} {'max |Δcos|':>11} {'ms':>8}")
+        for fmt, path in paths.items():
+            on_disk = path.stat().st_size + (scales_path(path).stat().st_size if scales_path(path).exists() else 0)
+            with ctx.Pool(1) as pool:
+                scores, ids, elapsed, peak = pool.apply(
+                    _score_file, (path, queries, args.k, args.block_rows)
+                )
+            if ref_ids is None:
+                ref_scores, ref_ids = scores, ids
+            recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(ref_ids, ids)])
+            err = float(np.abs(scores - ref_scores).max())
+            print(
+                f"{fmt:<8} {on_disk / 2**20:>9.1f} {peak:>9.1f} {recall:>9.3f} "
+                f"{err:>11.5f} {elapsed * 1e3:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Juthoor LV2 — local embedding service
+
+Keeps BGE-M3 (semantic) and ByT5 (form) loaded in one long-lived process and
+serves embed requests from pipeline scripts over a Unix socket (or localhost).
+Concurrent requests are coalesced into shared batches, and vectors come from
+the shared embedding store (outputs/embeddings/_store) whenever possible. See
+lv3.discovery.embedding_service.
+
+Clients: retrieval.embed_corpus(backend="service"), run_discovery_multilang
+--embed-backend service, or any script using embedding_service.get_embedder()
+(which uses a running service automatically).
+
+Usage:
+  python scripts/discovery/embedding_service.py serve --threads 8 --preload
+  python scripts/discovery/embedding_service.py serve --models form --quantize int8
+  python scripts/discovery/embedding_service.py status
+  python scripts/discovery/embedding_service.py stop
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.discovery.retrieval import get_store_root  # noqa: E402
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import (  # noqa: E402
+    SERVICE_MODELS,
+    EmbeddingService,
+    EmbeddingServiceClient,
+    default_address,
+    parse_address,
+    service_available,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Config, ByT5Config  # noqa: E402
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Local embedding service (BGE-M3 / ByT5)")
+    p.add_argument("--address", default=None, help="unix:/path.sock or host:port (default: $JUTHOOR_EMBED_SERVICE)")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    serve = sub.add_parser("serve", help="Run the service in the foreground")
+    serve.add_argument("--models", nargs="+", choices=SERVICE_MODELS, default=list(SERVICE_MODELS))
+    serve.add_argument("--device", default="cpu")
+    serve.add_argument("--threads", type=int, default=0, help="torch CPU threads (0 = torch default)")
+    serve.add_argument("--quantize", choices=["none", "int8"], default="none")
+    serve.add_argument("--max-wait-ms", type=float, default=20.0, help="Coalescing window per batch")
+    serve.add_argument("--max-batch-texts", type=int, default=4096)
+    serve.add_argument("--no-store", action="store_true", help="Do not read/write the shared embedding store")
+    serve.add_argument("--preload", action="store_true", help="Load models before accepting requests")
+
+    sub.add_parser("status", help="Print the running service's info as JSON")
+    sub.add_parser("stop", help="Ask the running service to shut down")
+    args = p.parse_args()
+
+    address = parse_address(args.address) if args.address else default_address()
+
+    if args.cmd == "serve":
+        if service_available(address):
+            print(f"[error] A service is already running at {address}", file=sys.stderr)
+            return 1
+        service = EmbeddingService(
+            models=tuple(args.models),
+            semantic_cfg=BgeM3Config(num_threads=args.threads, quantize=args.quantize),
+            form_cfg=ByT5Config(num_threads=args.threads, quantize=args.quantize),
+            device=args.device,
+            store_root=None if args.no_store else get_store_root(LV2_ROOT),
+            max_batch_texts=args.max_batch_texts,
+            max_wait_ms=args.max_wait_ms,
+        )
+        if args.preload:
+            service.preload()
+        print(f"[info] Serving {', '.join(args.models)} at {address}", file=sys.stderr)
+        try:
+            service.serve_forever(address)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if not service_available(address):
+        print(f"[error] No embedding service at {address}", file=sys.stderr)
+        return 1
+    client = EmbeddingServiceClient(address=address)
+    if args.cmd == "status":
+        print(json.dumps(client.info(), indent=2))
+    else:
+        client.shutdown()
+        print("[info] Service stopped.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -16,7 +16,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import re
 import sys
 import unicodedata
 from collections import defaultdict
@@ -32,19 +31,15 @@ LV2_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_GOLD = LV2_ROOT / "resources/benchmarks/cognate_gold.jsonl"
 
 # ---------------------------------------------------------------------------
-# Arabic normalization (mirrors run_eye1_full_scale._norm_arabic)
+# Arabic normalization (the canonical normalizer Eye 1 writes arabic_root with,
+# so gold lemmas carrying the article ال still line up with Eye 1 keys)
 # ---------------------------------------------------------------------------
 
-_DIAC_RE = re.compile(r"[\u064B-\u065F\u0670\u0640]")
-_HAMZA_TR = str.maketrans({
-    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
-    "ؤ": "و", "ئ": "ي", "ء": "ا",
-})
+sys.path.insert(0, str(LV2_ROOT / "src"))
 
-
-def _norm_arabic(text: str) -> str:
-    text = _DIAC_RE.sub("", text)
-    return text.translate(_HAMZA_TR).strip()
+from juthoor_cognatediscovery_lv2.discovery.normalization import (  # noqa: E402
+    normalize_arabic as _norm_arabic,
+)
 
 
 # ---------------------------------------------------------------------------
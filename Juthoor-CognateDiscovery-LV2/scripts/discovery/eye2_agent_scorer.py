@@ -7,18 +7,21 @@ Modes:
   --investigate   Print an investigation prompt for a single batch file to stdout
   --ingest-response  Parse findings JSON response and write JSONL results
   --merge         Merge all findings JSONL files into a final output with verdict summary
+  --orchestrate   Send every prepared batch to N concurrent backends, ingest the findings, then merge
 
 Usage:
   python eye2_agent_scorer.py --prepare --lang got --min-ds 0.90 --top-k 3 --batch-size 8
   python eye2_agent_scorer.py --investigate outputs/eye2_agent_batches/got/batch_000.txt
   python eye2_agent_scorer.py --ingest-response --lang got --batch-index 0 --response-file <findings.json>
   python eye2_agent_scorer.py --merge --lang got
+  python eye2_agent_scorer.py --orchestrate --lang got --backend "cmd:claude -p" --backend http://localhost:8700/investigate --workers 4
 """
 from __future__ import annotations
 
 import argparse
 import io
 import json
+import os
 import sys
 from collections import defaultdict
 
@@ -46,16 +49,24 @@ if str(_SRC_DIR) not in sys.path:
 # Import enrichment helpers from eye2_batch_scorer
 # ---------------------------------------------------------------------------
 
+from juthoor_cognatediscovery_lv2.discovery.agent_orchestrator import (  # noqa: E402
+    Backend,
+    BatchJob,
+    Orchestrator,
+    check_findings,
+    parse_backend,
+    parse_findings,
+)
+from juthoor_cognatediscovery_lv2.discovery.enrichment_store import EnrichmentStore  # noqa: E402
 from juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer import (  # noqa: E402
-    _norm_arabic_lookup,
     _load_profiles,
-    _load_lv0_definitions,
-    _load_deep_glossary,
-    _load_target_glosses,
+    _lookup,
     _default_profiles_path,
     _LANG_NAMES,
+    enrich_candidates,
     load_eye1_candidates,
 )
+from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Paths
@@ -309,40 +320,20 @@ def _build_investigation_prompt(pairs: list[dict[str, Any]], lang: str) -> str:
 # ---------------------------------------------------------------------------
 
 def _enrich_candidates(candidates: list[dict[str, Any]], lang: str) -> list[dict[str, Any]]:
-    """Enrich each candidate dict in-place with Arabic and target glosses."""
-    profiles = _load_profiles(_default_profiles_path())
-    lv0_defs = _load_lv0_definitions()
-    target_glosses = _load_target_glosses(lang)
-    deep = _load_deep_glossary()
-
-    enriched_ara = 0
-    enriched_tgt = 0
-    enriched_deep = 0
-
-    for c in candidates:
-        ar_key = _norm_arabic_lookup(c["arabic_root"])
-        c["_ar_key"] = ar_key
-
-        prof = profiles.get(ar_key, {})
-        c["masadiq_gloss"] = prof.get("masadiq_gloss", "")
-        c["mafahim_gloss"] = prof.get("mafahim_gloss", "")
-
-        # LV0 fallback when no profile exists
-        if not c["masadiq_gloss"] and not c["mafahim_gloss"]:
-            c["masadiq_gloss"] = lv0_defs.get(ar_key, "")
-
-        if c["masadiq_gloss"] or c["mafahim_gloss"]:
-            enriched_ara += 1
-
-        tgt_entry = target_glosses.get(c["target_lemma"], {})
-        c["target_meaning"] = tgt_entry.get("gloss", "")
-        if c["target_meaning"]:
-            enriched_tgt += 1
-
-        expanded = deep.get(ar_key, {}).get("meanings", [])
-        c["arabic_meanings_expanded"] = expanded
-        if expanded:
-            enriched_deep += 1
+    """Enrich each candidate dict in-place with Arabic and target glosses.
+
+    Uses the prebuilt enrichment store when one has been built (see
+    juthoor_cognatediscovery_lv2.discovery.enrichment_store).
+    """
+    profiles_path = _default_profiles_path()
+    store = EnrichmentStore.open()
+    try:
+        profiles = _lookup(store, "profile", profiles_path, lambda: _load_profiles(profiles_path))
+        hits = enrich_candidates(candidates, profiles, lang, store=store)
+    finally:
+        if store is not None:
+            store.close()
+    enriched_ara, enriched_tgt, enriched_deep = hits["arabic"], hits["target"], hits["deep"]
 
     total = len(candidates)
     print(
@@ -461,7 +452,9 @@ def cmd_prepare(args: argparse.Namespace) -> None:
         f"\nNext step: for each batch_NNN.txt, send it to a Claude Code agent and save "
         f"the findings JSON, then run:\n"
         f"  python eye2_agent_scorer.py --ingest-response --lang {lang} "
-        f"--batch-index NNN --response-file <path-to-findings.json>",
+        f"--batch-index NNN --response-file <path-to-findings.json>\n"
+        f"or send them all at once:\n"
+        f"  python eye2_agent_scorer.py --orchestrate --lang {lang} --backend \"cmd:<agent command>\" --workers 4",
         file=sys.stderr,
     )
 
@@ -559,22 +552,10 @@ def cmd_ingest_response(args: argparse.Namespace) -> None:
         sys.exit(1)
 
     meta_pairs: list[dict[str, Any]] = json.loads(meta_file.read_text(encoding="utf-8"))
-    # Build lookup by pair_id
-    meta_by_id: dict[str, dict[str, Any]] = {mp["pair_id"]: mp for mp in meta_pairs}
-
-    raw_response = response_file.read_text(encoding="utf-8").strip()
-
-    # Strip markdown fences if present
-    if raw_response.startswith("```"):
-        parts = raw_response.split("```", 2)
-        inner = parts[1]
-        if inner.startswith("json"):
-            inner = inner[4:]
-        raw_response = inner.strip()
 
     try:
-        findings: list[dict[str, Any]] = json.loads(raw_response)
-    except json.JSONDecodeError as exc:
+        findings = parse_findings(response_file.read_text(encoding="utf-8"))
+    except ValueError as exc:
         print(f"[error] Failed to parse agent findings JSON: {exc}", file=sys.stderr)
         sys.exit(1)
 
@@ -584,13 +565,43 @@ def cmd_ingest_response(args: argparse.Namespace) -> None:
         batch_stem = meta_file.stem.replace("_meta", "")
         out_path = _results_dir(lang) / f"{batch_stem}.jsonl"
 
+    written, skipped, verdict_counts = _write_findings(
+        findings, meta_pairs, out_path, lang=lang, batch=meta_file.stem.replace("_meta", ""),
+    )
+
+    print(f"[done] Wrote {written} findings to {out_path}", file=sys.stderr)
+    if skipped:
+        print(f"[warn] Skipped {skipped} findings (unrecognised pair IDs).", file=sys.stderr)
+    print("[info] Verdict breakdown:", file=sys.stderr)
+    for v, count in sorted(verdict_counts.items()):
+        print(f"  {v}: {count}", file=sys.stderr)
+
+
+def _write_findings(
+    findings: list[dict[str, Any]],
+    meta_pairs: list[dict[str, Any]],
+    out_path: Path,
+    *,
+    lang: str,
+    batch: str,
+    model: str = "agent_detective",
+) -> tuple[int, int, defaultdict[str, int]]:
+    """Write one JSONL record per recognised finding; (written, skipped, verdict counts).
+
+    The file is written beside ``out_path`` and renamed into place, so a
+    results file is never half written (--orchestrate counts it as done).
+    """
+    # Build lookup by pair_id
+    meta_by_id: dict[str, dict[str, Any]] = {mp["pair_id"]: mp for mp in meta_pairs}
+
     out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + f".{os.getpid()}.tmp")
 
     written = 0
     skipped = 0
     verdict_counts: defaultdict[str, int] = defaultdict(int)
 
-    with open(out_path, "w", encoding="utf-8") as fh:
+    with open(tmp_path, "w", encoding="utf-8") as fh:
         for item in findings:
             pair_id = str(item.get("pair_id", ""))
 
@@ -633,18 +644,14 @@ def cmd_ingest_response(args: argparse.Namespace) -> None:
                 "verdict": verdict,
                 "semantic_score": score,
                 "discovery_score": float(c.get("discovery_score", 0.0)),
-                "model": "agent_detective",
-                "batch": meta_file.stem.replace("_meta", ""),
+                "model": model,
+                "batch": batch,
             }
             fh.write(json.dumps(record, ensure_ascii=False) + "\n")
             written += 1
 
-    print(f"[done] Wrote {written} findings to {out_path}", file=sys.stderr)
-    if skipped:
-        print(f"[warn] Skipped {skipped} findings (unrecognised pair IDs).", file=sys.stderr)
-    print("[info] Verdict breakdown:", file=sys.stderr)
-    for v, count in sorted(verdict_counts.items()):
-        print(f"  {v}: {count}", file=sys.stderr)
+    os.replace(tmp_path, out_path)
+    return written, skipped, verdict_counts
 
 # ---------------------------------------------------------------------------
 # Mode 4: --merge
@@ -734,6 +741,120 @@ def cmd_merge(args: argparse.Namespace) -> None:
     print(f"[merge] Total discoveries (confirmed + plausible): {discoveries}", file=sys.stderr)
     print(f"[done] Merged output: {final_path}", file=sys.stderr)
 
+# ---------------------------------------------------------------------------
+# Mode 5: --orchestrate  (concurrent backends over the prepared batches)
+# ---------------------------------------------------------------------------
+
+def _batch_jobs(lang: str) -> list[BatchJob]:
+    """One job per prepared batch_NNN.txt that has its meta file."""
+    batches_dir = _batches_dir(lang)
+    jobs: list[BatchJob] = []
+    for meta_file in sorted(batches_dir.glob("batch_*_meta.json")):
+        key = meta_file.stem.replace("_meta", "")
+        prompt_file = batches_dir / f"{key}.txt"
+        if prompt_file.exists():
+            n_pairs = len(json.loads(meta_file.read_text(encoding="utf-8")))
+            jobs.append(BatchJob(key=key, prompt_path=prompt_file, pairs=n_pairs))
+    return jobs
+
+
+def _results_cover_batch(results_file: Path, meta_file: Path) -> bool:
+    """True if ``results_file`` belongs to the batch as currently prepared.
+
+    A results file written after the meta file counts as is. An older one
+    (the batches were re-prepared since) counts only if it answers every
+    pair id in the current meta file; a line that does not parse (torn or
+    corrupt) makes it not count, so the batch is investigated again.
+    """
+    if not results_file.exists():
+        return False
+    if results_file.stat().st_mtime >= meta_file.stat().st_mtime:
+        return True
+    wanted = {mp["pair_id"] for mp in json.loads(meta_file.read_text(encoding="utf-8"))}
+    answered: set[Any] = set()
+    try:
+        with open(results_file, encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    answered.add(json.loads(line).get("pair_id"))
+    except (UnicodeDecodeError, json.JSONDecodeError, AttributeError):
+        return False
+    return wanted <= answered
+
+
+def cmd_orchestrate(args: argparse.Namespace) -> None:
+    """Run every prepared batch through the backends, ingest the findings, then merge."""
+    lang = args.lang
+    try:
+        backends = [parse_backend(spec) for spec in args.backend]
+    except ValueError as exc:
+        print(f"[error] {exc}", file=sys.stderr)
+        sys.exit(1)
+
+    jobs = _batch_jobs(lang)
+    if not jobs:
+        print(f"[error] No prepared batches in {_batches_dir(lang)}; run --prepare first.", file=sys.stderr)
+        sys.exit(1)
+    results_dir = _results_dir(lang)
+
+    def handle(job: BatchJob, reply: str, backend: Backend) -> int:
+        meta_pairs = json.loads((_batches_dir(lang) / f"{job.key}_meta.json").read_text(encoding="utf-8"))
+        findings = parse_findings(reply)
+        check_findings(findings, [mp["pair_id"] for mp in meta_pairs])
+        written, _, _ = _write_findings(
+            findings, meta_pairs, results_dir / f"{job.key}.jsonl", lang=lang, batch=job.key, model=backend.model,
+        )
+        return written
+
+    telemetry = (TelemetryRecorder(None) if args.no_telemetry
+                 else TelemetryRecorder.default("eye2_agent_orchestrator", tags={"lang": lang}))
+    orchestrator = Orchestrator(
+        jobs, backends, handle,
+        lease_dir=results_dir / ".leases",
+        workers=args.workers,
+        timeout=args.timeout,
+        max_attempts=args.max_attempts,
+        is_done=lambda job: _results_cover_batch(
+            results_dir / f"{job.key}.jsonl", _batches_dir(lang) / f"{job.key}_meta.json",
+        ),
+        telemetry=telemetry,
+    )
+    report = orchestrator.run()
+
+    report_file = results_dir / "orchestrate_report.json"
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+    report_file.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(
+        f"\n[orchestrate] {report['done']} ingested, {report['skipped']} already done, "
+        f"{report['leased_elsewhere']} leased elsewhere, {report['failed']} failed, "
+        f"{report['unfinished']} unfinished ({report['attempts']} attempts, {report['requeued']} re-queued)",
+        file=sys.stderr,
+    )
+    print(
+        f"[orchestrate] {report['pairs']} pairs in {report['elapsed_s']}s: "
+        f"{report['batches_per_min']} batches/min, {report['pairs_per_min']} pairs/min",
+        file=sys.stderr,
+    )
+    for name, s in report["backends"].items():
+        print(
+            f"  {name}: {s['ok']}/{s['attempts']} ok, {s['timeouts']} timeouts, {s['invalid']} invalid, "
+            f"{s['errors']} errors, {s['pairs_per_min']} pairs/min",
+            file=sys.stderr,
+        )
+    for key, error in report["failures"].items():
+        print(f"[warn] {key}: {error}", file=sys.stderr)
+    print(f"[done] Report: {report_file}", file=sys.stderr)
+
+    if report["leased_elsewhere"]:
+        # another orchestrator is still writing those batches: merging now would miss them
+        print(f"[warn] {report['leased_elsewhere']} batches are leased by another run; "
+              "not merging (re-run --orchestrate or --merge once it finishes).", file=sys.stderr)
+    elif not args.no_merge and report["done"] + report["skipped"]:
+        cmd_merge(args)
+    if report["failed"] or report["unfinished"] or report["leased_elsewhere"]:
+        sys.exit(1)
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -762,6 +883,10 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         "--merge", action="store_true",
         help="Merge all findings JSONL files into a final output with verdict summary.",
     )
+    mode.add_argument(
+        "--orchestrate", action="store_true",
+        help="Send all prepared batches to --backend(s) concurrently, ingest the findings, then merge.",
+    )
 
     # --prepare options
     p.add_argument("--lang", help="Target language code (got, grc, lat, ...)")
@@ -792,6 +917,27 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help="Path to agent findings JSON response file.",
     )
 
+    # --orchestrate options
+    p.add_argument(
+        "--backend", action="append", default=[], metavar="SPEC",
+        help="Scoring backend, repeatable: 'cmd:<command>' (prompt on stdin; {prompt_file}, {batch}, "
+             "{pairs} filled in), an http(s):// endpoint, or 'stub[:latency]'.",
+    )
+    p.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help="Concurrent batches (default: one per --backend; backends are shared round-robin).",
+    )
+    p.add_argument(
+        "--timeout", type=float, default=600.0, metavar="S",
+        help="Seconds per backend call before the batch is re-queued (default: 600).",
+    )
+    p.add_argument(
+        "--max-attempts", type=int, default=3, metavar="N",
+        help="Attempts per batch before it is reported as failed (default: 3).",
+    )
+    p.add_argument("--no-merge", action="store_true", help="With --orchestrate: skip the final --merge.")
+    p.add_argument("--no-telemetry", action="store_true", help="Do not log calls to the LLM telemetry log.")
+
     # shared
     p.add_argument(
         "--output", metavar="FILE",
@@ -828,6 +974,12 @@ def main(argv: list[str] | None = None) -> None:
             sys.exit(1)
         cmd_merge(args)
 
+    elif args.orchestrate:
+        if not args.lang or not args.backend:
+            print("[error] --orchestrate requires --lang and at least one --backend.", file=sys.stderr)
+            sys.exit(1)
+        cmd_orchestrate(args)
+
 
 if __name__ == "__main__":
     main()
@@ -4,14 +4,17 @@ Juthoor LV2 Multi-Language Discovery Pipeline -- Generic cognate discovery for a
 Adapts run_full_discovery.py to support any source/target language pair from the LV0 corpus map.
 
 Modes:
-  --fast    : Phonetic-only discovery (no embeddings, minutes)
-  --full    : BGE-M3 + FAISS + phonetic + LLM validation (slower, best results)
+  --fast    : Phonetic discovery (no embedding, minutes); --semantic-k N adds each
+              source's semantic top-N from cached BGE-M3 vectors to Phase 3
+  --full    : BGE-M3 + FAISS + phonetic + LLM validation (slower, best results);
+              only texts missing from the embedding store are embedded
   --llm     : Enable Claude API validation for top candidates
 
 Usage:
   python run_discovery_multilang.py --source ara --target heb --limit 500
   python run_discovery_multilang.py --source ara --target lat --limit 5000 --target-limit 10000
   python run_discovery_multilang.py --source ara --target grc --fast --limit 500
+  python run_discovery_multilang.py --source ara --target lat --fast --semantic-k 50
   python run_discovery_multilang.py --source ara --target per --limit 500
 """
 from __future__ import annotations
@@ -41,6 +44,8 @@ GOLD_BENCHMARK = LV2_ROOT / "resources/benchmarks/cognate_gold.jsonl"
 LEADS_DIR = LV2_ROOT / "outputs/leads"
 CONCEPTS_FILE = LV2_ROOT / "resources/concepts/concepts_v3_2_enriched.jsonl"
 ARABIC_GLOSSES_LOOKUP = LV2_ROOT / "data/processed/arabic/arabic_english_glosses.json"
+# Store namespace config of full-mode SentenceTransformer vectors (not FlagEmbedding's BgeM3Config)
+SENTENCE_TRANSFORMERS_CONFIG = {"encoder": "sentence-transformers", "normalize_embeddings": True}
 
 # Package path
 sys.path.insert(0, str(LV2_ROOT / "src"))
@@ -643,6 +648,9 @@ def score_all_pairs_fast(
     prefilter_threshold: float = 0.50,
     concept_matcher: Any = None,
     semantic_threshold: float = 0.0,
+    candidate_engine: str = "scan",
+    max_edit: int = 1,
+    semantic_candidates: dict[int, list[tuple[int, float]]] | None = None,
 ) -> list[dict[str, Any]]:
     """Score all source x target pairs using a three-phase approach.
 
@@ -650,6 +658,14 @@ def score_all_pairs_fast(
     Phase 2: Fast skeleton scoring for all pairs using pre-computed data.
              Pairs below prefilter_threshold are dropped.
     Phase 3: Full MultiMethodScorer only on top candidates that passed Phase 2.
+
+    With ``candidate_engine="edit"``, Phase 2 only scores targets whose lemma
+    or stem skeleton lies within ``max_edit`` edits of a source projection
+    (SkeletonIndex lookup) instead of scanning every target.
+
+    ``semantic_candidates`` (source index -> [(target index, cosine)], from
+    semantic_prefilter_candidates) are unioned with the Phase 2 survivors
+    before Phase 3, whatever their phonetic prefilter score.
     """
     import heapq
     from difflib import SequenceMatcher
@@ -745,9 +761,21 @@ def score_all_pairs_fast(
     print(f"  Phase 2 pre-filter threshold: {prefilter_threshold}")
     print(f"  Phase 3 full scorer: top-{n_full_scorer_candidates} candidates per source entry")
 
+    skeleton_index = None
+    if candidate_engine == "edit":
+        from juthoor_cognatediscovery_lv2.discovery.skeleton_index import SkeletonIndex
+
+        skeleton_index = SkeletonIndex(max_edit)
+        for j, tgt_cache in enumerate(tgt_cache_list):
+            for skel in (tgt_cache["tgt_skel"], tgt_cache["stem_skel"]):
+                if skel and len(skel) >= 2:
+                    skeleton_index.add(skel, j)
+        print(f"  Phase 2 candidates: edit-distance index (k={max_edit}), {len(skeleton_index):,} skeletons")
+
     leads: list[dict[str, Any]] = []
     prefilter_passed = 0
     full_scored = 0
+    semantic_added = 0
 
     for i, src_cache in enumerate(src_cache_list):
         if i % 10 == 0:
@@ -757,7 +785,15 @@ def score_all_pairs_fast(
         # Phase 2: fast scoring for all target entries, keep top candidates
         candidate_heap: list[tuple[float, int]] = []
 
-        for j, tgt_cache in enumerate(tgt_cache_list):
+        if skeleton_index is not None:
+            queries = [_strip_diacriticals(v) for v in src_cache["variants"]]
+            queries += [src_cache["primary_latin"], *src_cache["meta_variants"]]
+            candidate_js = sorted(skeleton_index.search(q for q in queries if q))
+        else:
+            candidate_js = range(len(tgt_cache_list))
+
+        for j in candidate_js:
+            tgt_cache = tgt_cache_list[j]
             fast_score = _score_fast_inline(src_cache, tgt_cache)
             if fast_score < prefilter_threshold:
                 continue
@@ -767,10 +803,20 @@ def score_all_pairs_fast(
             elif fast_score > candidate_heap[0][0]:
                 heapq.heapreplace(candidate_heap, (fast_score, j))
 
+        # Hybrid: semantic neighbours join Phase 3 even if they failed the phonetic prefilter
+        semantic_hits = {j: (rank, cos) for rank, (j, cos) in enumerate((semantic_candidates or {}).get(i, ()))}
+        phase3 = list(candidate_heap)
+        if semantic_hits:
+            in_heap = {j for _, j in candidate_heap}
+            for j in semantic_hits:
+                if j not in in_heap:
+                    phase3.append((_score_fast_inline(src_cache, tgt_cache_list[j]), j))
+                    semantic_added += 1
+
         # Phase 3: full MultiMethodScorer on top candidates
         top_for_this: list[dict[str, Any]] = []
         entry_t0 = time.time()
-        for fast_score, j in candidate_heap:
+        for fast_score, j in phase3:
             if time.time() - entry_t0 > 30.0:
                 break
             tgt = tgt_cache_list[j]["entry"]
@@ -808,6 +854,9 @@ def score_all_pairs_fast(
             lead["scores"]["concept_similarity"] = round(concept_sim, 4)
             lead["scores"]["semantic_score"] = round(semantic, 4)
             lead["scores"]["combined_score"] = round(combined, 4)
+            if j in semantic_hits:
+                rank, cos = semantic_hits[j]
+                lead["retrieval"] = {"semantic_rank": rank, "semantic_cosine": round(cos, 4)}
             top_for_this.append(lead)
 
         top_for_this.sort(key=lambda x: x["scores"]["combined_score"], reverse=True)
@@ -817,6 +866,8 @@ def score_all_pairs_fast(
         f"  Phase 2 passed: {prefilter_passed:,} / {total_pairs:,} "
         f"({100*prefilter_passed/max(total_pairs,1):.1f}%)"
     )
+    if semantic_candidates is not None:
+        print(f"  Semantic candidates added to Phase 3: {semantic_added:,}")
     print(f"  Phase 3 full scorer calls: {full_scored:,}")
     return leads
 
@@ -898,73 +949,126 @@ def _build_lead(
 # Stage 2 (full mode): BGE-M3 FAISS retrieval
 # ---------------------------------------------------------------------------
 
+def semantic_prefilter_candidates(
+    source_entries: list[dict[str, Any]],
+    target_entries: list[dict[str, Any]],
+    top_k: int = 50,
+    index_spec: str = "flat",
+) -> dict[int, list[tuple[int, float]]] | None:
+    """Semantic top-k per source entry from cached BGE-M3 vectors (no embedding).
+
+    Reads the shared embedding store; texts that were never embedded simply
+    get no semantic candidates. Returns None if the store is unusable.
+    """
+    from juthoor_cognatediscovery_lv2.discovery.semantic_prefilter import SemanticPrefilter
+
+    try:
+        prefilter = SemanticPrefilter.from_repo(LV2_ROOT, k=top_k, index_spec=index_spec)
+        hits = prefilter.candidates(source_entries, target_entries)
+    except Exception as e:
+        print(f"  [WARN] Semantic prefilter failed: {e}. Continuing phonetic-only.")
+        return None
+    print(f"  Semantic prefilter (top-{top_k}): {prefilter.report()}")
+    if prefilter.low_coverage:
+        print("  [WARN] Most texts have no cached BGE-M3 vector; embed the corpora first "
+              "(retrieval.embed_corpus, --full, or the embedding service).")
+    return hits
+
+
 def try_faiss_retrieval(
     source_entries: list[dict[str, Any]],
     target_entries: list[dict[str, Any]],
     top_k: int = 100,
+    index_spec: str = "flat",
+    embed_backend: str = "local",
 ) -> dict[int, list[int]] | None:
     """Attempt BGE-M3 embedding + FAISS retrieval.
 
+    Vectors come from the shared embedding store; only texts it has never
+    seen are embedded (and written back), so repeated runs and corpora that
+    were already embedded cost no model time.
+
+    ``index_spec`` is an IndexSpec string (e.g. ``"hnsw:ef_search=256"`` or
+    ``"ivf_pq:nprobe=32"``); the default is exact inner-product search.
+    ``embed_backend`` "service" embeds through a running embedding service
+    (no model load here); "auto" uses one if it is running.
+
     Returns a dict mapping source_index -> [target_indices].
-    Returns None if embedding not available or estimated time > 30 min.
+    Returns None if embedding not available or the estimated time for the
+    uncached texts is > 30 min.
     """
-    try:
-        from sentence_transformers import SentenceTransformer
-    except ImportError:
-        print("  [WARN] sentence-transformers not available. Falling back to fast mode.")
-        return None
+    from juthoor_cognatediscovery_lv2.discovery.retrieval import get_store_root
+    from juthoor_cognatediscovery_lv2.discovery.semantic_prefilter import SemanticPrefilter, semantic_texts
+    from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import EmbeddingStore
 
-    model_name = "BAAI/bge-m3"
-    print(f"  Loading BGE-M3 model ({model_name})...")
     try:
-        t0 = time.time()
-        model = SentenceTransformer(model_name)
-        sample_text = "test word meaning"
-        model.encode([sample_text])
-        per_item_s = (time.time() - t0) / 1
-        total_items = len(source_entries) + len(target_entries)
-        estimated_min = (per_item_s * total_items) / 60
-        if estimated_min > 30:
-            print(f"  [WARN] Estimated embedding time: {estimated_min:.0f} min > 30 min limit.")
-            print("  Falling back to fast mode.")
-            return None
-        print(f"  Estimated embedding time: {estimated_min:.1f} min. Proceeding...")
+        prefilter = SemanticPrefilter.from_repo(LV2_ROOT, k=top_k, index_spec=index_spec)
     except Exception as e:
-        print(f"  [WARN] BGE-M3 init failed: {e}. Falling back to fast mode.")
+        print(f"  [WARN] Embedding store unavailable: {e}. Falling back to fast mode.")
         return None
+    texts = semantic_texts(source_entries) + semantic_texts(target_entries)
+    n_missing = len(prefilter.store.missing(texts))
+    print(f"  Embedding store: {len(set(texts)) - n_missing:,} cached, {n_missing:,} to embed.")
+
+    encode = None
+    if n_missing and embed_backend in ("service", "auto"):
+        from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import (
+            get_embedder,
+            service_available,
+        )
 
-    try:
-        import numpy as np
-        import faiss
-
-        def get_gloss(entry: dict[str, Any]) -> str:
-            return (
-                entry.get("meaning_text", "")
-                or entry.get("gloss_plain", "")
-                or entry.get("gloss", "")
-                or entry.get("short_gloss", "")
-                or entry.get("lemma", "")
-            )
+        if service_available():
+            try:
+                # checked against the store's config, so service vectors never land in the wrong namespace
+                encode = get_embedder("semantic", backend="service", config=prefilter.store.config).embed
+                print("  Using the local embedding service (BGE-M3 already loaded).")
+            except RuntimeError as e:
+                print(f"  [WARN] {e}.")
+                if embed_backend == "service":
+                    print("  Falling back to fast mode.")
+                    return None
+        elif embed_backend == "service":
+            print("  [WARN] No embedding service running. Falling back to fast mode.")
+            return None
 
-        print(f"  Embedding {len(source_entries)} source entries...")
-        src_texts = [get_gloss(e) for e in source_entries]
-        src_vectors = model.encode(src_texts, batch_size=64, show_progress_bar=True)
-
-        print(f"  Embedding {len(target_entries)} target entries...")
-        tgt_texts = [get_gloss(e) for e in target_entries]
-        tgt_vectors = model.encode(tgt_texts, batch_size=64, show_progress_bar=True)
-
-        dim = tgt_vectors.shape[1]
-        index = faiss.IndexFlatIP(dim)
-        tgt_norm = tgt_vectors / (np.linalg.norm(tgt_vectors, axis=1, keepdims=True) + 1e-10)
-        src_norm = src_vectors / (np.linalg.norm(src_vectors, axis=1, keepdims=True) + 1e-10)
-        index.add(tgt_norm.astype(np.float32))
-
-        print(f"  Searching FAISS index (top-{top_k} per source entry)...")
-        scores, idxs = index.search(src_norm.astype(np.float32), top_k)
-        retrieval_map: dict[int, list[int]] = {}
-        for i, idx_row in enumerate(idxs):
-            retrieval_map[i] = [int(idx) for idx in idx_row if idx >= 0]
+    if n_missing and encode is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            print("  [WARN] sentence-transformers not available. Falling back to fast mode.")
+            return None
+
+        model_name = "BAAI/bge-m3"
+        # SentenceTransformer vectors differ from FlagEmbedding's: keep them in their own namespace
+        prefilter.store = EmbeddingStore(get_store_root(LV2_ROOT), f"sentence-transformers/{model_name}",
+                                         SENTENCE_TRANSFORMERS_CONFIG)
+        n_missing = len(prefilter.store.missing(texts))
+        print(f"  SentenceTransformer store: {len(set(texts)) - n_missing:,} cached, {n_missing:,} to embed.")
+        print(f"  Loading BGE-M3 model ({model_name})...")
+        try:
+            t0 = time.time()
+            model = SentenceTransformer(model_name)
+            sample_text = "test word meaning"
+            model.encode([sample_text])
+            per_item_s = (time.time() - t0) / 1
+            estimated_min = (per_item_s * n_missing) / 60
+            if estimated_min > 30:
+                print(f"  [WARN] Estimated embedding time: {estimated_min:.0f} min > 30 min limit.")
+                print("  Falling back to fast mode.")
+                return None
+            print(f"  Estimated embedding time: {estimated_min:.1f} min. Proceeding...")
+        except Exception as e:
+            print(f"  [WARN] BGE-M3 init failed: {e}. Falling back to fast mode.")
+            return None
+
+        def encode(texts: list[str]):
+            return model.encode(texts, batch_size=64, show_progress_bar=True, normalize_embeddings=True)
+
+    try:
+        prefilter.embed = encode
+        print(f"  Searching {prefilter.index_spec.factory_string()} index (top-{top_k} per source entry)...")
+        hits = prefilter.candidates(source_entries, target_entries)
+        retrieval_map = {i: [j for j, _ in row] for i, row in hits.items()}
         print("  FAISS retrieval complete.")
         return retrieval_map
 
@@ -1022,46 +1126,65 @@ def score_pairs_with_retrieval(
 def run_llm_validation(
     leads: list[dict[str, Any]],
     llm_limit: int = 100,
+    use_cache: bool = True,
+    concurrency: int = 5,
+    requests_per_minute: float = 0.0,
+    pairs_per_prompt: int = 1,
 ) -> list[dict[str, Any]]:
-    """Validate top leads with Claude API, updating scores in-place."""
+    """Validate top leads with Claude API, updating scores in-place.
+
+    Answers are cached per pair (see discovery.llm_cache), so rerunning with a
+    larger --llm-limit or a re-ranked lead list only pays for new pairs.
+    Up to ``concurrency`` requests run at once (validate_batch).
+    """
+    from juthoor_cognatediscovery_lv2.discovery.llm_cache import LLMCache
+    from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder
     from juthoor_cognatediscovery_lv2.discovery.llm_validator import LLMEtymologyValidator
 
-    validator = LLMEtymologyValidator()
+    cache = LLMCache.default() if use_cache else None
+    validator = LLMEtymologyValidator(
+        max_concurrent=concurrency, cache=cache,
+        requests_per_minute=requests_per_minute, pairs_per_prompt=pairs_per_prompt,
+        telemetry=TelemetryRecorder.default("run_discovery_multilang"),
+    )
     if not validator.available:
         print("  [WARN] No ANTHROPIC_API_KEY found. Skipping LLM validation.")
+        if cache is not None:
+            cache.close()
         return leads
 
     sorted_leads = sorted(leads, key=lambda x: x["scores"]["multi_method_best"], reverse=True)
     to_validate = sorted_leads[:llm_limit]
     rest = sorted_leads[llm_limit:]
 
-    print(f"  Validating {len(to_validate)} pairs with Claude API...")
-    for idx, lead in enumerate(to_validate):
-        if idx % 10 == 0:
-            print(f"    LLM validating {idx + 1}/{len(to_validate)}...")
-        src = lead["source"]
-        tgt = lead["target"]
-        phonetic_score = lead["scores"].get("multi_method_best", 0.0)
-        try:
-            result = validator.validate_pair(
-                arabic_root=src.get("lemma", "") or src.get("root", ""),
-                arabic_meaning=src.get("gloss", ""),
-                english_word=tgt.get("lemma", ""),
-                english_meaning=tgt.get("gloss", ""),
-                phonetic_score=phonetic_score,
-                additional_context=lead["evidence"].get("explanation", ""),
-            )
-            llm_conf = result.confidence
-            combined = 0.7 * phonetic_score + 0.3 * llm_conf
-            lead["scores"]["llm_confidence"] = llm_conf
-            lead["scores"]["final_combined"] = round(combined, 6)
-            lead["evidence"]["llm_reasoning"] = result.reasoning
-            lead["evidence"]["llm_method"] = result.method_used
-            lead["evidence"]["llm_is_cognate"] = result.is_cognate
-            lead["evidence"]["phonetic_rules"] = result.phonetic_rules_identified
-        except Exception as e:
-            lead["scores"]["llm_confidence"] = None
-            lead["evidence"]["llm_error"] = str(e)
+    print(f"  Validating {len(to_validate)} pairs with Claude API ({concurrency} concurrent)...")
+    pairs = [
+        {
+            "arabic_root": lead["source"].get("lemma", "") or lead["source"].get("root", ""),
+            "arabic_meaning": lead["source"].get("gloss", ""),
+            "english_word": lead["target"].get("lemma", ""),
+            "english_meaning": lead["target"].get("gloss", ""),
+            "phonetic_score": lead["scores"].get("multi_method_best", 0.0),
+            "additional_context": lead["evidence"].get("explanation", ""),
+        }
+        for lead in to_validate
+    ]
+    results = validator.validate_batch(pairs)
+    # validate_batch degrades per pair (phonetic_fallback), so every lead gets a result.
+    for lead, pair, result in zip(to_validate, pairs, results):
+        llm_conf = result.confidence
+        combined = 0.7 * pair["phonetic_score"] + 0.3 * llm_conf
+        lead["scores"]["llm_confidence"] = llm_conf
+        lead["scores"]["final_combined"] = round(combined, 6)
+        lead["evidence"]["llm_reasoning"] = result.reasoning
+        lead["evidence"]["llm_method"] = result.method_used
+        lead["evidence"]["llm_is_cognate"] = result.is_cognate
+        lead["evidence"]["phonetic_rules"] = result.phonetic_rules_identified
+        if result.method_used == "phonetic_fallback":
+            lead["evidence"]["llm_error"] = result.raw_response
+    if cache is not None:
+        print(f"  LLM cache: {cache.stats}")
+        cache.close()
 
     combined_leads = to_validate + rest
     combined_leads.sort(key=lambda x: x["scores"].get("final_combined", 0.0), reverse=True)
@@ -1264,9 +1387,27 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--threshold", type=float, default=0.45, help="Minimum score threshold (default 0.45)")
     parser.add_argument("--llm", action="store_true", help="Enable Claude API validation for top candidates")
     parser.add_argument("--llm-limit", type=int, default=100, help="Max pairs to send to LLM (default 100)")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Bypass the per-pair LLM response cache")
+    parser.add_argument("--llm-concurrency", type=int, default=5, help="LLM requests in flight (default 5)")
+    parser.add_argument("--llm-rpm", type=float, default=0, help="LLM requests per minute (default 0 = unpaced)")
+    parser.add_argument("--llm-pairs-per-prompt", type=int, default=1, help="Pairs packed into one LLM prompt (default 1)")
     parser.add_argument("--output-dir", type=Path, default=None, help="Output directory (default: outputs/leads/)")
     parser.add_argument("--semantic-threshold", type=float, default=0.0, help="Min semantic score (0=disabled)")
     parser.add_argument("--no-gold-supplement", action="store_true", help="Skip gold benchmark supplementation")
+    parser.add_argument("--faiss-index", type=str, default="flat",
+                        help="Full-mode index recipe: flat | ivf_flat | ivf_pq | hnsw | opq_ivf_pq | numpy, "
+                             "with optional params, e.g. 'hnsw:hnsw_m=32,ef_search=256' (default flat; "
+                             "exact NumPy search is used automatically when faiss is missing)")
+    parser.add_argument("--candidate-engine", choices=("scan", "edit"), default="scan",
+                        help="Fast-mode Phase 2 candidates: scan all targets (default) or edit-distance index")
+    parser.add_argument("--max-edit", type=int, default=1,
+                        help="Max skeleton edit distance for --candidate-engine edit (default 1)")
+    parser.add_argument("--embed-backend", choices=("local", "service", "auto"), default="local",
+                        help="Full-mode embeddings: load BGE-M3 here (default), use a running "
+                             "embedding service, or use one if it is running")
+    parser.add_argument("--semantic-k", type=int, default=0,
+                        help="Fast mode: also send each source's semantic top-k targets (from cached "
+                             "BGE-M3 vectors, no embedding) to Phase 3 (0 = off)")
     return parser.parse_args()
 
 
@@ -1398,7 +1539,10 @@ def main() -> int:
 
     if mode == "full":
         print("\n[Stage 2] Attempting BGE-M3 + FAISS retrieval...")
-        retrieval_map = try_faiss_retrieval(source_entries, target_entries, top_k=100)
+        retrieval_map = try_faiss_retrieval(
+            source_entries, target_entries, top_k=100, index_spec=args.faiss_index,
+            embed_backend=args.embed_backend,
+        )
         if retrieval_map is not None:
             print("\n[Stage 3] Scoring FAISS-retrieved candidates...")
             leads = score_pairs_with_retrieval(
@@ -1409,14 +1553,27 @@ def main() -> int:
         else:
             print("\n[Stage 2 fallback] Using fast mode scoring...")
             mode = "fast (fallback from full)"
+            semantic_candidates = (
+                semantic_prefilter_candidates(source_entries, target_entries, args.semantic_k, args.faiss_index)
+                if args.semantic_k > 0 else None
+            )
             leads = score_all_pairs_fast(
                 source_entries, target_entries, scorer,
                 source_lang=source_lang, target_lang=target_lang,
                 top_k=args.top_k, threshold=args.threshold,
                 concept_matcher=concept_matcher,
                 semantic_threshold=args.semantic_threshold,
+                candidate_engine=args.candidate_engine,
+                max_edit=args.max_edit,
+                semantic_candidates=semantic_candidates,
             )
     else:
+        semantic_candidates = None
+        if args.semantic_k > 0:
+            print("\n[Stage 2a] Semantic prefilter from cached vectors...")
+            semantic_candidates = semantic_prefilter_candidates(
+                source_entries, target_entries, args.semantic_k, args.faiss_index,
+            )
         print("\n[Stage 2+3] Scoring all pairs (fast mode)...")
         leads = score_all_pairs_fast(
             source_entries, target_entries, scorer,
@@ -1424,6 +1581,9 @@ def main() -> int:
             top_k=args.top_k, threshold=args.threshold,
             concept_matcher=concept_matcher,
             semantic_threshold=args.semantic_threshold,
+            candidate_engine=args.candidate_engine,
+            max_edit=args.max_edit,
+            semantic_candidates=semantic_candidates,
         )
 
     leads.sort(key=lambda x: x["scores"].get("final_combined", 0.0), reverse=True)
@@ -1432,7 +1592,11 @@ def main() -> int:
     # Stage 4: LLM Validation
     if args.llm and leads:
         print(f"\n[Stage 4] LLM validation (top {args.llm_limit})...")
-        leads = run_llm_validation(leads, llm_limit=args.llm_limit)
+        leads = run_llm_validation(
+            leads, llm_limit=args.llm_limit, use_cache=not args.no_llm_cache,
+            concurrency=args.llm_concurrency, requests_per_minute=args.llm_rpm,
+            pairs_per_prompt=args.llm_pairs_per_prompt,
+        )
         print("  LLM validation complete.")
 
     # Stage 5: Benchmark Evaluation
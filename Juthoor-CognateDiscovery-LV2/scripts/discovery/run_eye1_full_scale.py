@@ -8,6 +8,9 @@ Usage:
   python scripts/discovery/run_eye1_full_scale.py --target lat --threshold 0.3
   python scripts/discovery/run_eye1_full_scale.py --target grc --threshold 0.3
 
+  # Stream roots as they finish, for Eye 2 --follow (see run_pipeline.py)
+  python scripts/discovery/run_eye1_full_scale.py --target grc --stream
+
   # Quick test (100 roots × 1000 lemmas)
   python scripts/discovery/run_eye1_full_scale.py --target lat --threshold 0.3 \\
       --arabic-limit 100 --target-limit 1000
@@ -21,7 +24,7 @@ import sys
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 # Force UTF-8 output on Windows
 if hasattr(sys.stdout, "reconfigure"):
@@ -39,6 +42,8 @@ LV0_PROCESSED = REPO_ROOT / "Juthoor-DataCore-LV0/data/processed"
 
 sys.path.insert(0, str(LV2_ROOT / "src"))
 
+from juthoor_cognatediscovery_lv2.discovery.eye1_stream import done_marker, mark_done  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Corpus paths (relative to LV0_PROCESSED)
 # ---------------------------------------------------------------------------
@@ -91,25 +96,14 @@ def _load_target_morphology() -> Any:
 
 import re as _re
 
-_ARABIC_DIACRITICS_RE = _re.compile(r"[\u064B-\u065F\u0670\u0640]")
-_HAMZA_TR = str.maketrans({
-    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
-    "ؤ": "و", "ئ": "ي", "ء": "ا",
-})
+from juthoor_cognatediscovery_lv2.discovery.normalization import (  # noqa: E402
+    normalize_arabic as _norm_arabic,
+)
+
 # Reject roots containing non-Arabic chars (parentheses, Latin, digits, etc.)
 _GARBAGE_ROOT_RE = _re.compile(r"[a-zA-Z0-9()\[\]{}<>\"؛;,]")
 
 
-def _norm_arabic(text: str) -> str:
-    text = _ARABIC_DIACRITICS_RE.sub("", text)
-    text = text.translate(_HAMZA_TR).strip()
-    # Strip definite article ال if present at start
-    # Only strip if there are at least 2 letters after ال (minimum valid root)
-    if text.startswith("ال") and len(text) >= 4:
-        text = text[2:]
-    return text
-
-
 # ---------------------------------------------------------------------------
 # POS filter for kaikki corpora
 # ---------------------------------------------------------------------------
@@ -400,6 +394,8 @@ def build_arabic_skeleton_index(
 def build_target_skeleton_index(
     lemmas: list[dict[str, Any]],
     lang: str,
+    variant_budget: int = 0,
+    signature_dedup: bool = False,
 ) -> list[dict[str, Any]]:
     """For each target lemma, build consonant skeleton variants.
 
@@ -409,11 +405,15 @@ def build_target_skeleton_index(
     the inner matching loop 3-4x faster.
 
     Uses extract_all_skeletons(word, ipa, lang) from target_morphology.
+    ``variant_budget`` caps the skeletons kept per lemma (most plausible
+    first; 0 = unbounded) and ``signature_dedup`` collapses variants with the
+    same consonant set. Both are off by default: they cost Eye 1 recall.
     Pre-computes:
       - all_skeletons: list of skeleton strings (from primary lemma)
       - all_skels_sets: list of frozensets for fast Jaccard
     """
     tm = _load_target_morphology()
+    stats = tm.VariantBudgetStats()
 
     # Track by primary skeleton for deduplication
     by_primary_skel: dict[str, dict[str, Any]] = {}
@@ -423,7 +423,9 @@ def build_target_skeleton_index(
     for entry in lemmas:
         lemma = entry["lemma"]
         ipa = entry.get("ipa") or None
-        skels = tm.extract_all_skeletons(lemma, ipa, lang)
+        skels = tm.extract_all_skeletons(
+            lemma, ipa, lang, max_skeletons=variant_budget, signature_dedup=signature_dedup, stats=stats,
+        )
         if not skels:
             total_skipped += 1
             continue
@@ -458,6 +460,12 @@ def build_target_skeleton_index(
         f"({total_skipped} skipped, skeleton dedup ratio: {total_in/max(1,len(augmented)):.1f}x)",
         file=sys.stderr,
     )
+    print(
+        f"  Variant budget: {stats.skeletons_kept} skeletons kept, "
+        f"{stats.truncated_words} lemmas truncated ({stats.variants_dropped} variants dropped), "
+        f"{stats.signature_duplicates} signature duplicates collapsed",
+        file=sys.stderr,
+    )
     return augmented
 
 
@@ -504,6 +512,27 @@ def build_inverted_index(
     return dict(inv)
 
 
+def build_edit_index(
+    target_entries: list[dict[str, Any]],
+    max_distance: int = 1,
+) -> Any:
+    """Alternative candidate engine: skeletons within ``max_distance`` edits.
+
+    Indexes every skeleton variant of every target in a symmetric-deletion
+    SkeletonIndex. run_matching then takes as candidates the targets that
+    have some variant within ``max_distance`` edits (adjacent swaps count as
+    one) of the root's primary or first alternate projections.
+    """
+    from juthoor_cognatediscovery_lv2.discovery.skeleton_index import SkeletonIndex
+
+    index = SkeletonIndex(max_distance)
+    for idx, entry in enumerate(target_entries):
+        for skel in entry["all_skeletons"]:
+            if len(skel) >= 2:
+                index.add(skel, idx)
+    return index
+
+
 # ---------------------------------------------------------------------------
 # Step 6: Jaccard + ordered overlap computation
 # ---------------------------------------------------------------------------
@@ -593,6 +622,57 @@ def _discovery_score(
     )
 
 
+def _root_records(
+    ar_entry: dict[str, Any],
+    heap: list,
+    target_entries: list[dict[str, Any]],
+    lang: str,
+) -> list[dict[str, Any]]:
+    """One root's heap as output records, sorted descending by discovery_score."""
+    records: list[dict[str, Any]] = []
+    for score, _tie, idx, best_j, best_ai, best_ti, ord_ov in sorted(heap, reverse=True):
+        tgt_entry = target_entries[idx]
+        best_ar_skel = ar_entry["all_skeletons"][best_ai]
+        best_tgt_skel = tgt_entry["all_skeletons"][best_ti]
+        ar_skel_sets = ar_entry["all_skels_sets"]
+        tgt_skel_sets = tgt_entry["all_skels_sets"]
+        overlap_chars = sorted(ar_skel_sets[best_ai] & tgt_skel_sets[best_ti])
+
+        # Bug 3 fix: use the BEST matched skeleton pair for ratio/length,
+        # not the primary skeleton which may be a different variant
+        ar_skel_for_ratio = best_ar_skel
+        tgt_skel_for_ratio = best_tgt_skel
+        min_len = min(len(ar_skel_for_ratio), len(tgt_skel_for_ratio))
+
+        match_record = {
+            "arabic_root": ar_entry["arabic_root"],
+            "arabic_skeleton": best_ar_skel,
+            "target_lemma": tgt_entry["lemma"],
+            "target_skeleton": best_tgt_skel,
+            "jaccard": round(best_j, 4),
+            "overlap_consonants": overlap_chars,
+            "ordered_overlap": ord_ov,
+            "lang": lang,
+            "n_lemmas": 1 + len(tgt_entry.get("alt_lemmas", [])),
+            "discovery_score": round(score, 4),
+            "ordered_overlap_ratio": round(
+                len(ord_ov) / min_len if min_len > 0 else 0, 3
+            ),
+            "ar_skel_len": len(ar_skel_for_ratio),
+            "tgt_skel_len": len(tgt_skel_for_ratio),
+        }
+        records.append(match_record)
+
+        # Bug 1 fix: emit alt_lemmas as separate records so Eye 2 sees all
+        for alt in tgt_entry.get("alt_lemmas", []):
+            alt_record = dict(match_record)
+            alt_lemma = alt["lemma"] if isinstance(alt, dict) else alt
+            alt_record["target_lemma"] = alt_lemma
+            alt_record["is_alt"] = True
+            records.append(alt_record)
+    return records
+
+
 def run_matching(
     arabic_entries: list[dict[str, Any]],
     target_entries: list[dict[str, Any]],
@@ -601,6 +681,8 @@ def run_matching(
     threshold: float = 0.3,
     min_overlap: int = 2,
     top_k: int = 200,
+    edit_index: Any = None,
+    on_root: Callable[[list[dict[str, Any]]], None] | None = None,
 ) -> tuple[list[dict[str, Any]], float]:
     """Run skeleton matching with inverted-index acceleration and ranked output.
 
@@ -612,10 +694,15 @@ def run_matching(
     5. Output ranked candidates — Eye 2 consumes top candidates first
 
     When top_k=0, all matches above threshold are kept (exhaustive mode).
+    When ``edit_index`` (see build_edit_index) is given, it replaces the
+    sorted-pair lookup in step 1; scoring and gating are unchanged.
+    ``on_root`` is called with each root's ranked records as soon as that
+    root is done (the --stream handoff to Eye 2), in output order.
     """
     # Per-root bounded heaps: (discovery_score, tie_breaker, match_dict)
     # Using tie_breaker (counter) to avoid dict comparison in heapq
     root_heaps: dict[str, list] = defaultdict(list)
+    matches: list[dict[str, Any]] = []
     tie_counter = 0
     total_considered = 0
     total_passed = 0
@@ -639,20 +726,27 @@ def run_matching(
         primary_latin = ar_entry["primary_latin"]
         ar_len = len(primary_latin)
 
-        # 1. Sorted-pair inverted index lookup
-        ar_pairs = _sorted_pairs(primary_latin) if ar_len >= 2 else set()
-        for alt_skel in ar_entry["all_skeletons"][1:4]:
-            if len(alt_skel) >= 2:
-                ar_pairs.update(_sorted_pairs(alt_skel))
+        required_hits = min_overlap if min_overlap >= 2 else 2
 
-        candidate_counts: dict[int, int] = defaultdict(int)
-        for pair in ar_pairs:
-            if pair in inv_index:
-                for idx in inv_index[pair]:
-                    candidate_counts[idx] += 1
+        # 1. Sorted-pair inverted index lookup (or edit-distance index, whose
+        #    hits all count as passing the pair filter)
+        if edit_index is not None:
+            candidate_counts = dict.fromkeys(
+                edit_index.search(ar_entry["all_skeletons"][:4]), required_hits
+            )
+        else:
+            ar_pairs = _sorted_pairs(primary_latin) if ar_len >= 2 else set()
+            for alt_skel in ar_entry["all_skeletons"][1:4]:
+                if len(alt_skel) >= 2:
+                    ar_pairs.update(_sorted_pairs(alt_skel))
+
+            candidate_counts = defaultdict(int)
+            for pair in ar_pairs:
+                if pair in inv_index:
+                    for idx in inv_index[pair]:
+                        candidate_counts[idx] += 1
 
         # 2. Process candidates sharing >= required consonant pairs
-        required_hits = min_overlap if min_overlap >= 2 else 2
         ar_root = ar_entry["arabic_root"]
         heap = root_heaps[ar_root]
 
@@ -695,55 +789,12 @@ def run_matching(
                 tie_counter += 1
                 heap.append((score, tie_counter, idx, best_j, best_ai, best_ti, ord_ov))
 
-    # Flatten heaps into sorted output
-    matches: list[dict[str, Any]] = []
-    for ar_entry in arabic_entries:
-        ar_root = ar_entry["arabic_root"]
-        heap = root_heaps.get(ar_root)
-        if not heap:
-            continue
-
-        # Sort descending by discovery_score
-        for score, _tie, idx, best_j, best_ai, best_ti, ord_ov in sorted(heap, reverse=True):
-            tgt_entry = target_entries[idx]
-            best_ar_skel = ar_entry["all_skeletons"][best_ai]
-            best_tgt_skel = tgt_entry["all_skeletons"][best_ti]
-            ar_skel_sets = ar_entry["all_skels_sets"]
-            tgt_skel_sets = tgt_entry["all_skels_sets"]
-            overlap_chars = sorted(ar_skel_sets[best_ai] & tgt_skel_sets[best_ti])
-
-            # Bug 3 fix: use the BEST matched skeleton pair for ratio/length,
-            # not the primary skeleton which may be a different variant
-            ar_skel_for_ratio = best_ar_skel
-            tgt_skel_for_ratio = best_tgt_skel
-            min_len = min(len(ar_skel_for_ratio), len(tgt_skel_for_ratio))
-
-            match_record = {
-                "arabic_root": ar_entry["arabic_root"],
-                "arabic_skeleton": best_ar_skel,
-                "target_lemma": tgt_entry["lemma"],
-                "target_skeleton": best_tgt_skel,
-                "jaccard": round(best_j, 4),
-                "overlap_consonants": overlap_chars,
-                "ordered_overlap": ord_ov,
-                "lang": lang,
-                "n_lemmas": 1 + len(tgt_entry.get("alt_lemmas", [])),
-                "discovery_score": round(score, 4),
-                "ordered_overlap_ratio": round(
-                    len(ord_ov) / min_len if min_len > 0 else 0, 3
-                ),
-                "ar_skel_len": len(ar_skel_for_ratio),
-                "tgt_skel_len": len(tgt_skel_for_ratio),
-            }
-            matches.append(match_record)
-
-            # Bug 1 fix: emit alt_lemmas as separate records so Eye 2 sees all
-            for alt in tgt_entry.get("alt_lemmas", []):
-                alt_record = dict(match_record)
-                alt_lemma = alt["lemma"] if isinstance(alt, dict) else alt
-                alt_record["target_lemma"] = alt_lemma
-                alt_record["is_alt"] = True
-                matches.append(alt_record)
+        # 8. The root is final: flatten its heap into ranked records
+        if heap:
+            records = _root_records(ar_entry, heap, target_entries, lang)
+            matches.extend(records)
+            if on_root is not None:
+                on_root(records)
 
     elapsed = time.time() - t0
     total_passed = sum(len(h) for h in root_heaps.values())
@@ -805,6 +856,35 @@ def parse_args() -> argparse.Namespace:
         default=200,
         help="Keep top K matches per Arabic root (0 = all, default 200)",
     )
+    p.add_argument(
+        "--variant-budget",
+        type=int,
+        default=0,
+        help="Max skeleton variants kept per target lemma (0 = unbounded, the default; 40 is the suggested cap)",
+    )
+    p.add_argument(
+        "--signature-dedup",
+        action="store_true",
+        help="Collapse target variants with the same consonant set (smaller index, lower recall)",
+    )
+    p.add_argument(
+        "--candidate-engine",
+        choices=("pairs", "edit"),
+        default="pairs",
+        help="Candidate lookup: sorted consonant pairs (default) or edit-distance index",
+    )
+    p.add_argument(
+        "--max-edit",
+        type=int,
+        default=1,
+        help="Max skeleton edit distance for --candidate-engine edit (default 1)",
+    )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write each root's matches as soon as it is done and mark the output done at the end "
+             "(for Eye 2 --follow)",
+    )
     p.add_argument(
         "--arabic-limit",
         type=int,
@@ -871,29 +951,66 @@ def main() -> None:
     # ---- Step 4: Pre-compute target skeletons ----
     t0 = time.time()
     print("[4/6] Pre-computing target skeletons + variants...", file=sys.stderr)
-    target_entries = build_target_skeleton_index(raw_target, lang)
+    target_entries = build_target_skeleton_index(
+        raw_target, lang, variant_budget=args.variant_budget, signature_dedup=args.signature_dedup,
+    )
     print(f"  {len(target_entries)} target entries with skeletons in {time.time()-t0:.1f}s", file=sys.stderr)
 
     # ---- Step 5: Build inverted index ----
     t0 = time.time()
-    print("[5/6] Building inverted index (consonant → targets)...", file=sys.stderr)
-    inv_index = build_inverted_index(target_entries)
-    print(f"  {len(inv_index)} consonant keys in index in {time.time()-t0:.1f}s", file=sys.stderr)
+    edit_index = None
+    if args.candidate_engine == "edit":
+        print(f"[5/6] Building edit-distance index (k={args.max_edit})...", file=sys.stderr)
+        inv_index = {}
+        edit_index = build_edit_index(target_entries, args.max_edit)
+        n_postings = edit_index.n_keys
+        print(
+            f"  {len(edit_index)} skeletons, {n_postings:,} deletion keys in {time.time()-t0:.1f}s",
+            file=sys.stderr,
+        )
+    else:
+        print("[5/6] Building inverted index (consonant → targets)...", file=sys.stderr)
+        inv_index = build_inverted_index(target_entries)
+        n_postings = sum(len(v) for v in inv_index.values())
+        print(
+            f"  {len(inv_index)} consonant keys, {n_postings:,} postings in index in {time.time()-t0:.1f}s",
+            file=sys.stderr,
+        )
 
     # ---- Step 6: Run matching ----
     print("[6/6] Running skeleton matching...", file=sys.stderr)
-    matches, elapsed = run_matching(
-        arabic_entries,
-        target_entries,
-        inv_index,
-        lang=lang,
-        threshold=args.threshold,
-        min_overlap=args.min_overlap,
-        top_k=args.top_k,
-    )
+    stream_fh = None
+    on_root = None
+    if args.stream:
+        done_marker(output_path).unlink(missing_ok=True)
+        stream_fh = open(output_path, "w", encoding="utf-8")
+
+        def on_root(records: list[dict[str, Any]]) -> None:
+            stream_fh.write("".join(json.dumps(m, ensure_ascii=False) + "\n" for m in records))
+            stream_fh.flush()
+
+    try:
+        matches, elapsed = run_matching(
+            arabic_entries,
+            target_entries,
+            inv_index,
+            lang=lang,
+            threshold=args.threshold,
+            min_overlap=args.min_overlap,
+            top_k=args.top_k,
+            edit_index=edit_index,
+            on_root=on_root,
+        )
+    finally:
+        if stream_fh is not None:
+            stream_fh.close()
 
     # ---- Write output ----
-    print(f"\nWriting {len(matches)} matches to {output_path} ...", file=sys.stderr)
+    if args.stream:
+        mark_done(output_path, matches=len(matches), roots=len(arabic_entries))
+        print(f"\nStreamed {len(matches)} matches to {output_path}", file=sys.stderr)
+    else:
+        print(f"\nWriting {len(matches)} matches to {output_path} ...", file=sys.stderr)
     # Sanity check: catch regressions of the ال normalization bug. We expect
     # almost zero ال prefixes in the stored arabic_root field (a few len<4
     # residuals like "الا" are acceptable).
@@ -911,9 +1028,10 @@ def main() -> None:
                 f"  note: {al_residuals} len<4 ال-prefix residuals (expected)",
                 file=sys.stderr,
             )
-    with open(output_path, "w", encoding="utf-8") as f:
-        for m in matches:
-            f.write(json.dumps(m, ensure_ascii=False) + "\n")
+    if not args.stream:
+        with open(output_path, "w", encoding="utf-8") as f:
+            for m in matches:
+                f.write(json.dumps(m, ensure_ascii=False) + "\n")
 
     total_elapsed = time.time() - t_global
     pairs_checked = len(arabic_entries) * len(target_entries)
@@ -923,6 +1041,7 @@ def main() -> None:
     print("=== Summary ===", file=sys.stderr)
     print(f"  Arabic roots     : {len(arabic_entries)}", file=sys.stderr)
     print(f"  Target lemmas    : {len(target_entries)}", file=sys.stderr)
+    print(f"  Index postings   : {n_postings:,}", file=sys.stderr)
     print(f"  Pairs (max)      : {pairs_checked:,}", file=sys.stderr)
     print(f"  Matches found    : {len(matches)}", file=sys.stderr)
     print(f"  Match rate       : {len(matches)/max(1,len(arabic_entries)*len(target_entries))*100:.4f}%", file=sys.stderr)
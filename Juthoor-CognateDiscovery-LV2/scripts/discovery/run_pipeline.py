@@ -3,8 +3,16 @@ Juthoor LV2 — Unified Discovery Pipeline
 
 Chains Eye 1 → Eye 2 → Cognate Graph in a single command.
 
+With ``--stage all`` Eye 1 and Eye 2 run side by side by default: Eye 1
+streams each root's candidates as soon as it is matched (``--stream``) and
+Eye 2 tails that file (``--follow``), so LLM scoring starts with the first
+roots instead of after the whole Eye 1 run. Both processes' logs are
+relayed with an [eye1]/[eye2] prefix, plus a shared [pipeline] progress
+line. ``--handoff staged`` restores the run-one-then-the-other behaviour.
+
 Usage:
     python scripts/discovery/run_pipeline.py --source ara --target grc
+    python scripts/discovery/run_pipeline.py --source ara --target grc --handoff staged
     python scripts/discovery/run_pipeline.py --source ara --target grc --stage eye1
     python scripts/discovery/run_pipeline.py --source ara --target grc --stage eye2
     python scripts/discovery/run_pipeline.py --stage graph
@@ -12,8 +20,10 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 
@@ -28,6 +38,11 @@ EYE2_MODULE = "juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer"
 GRAPH_SCRIPT = LV2_ROOT / "scripts" / "discovery" / "build_cognate_graph.py"
 OUTPUTS_DIR = LV2_ROOT / "outputs"
 
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.discovery.eye1_stream import Eye1Follower, done_marker  # noqa: E402
+from juthoor_cognatediscovery_lv2.discovery.eye2_checkpoint import Eye2Checkpoint, checkpoint_path  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Config loading
 # ---------------------------------------------------------------------------
@@ -45,7 +60,7 @@ def _load_config() -> dict:
         print(f"[pipeline] Config not found: {config_path} — using hardcoded defaults", file=sys.stderr)
     return {
         "eye1": {"threshold": 0.3, "min_overlap": 2, "top_k": 200},
-        "eye2": {"batch_size": 10, "first_pass_model": "sonnet", "min_discovery_score": 0.6, "top_n_per_root": 50},
+        "eye2": {"batch_size": 25, "token_budget": 6000, "concurrency": 4, "first_pass_model": "sonnet", "min_discovery_score": 0.6, "top_n_per_root": 50},
     }
 
 # ---------------------------------------------------------------------------
@@ -68,7 +83,15 @@ def _run(cmd: list[str], label: str) -> int:
     return result.returncode
 
 
-def run_eye1(args: argparse.Namespace, cfg: dict) -> int:
+def _eye1_output(args: argparse.Namespace) -> Path:
+    return OUTPUTS_DIR / f"eye1_full_scale_{args.target}.jsonl"
+
+
+def _eye2_output(args: argparse.Namespace) -> Path:
+    return OUTPUTS_DIR / "leads" / f"eye2_{args.source}_{args.target}.jsonl"
+
+
+def _eye1_cmd(args: argparse.Namespace, cfg: dict) -> list[str]:
     eye1_cfg = cfg.get("eye1", {})
     threshold = args.threshold if args.threshold is not None else eye1_cfg.get("threshold", 0.3)
     top_k = args.top_k if args.top_k is not None else eye1_cfg.get("top_k", 200)
@@ -81,44 +104,132 @@ def run_eye1(args: argparse.Namespace, cfg: dict) -> int:
         "--top-k", str(top_k),
         "--min-overlap", str(min_overlap),
     ]
-    return _run(cmd, "Eye 1")
+    return cmd
 
 
-def run_eye2(args: argparse.Namespace, cfg: dict) -> int:
-    eye1_output = OUTPUTS_DIR / f"eye1_full_scale_{args.target}.jsonl"
-    if not eye1_output.exists():
-        print(
-            f"[pipeline] ERROR: Eye 1 output not found: {eye1_output}\n"
-            "  Run Eye 1 first: --stage eye1",
-            file=sys.stderr,
-        )
-        return 1
-
+def _eye2_cmd(args: argparse.Namespace, cfg: dict) -> list[str]:
     eye2_cfg = cfg.get("eye2", {})
     model = args.model if args.model else eye2_cfg.get("first_pass_model", "sonnet")
-    batch_size = eye2_cfg.get("batch_size", 10)
+    batch_size = eye2_cfg.get("batch_size", 25)
     min_score = eye2_cfg.get("min_discovery_score", 0.6)
     top_n = eye2_cfg.get("top_n_per_root", 50)
+    concurrency = eye2_cfg.get("concurrency", 4)
+    token_budget = eye2_cfg.get("token_budget", 6000)
 
-    eye2_output = OUTPUTS_DIR / "leads" / f"eye2_{args.source}_{args.target}.jsonl"
+    eye2_output = _eye2_output(args)
     eye2_output.parent.mkdir(parents=True, exist_ok=True)
 
     cmd = [
         sys.executable, "-m", EYE2_MODULE,
-        "--input", str(eye1_output),
+        "--input", str(_eye1_output(args)),
         "--output", str(eye2_output),
         "--lang", args.target,
         "--model", model,
         "--batch-size", str(batch_size),
         "--min-discovery-score", str(min_score),
         "--top-n-per-root", str(top_n),
+        "--concurrency", str(concurrency),
+        "--token-budget", str(token_budget),
     ]
     if args.dry_run:
         cmd.append("--dry-run")
     if args.resume:
         cmd.append("--resume")
+    return cmd
+
+
+def run_eye1(args: argparse.Namespace, cfg: dict) -> int:
+    return _run(_eye1_cmd(args, cfg), "Eye 1")
+
 
-    return _run(cmd, "Eye 2")
+def run_eye2(args: argparse.Namespace, cfg: dict) -> int:
+    eye1_output = _eye1_output(args)
+    if not eye1_output.exists():
+        print(
+            f"[pipeline] ERROR: Eye 1 output not found: {eye1_output}\n"
+            "  Run Eye 1 first: --stage eye1",
+            file=sys.stderr,
+        )
+        return 1
+    return _run(_eye2_cmd(args, cfg), "Eye 2")
+
+
+def _spawn(cmd: list[str], prefix: str) -> subprocess.Popen:
+    """Start a stage in the background, relaying its output line by line with ``prefix``."""
+    print(f"[pipeline] Starting: {' '.join(str(c) for c in cmd)}", file=sys.stderr)
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8", errors="replace",
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+
+    def relay() -> None:
+        for line in proc.stdout:
+            print(f"{prefix} {line}", end="", file=sys.stderr, flush=True)
+
+    threading.Thread(target=relay, daemon=True).start()
+    return proc
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run_eye1_eye2_streaming(args: argparse.Namespace, cfg: dict, *, every: float = 30.0) -> int:
+    """Run Eye 1 (--stream) and Eye 2 (--follow) together; print a shared progress line."""
+    eye2_cfg = cfg.get("eye2", {})
+    eye1_output, eye2_output = _eye1_output(args), _eye2_output(args)
+    # A stale output or done marker would let Eye 2 race ahead on last run's candidates.
+    eye1_output.unlink(missing_ok=True)
+    done_marker(eye1_output).unlink(missing_ok=True)
+
+    eye1 = _spawn(_eye1_cmd(args, cfg) + ["--stream"], "[eye1]")
+    eye2 = _spawn(_eye2_cmd(args, cfg) + ["--follow"], "[eye2]")
+    # Same filters as Eye 2, only to count what has been handed over.
+    follower = Eye1Follower(eye1_output, min_discovery_score=eye2_cfg.get("min_discovery_score", 0.6),
+                            top_n_per_root=eye2_cfg.get("top_n_per_root", 50), lang_filter=args.target,
+                            stream=None)
+    ckpt: Eye2Checkpoint | None = None
+    last = 0.0
+    try:
+        while True:
+            rc1, rc2 = eye1.poll(), eye2.poll()
+            follower.poll()
+            if time.time() - last >= every or rc2 is not None:
+                last = time.time()
+                eye2_state = "dry run"
+                if not args.dry_run and ckpt is None and checkpoint_path(eye2_output).exists():
+                    ckpt = Eye2Checkpoint(eye2_output, stream=None)
+                if ckpt is not None:
+                    st = ckpt.status()
+                    eye2_state = f"{st['done']} scored, {st['failed']} failed, {st['pending']} pending"
+                elif not args.dry_run:
+                    eye2_state = "starting"
+                print(
+                    f"[pipeline] eye1 {'running' if rc1 is None else 'done'}: {follower.roots} roots, "
+                    f"{follower.candidates} candidates handed over | eye2: {eye2_state}",
+                    file=sys.stderr, flush=True,
+                )
+            if rc1 not in (None, 0):
+                print(f"[pipeline] ERROR: Eye 1 exited with code {rc1}; stopping Eye 2", file=sys.stderr)
+                _stop(eye2)
+                return rc1
+            if rc2 is not None:
+                if rc2 != 0:
+                    print(f"[pipeline] ERROR: Eye 2 exited with code {rc2}; stopping Eye 1", file=sys.stderr)
+                    _stop(eye1)
+                    return rc2
+                return eye1.wait()
+            time.sleep(1.0)
+    finally:
+        _stop(eye1)
+        _stop(eye2)
+        if ckpt is not None:
+            ckpt.close()
 
 
 def run_graph(cfg: dict) -> int:
@@ -155,6 +266,13 @@ def _parse_args() -> argparse.Namespace:
     p.add_argument("--model", default=None, help="Override Eye 2 model (sonnet/opus)")
     p.add_argument("--dry-run", action="store_true", help="Pass --dry-run to Eye 2")
     p.add_argument("--resume", action="store_true", help="Pass --resume to Eye 2")
+    p.add_argument(
+        "--handoff",
+        default="stream",
+        choices=["stream", "staged"],
+        help="--stage all: run Eye 2 alongside Eye 1 on its streamed output (default), "
+             "or only after Eye 1 has finished (staged)",
+    )
     return p.parse_args()
 
 
@@ -170,7 +288,12 @@ def main() -> None:
     t_start = time.time()
     failed = False
 
-    stages = ["eye1", "eye2", "graph"] if args.stage == "all" else [args.stage]
+    if args.stage != "all":
+        stages = [args.stage]
+    elif args.handoff == "stream":
+        stages = ["eye1+eye2", "graph"]
+    else:
+        stages = ["eye1", "eye2", "graph"]
 
     for stage in stages:
         _header(f"Stage: {stage.upper()}")
@@ -180,6 +303,8 @@ def main() -> None:
             rc = run_eye1(args, cfg)
         elif stage == "eye2":
             rc = run_eye2(args, cfg)
+        elif stage == "eye1+eye2":
+            rc = run_eye1_eye2_streaming(args, cfg)
         else:
             rc = run_graph(cfg)
 
@@ -254,15 +254,38 @@ def _score_with_timeout(scorer: Any, arabic_entry: dict, target_entry: dict, tim
 # ---------------------------------------------------------------------------
 
 
+def build_skeleton_index(reverse_index: dict[str, Any], max_distance: int = 1) -> Any:
+    """Edit-distance index over the reverse index's skeleton keys."""
+    from juthoor_cognatediscovery_lv2.discovery.skeleton_index import SkeletonIndex
+
+    return SkeletonIndex.build(((key, 0) for key in reverse_index), max_distance)
+
+
+def _edit_variants(skeleton_index: Any, skeleton: str) -> list[str]:
+    """Reverse-index keys within the index's edit distance, nearest first."""
+    found = skeleton_index.lookup(skeleton)
+    return sorted(found, key=lambda key: (found[key], key))
+
+
 def build_reverse_lookup(
     reverse_index: dict[str, Any],
     skeleton: str,
+    skeleton_index: Any = None,
 ) -> list[dict[str, Any]]:
-    """Fetch all Arabic root candidates for a given skeleton via lookup variants."""
+    """Fetch all Arabic root candidates for a given skeleton via lookup variants.
+
+    With ``skeleton_index`` (see build_skeleton_index) the hand-written
+    truncation/permutation variants are replaced by every key within the
+    index's edit distance.
+    """
     seen_roots: set[str] = set()
     candidates: list[dict[str, Any]] = []
 
-    for variant in _lookup_variants(skeleton):
+    variants = (
+        _edit_variants(skeleton_index, skeleton)
+        if skeleton_index is not None else _lookup_variants(skeleton)
+    )
+    for variant in variants:
         entry = reverse_index.get(variant)
         if not entry:
             continue
@@ -285,6 +308,7 @@ def process_word(
     no_semantic: bool,
     score_timeout: float = 5.0,
     target_lang: str = "",
+    skeleton_index: Any = None,
 ) -> dict[str, Any] | None:
     """Process one target word and return a result record, or None if no candidates pass."""
     lemma = str(target_entry.get("lemma", "") or "").strip()
@@ -310,7 +334,7 @@ def process_word(
     raw_candidates: list[dict[str, Any]] = []
     seen_roots: set[str] = set()
     for skel in skeletons:
-        for cand in build_reverse_lookup(reverse_index, skel):
+        for cand in build_reverse_lookup(reverse_index, skel, skeleton_index):
             root = cand.get("root", "")
             if root not in seen_roots:
                 seen_roots.add(root)
@@ -429,6 +453,14 @@ def run(args: argparse.Namespace) -> None:
     with open(REVERSE_INDEX, encoding="utf-8") as f:
         reverse_index: dict[str, Any] = json.load(f)
     print(f"      {len(reverse_index):,} skeleton keys loaded")
+    skeleton_index = None
+    if args.candidate_engine == "edit":
+        t0 = time.time()
+        skeleton_index = build_skeleton_index(reverse_index, args.max_edit)
+        print(
+            f"      edit-distance index (k={args.max_edit}): "
+            f"{skeleton_index.n_keys:,} deletion keys in {time.time() - t0:.1f}s"
+        )
 
     # Step 3+4+5: Score
     print(f"\n[3/5] Initialising scorer and concept matcher...")
@@ -474,6 +506,7 @@ def run(args: argparse.Namespace) -> None:
                 no_semantic=args.no_semantic,
                 score_timeout=5.0,
                 target_lang=lang,
+                skeleton_index=skeleton_index,
             )
 
             if result is not None:
@@ -560,6 +593,18 @@ def main() -> None:
         action="store_true",
         help="Skip semantic filter — keep all phonetic matches",
     )
+    parser.add_argument(
+        "--candidate-engine",
+        choices=("variants", "edit"),
+        default="variants",
+        help="Reverse-index lookup: truncation/permutation variants (default) or edit-distance index",
+    )
+    parser.add_argument(
+        "--max-edit",
+        type=int,
+        default=1,
+        help="Max skeleton edit distance for --candidate-engine edit (default 1)",
+    )
     args = parser.parse_args()
     run(args)
 
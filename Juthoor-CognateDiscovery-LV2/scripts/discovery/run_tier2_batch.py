@@ -0,0 +1,202 @@
+"""
+Juthoor LV2 — Tier 2 Batch Matcher (over Eye 1 misses)
+
+Runs the Tier 2 extended sound-law matcher (cross-family shifts + positional
+rules) at corpus scale. Arabic projections are generated once per root, target
+skeletons are looked up through Eye 1's sorted-pair inverted index, and every
+(arabic_root, target_lemma) pair already present in the Eye 1 output is
+skipped. Output uses the Eye 1 JSONL schema (plus "tier": 2) so Eye 2 can
+score it directly.
+
+Usage:
+  python scripts/discovery/run_tier2_batch.py --target lat \\
+      --eye1 outputs/eye1_full_scale_lat.jsonl --workers 4
+
+  # Quick test (100 roots × 1000 lemmas)
+  python scripts/discovery/run_tier2_batch.py --target lat \\
+      --arabic-limit 100 --target-limit 1000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Force UTF-8 output on Windows
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8", errors="replace")
+if hasattr(sys.stderr, "reconfigure"):
+    sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+
+LV2_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import run_eye1_full_scale as eye1  # noqa: E402  (loaders + target skeleton index)
+
+from juthoor_cognatediscovery_lv2.discovery.tier2_matcher import (  # noqa: E402
+    build_tier2_index,
+    load_eye1_pairs,
+    prepare_tier2_roots,
+    tier2_batch_match,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Tier 2 batch matcher: extended sound laws over Eye 1 misses"
+    )
+    p.add_argument(
+        "--target",
+        required=True,
+        choices=list(eye1.CORPUS_PATHS.keys()),
+        help="Target language code (lat, grc, ang, enm, ...)",
+    )
+    p.add_argument(
+        "--eye1",
+        type=str,
+        default=None,
+        help="Eye 1 output to exclude (default: outputs/eye1_full_scale_{target}.jsonl if present)",
+    )
+    p.add_argument("--threshold", type=float, default=0.3,
+                   help="Minimum Jaccard similarity (default 0.3)")
+    p.add_argument("--min-overlap", type=int, default=2,
+                   help="Minimum ordered consonant overlap (default 2)")
+    p.add_argument("--top-k", type=int, default=200,
+                   help="Keep top K matches per Arabic root (0 = all, default 200)")
+    p.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) - 1),
+                   help="Worker processes (default: CPU count - 1)")
+    p.add_argument("--chunk-size", type=int, default=64,
+                   help="Arabic roots per worker task (default 64)")
+    p.add_argument("--output", type=str, default=None,
+                   help="Output file path (default: outputs/tier2_batch_{target}.jsonl)")
+    p.add_argument("--arabic-source", type=str, default=None,
+                   help="Path to Arabic roots JSONL file (default: auto-detect)")
+    p.add_argument("--target-source", type=str, default=None,
+                   help="Path to target lemmas JSONL file (default: auto-detect)")
+    p.add_argument("--variant-budget", type=int, default=0,
+                   help="Max skeleton variants kept per target lemma (0 = unbounded, the default)")
+    p.add_argument("--signature-dedup", action="store_true",
+                   help="Collapse target variants with the same consonant set (lower recall)")
+    p.add_argument("--arabic-limit", type=int, default=0,
+                   help="Limit number of Arabic roots (0 = all)")
+    p.add_argument("--target-limit", type=int, default=0,
+                   help="Limit number of target lemmas (0 = all)")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    lang = args.target
+
+    output_path = (
+        Path(args.output) if args.output
+        else LV2_ROOT / "outputs" / f"tier2_batch_{lang}.jsonl"
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    eye1_path = (
+        Path(args.eye1) if args.eye1
+        else LV2_ROOT / "outputs" / f"eye1_full_scale_{lang}.jsonl"
+    )
+
+    print("=== Tier 2 Batch Matcher ===", file=sys.stderr)
+    print(f"  Target language : {lang}", file=sys.stderr)
+    print(f"  Eye 1 exclusions: {eye1_path}", file=sys.stderr)
+    print(f"  Workers         : {args.workers}", file=sys.stderr)
+    print(f"  Output          : {output_path}", file=sys.stderr)
+    print(file=sys.stderr)
+
+    t_global = time.time()
+
+    # ---- Step 1: Eye 1 pairs to skip ----
+    if eye1_path.exists():
+        exclude = load_eye1_pairs(eye1_path)
+        print(f"[1/5] {len(exclude):,} Eye 1 pairs loaded for exclusion", file=sys.stderr)
+    else:
+        if args.eye1:
+            print(f"ERROR: Eye 1 output not found: {eye1_path}", file=sys.stderr)
+            sys.exit(1)
+        exclude = set()
+        print("[1/5] No Eye 1 output found — running over all pairs", file=sys.stderr)
+
+    # ---- Step 2: Load corpora ----
+    print("[2/5] Loading Arabic roots + target lemmas...", file=sys.stderr)
+    arabic_source = Path(args.arabic_source) if args.arabic_source else None
+    raw_arabic = eye1.load_arabic_roots(source_override=arabic_source, limit=args.arabic_limit, lang=lang)
+    if not raw_arabic:
+        print("ERROR: No Arabic roots loaded. Exiting.", file=sys.stderr)
+        sys.exit(1)
+    target_source = Path(args.target_source) if args.target_source else None
+    raw_target = eye1.load_target_lemmas(lang, source_override=target_source, limit=args.target_limit)
+    if not raw_target:
+        print(f"ERROR: No target lemmas loaded for lang={lang}. Exiting.", file=sys.stderr)
+        sys.exit(1)
+
+    # ---- Step 3: Arabic Tier 2 projections (once per root) ----
+    t0 = time.time()
+    print("[3/5] Pre-computing Tier 2 Arabic projections...", file=sys.stderr)
+    roots = prepare_tier2_roots(raw_arabic, lang)
+    n_variants = sum(len(r["variants"]) for r in roots)
+    print(
+        f"  {len(roots)} roots, {n_variants:,} projections "
+        f"({n_variants / max(1, len(roots)):.1f}/root) in {time.time()-t0:.1f}s",
+        file=sys.stderr,
+    )
+
+    # ---- Step 4: Target skeletons + index (Eye 1 layout) ----
+    t0 = time.time()
+    print("[4/5] Pre-computing target skeletons + inverted index...", file=sys.stderr)
+    target_entries = eye1.build_target_skeleton_index(
+        raw_target, lang, variant_budget=args.variant_budget, signature_dedup=args.signature_dedup,
+    )
+    inv_index = build_tier2_index(target_entries)
+    n_postings = sum(len(v) for v in inv_index.values())
+    print(
+        f"  {len(target_entries)} target entries, {len(inv_index)} pair keys, "
+        f"{n_postings:,} postings in {time.time()-t0:.1f}s",
+        file=sys.stderr,
+    )
+
+    # ---- Step 5: Match ----
+    print("[5/5] Running Tier 2 matching...", file=sys.stderr)
+    matches, stats = tier2_batch_match(
+        roots,
+        target_entries,
+        lang,
+        inv_index=inv_index,
+        exclude=exclude,
+        threshold=args.threshold,
+        min_overlap=args.min_overlap,
+        top_k=args.top_k,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=True,
+    )
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        for m in matches:
+            f.write(json.dumps(m, ensure_ascii=False) + "\n")
+
+    print(file=sys.stderr)
+    print("=== Summary ===", file=sys.stderr)
+    print(f"  Arabic roots     : {stats.roots}", file=sys.stderr)
+    print(f"  Target entries   : {len(target_entries)}", file=sys.stderr)
+    print(f"  Candidates       : {stats.candidates:,}", file=sys.stderr)
+    print(f"  Skipped (Eye 1)  : {stats.excluded:,}", file=sys.stderr)
+    print(f"  Pairs scored     : {stats.scored:,}", file=sys.stderr)
+    print(f"  Matches written  : {stats.records:,}", file=sys.stderr)
+    print(f"  Matching time    : {stats.elapsed:.1f}s", file=sys.stderr)
+    print(f"  Total time       : {time.time()-t_global:.1f}s", file=sys.stderr)
+    print(
+        f"  Throughput       : {stats.roots_per_sec:,.0f} roots/s, "
+        f"{stats.pairs_per_sec:,.0f} pairs/s",
+        file=sys.stderr,
+    )
+    print(f"  Output           : {output_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
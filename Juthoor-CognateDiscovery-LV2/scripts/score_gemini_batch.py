@@ -1,16 +1,33 @@
 """Score an Eye 2 batch via Gemini CLI.
 
-Usage: python scripts/score_gemini_batch.py <batch_file> <output_file>
+Usage: python scripts/score_gemini_batch.py <batch_file> <output_file> [--no-cache] [--gemini-cmd PATH]
 Example: python scripts/score_gemini_batch.py outputs/eye2_batches/grc_b0024.jsonl outputs/eye2_results/grc_b0024.jsonl
+
+Answers are cached per pair in the shared LLM response cache, so pairs scored
+by an earlier batch file are written from it and only the rest are sent.
+Each Gemini call is logged to the LLM telemetry log (token counts estimated
+from text length, as the CLI reports none).
+
+The CLI is found on PATH (``gemini``, or ``gemini.cmd`` on Windows) unless
+``--gemini-cmd`` or ``$JUTHOOR_GEMINI_CMD`` names it. It runs in the system
+temp directory by default (``--cwd``), away from any project context files.
 """
 from __future__ import annotations
 
+import argparse
 import json
+import os
+import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 LV2_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(LV2_ROOT / "src"))
+
+from juthoor_cognatediscovery_lv2.discovery.llm_cache import LLMCache, template_version  # noqa: E402
+from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder  # noqa: E402
 
 PROMPT_TEMPLATE = """You are a Juthoor linguistic cognate expert. Arabic preserves the oldest Semitic phonetics. When words traveled into Greek, consonants merged but MEANINGS persisted.
 
@@ -29,13 +46,61 @@ Return ONLY a raw JSON array starting with [ and ending with ]. No markdown, no
 [{{"pair_index":0,"score":0.0,"reasoning":"brief","method":"weak"}},...]"""
 
 
-def main() -> None:
-    if len(sys.argv) < 3:
-        print("Usage: score_gemini_batch.py <batch.jsonl> <output.jsonl>", file=sys.stderr)
-        sys.exit(1)
+def _pair_payload(p: dict) -> dict:
+    return {"arabic_root": p["arabic_root"], "masadiq": (p.get("masadiq_gloss", "") or "")[:150],
+            "target_lemma": p["target_lemma"]}
+
+
+def _record(p: dict, item: dict) -> dict:
+    return {
+        "source_lemma": p["arabic_root"],
+        "target_lemma": p["target_lemma"],
+        "semantic_score": float(item.get("score", 0)),
+        "reasoning": str(item.get("reasoning", "")),
+        "method": str(item.get("method", "weak")),
+        "lang_pair": "ara-grc",
+        "model": "gemini",
+    }
+
+
+def _parse_scores(raw: str) -> list:
+    """The JSON array in a Gemini reply; ValueError says why there is none."""
+    if not raw:
+        raise ValueError("empty")
+    # Strip markdown fences
+    if "```" in raw:
+        for part in raw.split("```"):
+            part = part.strip()
+            if part.startswith("json"):
+                part = part[4:].strip()
+            if part.startswith("["):
+                raw = part
+                break
+
+    start_idx = raw.find("[")
+    end_idx = raw.rfind("]")
+    if start_idx == -1 or end_idx == -1:
+        raise ValueError("no JSON")
+    try:
+        return json.loads(raw[start_idx:end_idx + 1])
+    except json.JSONDecodeError:
+        raise ValueError("parse fail") from None
 
-    batch_path = LV2_ROOT / sys.argv[1] if not Path(sys.argv[1]).is_absolute() else Path(sys.argv[1])
-    output_path = LV2_ROOT / sys.argv[2] if not Path(sys.argv[2]).is_absolute() else Path(sys.argv[2])
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Score an Eye 2 batch via Gemini CLI.")
+    ap.add_argument("batch_file")
+    ap.add_argument("output_file")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the per-pair LLM response cache.")
+    ap.add_argument("--no-telemetry", action="store_true", help="Do not log calls to the LLM telemetry log.")
+    ap.add_argument("--gemini-cmd", default=os.environ.get("JUTHOOR_GEMINI_CMD") or shutil.which("gemini") or "gemini",
+                    help="Gemini CLI executable (default: $JUTHOOR_GEMINI_CMD, else `gemini` on PATH).")
+    ap.add_argument("--cwd", default=tempfile.gettempdir(),
+                    help="Working directory for the CLI (default: the system temp directory).")
+    args = ap.parse_args()
+
+    batch_path = LV2_ROOT / args.batch_file if not Path(args.batch_file).is_absolute() else Path(args.batch_file)
+    output_path = LV2_ROOT / args.output_file if not Path(args.output_file).is_absolute() else Path(args.output_file)
 
     # Load pairs
     pairs = []
@@ -44,18 +109,27 @@ def main() -> None:
             if line.strip():
                 pairs.append(json.loads(line))
 
+    cache = None if args.no_cache else LLMCache.default()
+    telemetry = (TelemetryRecorder(None) if args.no_telemetry
+                 else TelemetryRecorder.default("score_gemini_batch", tags={"lang": "grc", "batch": batch_path.stem}))
+    scope = cache.scope("gemini-cli", "gemini", template_version(PROMPT_TEMPLATE)) if cache is not None else None
+    cached, misses = scope.split([_pair_payload(p) for p in pairs]) if scope else ({}, list(range(len(pairs))))
+
     # Process in sub-batches of 10 (Gemini handles smaller prompts reliably)
-    gemini_cmd = "C:/Users/yassi/AppData/Roaming/npm/gemini.cmd"
     sub_batch_size = 10
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    written = 0
-    total_subs = (len(pairs) + sub_batch_size - 1) // sub_batch_size
+    to_send = [pairs[i] for i in misses]
+    total_subs = (len(to_send) + sub_batch_size - 1) // sub_batch_size
 
-    print(f"[gemini] Scoring {len(pairs)} pairs in {total_subs} sub-batches from {batch_path.name}...", file=sys.stderr)
+    print(f"[gemini] {len(cached)} pairs cached; scoring {len(to_send)} in {total_subs} sub-batches "
+          f"from {batch_path.name}...", file=sys.stderr)
 
     with open(output_path, "w", encoding="utf-8") as out_f:
-        for sb_start in range(0, len(pairs), sub_batch_size):
-            sb = pairs[sb_start:sb_start + sub_batch_size]
+        for i, item in cached.items():
+            out_f.write(json.dumps(_record(pairs[i], item), ensure_ascii=False) + "\n")
+        written = len(cached)
+        for sb_start in range(0, len(to_send), sub_batch_size):
+            sb = to_send[sb_start:sb_start + sub_batch_size]
             sb_lines = []
             for i, p in enumerate(sb):
                 m = (p.get("masadiq_gloss", "") or "")[:150]
@@ -65,62 +139,43 @@ def main() -> None:
             sub_num = sb_start // sub_batch_size + 1
             print(f"  [{sub_num}/{total_subs}]...", end="", file=sys.stderr, flush=True)
 
+            call = telemetry.call(model="gemini", provider="gemini-cli", pairs=len(sb))
             try:
-                result = subprocess.run(
-                    [gemini_cmd, "-p", prompt],
-                    capture_output=True, text=True, timeout=180,
-                    cwd="C:/Users/yassi/AppData/Local/Temp",
-                )
+                with call:
+                    result = subprocess.run(
+                        [args.gemini_cmd, "-p", prompt],
+                        capture_output=True, text=True, timeout=180, cwd=args.cwd,
+                    )
+                    raw = result.stdout.strip()
+                    call.response(len(prompt) // 3, len(raw) // 3, estimated=True)
+                    scores = _parse_scores(raw)
+            except FileNotFoundError:
+                print(f"\n[error] Gemini CLI not found: {args.gemini_cmd} (set --gemini-cmd or $JUTHOOR_GEMINI_CMD)",
+                      file=sys.stderr)
+                sys.exit(1)
             except subprocess.TimeoutExpired:
                 print(" timeout, skip", file=sys.stderr)
                 continue
-
-            raw = result.stdout.strip()
-            if not raw:
-                print(" empty, skip", file=sys.stderr)
-                continue
-
-            # Strip markdown fences
-            if "```" in raw:
-                for part in raw.split("```"):
-                    part = part.strip()
-                    if part.startswith("json"):
-                        part = part[4:].strip()
-                    if part.startswith("["):
-                        raw = part
-                        break
-
-            start_idx = raw.find("[")
-            end_idx = raw.rfind("]")
-            if start_idx == -1 or end_idx == -1:
-                print(" no JSON, skip", file=sys.stderr)
-                continue
-
-            try:
-                scores = json.loads(raw[start_idx:end_idx + 1])
-            except json.JSONDecodeError:
-                print(" parse fail, skip", file=sys.stderr)
+            except ValueError as exc:
+                print(f" {exc}, skip", file=sys.stderr)
                 continue
 
             sub_written = 0
             for item in scores:
                 idx = item.get("pair_index", 0)
                 if idx < len(sb):
-                    out_f.write(json.dumps({
-                        "source_lemma": sb[idx]["arabic_root"],
-                        "target_lemma": sb[idx]["target_lemma"],
-                        "semantic_score": float(item.get("score", 0)),
-                        "reasoning": str(item.get("reasoning", "")),
-                        "method": str(item.get("method", "weak")),
-                        "lang_pair": "ara-grc",
-                        "model": "gemini",
-                    }, ensure_ascii=False) + "\n")
+                    out_f.write(json.dumps(_record(sb[idx], item), ensure_ascii=False) + "\n")
+                    if scope:
+                        scope.put(_pair_payload(sb[idx]), {k: item.get(k) for k in ("score", "reasoning", "method")})
                     sub_written += 1
             out_f.flush()
             written += sub_written
             print(f" {sub_written} scored", file=sys.stderr)
 
     print(f"[gemini] Total: {written}/{len(pairs)} results to {output_path.name}", file=sys.stderr)
+    if cache is not None:
+        print(f"[cache] {cache.stats}", file=sys.stderr)
+        cache.close()
 
 
 if __name__ == "__main__":
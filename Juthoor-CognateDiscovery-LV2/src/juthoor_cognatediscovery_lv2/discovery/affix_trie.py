@@ -0,0 +1,111 @@
+"""Compiled prefix / suffix tries for morphological decomposition.
+
+The decomposition helpers in ``target_morphology`` and ``multi_method_scorer``
+used to scan long affix tuples with ``startswith``/``endswith`` for every word
+(and, in the English case, re-sort the tuples by length on every call).
+An :class:`AffixTrie` is compiled once from such a tuple and answers the same
+questions by walking the word a single time, so the cost is bounded by the
+length of the longest affix rather than by the size of the table.
+
+Suffix tries are stored over reversed affixes; callers never see that.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+# Sentinel key marking "an affix ends at this node".  Characters are always
+# one-code-point strings, so the empty string can never collide with them.
+_END = ""
+
+
+class AffixTrie:
+    """Prefix or suffix trie over a fixed affix table.
+
+    Parameters
+    ----------
+    affixes:
+        The affix table.  Declaration order is remembered: when several
+        affixes match, :meth:`strip_first` honours the table order exactly
+        like the linear ``for affix in table`` scans it replaces.
+    suffix:
+        Build a reversed-suffix trie (match at the end of the word) instead
+        of a prefix trie.
+    """
+
+    __slots__ = ("affixes", "suffix", "_root", "_max_len")
+
+    def __init__(self, affixes: Iterable[str], *, suffix: bool = False) -> None:
+        self.affixes: tuple[str, ...] = tuple(affixes)
+        self.suffix = suffix
+        self._root: dict = {}
+        self._max_len = 0
+        for rank, affix in enumerate(self.affixes):
+            if not affix:
+                continue
+            node = self._root
+            for ch in (reversed(affix) if suffix else affix):
+                node = node.setdefault(ch, {})
+            # Duplicate entries keep their first (highest-priority) rank.
+            node.setdefault(_END, (rank, affix))
+            self._max_len = max(self._max_len, len(affix))
+
+    def __len__(self) -> int:
+        return len(self.affixes)
+
+    def __repr__(self) -> str:
+        kind = "suffix" if self.suffix else "prefix"
+        return f"AffixTrie({kind}, {len(self.affixes)} affixes)"
+
+    def _walk(self, word: str) -> list[tuple[int, str]]:
+        """Return ``(rank, affix)`` for every match, shortest first."""
+        found: list[tuple[int, str]] = []
+        node = self._root
+        n = len(word)
+        for i in range(min(n, self._max_len)):
+            node = node.get(word[n - 1 - i] if self.suffix else word[i])
+            if node is None:
+                break
+            hit = node.get(_END)
+            if hit is not None:
+                found.append(hit)
+        return found
+
+    def matches(self, word: str) -> list[str]:
+        """Return every affix that matches *word*, longest first."""
+        return [affix for _rank, affix in reversed(self._walk(word))]
+
+    def _stem(self, word: str, affix: str) -> str:
+        return word[: -len(affix)] if self.suffix else word[len(affix):]
+
+    def strip_first(self, word: str, min_stem: int = 0) -> tuple[str, str] | None:
+        """Strip the affix that comes first in the table and leaves a long enough stem.
+
+        Returns ``(affix, stem)`` or ``None``.  Equivalent to scanning the
+        table in declaration order and stopping at the first affix for which
+        ``len(stem) >= min_stem``.
+        """
+        best: tuple[int, str] | None = None
+        for rank, affix in self._walk(word):
+            if len(word) - len(affix) < min_stem:
+                continue
+            if best is None or rank < best[0]:
+                best = (rank, affix)
+        if best is None:
+            return None
+        return best[1], self._stem(word, best[1])
+
+    def strip_longest(self, word: str, min_stem: int = 0) -> tuple[str, str] | None:
+        """Strip the longest matching affix that leaves a long enough stem."""
+        for _rank, affix in reversed(self._walk(word)):
+            if len(word) - len(affix) >= min_stem:
+                return affix, self._stem(word, affix)
+        return None
+
+    def strip_all(self, word: str, min_stem: int = 0) -> list[str]:
+        """Return the stems left by every matching affix, longest stem first."""
+        stems: list[str] = []
+        for _rank, affix in self._walk(word):
+            if len(word) - len(affix) >= min_stem:
+                stems.append(self._stem(word, affix))
+        # _walk yields shortest affixes first, i.e. longest stems first.
+        return stems
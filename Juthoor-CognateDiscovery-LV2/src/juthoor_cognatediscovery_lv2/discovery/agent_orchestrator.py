@@ -0,0 +1,486 @@
+"""Run Eye 2 investigation batches through several scoring backends at once.
+
+``scripts/discovery/eye2_agent_scorer.py --prepare`` writes one prompt file
+per batch (``batch_NNN.txt`` plus ``batch_NNN_meta.json``). Before this
+module, each batch went to an agent by hand and came back through
+``--ingest-response --batch-index N``. :class:`Orchestrator` instead hands
+the batches to ``workers`` threads. Each thread drives one backend:
+
+- ``cmd:<template>``: a subprocess. The prompt goes to stdin and the reply is
+  stdout. ``{prompt_file}``, ``{batch}`` and ``{pairs}`` in the template are
+  filled in (e.g. ``cmd:gemini -p @{prompt_file}``, ``cmd:claude -p``).
+- ``http://...`` / ``https://...``: ``POST {"prompt", "batch", "pairs"}``.
+  The reply can be the findings array, ``{"findings": [...]}``,
+  ``{"text": "..."}`` or a Messages-shaped ``{"content": [...]}``.
+- ``stub`` / ``stub:<latency>``: answers every pair with ``no_path`` locally,
+  for trying the pipeline without an agent.
+
+A batch is leased before it is sent. The lease is a ``<batch>.lease`` file,
+created exclusively in ``lease_dir``, and it expires after the call timeout
+plus a grace period. Several orchestrators (or machines sharing the
+directory) can therefore work on one batch set. A crashed orchestrator's
+batches become free once their leases expire. Taking over an expired lease
+is best-effort, so two processes may rarely run the same batch. That is
+harmless, because a batch's results file is replaced whole.
+
+The caller's ``handle(job, reply, backend)`` validates and ingests a reply. It raises
+``ValueError`` for a reply that does not answer the batch (see
+:func:`parse_findings` and :func:`check_findings`). A timed-out, failed or
+invalid attempt puts the batch back in the queue. Workers pass over a batch
+that failed on their own backend while another backend has yet to try it.
+After ``max_attempts`` the batch is reported as failed.
+:meth:`Orchestrator.run` returns throughput and failure counts, per backend
+and overall.
+
+CLI: python scripts/discovery/eye2_agent_scorer.py --orchestrate --lang got --backend "cmd:claude -p" --workers 4
+"""
+from __future__ import annotations
+
+import abc
+import json
+import os
+import re
+import shlex
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence, TextIO
+
+from .llm_telemetry import TelemetryRecorder
+
+_LEASE_GRACE_S = 60.0
+_FINDINGS = ("path_found", "no_path")
+_PAIR_IDS_RE = re.compile(r"^Pair IDs to return:\s*(.+)$", re.MULTILINE)
+
+
+class BackendError(RuntimeError):
+    """A backend call that produced no usable reply."""
+
+
+class BackendTimeout(BackendError):
+    pass
+
+
+@dataclass
+class BatchJob:
+    key: str  # "batch_007"
+    prompt_path: Path
+    pairs: int
+    attempts: int = 0
+    last_error: str = ""
+    failed_on: set[str] = field(default_factory=set)  # backends that failed it
+
+
+# ---------------------------------------------------------------------------
+# Findings
+# ---------------------------------------------------------------------------
+
+
+def parse_findings(raw: str) -> list[dict[str, Any]]:
+    """The findings array in an agent reply; ValueError says why there is none."""
+    text = raw.strip()
+    if not text:
+        raise ValueError("empty reply")
+    if text.startswith("```"):
+        inner = text.split("```", 2)[1]
+        text = (inner[4:] if inner.startswith("json") else inner).strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        start, end = text.find("["), text.rfind("]")
+        if start == -1 or end < start:
+            raise ValueError("no JSON array in reply") from None
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"findings JSON does not parse: {exc}") from None
+    if isinstance(data, dict) and isinstance(data.get("findings"), list):
+        data = data["findings"]
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("findings are not a JSON array of objects")
+    return data
+
+
+def check_findings(findings: list[dict[str, Any]], pair_ids: Sequence[str]) -> None:
+    """Raise ValueError unless every pair has a finding of a known kind."""
+    answered = {str(item.get("pair_id", "")) for item in findings}
+    missing = [pid for pid in pair_ids if pid not in answered]
+    if missing:
+        raise ValueError(f"{len(missing)}/{len(pair_ids)} pairs unanswered (first: {missing[0]})")
+    wanted = set(pair_ids)
+    for item in findings:
+        finding = str(item.get("finding", "")).lower().strip()
+        if str(item.get("pair_id", "")) in wanted and finding not in _FINDINGS:
+            raise ValueError(f"pair {item.get('pair_id')}: finding {item.get('finding')!r} is not one of {_FINDINGS}")
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class Backend(abc.ABC):
+    """Sends one investigation prompt and returns the raw reply text."""
+
+    name = "backend"
+    model = "agent_detective"  # recorded on ingested findings and in telemetry
+
+    @abc.abstractmethod
+    def run(self, prompt: str, *, job: BatchJob, timeout: float) -> str:
+        """The reply to ``prompt``; raises :class:`BackendTimeout` after ``timeout`` seconds."""
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class StubBackend(Backend):
+    """Answers every pair in the prompt with ``no_path`` (no agent involved)."""
+
+    name = "stub"
+    model = "agent_stub"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+
+    def run(self, prompt: str, *, job: BatchJob, timeout: float) -> str:
+        m = _PAIR_IDS_RE.search(prompt)
+        if m is None:
+            raise BackendError("prompt has no 'Pair IDs to return:' line")
+        if self.latency:
+            time.sleep(min(self.latency, timeout))
+        return json.dumps([
+            {"pair_id": pid.strip(), "finding": "no_path", "semantic_journey": "", "journey_type": "no_connection",
+             "confidence": "low", "key_insight": "stub backend: not investigated"}
+            for pid in m.group(1).split(",") if pid.strip()
+        ])
+
+
+class CommandBackend(Backend):
+    """Runs a command per batch: prompt on stdin, reply on stdout."""
+
+    name = "cmd"
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self.argv = shlex.split(template)
+        if not self.argv:
+            raise ValueError("empty command template")
+
+    def run(self, prompt: str, *, job: BatchJob, timeout: float) -> str:
+        fill = {"{prompt_file}": str(job.prompt_path), "{batch}": job.key, "{pairs}": str(job.pairs)}
+        argv = []
+        for token in self.argv:
+            for placeholder, value in fill.items():
+                token = token.replace(placeholder, value)
+            argv.append(token)
+        try:
+            result = subprocess.run(argv, input=prompt, capture_output=True, text=True, encoding="utf-8",
+                                    errors="replace", timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise BackendTimeout(f"{argv[0]} timed out after {timeout:.0f}s") from None
+        except OSError as exc:
+            raise BackendError(f"{argv[0]}: {exc}") from None
+        if result.returncode != 0:
+            raise BackendError(f"{argv[0]} exited {result.returncode}: {result.stderr.strip()[-200:]}")
+        return result.stdout
+
+    def __repr__(self) -> str:
+        return f"cmd:{self.argv[0]}"
+
+
+class HttpBackend(Backend):
+    """POSTs the prompt to an endpoint as JSON."""
+
+    name = "http"
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def run(self, prompt: str, *, job: BatchJob, timeout: float) -> str:
+        body = json.dumps({"prompt": prompt, "batch": job.key, "pairs": job.pairs}, ensure_ascii=False)
+        req = urllib.request.Request(self.url, data=body.encode("utf-8"),
+                                     headers={"content-type": "application/json"}, method="POST")
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                raw = resp.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as exc:
+            raise BackendError(f"HTTP {exc.code}: {exc.read().decode('utf-8', 'replace')[:200]}") from None
+        except (TimeoutError, socket.timeout):
+            raise BackendTimeout(f"{self.url} timed out after {timeout:.0f}s") from None
+        except urllib.error.URLError as exc:
+            if isinstance(exc.reason, (TimeoutError, socket.timeout)):
+                raise BackendTimeout(f"{self.url} timed out after {timeout:.0f}s") from None
+            raise BackendError(f"{self.url}: {exc.reason}") from None
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            return raw
+        if isinstance(payload, dict):
+            if isinstance(payload.get("content"), list):  # Messages API shape
+                return "".join(b.get("text", "") for b in payload["content"] if isinstance(b, dict))
+            for key in ("text", "response", "output"):
+                if isinstance(payload.get(key), str):
+                    return payload[key]
+        return raw
+
+    def __repr__(self) -> str:
+        return self.url
+
+
+def parse_backend(spec: str) -> Backend:
+    """``stub[:latency]``, ``cmd:<template>`` or an ``http(s)://`` URL."""
+    if spec == "stub" or spec.startswith("stub:"):
+        return StubBackend(float(spec[5:] or 0) if spec.startswith("stub:") else 0.0)
+    if spec.startswith("cmd:"):
+        return CommandBackend(spec[4:])
+    if spec.startswith(("http://", "https://")):
+        return HttpBackend(spec)
+    raise ValueError(f"unknown backend {spec!r} (expected stub, cmd:<command> or an http(s):// URL)")
+
+
+# ---------------------------------------------------------------------------
+# Leases
+# ---------------------------------------------------------------------------
+
+
+class LeaseDir:
+    """Exclusive, expiring claims on batches, one ``<key>.lease`` file each."""
+
+    def __init__(self, path: Path, *, owner: str | None = None) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}"
+
+    def _file(self, key: str) -> Path:
+        return self.path / f"{key}.lease"
+
+    def holder(self, key: str) -> dict[str, Any] | None:
+        """The current lease on ``key``; None if free or expired."""
+        try:
+            lease = json.loads(self._file(key).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return lease if float(lease.get("expires", 0)) > time.time() else None
+
+    def acquire(self, key: str, ttl: float) -> bool:
+        path = self._file(key)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self.holder(key) is not None:
+                    return False
+                path.unlink(missing_ok=True)  # expired (or torn): take it over
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"owner": self.owner, "expires": time.time() + ttl}, fh)
+            return True
+        return False
+
+    def release(self, key: str) -> None:
+        lease = self.holder(key)
+        if lease is None or lease.get("owner") == self.owner:
+            self._file(key).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator
+# ---------------------------------------------------------------------------
+
+
+def _backend_stats() -> dict[str, Any]:
+    return {"attempts": 0, "ok": 0, "timeouts": 0, "invalid": 0, "errors": 0, "pairs": 0, "busy_s": 0.0}
+
+
+class Orchestrator:
+    """Leases batches to ``workers`` threads, one backend each (round-robin).
+
+    ``handle(job, reply, backend)`` ingests a reply and returns the pairs
+    written; it raises ValueError for a reply that does not answer the batch.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[BatchJob],
+        backends: Sequence[Backend],
+        handle: Callable[[BatchJob, str, Backend], int],
+        *,
+        lease_dir: Path,
+        workers: int | None = None,
+        timeout: float = 600.0,
+        max_attempts: int = 3,
+        is_done: Callable[[BatchJob], bool] = lambda job: False,
+        telemetry: TelemetryRecorder | None = None,
+        stream: TextIO | None = sys.stderr,
+    ) -> None:
+        if not backends:
+            raise ValueError("at least one backend is required")
+        self.jobs = list(jobs)
+        self.backends = list(backends)
+        self.handle = handle
+        self.leases = LeaseDir(lease_dir)
+        self.workers = max(1, workers or len(self.backends))
+        self.timeout = timeout
+        self.max_attempts = max(1, max_attempts)
+        self.is_done = is_done
+        self.telemetry = telemetry or TelemetryRecorder(None)
+        self.stream = stream
+        self._cond = threading.Condition()
+        self._pending: deque[BatchJob] = deque()
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._counts = {"done": 0, "skipped": 0, "leased_elsewhere": 0, "failed": 0, "requeued": 0, "pairs": 0}
+        self._failed: dict[str, str] = {}
+        self._stats: list[tuple[str, dict[str, Any]]] = []  # (backend, stats) per worker
+        self._pool = {repr(self.backends[i % len(self.backends)]) for i in range(self.workers)}
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    def _eligible(self, backend: str) -> BatchJob | None:
+        for job in self._pending:
+            if backend not in job.failed_on or self._pool <= job.failed_on:
+                return job
+        return None
+
+    def _next(self, backend: str) -> BatchJob | None:
+        """The next job for a worker on ``backend``; None once the queue is drained."""
+        with self._cond:
+            while True:
+                if self._stop.is_set() or not (self._pending or self._in_flight):
+                    return None
+                job = self._eligible(backend)
+                if job is not None:
+                    self._pending.remove(job)
+                    self._in_flight += 1
+                    return job
+                self._cond.wait()
+
+    def _finish(self, job: BatchJob, outcome: str, *, pairs: int = 0, error: str = "") -> None:
+        with self._cond:
+            self._in_flight -= 1
+            if outcome == "retry":
+                self._counts["requeued"] += 1
+                self._pending.append(job)
+            else:
+                self._counts[outcome] += 1
+                self._counts["pairs"] += pairs
+                if outcome == "failed":
+                    self._failed[job.key] = error
+            finished = self._counts["done"] + self._counts["skipped"] + self._counts["failed"]
+            self._cond.notify_all()
+        if outcome == "done":
+            self._log(f"[orchestrate] {job.key}: {pairs} pairs ingested ({finished}/{len(self.jobs)})")
+        elif outcome == "failed":
+            self._log(f"[orchestrate] {job.key}: FAILED after {job.attempts} attempts: {error}")
+
+    def _attempt(self, job: BatchJob, backend: Backend, stats: dict[str, Any]) -> tuple[str, int]:
+        """Send ``job`` once; (outcome, pairs ingested)."""
+        job.attempts += 1
+        stats["attempts"] += 1
+        t0 = time.perf_counter()
+        try:
+            prompt = job.prompt_path.read_text(encoding="utf-8")
+            with self.telemetry.call(model=backend.model, provider=backend.name, pairs=job.pairs,
+                                     attempt=job.attempts, batch=job.key) as call:
+                reply = backend.run(prompt, job=job, timeout=self.timeout)
+                call.response(len(prompt) // 3, len(reply) // 3, estimated=True)
+                pairs = self.handle(job, reply, backend)
+        except BackendTimeout as exc:
+            stats["timeouts"] += 1
+            job.last_error = str(exc)
+        except ValueError as exc:
+            stats["invalid"] += 1
+            job.last_error = f"invalid reply: {exc}"
+        except Exception as exc:
+            stats["errors"] += 1
+            job.last_error = f"{type(exc).__name__}: {exc}"
+        else:
+            stats["ok"] += 1
+            stats["pairs"] += pairs
+            return "done", pairs
+        finally:
+            stats["busy_s"] += time.perf_counter() - t0
+        job.failed_on.add(repr(backend))
+        self._log(f"[orchestrate] {job.key} via {backend!r} (attempt {job.attempts}/{self.max_attempts}): "
+                  f"{job.last_error}")
+        return ("retry" if job.attempts < self.max_attempts else "failed"), 0
+
+    def _work(self, backend: Backend, stats: dict[str, Any]) -> None:
+        while (job := self._next(repr(backend))) is not None:
+            if not self.leases.acquire(job.key, self.timeout + _LEASE_GRACE_S):
+                self._finish(job, "leased_elsewhere")
+                continue
+            try:
+                if self.is_done(job):  # checked under the lease: another run may have just finished it
+                    self._finish(job, "skipped")
+                    continue
+                outcome, pairs = self._attempt(job, backend, stats)
+            except BaseException:
+                self._finish(job, "failed", error="orchestrator interrupted")
+                raise
+            finally:
+                self.leases.release(job.key)
+            self._finish(job, outcome, pairs=pairs, error=job.last_error)
+
+    def run(self) -> dict[str, Any]:
+        """Work through every job; returns the report (see :meth:`report`)."""
+        self._pending.extend(self.jobs)
+        threads = []
+        for i in range(self.workers):
+            backend = self.backends[i % len(self.backends)]
+            stats = _backend_stats()
+            self._stats.append((repr(backend), stats))
+            threads.append(threading.Thread(target=self._work, args=(backend, stats),
+                                            name=f"orchestrate-{i}", daemon=True))
+        self._log(f"[orchestrate] {len(self.jobs)} batches, {self.workers} workers on "
+                  + ", ".join(dict.fromkeys(name for name, _ in self._stats)))
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        try:
+            for t in threads:
+                while t.is_alive():
+                    t.join(0.5)
+        except KeyboardInterrupt:
+            self._stop.set()
+            with self._cond:
+                self._cond.notify_all()
+            self._log("[orchestrate] interrupted; waiting for the calls in flight (results so far are kept)")
+            for t in threads:
+                t.join()
+        return self.report(time.perf_counter() - t0)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        minutes = max(elapsed, 1e-9) / 60
+        with self._cond:
+            counts = dict(self._counts)
+            unfinished = len(self._pending) + self._in_flight
+        by_backend: dict[str, dict[str, Any]] = {}
+        for name, stats in self._stats:
+            total = by_backend.setdefault(name, _backend_stats())
+            for key, value in stats.items():
+                total[key] += value
+        return {
+            "batches": len(self.jobs),
+            **counts,
+            "unfinished": unfinished,
+            "attempts": sum(s["attempts"] for s in by_backend.values()),
+            "elapsed_s": round(elapsed, 1),
+            "batches_per_min": round(counts["done"] / minutes, 2),
+            "pairs_per_min": round(counts["pairs"] / minutes, 1),
+            "failures": dict(sorted(self._failed.items())),
+            "backends": {
+                name: {**s, "busy_s": round(s["busy_s"], 1),
+                       "pairs_per_min": round(s["pairs"] / max(elapsed, 1e-9) * 60, 1)}
+                for name, s in by_backend.items()
+            },
+        }
@@ -0,0 +1,280 @@
+"""Prebuilt, indexed store of the lookups Eye 2 builds its prompt context from.
+
+Eye 2 used to parse every lookup file in full at start-up: Arabic semantic
+profiles, LV0 definitions, the deep glossary and the target-language
+IPA/gloss tables. The store keeps them in one read-only sqlite file (default
+``outputs/enrichment/lookups.sqlite``). Each value sits under ``(kind, key)``,
+with ``key`` the normalized lookup key the loaders use:
+
+- ``profile``: ``{"masadiq_gloss", "mafahim_gloss"}``
+- ``lv0``: the definition string
+- ``deep``: ``{"meanings": [...]}``
+- ``gloss:<lang>``: ``{"ipa", "gloss"}`` keyed by target lemma
+
+Values are read on demand through :meth:`EnrichmentStore.view`, a lazy
+read-only mapping. Opening the store costs the same whatever its size, and
+memory grows only with the keys a run actually touches.
+
+Each kind is stamped with its source file's path, size and mtime, and the
+store with :data:`STORE_VERSION`. :meth:`EnrichmentStore.fresh` only vouches
+for a kind whose source is unchanged. Callers read the file as before for
+anything stale or missing, so a stale store costs speed, not correctness.
+``build`` writes a new file and swaps it in, so readers never see it half
+built.
+
+CLI::
+
+    python -m juthoor_cognatediscovery_lv2.discovery.enrichment_store build
+    python -m juthoor_cognatediscovery_lv2.discovery.enrichment_store build --langs grc lat --profiles data/llm_annotations/arabic_semantic_profiles.jsonl
+    python -m juthoor_cognatediscovery_lv2.discovery.enrichment_store status
+    python -m juthoor_cognatediscovery_lv2.discovery.enrichment_store get lv0 كتب
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+# Bump when what a loader extracts changes; older stores then count as stale.
+STORE_VERSION = "1"
+
+_SCHEMA = """
+CREATE TABLE entries (kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, key))
+    WITHOUT ROWID;
+CREATE TABLE sources (kind TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL,
+                      mtime_ns INTEGER NOT NULL, entries INTEGER NOT NULL, built REAL NOT NULL);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_REBUILD = "python -m juthoor_cognatediscovery_lv2.discovery.enrichment_store build"
+
+
+def default_store_path() -> Path:
+    return Path(__file__).resolve().parents[3] / "outputs" / "enrichment" / "lookups.sqlite"
+
+
+def source_stamp(path: Path) -> tuple[int, int]:
+    """(size, mtime_ns) of a source file; (-1, -1) if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return -1, -1
+    return st.st_size, st.st_mtime_ns
+
+
+_MISSING = object()
+
+
+class StoreView(Mapping):
+    """Read-only mapping over one kind; looked-up values are memoized."""
+
+    def __init__(self, store: "EnrichmentStore", kind: str) -> None:
+        self.store = store
+        self.kind = kind
+        self._memo: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._memo:
+            self._memo[key] = self.store.get(self.kind, key, _MISSING)
+        value = self._memo[key]
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys(self.kind))
+
+    def __len__(self) -> int:
+        return self.store.count(self.kind)
+
+
+class EnrichmentStore:
+    """Read-only handle on a built store; safe to share between threads."""
+
+    def __init__(self, path: Path | str, *, stream: Any = sys.stderr) -> None:
+        self.path = Path(path)
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self._sources = {
+            kind: (path, size, mtime_ns)
+            for kind, path, size, mtime_ns in self._db.execute("SELECT kind, path, size, mtime_ns FROM sources")
+        }
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        self.version = row[0] if row else ""
+        self._warned: set[str] = set()
+
+    @classmethod
+    def open(cls, path: Path | str | None = None, **kwargs: Any) -> "EnrichmentStore | None":
+        """The store at ``path`` (default location), or None if it has not been built."""
+        path = Path(path) if path is not None else default_store_path()
+        return cls(path, **kwargs) if path.exists() else None
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "EnrichmentStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    def fresh(self, kind: str, source: Path) -> bool:
+        """True if ``kind`` was built from ``source`` as it is now (same size and mtime)."""
+        recorded = self._sources.get(kind)
+        if recorded is None:
+            return False
+        ok = (self.version == STORE_VERSION and recorded[0] == str(Path(source).resolve())
+              and recorded[1:] == source_stamp(Path(source)))
+        if not ok and kind not in self._warned:
+            self._warned.add(kind)
+            self._log(f"[enrich] {self.path.name}: {kind} does not match {source} (changed since the build, "
+                      f"or built from another file or version); reading the file instead. Rebuild: {_REBUILD}")
+        return ok
+
+    def get(self, kind: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM entries WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def keys(self, kind: str) -> list[str]:
+        with self._lock:
+            return [key for (key,) in self._db.execute("SELECT key FROM entries WHERE kind = ?", (kind,))]
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def view(self, kind: str) -> StoreView:
+        return StoreView(self, kind)
+
+    def status(self) -> dict[str, Any]:
+        with self._lock:
+            rows = self._db.execute("SELECT kind, path, entries, built FROM sources ORDER BY kind").fetchall()
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "current_version": STORE_VERSION,
+            "bytes": self.path.stat().st_size,
+            "kinds": {
+                kind: {
+                    "source": path,
+                    "entries": entries,
+                    "built": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(built)),
+                    "fresh": self.version == STORE_VERSION
+                    and self._sources[kind][1:] == source_stamp(Path(path)),
+                }
+                for kind, path, entries, built in rows
+            },
+        }
+
+
+def write_store(path: Path, sources: Iterable[tuple[str, Path, Callable[[], Mapping[str, Any]]]]) -> dict[str, int]:
+    """Write a store from ``(kind, source file, load)`` triples; returns entries per kind.
+
+    ``load()`` returns the kind's ``{key: value}`` lookup. The source is
+    stamped before it is loaded, so a file edited mid-build reads as stale.
+
+    The file is built next to ``path`` and renamed over it when complete.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    counts: dict[str, int] = {}
+    db = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        db.executescript(_SCHEMA)
+        db.execute("BEGIN")
+        for kind, source, load in sources:
+            size, mtime_ns = source_stamp(Path(source))
+            values = load()
+            db.executemany(
+                "INSERT OR IGNORE INTO entries (kind, key, value) VALUES (?, ?, ?)",
+                ((kind, key, json.dumps(value, ensure_ascii=False)) for key, value in values.items()),
+            )
+            counts[kind] = len(values)
+            db.execute(
+                "INSERT OR REPLACE INTO sources (kind, path, size, mtime_ns, entries, built) VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, str(Path(source).resolve()), size, mtime_ns, len(values), time.time()),
+            )
+        db.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (STORE_VERSION,))
+        db.execute("COMMIT")
+        db.execute("VACUUM")
+    finally:
+        db.close()
+    os.replace(tmp, path)
+    return counts
+
+
+def build(path: Path | None = None, *, profiles_path: Path | None = None,
+          langs: Iterable[str] | None = None) -> dict[str, int]:
+    """Build the store from the files Eye 2 reads, using Eye 2's own loaders."""
+    from . import eye2_batch_scorer as eye2  # the loaders define what each lookup holds
+
+    profiles_path = profiles_path or eye2._default_profiles_path()
+    langs = list(langs) if langs is not None else list(eye2._IPA_GLOSS_PATHS)
+
+    def deep() -> dict[str, Any]:
+        return {k: {"meanings": v.get("meanings", [])} for k, v in eye2._load_deep_glossary().items()}
+
+    sources: list[tuple[str, Path, Callable[[], Mapping[str, Any]]]] = [
+        ("profile", profiles_path, lambda: eye2._load_profiles(profiles_path)),
+        ("lv0", eye2._default_lv0_lexemes_path(), eye2._load_lv0_definitions),
+        ("deep", eye2._deep_glossary_path(), deep),
+    ]
+    for lang in langs:
+        source = eye2._target_gloss_path(lang)
+        if source is not None:
+            sources.append((f"gloss:{lang}", source, lambda lang=lang: eye2._load_target_glosses(lang)))
+    return write_store(path or default_store_path(), sources)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Build and inspect the Eye 2 enrichment lookup store.")
+    p.add_argument("--path", default=None, help="Store file (default: outputs/enrichment/lookups.sqlite).")
+    sub = p.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="(Re)build the store from the lookup files.")
+    b.add_argument("--profiles", default=None, help="Arabic semantic profiles JSONL (default: Eye 2's).")
+    b.add_argument("--langs", nargs="+", default=None, help="Target glosses to include (default: all configured).")
+    sub.add_parser("status", help="Print kinds, entry counts and whether each source is unchanged.")
+    g = sub.add_parser("get", help="Point lookup of one key.")
+    g.add_argument("kind")
+    g.add_argument("key")
+    args = p.parse_args(argv)
+    path = Path(args.path) if args.path else default_store_path()
+
+    if args.command == "build":
+        t0 = time.time()
+        counts = build(path, profiles_path=Path(args.profiles) if args.profiles else None, langs=args.langs)
+        print(f"[enrich] Built {path} in {time.time() - t0:.1f}s: "
+              + ", ".join(f"{kind} {n}" for kind, n in counts.items()), file=sys.stderr)
+        return 0
+    store = EnrichmentStore.open(path)
+    if store is None:
+        print(f"[enrich] No store at {path}; build it with: {_REBUILD}", file=sys.stderr)
+        return 1
+    with store:
+        if args.command == "status":
+            print(json.dumps(store.status(), indent=2, ensure_ascii=False))
+        else:
+            from .normalization import normalize_arabic
+
+            key = args.key if args.kind.startswith("gloss:") else normalize_arabic(args.key)
+            print(json.dumps(store.get(args.kind, key), indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+"""Follow an Eye 1 output file while Eye 1 is still writing it.
+
+With ``--stream``, Eye 1 (scripts/discovery/run_eye1_full_scale.py) appends
+each Arabic root's ranked candidates as soon as that root is matched, all of
+a root's lines together, and writes ``<output>.done`` when it finishes.
+:class:`Eye1Follower` tails such a file. A root is final once a line for the
+next root (or the done marker) appears, and each final root is filtered the
+way :func:`~.eye2_batch_scorer.load_eye1_candidates` filters a whole file
+(``min_discovery_score``, ``lang``, then the top ``top_n_per_root`` by
+score). Eye 2 can thus score the first roots while Eye 1 works on the rest.
+
+CLI: python -m juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer --input eye1.jsonl --follow ...
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator, TextIO
+
+
+def done_marker(path: Path) -> Path:
+    return path.with_name(path.name + ".done")
+
+
+def mark_done(path: Path, **info: Any) -> None:
+    """Tell followers that ``path`` is complete (written after the last flush)."""
+    done_marker(path).write_text(json.dumps({"finished": time.time(), **info}) + "\n", encoding="utf-8")
+
+
+class Eye1Follower:
+    """Tails a streamed Eye 1 JSONL and hands out filtered candidates per finished root."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        min_discovery_score: float,
+        top_n_per_root: int,
+        lang_filter: str | None = None,
+        poll_interval: float = 2.0,
+        idle_timeout: float = 0.0,
+        stream: TextIO | None = sys.stderr,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.min_discovery_score = min_discovery_score
+        self.top_n_per_root = top_n_per_root
+        self.lang_filter = lang_filter
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout  # 0 = wait for Eye 1 indefinitely
+        self.stream = stream
+        self._sleep = sleep
+        self._clock = clock
+        self.offset = 0
+        self.finished = False
+        self.lines = 0
+        self.roots = 0
+        self.candidates = 0
+        self._root: str | None = None
+        self._group: list[dict[str, Any]] = []
+        self._seen: set[str] = set()
+        self._warned = False
+        self._last_growth = clock()
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    def _close_root(self, ready: list[dict[str, Any]]) -> None:
+        if self._root is None:
+            return
+        self._group.sort(key=lambda x: float(x.get("discovery_score", 0)), reverse=True)
+        kept = self._group[:self.top_n_per_root]
+        ready.extend(kept)
+        self.roots += 1
+        self.candidates += len(kept)
+        self._root, self._group = None, []
+
+    def _take(self, raw: bytes, ready: list[dict[str, Any]]) -> None:
+        raw = raw.strip()
+        if not raw:
+            return
+        obj = json.loads(raw)
+        self.lines += 1
+        root = obj["arabic_root"]
+        if root != self._root:
+            self._close_root(ready)
+            if root in self._seen and not self._warned:
+                self._warned = True
+                self._log(f"[follow] {self.path.name} is not grouped by root ({root!r} seen twice); "
+                          "top-N is applied per run of lines, not per root.")
+            self._seen.add(root)
+            self._root = root
+        if float(obj.get("discovery_score", 0)) < self.min_discovery_score:
+            return
+        if self.lang_filter and obj.get("lang") != self.lang_filter:
+            return
+        self._group.append(obj)
+
+    def poll(self) -> list[dict[str, Any]]:
+        """Candidates of the roots finished since the last poll (never blocks)."""
+        if self.finished:
+            return []
+        # Look for the marker before reading: all lines written before it are read below.
+        done = done_marker(self.path).exists()
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size < self.offset:
+            raise RuntimeError(f"{self.path} shrank while being followed (was Eye 1 restarted?)")
+        ready: list[dict[str, Any]] = []
+        if size > self.offset:
+            self._last_growth = self._clock()
+            with open(self.path, "rb") as fh:
+                fh.seek(self.offset)
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        break  # the rest of this line is still being written
+                    self.offset += len(raw)
+                    self._take(raw, ready)
+        if done:
+            self._close_root(ready)
+            self.finished = True
+        return ready
+
+    def follow(self, *, min_pairs: int = 1, max_wait: float = 30.0) -> Iterator[list[dict[str, Any]]]:
+        """Yield chunks of ready candidates until Eye 1 is done, sleeping between polls.
+
+        A chunk is held back until it has ``min_pairs`` candidates (so it fills
+        the scorer's window) or its first candidate has waited ``max_wait`` s.
+        """
+        pending: list[dict[str, Any]] = []
+        since = self._clock()
+        while not self.finished:
+            ready = self.poll()
+            if ready and not pending:
+                since = self._clock()
+            pending.extend(ready)
+            if pending and (self.finished or len(pending) >= min_pairs or self._clock() - since >= max_wait):
+                yield pending
+                pending = []
+            elif not self.finished:
+                if self.idle_timeout and self._clock() - self._last_growth > self.idle_timeout:
+                    raise TimeoutError(
+                        f"{self.path} has not grown for {self.idle_timeout:.0f}s and is not marked done"
+                    )
+                self._sleep(self.poll_interval)
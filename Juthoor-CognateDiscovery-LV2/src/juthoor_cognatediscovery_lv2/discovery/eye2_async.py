@@ -0,0 +1,519 @@
+"""Asynchronous, rate-limited scoring engine for Eye 2 prompts.
+
+:class:`AsyncEye2Engine` replaces the one-batch-at-a-time loop of
+``eye2_batch_scorer.score_candidates``:
+
+- up to ``EngineConfig.concurrency`` Messages API requests are in flight, an
+  :class:`AdaptiveLimit` halves that window whenever the API throttles
+  (429/529) and grows it back one slot at a time after successes;
+- ``TokenBucket`` limiters keep within ``requests_per_minute`` and
+  ``tokens_per_minute`` (input tokens; estimated before the call, settled
+  against the reported usage after it);
+- ``retry-after`` and the ``anthropic-ratelimit-*`` headers pause *all*
+  workers until the limit resets, not just the request that hit it;
+- retryable failures (429, 5xx, 529, timeouts, unparseable replies) are
+  retried with capped exponential backoff and full jitter;
+- results reach the caller through an :class:`OrderedWriter`, in prompt
+  order, as soon as every earlier batch is done;
+- :class:`Progress` reports batches, pairs/s and ETA on stderr.
+
+Transport: ``POST /v1/messages`` via urllib (``$ANTHROPIC_BASE_URL`` points
+it at a stand-in such as :mod:`.messages_standin`) or the anthropic SDK's
+async client.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping, Protocol, Sequence, TextIO
+
+from ..lv3.discovery.gemini_async import TokenBucket, retry_delay
+from .llm_telemetry import LLMCall, TelemetryRecorder
+
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+BASE_URL_ENV = "ANTHROPIC_BASE_URL"
+ANTHROPIC_VERSION = "2023-06-01"
+RETRYABLE_STATUS = frozenset({0, 408, 429, 500, 502, 503, 504, 529})
+THROTTLE_STATUS = frozenset({429, 529})
+_RATELIMIT_KINDS = ("requests", "tokens", "input-tokens", "output-tokens")
+
+
+class AnthropicAPIError(RuntimeError):
+    """A Messages API request failed; ``status`` 0 means no HTTP response at all."""
+
+    def __init__(self, status: int, message: str, *, headers: Mapping[str, str] | None = None) -> None:
+        super().__init__(f"Anthropic API error {status}: {message}")
+        self.status = status
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRYABLE_STATUS
+
+    @property
+    def retry_after(self) -> float | None:
+        return _seconds(self.headers.get("retry-after"))
+
+
+def _seconds(value: str | None) -> float | None:
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def rate_limit_delay(headers: Mapping[str, str], *, now: datetime | None = None) -> float | None:
+    """Seconds to hold off according to rate-limit response headers, or ``None``.
+
+    ``retry-after`` wins; otherwise the latest ``anthropic-ratelimit-*-reset``
+    among limits whose ``-remaining`` is 0.
+    """
+    h = {k.lower(): v for k, v in headers.items()}
+    retry_after = _seconds(h.get("retry-after"))
+    if retry_after is not None:
+        return retry_after
+    now = now or datetime.now(timezone.utc)
+    delay: float | None = None
+    for kind in _RATELIMIT_KINDS:
+        if h.get(f"anthropic-ratelimit-{kind}-remaining") != "0":
+            continue
+        reset = h.get(f"anthropic-ratelimit-{kind}-reset")
+        try:
+            at = datetime.fromisoformat(reset.replace("Z", "+00:00")) if reset else None
+        except ValueError:
+            at = None
+        if at is not None:
+            delay = max(delay or 0.0, (at - now).total_seconds(), 0.0)
+    return delay
+
+
+def parse_llm_json(raw: str) -> list[dict[str, Any]]:
+    """Parse the JSON array a scoring prompt asks for, tolerating markdown fences.
+
+    Raises ``ValueError`` (``json.JSONDecodeError`` included) if there is none.
+    """
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```", 2)[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+        if raw.endswith("```"):
+            raw = raw[:-3]
+    parsed = json.loads(raw.strip())
+    if not isinstance(parsed, list):
+        raise ValueError(f"expected a JSON array, got {type(parsed).__name__}")
+    return parsed
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """Rough input-token count (~3 characters per token for mixed Arabic/Latin text)."""
+    return max(1, len(prompt) // 3)
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Completion:
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+class MessagesTransport(Protocol):
+    async def complete(self, prompt: str, *, model: str, max_tokens: int) -> Completion: ...
+
+
+class RestTransport:
+    """``POST /v1/messages`` with the stdlib (one thread per request)."""
+
+    def __init__(self, base_url: str | None = None, *, api_key: str | None = None, timeout: float = 120.0) -> None:
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV) or ANTHROPIC_BASE_URL).rstrip("/")
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        self.timeout = timeout
+
+    def _post(self, prompt: str, model: str, max_tokens: int) -> Completion:
+        body = {"model": model, "max_tokens": max_tokens, "messages": [{"role": "user", "content": prompt}]}
+        req = urllib.request.Request(
+            f"{self.base_url}/v1/messages",
+            data=json.dumps(body).encode("utf-8"),
+            headers={
+                "content-type": "application/json",
+                "x-api-key": self.api_key,
+                "anthropic-version": ANTHROPIC_VERSION,
+            },
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = json.loads(resp.read())
+                headers = dict(resp.headers.items())
+        except urllib.error.HTTPError as exc:
+            raise AnthropicAPIError(
+                exc.code,
+                exc.read().decode("utf-8", "replace")[:300],
+                headers=dict(exc.headers.items()) if exc.headers else None,
+            ) from exc
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+            raise AnthropicAPIError(0, str(exc)) from exc
+        usage = payload.get("usage") or {}
+        return Completion(
+            text="".join(b.get("text", "") for b in payload.get("content") or [] if b.get("type") == "text"),
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0),
+            headers=headers,
+        )
+
+    async def complete(self, prompt: str, *, model: str, max_tokens: int) -> Completion:
+        return await asyncio.to_thread(self._post, prompt, model, max_tokens)
+
+
+class SDKTransport:
+    """The anthropic SDK's async client, with its own retries off (the engine retries)."""
+
+    def __init__(self, api_key: str | None = None) -> None:
+        import anthropic
+
+        self._client = anthropic.AsyncAnthropic(
+            api_key=api_key or os.environ.get("ANTHROPIC_API_KEY", ""), max_retries=0,
+        )
+
+    async def complete(self, prompt: str, *, model: str, max_tokens: int) -> Completion:
+        import anthropic
+
+        try:
+            raw = await self._client.messages.with_raw_response.create(
+                model=model, max_tokens=max_tokens, messages=[{"role": "user", "content": prompt}],
+            )
+        except anthropic.APIStatusError as exc:
+            raise AnthropicAPIError(exc.status_code, str(exc), headers=dict(exc.response.headers)) from exc
+        except anthropic.APIConnectionError as exc:
+            raise AnthropicAPIError(0, str(exc)) from exc
+        msg = raw.parse()
+        return Completion(
+            text="".join(getattr(b, "text", "") for b in msg.content),
+            input_tokens=msg.usage.input_tokens,
+            output_tokens=msg.usage.output_tokens,
+            headers=dict(raw.headers),
+        )
+
+
+def default_transport() -> MessagesTransport:
+    """REST if ``$ANTHROPIC_BASE_URL`` is set or the SDK is missing, else the SDK."""
+    if os.environ.get(BASE_URL_ENV):
+        return RestTransport()
+    try:
+        import anthropic  # noqa: F401
+    except ImportError:
+        return RestTransport()
+    return SDKTransport()
+
+
+# ---------------------------------------------------------------------------
+# Flow control, ordering, progress
+# ---------------------------------------------------------------------------
+
+
+class AdaptiveLimit:
+    """Async concurrency window: halves when throttled, +1 after ``increase_every`` successes."""
+
+    def __init__(self, maximum: int, *, increase_every: int = 4) -> None:
+        self.maximum = max(1, maximum)
+        self.limit = self.maximum
+        self.increase_every = increase_every
+        self.active = 0
+        self.max_active = 0
+        self._successes = 0
+        self._cond: asyncio.Condition | None = None
+
+    async def __aenter__(self) -> "AdaptiveLimit":
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def throttled(self) -> None:
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+
+    def succeeded(self) -> None:
+        self._successes += 1
+        if self._successes >= self.increase_every and self.limit < self.maximum:
+            self.limit += 1
+            self._successes = 0
+
+
+class OrderedWriter:
+    """Passes ``(i, value)`` to ``emit`` in index order, holding early finishers back."""
+
+    def __init__(self, emit: Callable[[int, Any], None], *, start: int = 0) -> None:
+        self._emit = emit
+        self.next = start
+        self._held: dict[int, Any] = {}
+        self._seen: set[int] = set()
+
+    def __contains__(self, i: int) -> bool:
+        return i in self._seen
+
+    @property
+    def held(self) -> int:
+        return len(self._held)
+
+    def put(self, i: int, value: Any) -> None:
+        self._seen.add(i)
+        self._held[i] = value
+        while self.next in self._held:
+            self._emit(self.next, self._held.pop(self.next))
+            self.next += 1
+
+    def drain(self) -> None:
+        """Emit everything held back, gaps and all (used when a run is cut short)."""
+        for i in sorted(self._held):
+            self._emit(i, self._held.pop(i))
+
+
+class Progress:
+    """Batch/pair counters with throughput and ETA, printed at most every ``every`` seconds."""
+
+    def __init__(
+        self,
+        batches: int,
+        pairs: int,
+        *,
+        every: float = 10.0,
+        stream: TextIO | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.batches, self.pairs = batches, pairs
+        self.every = every
+        self.stream = stream
+        self._clock = clock
+        self.started = clock()
+        self._last_print = self.started
+        self.batches_done = self.pairs_done = self.batches_failed = 0
+
+    @property
+    def elapsed(self) -> float:
+        return self._clock() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Pairs finished (scored or failed) per second."""
+        return self.pairs_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update(self, pairs: int, *, failed: bool = False, note: str = "") -> None:
+        self.batches_done += 1
+        self.pairs_done += pairs
+        self.batches_failed += int(failed)
+        now = self._clock()
+        if self.stream is not None and (now - self._last_print >= self.every or self.batches_done == self.batches):
+            self._last_print = now
+            print(self.line(note), file=self.stream, flush=True)
+
+    def line(self, note: str = "") -> str:
+        eta = (self.pairs - self.pairs_done) / self.rate if self.rate > 0 else float("nan")
+        text = (
+            f"[progress] {self.batches_done}/{self.batches} batches, {self.pairs_done}/{self.pairs} pairs, "
+            f"{self.rate:.1f} pairs/s, eta {eta:.0f}s, {self.batches_failed} failed"
+        )
+        return f"{text}, {note}" if note else text
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class EngineConfig:
+    model_id: str
+    max_tokens: int = 2048
+    concurrency: int = 4
+    requests_per_minute: float = 0  # 0 = unlimited
+    tokens_per_minute: float = 0  # input tokens; 0 = unlimited
+    max_retries: int = 5
+    backoff_base: float = 2.0
+    backoff_cap: float = 60.0
+
+
+class AsyncEye2Engine:
+    """Scores a list of prompts concurrently; see the module docstring."""
+
+    def __init__(
+        self,
+        config: EngineConfig,
+        *,
+        transport: MessagesTransport | None = None,
+        seed: int | None = None,
+        progress_every: float = 10.0,
+        stream: TextIO | None = sys.stderr,
+        telemetry: TelemetryRecorder | None = None,
+    ) -> None:
+        self.config = config
+        self._transport = transport
+        self.telemetry = telemetry if telemetry is not None else TelemetryRecorder(None)
+        self._rng = random.Random(seed)
+        self.progress_every = progress_every
+        self.stream = stream
+        self.stats: dict[str, Any] = {}
+
+    @property
+    def transport(self) -> MessagesTransport:
+        if self._transport is None:
+            self._transport = default_transport()
+        return self._transport
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    def _hold_off(self, seconds: float | None) -> None:
+        if seconds:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+    async def _cooled_down(self) -> None:
+        while (wait := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(wait)
+
+    async def _call(self, prompt: str, n_tokens: int, call: LLMCall) -> Completion:
+        cfg = self.config
+        async with self._limit:
+            await self._cooled_down()
+            await self._rpm.acquire(1)
+            await self._tpm.acquire(n_tokens)
+            self.stats["requests"] += 1
+            call.start()
+            try:
+                completion = await self.transport.complete(prompt, model=cfg.model_id, max_tokens=cfg.max_tokens)
+            except AnthropicAPIError as exc:
+                if exc.status in THROTTLE_STATUS:
+                    self.stats["throttled"] += 1
+                    self._limit.throttled()
+                    self._hold_off(rate_limit_delay(exc.headers))
+                raise
+            self._limit.succeeded()
+        call.response(completion.input_tokens, completion.output_tokens)
+        self.stats["input_tokens"] += completion.input_tokens
+        self.stats["output_tokens"] += completion.output_tokens
+        self._tpm.debit(completion.input_tokens - n_tokens)
+        self._hold_off(rate_limit_delay(completion.headers))
+        return completion
+
+    async def _score(self, index: int, prompt: str, pairs: int = 1) -> list[dict[str, Any]]:
+        cfg = self.config
+        n_tokens = estimate_prompt_tokens(prompt)
+        for attempt in range(cfg.max_retries + 1):
+            try:
+                with self.telemetry.call(model=cfg.model_id, attempt=attempt + 1, pairs=pairs) as call:
+                    return parse_llm_json((await self._call(prompt, n_tokens, call)).text)
+            except AnthropicAPIError as exc:
+                if not exc.retryable or attempt == cfg.max_retries:
+                    raise
+                error: Exception = exc
+                retry_after = exc.retry_after
+            except ValueError as exc:
+                self.stats["parse_failures"] += 1
+                if attempt == cfg.max_retries:
+                    raise
+                error, retry_after = exc, None
+            self.stats["retries"] += 1
+            delay = retry_delay(
+                attempt, base=cfg.backoff_base, cap=cfg.backoff_cap, retry_after=retry_after, rng=self._rng,
+            )
+            self._log(f"[warn] batch {index + 1}: {error} (retry {attempt + 1}/{cfg.max_retries} in {delay:.1f}s)")
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def arun(
+        self,
+        prompts: Sequence[str],
+        emit: Callable[[int, list[dict[str, Any]] | None], None],
+        *,
+        sizes: Sequence[int] | None = None,
+    ) -> dict[str, Any]:
+        """Score ``prompts``; ``emit(i, items)`` is called in prompt order, with ``None`` for a failed batch.
+
+        ``sizes`` (pairs per prompt) only feeds progress reporting and telemetry. Returns run stats.
+        """
+        cfg = self.config
+        sizes = list(sizes) if sizes is not None else [1] * len(prompts)
+        self.stats = {
+            "batches": len(prompts), "failed_batches": 0, "pairs": sum(sizes), "requests": 0, "retries": 0,
+            "throttled": 0, "parse_failures": 0, "input_tokens": 0, "output_tokens": 0,
+        }
+        self._limit = AdaptiveLimit(cfg.concurrency)
+        self._rpm = TokenBucket(cfg.requests_per_minute)
+        self._tpm = TokenBucket(cfg.tokens_per_minute)
+        self._resume_at = 0.0
+        progress = Progress(len(prompts), sum(sizes), every=self.progress_every, stream=self.stream)
+        writer = OrderedWriter(emit)
+
+        async def run(i: int) -> tuple[int, list[dict[str, Any]] | None, Exception | None]:
+            try:
+                return i, await self._score(i, prompts[i], sizes[i]), None
+            except (AnthropicAPIError, ValueError) as exc:
+                return i, None, exc
+
+        tasks = [asyncio.ensure_future(run(i)) for i in range(len(prompts))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                i, items, error = await next_done
+                if error is not None:
+                    self.stats["failed_batches"] += 1
+                    self._log(f"[error] batch {i + 1}/{len(prompts)}: {error}")
+                writer.put(i, items)
+                progress.update(
+                    sizes[i], failed=error is not None,
+                    note=f"window {self._limit.limit}/{self._limit.maximum}, {self.stats['retries']} retries",
+                )
+        finally:
+            # On interruption keep every batch that did finish, even out of order;
+            # resume works per pair, so gaps are filled by the next run.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for task in tasks:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                i, items, _ = task.result()
+                if i not in writer:
+                    writer.put(i, items)
+            writer.drain()
+
+        self.stats["max_in_flight"] = self._limit.max_active
+        self.stats["elapsed_s"] = round(progress.elapsed, 3)
+        self.stats["pairs_per_s"] = round(progress.rate, 2)
+        return self.stats
+
+    def run(
+        self,
+        prompts: Sequence[str],
+        emit: Callable[[int, list[dict[str, Any]] | None], None],
+        *,
+        sizes: Sequence[int] | None = None,
+    ) -> dict[str, Any]:
+        """Synchronous wrapper around :meth:`arun` (not for use inside a running loop)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.arun(prompts, emit, sizes=sizes))
+        raise RuntimeError("AsyncEye2Engine.run() called inside an event loop; use `await arun()`")
@@ -0,0 +1,334 @@
+"""Submit/poll/collect Eye 2 prompts through the Message Batches API.
+
+For sweeps that do not need interactive latency, ``eye2_batch_scorer --mode
+batch-api`` packs every pending prompt into provider batch jobs (at most
+``max_requests`` requests / ``max_bytes`` per job), polls them with backoff
+and parses the results into the usual output JSONL.
+
+Everything needed to finish a sweep lives next to the output file, in
+``<output>.batch_api/``::
+
+    manifest.json       one entry per job: provider id, state, counts, times
+    job_0000.jsonl      {"custom_id", "prompt", "pairs": [...]} per request
+
+Job states move ``submitting -> submitted -> collecting -> collected`` and
+the manifest is rewritten atomically after every change, so a crash or
+reboot at any point resumes cleanly: a job still ``submitting`` is sent
+again, ``submitted`` jobs are polled, and a job caught mid-``collecting``
+skips pairs already in the output. Requests that errored or expired are not
+written; their pairs go out again with the next submission.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence
+
+from ..lv3.discovery.gemini_async import retry_delay
+from .eye2_async import ANTHROPIC_BASE_URL, ANTHROPIC_VERSION, BASE_URL_ENV, AnthropicAPIError, parse_llm_json
+from .llm_telemetry import TelemetryRecorder
+
+MAX_REQUESTS_PER_JOB = 10_000
+MAX_BYTES_PER_JOB = 200 * 1024 * 1024  # provider limit is 256 MB
+STATES = ("submitting", "submitted", "collecting", "collected")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class BatchClient:
+    """``/v1/messages/batches`` create, retrieve and results over HTTPS with the stdlib."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        api_key: str | None = None,
+        timeout: float = 300.0,
+        max_retries: int = 5,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV) or ANTHROPIC_BASE_URL).rstrip("/")
+        self.api_key = api_key or os.environ.get("ANTHROPIC_API_KEY", "")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._sleep = sleep
+
+    def _open(self, url: str, body: dict[str, Any] | None = None):
+        req = urllib.request.Request(
+            url if url.startswith("http") else f"{self.base_url}{url}",
+            data=json.dumps(body).encode("utf-8") if body is not None else None,
+            headers={
+                "content-type": "application/json",
+                "x-api-key": self.api_key,
+                "anthropic-version": ANTHROPIC_VERSION,
+            },
+            method="POST" if body is not None else "GET",
+        )
+        for attempt in range(self.max_retries + 1):
+            try:
+                return urllib.request.urlopen(req, timeout=self.timeout)
+            except urllib.error.HTTPError as exc:
+                error = AnthropicAPIError(
+                    exc.code,
+                    exc.read().decode("utf-8", "replace")[:300],
+                    headers=dict(exc.headers.items()) if exc.headers else None,
+                )
+            except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+                error = AnthropicAPIError(0, str(exc))
+            if not error.retryable or attempt == self.max_retries:
+                raise error
+            self._sleep(retry_delay(attempt, base=2.0, cap=60.0, retry_after=error.retry_after))
+        raise AssertionError("unreachable")
+
+    def create(self, requests: list[dict[str, Any]]) -> dict[str, Any]:
+        with self._open("/v1/messages/batches", {"requests": requests}) as resp:
+            return json.loads(resp.read())
+
+    def retrieve(self, job_id: str) -> dict[str, Any]:
+        with self._open(f"/v1/messages/batches/{job_id}") as resp:
+            return json.loads(resp.read())
+
+    def results(self, job: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Stream a job's result lines (``results_url`` if the job reports one)."""
+        with self._open(job.get("results_url") or f"/v1/messages/batches/{job['id']}/results") as resp:
+            for line in resp:
+                if line.strip():
+                    yield json.loads(line)
+
+
+@dataclass
+class PendingRequest:
+    custom_id: str
+    prompt: str
+    pairs: list[dict[str, Any]]
+
+
+class BatchJobRunner:
+    """Owns ``<output>.batch_api/``: submits jobs, polls them and hands results to a writer."""
+
+    def __init__(
+        self,
+        workdir: Path,
+        client: BatchClient,
+        *,
+        model_id: str,
+        max_tokens: int = 2048,
+        max_requests: int = MAX_REQUESTS_PER_JOB,
+        max_bytes: int = MAX_BYTES_PER_JOB,
+        stream: Any = sys.stderr,
+        telemetry: TelemetryRecorder | None = None,
+    ) -> None:
+        self.workdir = Path(workdir)
+        self.client = client
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.stream = stream
+        self.telemetry = telemetry if telemetry is not None else TelemetryRecorder(None)
+        self.manifest = self._load_manifest()
+
+    # -- manifest -----------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.workdir / "manifest.json"
+
+    def _load_manifest(self) -> dict[str, Any]:
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        return {"version": 1, "model": self.model_id, "jobs": []}
+
+    def _save(self) -> None:
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    def _requests(self, job: dict[str, Any]) -> Iterator[PendingRequest]:
+        with open(self.workdir / f"{job['name']}.jsonl", encoding="utf-8") as fh:
+            for line in fh:
+                if line.strip():
+                    yield PendingRequest(**json.loads(line))
+
+    @property
+    def open_jobs(self) -> list[dict[str, Any]]:
+        return [job for job in self.manifest["jobs"] if job["state"] != "collected"]
+
+    def in_flight_pairs(self) -> set[tuple[str, str]]:
+        """(arabic_root, target_lemma) of every pair in a job that has not been collected."""
+        return {
+            (p["arabic_root"], p["target_lemma"])
+            for job in self.open_jobs
+            for req in self._requests(job)
+            for p in req.pairs
+        }
+
+    def status(self) -> dict[str, Any]:
+        counts = {state: 0 for state in STATES}
+        for job in self.manifest["jobs"]:
+            counts[job["state"]] += 1
+        return {
+            "workdir": str(self.workdir),
+            "model": self.manifest.get("model"),
+            "jobs": len(self.manifest["jobs"]),
+            "states": counts,
+            "requests": sum(job["requests"] for job in self.manifest["jobs"]),
+            "pairs": sum(job["pairs"] for job in self.manifest["jobs"]),
+            "succeeded": sum(job.get("succeeded", 0) for job in self.manifest["jobs"]),
+            "failed": sum(job.get("failed", 0) for job in self.manifest["jobs"]),
+        }
+
+    # -- submit -------------------------------------------------------------
+
+    def submit(self, batches: Sequence[tuple[str, list[dict[str, Any]]]]) -> list[str]:
+        """Write ``(prompt, pairs)`` batches into new jobs and create them; returns provider job ids."""
+        jobs: list[list[PendingRequest]] = []
+        size = 0
+        for prompt, pairs in batches:
+            n_bytes = len(prompt.encode("utf-8")) + 200
+            if not jobs or len(jobs[-1]) >= self.max_requests or size + n_bytes > self.max_bytes:
+                jobs.append([])
+                size = 0
+            jobs[-1].append(PendingRequest("", prompt, pairs))
+            size += n_bytes
+
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        for requests in jobs:
+            job_no = len(self.manifest["jobs"])
+            name = f"job_{job_no:04d}"
+            with open(self.workdir / f"{name}.jsonl", "w", encoding="utf-8") as fh:
+                for r, req in enumerate(requests):
+                    req.custom_id = f"j{job_no:04d}-r{r:06d}"
+                    fh.write(json.dumps(req.__dict__, ensure_ascii=False) + "\n")
+            self.manifest["jobs"].append({
+                "name": name, "id": None, "state": "submitting", "model": self.model_id,
+                "requests": len(requests), "pairs": sum(len(req.pairs) for req in requests),
+            })
+            self._save()
+        return [self._create(job) for job in self.manifest["jobs"] if job["state"] == "submitting"]
+
+    def _create(self, job: dict[str, Any]) -> str:
+        created = self.client.create([
+            {
+                "custom_id": req.custom_id,
+                "params": {
+                    "model": job["model"],
+                    "max_tokens": self.max_tokens,
+                    "messages": [{"role": "user", "content": req.prompt}],
+                },
+            }
+            for req in self._requests(job)
+        ])
+        job.update(id=created["id"], state="submitted", submitted_at=_now(), polls=0)
+        self._save()
+        self._log(f"[batch-api] Submitted {job['name']} as {job['id']} ({job['requests']} requests, {job['pairs']} pairs).")
+        return job["id"]
+
+    # -- poll and collect ---------------------------------------------------
+
+    def collect(
+        self,
+        write: Callable[[list[dict[str, Any]], list[dict[str, Any]], set[tuple[str, str]] | None], int],
+        *,
+        wait: bool = True,
+        poll_interval: float = 30.0,
+        poll_max: float = 600.0,
+        already_written: Callable[[], set[tuple[str, str]]] = set,
+        failed: Callable[[list[tuple[str, str]], str], None] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> int:
+        """Poll open jobs and collect the ended ones; with ``wait``, until none are left.
+
+        ``write(pairs, items, skip)`` writes one request's parsed items and
+        returns how many pairs it wrote; ``skip`` (pairs already in the
+        output) is only set when resuming a job interrupted mid-collection.
+        ``failed(pairs, reason)`` hears about requests that produced nothing.
+        """
+        for job in self.open_jobs:
+            if job["state"] == "submitting":
+                self._create(job)
+        written = 0
+        delay = poll_interval
+        while True:
+            for job in self.open_jobs:
+                remote = self.client.retrieve(job["id"])
+                job["polls"] = job.get("polls", 0) + 1
+                if remote.get("processing_status") != "ended":
+                    continue
+                skip = already_written() if job["state"] == "collecting" else None
+                job.update(state="collecting", ended_at=remote.get("ended_at") or _now())
+                self._save()
+                written += self._collect_job(job, remote, write, skip, failed)
+            self._save()
+            open_jobs = self.open_jobs
+            if not wait or not open_jobs:
+                return written
+            self._log(f"[batch-api] {len(open_jobs)} job(s) still processing; next poll in {delay:.0f}s.")
+            sleep(delay * random.uniform(0.9, 1.1))
+            delay = min(poll_max, delay * 1.5)
+
+    def _collect_job(self, job: dict[str, Any], remote: dict[str, Any], write, skip, on_failed) -> int:
+        by_id = {req.custom_id: req.pairs for req in self._requests(job)}
+        written = succeeded = failed = 0
+        for line in self.client.results(remote):
+            pairs = by_id.pop(line.get("custom_id"), None)
+            if pairs is None:
+                continue
+            result = line.get("result") or {}
+            try:
+                # untimed: a batch request's latency is the whole job's
+                with self.telemetry.call(model=job["model"], provider="anthropic-batch", pairs=len(pairs),
+                                         timed=False) as call:
+                    if result.get("type") != "succeeded":
+                        raise ValueError(result.get("type") or "no result")
+                    message = result.get("message") or {}
+                    usage = message.get("usage") or {}
+                    call.response(usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+                    text = "".join(b.get("text", "") for b in message.get("content") or [] if b.get("type") == "text")
+                    items = parse_llm_json(text)
+            except ValueError as exc:
+                failed += 1
+                self._log(f"[batch-api] {job['name']} {line.get('custom_id')}: {exc}; pairs will be resubmitted.")
+                if on_failed is not None:
+                    on_failed([(p["arabic_root"], p["target_lemma"]) for p in pairs], f"batch-api: {exc}")
+                continue
+            succeeded += 1
+            written += write(pairs, items, skip)
+        failed += len(by_id)  # requests with no result line at all
+        if on_failed is not None and by_id:
+            on_failed([(p["arabic_root"], p["target_lemma"]) for pairs in by_id.values() for p in pairs],
+                      "batch-api: no result")
+        job.update(state="collected", collected_at=_now(), succeeded=succeeded, failed=failed)
+        self._save()
+        self._log(f"[batch-api] Collected {job['name']}: {written} pairs written, {failed} request(s) failed.")
+        return written
+
+
+@dataclass(frozen=True)
+class BatchAPIOptions:
+    """How ``score_candidates`` drives the batch API (``action``: run, submit or collect)."""
+
+    action: str = "run"
+    poll_interval: float = 30.0
+    poll_max: float = 600.0
+    max_requests: int = MAX_REQUESTS_PER_JOB
+    client: BatchClient | None = None
+
+
+def batch_workdir(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".batch_api")
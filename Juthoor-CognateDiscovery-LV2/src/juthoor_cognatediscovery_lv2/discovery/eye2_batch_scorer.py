@@ -1,38 +1,44 @@
 """Eye 2 Batch Scorer — Eye 1 ranked candidates -> LLM semantic scoring -> JSONL.
 
+Batches are scored concurrently by :class:`.eye2_async.AsyncEye2Engine`
+(``--concurrency`` in flight, optional ``--requests-per-minute`` /
+``--tokens-per-minute`` quotas) and appended in batch order. With
+``--mode batch-api`` they go through the provider's Message Batches API
+instead (:mod:`.eye2_batch_api`): submit, poll, collect, resumable. With
+``--follow`` the input is tailed while Eye 1 is still writing it
+(:mod:`.eye1_stream`) and roots are scored as soon as they are final.
+
 CLI: python -m juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer \\
-         --input eye1.jsonl --output eye2.jsonl --lang grc --resume
+         --input eye1.jsonl --output eye2.jsonl --lang grc --resume --concurrency 8
+     python -m juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer \\
+         --input eye1.jsonl --output eye2.jsonl --lang grc --mode batch-api [--batch-action submit|collect|status]
+     python -m juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer --output eye2.jsonl --status
 """
 from __future__ import annotations
 
-import argparse, json, os, re, sys, time
+import argparse, json, os, re, sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
-
-# Arabic normalization (mirrors run_eye1_full_scale._norm_arabic for symmetric
-# lookup — ensures profiles/LV0/deep-glossary keys match Eye 1 output keys).
-_ARABIC_DIACRITICS_RE = re.compile(r"[\u064B-\u065F\u0670\u0640]")
-_HAMZA_TR = str.maketrans({
-    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
-    "ؤ": "و", "ئ": "ي", "ء": "ا",
-})
-
-
-def _norm_arabic_lookup(text: str) -> str:
-    """Normalize an Arabic string for dictionary lookup.
-
-    Mirrors run_eye1_full_scale._norm_arabic: strip diacritics, normalize
-    hamza variants, strip leading ال (if at least 2 letters remain).
-    """
-    if not text:
-        return text
-    text = _ARABIC_DIACRITICS_RE.sub("", text)
-    text = text.translate(_HAMZA_TR).strip()
-    if text.startswith("ال") and len(text) >= 4:
-        text = text[2:]
-    return text
-
+from typing import Any, Callable, Mapping
+
+from .enrichment_store import EnrichmentStore
+from .eye1_stream import Eye1Follower
+from .eye2_async import (
+    BASE_URL_ENV,
+    AsyncEye2Engine,
+    EngineConfig,
+    MessagesTransport,
+    estimate_prompt_tokens,
+)
+from .eye2_batch_api import MAX_REQUESTS_PER_JOB, BatchAPIOptions, BatchClient, BatchJobRunner, batch_workdir
+from .eye2_checkpoint import Eye2Checkpoint
+from .llm_cache import LLMCache, default_cache_path, template_version
+from .llm_telemetry import TelemetryRecorder
+from .normalization import normalize_arabic
+
+# Profiles/LV0/deep-glossary keys use the same normalizer Eye 1 writes
+# arabic_root with, so lookups are symmetric.
+_norm_arabic_lookup = normalize_arabic
 
 _MODEL_MAP = {"sonnet": "claude-sonnet-4-6", "opus": "claude-opus-4-6"}
 _LANG_NAMES = {"lat": "Latin", "grc": "Greek", "eng": "English", "deu": "German", "fra": "French", "spa": "Spanish"}
@@ -54,6 +60,13 @@ def _default_profiles_path() -> Path:
 def _default_lv0_lexemes_path() -> Path:
     return _repo_root() / "Juthoor-DataCore-LV0" / "data" / "processed" / "arabic" / "classical" / "lexemes.jsonl"
 
+def _deep_glossary_path() -> Path:
+    return _lv2_root() / "data" / "enriched" / "arabic_deep_glossary.jsonl"
+
+def _target_gloss_path(lang: str) -> Path | None:
+    rel_path = _IPA_GLOSS_PATHS.get(lang)
+    return _lv2_root() / rel_path if rel_path is not None else None
+
 # -- Target IPA+gloss lookup (lazy, per lang) --------------------------------
 
 _target_glosses_cache: dict[str, dict[str, dict[str, str]]] = {}
@@ -64,11 +77,10 @@ def _load_target_glosses(lang: str) -> dict[str, dict[str, str]]:
     if lang in _target_glosses_cache:
         return _target_glosses_cache[lang]
     _target_glosses_cache[lang] = {}
-    rel_path = _IPA_GLOSS_PATHS.get(lang)
-    if rel_path is None:
+    full_path = _target_gloss_path(lang)
+    if full_path is None:
         print(f"[warn] No IPA gloss path configured for lang={lang!r}", file=sys.stderr)
         return _target_glosses_cache[lang]
-    full_path = _lv2_root() / rel_path
     if not full_path.exists():
         print(f"[warn] Target gloss file not found: {full_path}", file=sys.stderr)
         return _target_glosses_cache[lang]
@@ -89,7 +101,7 @@ def _load_deep_glossary() -> dict[str, Any]:
     if _deep_glossary_cache is not None:
         return _deep_glossary_cache
     _deep_glossary_cache = {}
-    path = _lv2_root() / "data" / "enriched" / "arabic_deep_glossary.jsonl"
+    path = _deep_glossary_path()
     if not path.exists():
         return _deep_glossary_cache
     with open(path, encoding="utf-8") as fh:
@@ -230,6 +242,48 @@ def _load_lv0_definitions(lv0_path: Path | None = None) -> dict[str, str]:
     print(f"[info] Loaded {len(_lv0_cache)} LV0 Arabic definitions (fallback).", file=sys.stderr)
     return _lv0_cache
 
+# -- Enrichment --------------------------------------------------------------
+
+def _lookup(store: EnrichmentStore | None, kind: str, source: Path | None,
+            load: Callable[[], Mapping[str, Any]]) -> Mapping[str, Any]:
+    """``kind`` from the prebuilt store if it was built from ``source`` as it is now, else ``load()``."""
+    if store is not None and source is not None and store.fresh(kind, source):
+        return store.view(kind)
+    return load()
+
+def enrich_candidates(candidates: list[dict[str, Any]], profiles: Mapping[str, dict[str, str]], lang: str, *,
+                      store: EnrichmentStore | None = None) -> dict[str, int]:
+    """Attach Arabic meanings and target glosses to ``candidates`` in place; returns hit counts.
+
+    Arabic: profile masadiq/mafahim, else the LV0 definition (Arabic text, which
+    the LLM reads natively), plus deep-glossary senses. Lookups come from the
+    enrichment ``store`` (:mod:`.enrichment_store`) where it is current, so
+    only the keys in play are read; otherwise the whole file is loaded.
+    """
+    lv0_defs = _lookup(store, "lv0", _default_lv0_lexemes_path(), _load_lv0_definitions)
+    target_glosses = _lookup(store, f"gloss:{lang}", _target_gloss_path(lang), lambda: _load_target_glosses(lang))
+    deep = _lookup(store, "deep", _deep_glossary_path(), _load_deep_glossary)
+    counts = {"arabic": 0, "target": 0, "deep": 0}
+    for c in candidates:
+        # Cache a normalized lookup key per candidate — ensures profiles/LV0/deep
+        # glossary lookups hit regardless of residual ال or hamza variants.
+        c["_ar_key"] = ar_key = _norm_arabic_lookup(c["arabic_root"])
+        prof = profiles.get(ar_key, {})
+        c["masadiq_gloss"] = prof.get("masadiq_gloss", "")
+        c["mafahim_gloss"] = prof.get("mafahim_gloss", "")
+        # Fallback: LV0 Arabic definition (Arabic text — LLM reads it natively)
+        if not c["masadiq_gloss"] and not c["mafahim_gloss"]:
+            c["masadiq_gloss"] = lv0_defs.get(ar_key, "")
+        if c["masadiq_gloss"] or c["mafahim_gloss"]:
+            counts["arabic"] += 1
+        c["target_meaning"] = target_glosses.get(c["target_lemma"], {}).get("gloss", "")
+        if c["target_meaning"]:
+            counts["target"] += 1
+        c["arabic_meanings_expanded"] = deep.get(ar_key, {}).get("meanings", [])
+        if c["arabic_meanings_expanded"]:
+            counts["deep"] += 1
+    return counts
+
 # -- Eye 1 loading -----------------------------------------------------------
 
 def load_eye1_candidates(input_path: Path, min_discovery_score: float, top_n_per_root: int, lang_filter: str | None = None) -> list[dict[str, Any]]:
@@ -295,21 +349,40 @@ def _load_prompt_template() -> str:
     return _prompt_template_cache
 
 
-def _build_prompt(pairs: list[dict[str, Any]], lang: str) -> str:
+def _arabic_context(p: dict[str, Any]) -> str:
+    ara_m = (f"masadiq: {p['masadiq_gloss']}" if p.get("masadiq_gloss") else "(no gloss)")
+    if p.get("mafahim_gloss"):
+        ara_m += f" | mafahim: {p['mafahim_gloss']}"
+    if p.get("arabic_meanings_expanded"):
+        ara_m += " | ALL MEANINGS: " + "; ".join(m["sense"] for m in p["arabic_meanings_expanded"][:7] if isinstance(m, dict) and m.get("sense"))
+    return ara_m
+
+def _target_line(p: dict[str, Any], lang_name: str) -> str:
+    tgt_p = f' ({p["target_meaning"]})' if p.get("target_meaning") else ""
+    return f'{lang_name} "{p["target_lemma"]}"{tgt_p}'
+
+def _build_prompt(pairs: list[dict[str, Any]], lang: str, *, grouped: bool = False) -> str:
+    """One scoring prompt; ``grouped`` states each Arabic root once above its numbered targets."""
     lang_name = _LANG_NAMES.get(lang, lang.upper())
     lines: list[str] = []
+    header = None
     for i, p in enumerate(pairs):
-        ara_m = (f"masadiq: {p['masadiq_gloss']}" if p.get("masadiq_gloss") else "(no gloss)")
-        if p.get("mafahim_gloss"):
-            ara_m += f" | mafahim: {p['mafahim_gloss']}"
-        if p.get("arabic_meanings_expanded"):
-            ara_m += " | ALL MEANINGS: " + "; ".join(m["sense"] for m in p["arabic_meanings_expanded"][:7] if isinstance(m, dict) and m.get("sense"))
-        tgt_p = f' ({p["target_meaning"]})' if p.get("target_meaning") else ""
-        lines.append(f'{i}. Arabic "{p["arabic_root"]}" ({ara_m}) <-> {lang_name} "{p["target_lemma"]}"{tgt_p}')
+        if not grouped:
+            lines.append(f'{i}. Arabic "{p["arabic_root"]}" ({_arabic_context(p)}) <-> {_target_line(p, lang_name)}')
+            continue
+        root_header = f'Arabic "{p["arabic_root"]}" ({_arabic_context(p)}):'
+        if root_header != header:
+            lines.append(root_header)
+            header = root_header
+        lines.append(f"  {i}. <-> {_target_line(p, lang_name)}")
     n = len(pairs)
 
+    intro = "Score these pairs:\n"
+    if grouped:
+        intro = ("Score these pairs. Each Arabic root is given once; score it against every "
+                 "numbered word listed under it:\n")
     task_instruction = (
-        "Score these pairs:\n" + "\n".join(lines) +
+        intro + "\n".join(lines) +
         f"\n\nReturn a JSON array of exactly {n} objects: "
         '[{"pair_index":0,"score":0.85,"reasoning":"...","method":"masadiq_direct"},...]\n'
     )
@@ -317,161 +390,399 @@ def _build_prompt(pairs: list[dict[str, Any]], lang: str) -> str:
     template = _load_prompt_template()
     return template.replace("{LANG_NAME}", lang_name).replace("{TASK_INSTRUCTION}", task_instruction)
 
-def _call_llm(client: Any, model_id: str, prompt: str, retries: int = 3) -> list[dict[str, Any]]:
-    """Call Anthropic API; parse JSON array; retry with backoff on failure."""
-    delay = 2.0
-    last_err: Exception | None = None
-    for attempt in range(retries):
-        try:
-            resp = client.messages.create(model=model_id, max_tokens=2048, messages=[{"role": "user", "content": prompt}])
-            raw = resp.content[0].text.strip()
-            if raw.startswith("```"):
-                raw = raw.split("```", 2)[1]
-                if raw.startswith("json"):
-                    raw = raw[4:]
-                if raw.endswith("```"):
-                    raw = raw[:-3]
-            return json.loads(raw.strip())
-        except Exception as exc:
-            last_err = exc
-            if attempt < retries - 1:
-                print(f"[warn] LLM failed ({attempt+1}/{retries}): {exc}. Retry in {delay:.0f}s...", file=sys.stderr)
-                time.sleep(delay); delay *= 2
-    raise RuntimeError(f"LLM call failed after {retries} attempts: {last_err}") from last_err
+def _pair_payload(c: dict[str, Any], lang: str) -> dict[str, Any]:
+    """Everything the prompt says about one pair — its LLM cache identity."""
+    return {
+        "lang": lang, "arabic_root": c["arabic_root"], "target_lemma": c["target_lemma"],
+        "masadiq": c.get("masadiq_gloss", ""), "mafahim": c.get("mafahim_gloss", ""),
+        "expanded": [m["sense"] for m in (c.get("arabic_meanings_expanded") or [])[:7]
+                     if isinstance(m, dict) and m.get("sense")],
+        "target_meaning": c.get("target_meaning", ""),
+    }
+
+def _pack_batches(pairs: list[dict[str, Any]], lang: str, max_pairs: int,
+                  token_budget: int) -> list[list[dict[str, Any]]]:
+    """Group pairs by Arabic root and fill grouped prompts up to ``token_budget``.
+
+    Roots keep their first-seen order. A root's targets share one context
+    line, so a batch only pays for a root's meanings once (again only when
+    the root straddles two batches). ``max_pairs`` still caps a batch, which
+    bounds the size of the JSON reply.
+    """
+    by_root: dict[str, list[dict[str, Any]]] = {}
+    for p in pairs:
+        by_root.setdefault(p["arabic_root"], []).append(p)
+    lang_name = _LANG_NAMES.get(lang, lang.upper())
+    base = estimate_prompt_tokens(_build_prompt([], lang, grouped=True)) + 10
+    batches: list[list[dict[str, Any]]] = []
+    batch: list[dict[str, Any]] = []
+    used = base
+    for group in by_root.values():
+        header = estimate_prompt_tokens(f'Arabic "{group[0]["arabic_root"]}" ({_arabic_context(group[0])}):')
+        for p in group:
+            cost = estimate_prompt_tokens(f"  {len(batch)}. <-> {_target_line(p, lang_name)}") + 1
+            opens_root = not batch or batch[-1]["arabic_root"] != p["arabic_root"]
+            if batch and (len(batch) >= max_pairs or used + cost + (header if opens_root else 0) > token_budget):
+                batches.append(batch)
+                batch, used, opens_root = [], base, True
+            batch.append(p)
+            used += cost + (header if opens_root else 0)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _cache_template_version(token_budget: int) -> str:
+    """LLM cache scope version: the template text plus the prompt layout it is filled with."""
+    template = _load_prompt_template()
+    return template_version(template if token_budget <= 0 else template + "\n[layout: grouped by root]")
+
+def _plan_batches(pairs: list[dict[str, Any]], lang: str, batch_size: int,
+                  token_budget: int, *, head: int = 0) -> tuple[list[list[dict[str, Any]]], list[str]]:
+    """Batches and their prompts: packed by root and budget, or fixed ``batch_size`` chunks.
+
+    The first ``head`` pairs (the failed-batch retry queue) are packed on their
+    own, so regrouping by root never mixes them into later batches.
+    """
+    fixed = [pairs[start: start + batch_size] for start in range(0, len(pairs), batch_size)]
+    if token_budget <= 0 or not pairs:
+        return fixed, [_build_prompt(batch, lang) for batch in fixed]
+    batches = [batch for part in (pairs[:head], pairs[head:]) if part
+               for batch in _pack_batches(part, lang, batch_size, token_budget)]
+    prompts = [_build_prompt(batch, lang, grouped=True) for batch in batches]
+    before = sum(estimate_prompt_tokens(_build_prompt(batch, lang)) for batch in fixed)
+    after = sum(map(estimate_prompt_tokens, prompts))
+    print(f"[pack] {len(pairs)} pairs in {len(batches)} prompts: ~{after / len(pairs):.0f} prompt tokens/pair "
+          f"(fixed batches of {batch_size}: ~{before / len(pairs):.0f} in {len(fixed)} prompts, "
+          f"{1 - after / before:.0%} saved).", file=sys.stderr)
+    return batches, prompts
+
+def _pair_of(c: dict[str, Any]) -> tuple[str, str]:
+    return (c["arabic_root"], c["target_lemma"])
+
+def _result_records(batch: list[dict[str, Any]], results: list[dict[str, Any]], lang: str,
+                    model_alias: str, batch_label: str) -> list[dict[str, Any]]:
+    """Output rows for one scored batch (LLM items mapped back via pair_index).
+
+    Items with an out-of-range or repeated ``pair_index`` are dropped; pairs
+    without an item are simply not written, so a resumed run re-sends them.
+    """
+    records: list[dict[str, Any]] = []
+    seen: set[int] = set()
+    for item in results:
+        idx = item.get("pair_index", 0)
+        if not isinstance(idx, int) or not 0 <= idx < len(batch) or idx in seen:
+            continue
+        seen.add(idx)
+        c = batch[idx]
+        records.append({
+            "source_lemma": c["arabic_root"], "target_lemma": c["target_lemma"],
+            "lang_pair": f"ara-{lang}", "semantic_score": float(item.get("score", 0.0)),
+            "reasoning": str(item.get("reasoning", "")), "method": str(item.get("method", "unknown")),
+            "discovery_score": float(c.get("discovery_score", 0.0)),
+            "model": model_alias, "batch": batch_label,
+        })
+    return records
 
 # -- Core scoring loop (public API) ------------------------------------------
 
-def score_candidates(candidates: list[dict[str, Any]], profiles: dict[str, dict[str, str]],
+def score_candidates(candidates: list[dict[str, Any]], profiles: Mapping[str, dict[str, str]],
                      output_path: Path, model_alias: str, lang: str, batch_size: int,
-                     resume: bool, dry_run: bool, batch_label: str) -> int:
-    """Score candidates, appending results to output_path. Returns count scored."""
-    already: set[tuple[str, str]] = set()
-    if resume:
-        already = load_scored_pairs(output_path)
-        if already:
-            print(f"[resume] Skipping {len(already)} already-scored pairs.", file=sys.stderr)
-
-    to_score = [c for c in candidates if (c["arabic_root"], c["target_lemma"]) not in already]
-    if not to_score:
-        print("[info] Nothing left to score.", file=sys.stderr); return 0
-
-    # Enrich with Arabic meanings (profiles first, LV0 fallback)
-    # Cache a normalized lookup key per candidate — ensures profiles/LV0/deep
-    # glossary lookups hit regardless of residual ال or hamza variants.
-    for c in to_score:
-        c["_ar_key"] = _norm_arabic_lookup(c["arabic_root"])
-
-    lv0_defs = _load_lv0_definitions()
-    enriched = 0
-    for c in to_score:
-        ar_key = c["_ar_key"]
-        prof = profiles.get(ar_key, {})
-        c["masadiq_gloss"] = prof.get("masadiq_gloss", "")
-        c["mafahim_gloss"] = prof.get("mafahim_gloss", "")
-        # Fallback: LV0 Arabic definition (Arabic text — LLM reads it natively)
-        if not c["masadiq_gloss"] and not c["mafahim_gloss"]:
-            c["masadiq_gloss"] = lv0_defs.get(ar_key, "")
-        if c["masadiq_gloss"] or c["mafahim_gloss"]:
-            enriched += 1
-
-    print(f"[info] {enriched}/{len(to_score)} pairs enriched with Arabic meaning ({enriched/max(1,len(to_score))*100:.1f}%).", file=sys.stderr)
-
-    # Enrich with target-language glosses
-    target_glosses = _load_target_glosses(lang)
-    deep = _load_deep_glossary()
-    tgt_enriched = 0
-    deep_enriched = 0
-    for c in to_score:
-        tgt_entry = target_glosses.get(c["target_lemma"], {})
-        c["target_meaning"] = tgt_entry.get("gloss", "")
-        if c["target_meaning"]:
-            tgt_enriched += 1
-        expanded = deep.get(c["_ar_key"], {}).get("meanings", [])
-        c["arabic_meanings_expanded"] = expanded
-        if expanded:
-            deep_enriched += 1
-    print(f"[info] {tgt_enriched} pairs with target meaning, {deep_enriched} with deep glossary.", file=sys.stderr)
-
-    print(f"[info] Scoring {len(to_score)} pairs in batches of {batch_size}.", file=sys.stderr)
-
-    if dry_run:
-        for c in to_score[:5]:
-            gloss = (c.get("masadiq_gloss") or "")[:50]
-            print(f"  [dry-run] {c['arabic_root']} ({gloss}) <-> {c['target_lemma']}", file=sys.stderr)
-        if len(to_score) > 5:
-            print(f"  [dry-run] ... and {len(to_score)-5} more.", file=sys.stderr)
-        return 0
-
-    api_key = os.environ.get("ANTHROPIC_API_KEY", "")
-    if not api_key:
-        print("[error] ANTHROPIC_API_KEY not set.", file=sys.stderr); sys.exit(1)
+                     resume: bool, dry_run: bool, batch_label: str, *,
+                     concurrency: int = 4, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                     transport: MessagesTransport | None = None, cache: LLMCache | None = None,
+                     batch_api: BatchAPIOptions | None = None, token_budget: int = 0,
+                     telemetry: TelemetryRecorder | None = None, extend: bool = False,
+                     enrichment: EnrichmentStore | None = None) -> int:
+    """Score candidates, appending results to output_path. Returns count scored.
+
+    Up to ``concurrency`` batches are in flight; results are still appended in
+    batch order. ``transport`` overrides the Messages API client (tests, stand-ins).
+    With a ``cache``, pairs answered before (same model, template and pair
+    payload) are written from it and batches are built from the misses only.
+    With a ``token_budget``, pairs are grouped by Arabic root and packed into
+    prompts of about that many tokens (``batch_size`` then caps pairs per
+    prompt). With ``batch_api``, misses go through provider batch jobs instead; that
+    mode always resumes (skips pairs in the output or in uncollected jobs).
+
+    Progress is indexed in a checkpoint sidecar (:mod:`.eye2_checkpoint`):
+    resuming consults the index instead of re-reading the output, and pairs
+    from failed batches are queued and sent first on the next resume.
+    Each request is logged to ``telemetry`` (:mod:`.llm_telemetry`) if given.
+    ``extend`` marks a later chunk of one run (see :func:`score_followed`): its
+    candidates are added to the checkpoint's candidate set, not swapped in.
+    ``enrichment`` serves the LV0/deep-glossary/target-gloss lookups from the
+    prebuilt store (:func:`enrich_candidates`).
+    """
+    ckpt = None if dry_run else Eye2Checkpoint(output_path)
+    try:
+        keys = [(c["arabic_root"], c["target_lemma"]) for c in candidates]
+        if ckpt is not None:
+            ckpt.sync()
+            ckpt.set_candidates(keys, replace=not extend)
+        already: set[tuple[str, str]] = set()
+        retry: set[tuple[str, str]] = set()
+        if resume or batch_api is not None:
+            already = ckpt.done_among(keys) if ckpt is not None else load_scored_pairs(output_path)
+            retry = ckpt.failed_pairs() if ckpt is not None else set()
+            if already:
+                print(f"[resume] Skipping {len(already)} already-scored pairs.", file=sys.stderr)
+
+        to_score = [c for c, key in zip(candidates, keys) if key not in already]
+        if not to_score:
+            print("[info] Nothing left to score.", file=sys.stderr); return 0
+        if retry:
+            # failed-batch queue first (stable sort keeps the rest in order)
+            to_score.sort(key=lambda c: _pair_of(c) not in retry)
+            n_retry = sum(_pair_of(c) in retry for c in to_score)
+            print(f"[checkpoint] Retrying {n_retry} pairs from failed batches first.", file=sys.stderr)
+
+        # Enrich with Arabic meanings (profiles first, LV0 fallback) and target glosses
+        hits = enrich_candidates(to_score, profiles, lang, store=enrichment)
+        enriched = hits["arabic"]
+        print(f"[info] {enriched}/{len(to_score)} pairs enriched with Arabic meaning ({enriched/max(1,len(to_score))*100:.1f}%).", file=sys.stderr)
+        print(f"[info] {hits['target']} pairs with target meaning, {hits['deep']} with deep glossary.", file=sys.stderr)
+
+        model_id = _MODEL_MAP.get(model_alias, model_alias)
+        payloads = [_pair_payload(c, lang) for c in to_score]
+        scope = cache.scope("anthropic", model_id, _cache_template_version(token_budget)) if cache is not None else None
+        cached, misses = scope.split(payloads) if scope else ({}, list(range(len(to_score))))
+        if scope:
+            print(f"[cache] {len(cached)}/{len(to_score)} pairs answered from {cache.path}.", file=sys.stderr)
+        runner = None
+        if batch_api is not None:
+            runner = BatchJobRunner(batch_workdir(output_path), batch_api.client or BatchClient(),
+                                    model_id=model_id, max_requests=batch_api.max_requests, telemetry=telemetry)
+            busy = runner.in_flight_pairs()
+            if busy:
+                misses = [i for i in misses if (to_score[i]["arabic_root"], to_score[i]["target_lemma"]) not in busy]
+                print(f"[batch-api] {len(busy)} pairs already in submitted jobs.", file=sys.stderr)
+
+        print(f"[info] Scoring {len(misses)} pairs in batches of {batch_size}.", file=sys.stderr)
+
+        if dry_run:
+            for c in to_score[:5]:
+                gloss = (c.get("masadiq_gloss") or "")[:50]
+                print(f"  [dry-run] {c['arabic_root']} ({gloss}) <-> {c['target_lemma']}", file=sys.stderr)
+            if len(to_score) > 5:
+                print(f"  [dry-run] ... and {len(to_score)-5} more.", file=sys.stderr)
+            return 0
+
+        needs_api = misses or (runner is not None and runner.open_jobs)
+        injected = transport is not None or (batch_api is not None and batch_api.client is not None)
+        if needs_api and not injected and not os.environ.get("ANTHROPIC_API_KEY") and not os.environ.get(BASE_URL_ENV):
+            print("[error] ANTHROPIC_API_KEY not set.", file=sys.stderr); sys.exit(1)
+
+        scored = 0
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "a", encoding="utf-8") as out_fh:
+            for i, item in cached.items():
+                for record in _result_records([to_score[i]], [dict(item, pair_index=0)], lang, model_alias, batch_label):
+                    out_fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    scored += 1
+            out_fh.flush()
+            if ckpt is not None and cached:
+                ckpt.commit([_pair_of(to_score[i]) for i in cached], out_fh.tell())
+
+            def write_pairs(batch: list[dict[str, Any]], results: list[dict[str, Any]],
+                            skip: set[tuple[str, str]] | None = None) -> int:
+                """Append one batch's records and cache its answers; returns pairs written."""
+                written: list[tuple[str, str]] = []
+                for record in _result_records(batch, results, lang, model_alias, batch_label):
+                    key = (record["source_lemma"], record["target_lemma"])
+                    if skip and key in skip:
+                        continue
+                    out_fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    written.append(key)
+                out_fh.flush()
+                if ckpt is not None:
+                    ckpt.commit(written, out_fh.tell())
+                    unanswered = {_pair_of(c) for c in batch} - set(written) - (skip or set())
+                    if unanswered:
+                        ckpt.fail(unanswered, "no result for pair_index")
+                if scope:
+                    scope.put_many(
+                        (batch[item["pair_index"]]["payload"], {k: item.get(k) for k in ("score", "reasoning", "method")})
+                        for item in results
+                        if isinstance(item.get("pair_index"), int) and 0 <= item["pair_index"] < len(batch)
+                    )
+                return len(written)
+
+            pending = [dict(to_score[i], payload=payloads[i]) for i in misses]
+            head = sum(_pair_of(c) in retry for c in pending)  # retry queue leads pending
+            if runner is not None:
+                return scored + _run_batch_api(runner, batch_api, pending, lang, batch_size, token_budget,
+                                               write_pairs, lambda: ckpt.done_among(keys), ckpt.fail, head=head)
+            if not misses:
+                print(f"[info] Done. All {scored} pairs came from the cache.", file=sys.stderr)
+                return scored
+
+            batches, prompts = _plan_batches(pending, lang, batch_size, token_budget, head=head)
+            print(f"[info] {len(batches)} batches, up to {concurrency} in flight.", file=sys.stderr)
+
+            def write(i: int, results: list[dict[str, Any]] | None) -> None:
+                nonlocal scored
+                if results is not None:
+                    scored += write_pairs(batches[i], results)
+                elif ckpt is not None:  # failed after retries; queued for the next --resume
+                    ckpt.fail([_pair_of(c) for c in batches[i]], "batch failed after retries")
+
+            config = EngineConfig(model_id=model_id, concurrency=concurrency,
+                                  requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute)
+            engine = AsyncEye2Engine(config, transport=transport, telemetry=telemetry)
+            stats = engine.run(prompts, write, sizes=[len(b) for b in batches])
+
+        if cache is not None:
+            print(f"[cache] {cache.stats}", file=sys.stderr)
+        print(
+            f"[info] Done. Scored {scored} pairs in {stats['elapsed_s']:.1f}s ({stats['pairs_per_s']:.1f} pairs/s); "
+            f"{stats['requests']} requests, {stats['retries']} retries, {stats['throttled']} throttled, "
+            f"{stats['failed_batches']} failed batches, {stats['input_tokens']}+{stats['output_tokens']} tokens.",
+            file=sys.stderr,
+        )
+        return scored
+    finally:
+        if ckpt is not None:
+            ckpt.close()
 
-    import anthropic
-    client = anthropic.Anthropic(api_key=api_key)
-    model_id = _MODEL_MAP.get(model_alias, model_alias)
+def score_followed(follower: Eye1Follower, *, min_pairs: int, **kwargs: Any) -> int:
+    """Score a streamed Eye 1 output chunk by chunk while Eye 1 is still running.
 
+    Each chunk is whatever roots are final (at least ``min_pairs`` candidates,
+    see :meth:`Eye1Follower.follow`) and goes through :func:`score_candidates`
+    with ``kwargs``; the loaded glossaries, cache and checkpoint carry over.
+    """
     scored = 0
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    total = (len(to_score) + batch_size - 1) // batch_size
-
-    with open(output_path, "a", encoding="utf-8") as out_fh:
-        for i, start in enumerate(range(0, len(to_score), batch_size), 1):
-            batch = to_score[start: start + batch_size]
-            print(f"[batch {i}/{total}] Scoring {len(batch)} pairs...", file=sys.stderr)
-            try:
-                results = _call_llm(client, model_id, _build_prompt(batch, lang))
-            except RuntimeError as exc:
-                print(f"[error] {exc}", file=sys.stderr); continue
-            for item in results:
-                idx = item.get("pair_index", 0)
-                if idx >= len(batch):
-                    continue
-                c = batch[idx]
-                out_fh.write(json.dumps({
-                    "source_lemma": c["arabic_root"], "target_lemma": c["target_lemma"],
-                    "lang_pair": f"ara-{lang}", "semantic_score": float(item.get("score", 0.0)),
-                    "reasoning": str(item.get("reasoning", "")), "method": str(item.get("method", "unknown")),
-                    "discovery_score": float(c.get("discovery_score", 0.0)),
-                    "model": model_alias, "batch": batch_label,
-                }, ensure_ascii=False) + "\n")
-                scored += 1
-            out_fh.flush()
-
-    print(f"[info] Done. Scored {scored} pairs.", file=sys.stderr)
+    for n, chunk in enumerate(follower.follow(min_pairs=min_pairs)):
+        state = "done" if follower.finished else "running"
+        print(f"[follow] Eye 1 {state}: {follower.roots} roots final; scoring {len(chunk)} more candidates "
+              f"({follower.candidates} so far).", file=sys.stderr)
+        scored += score_candidates(chunk, extend=n > 0, **kwargs)
+    print(f"[follow] Eye 1 finished: {follower.roots} roots, {follower.candidates} candidates; "
+          f"{scored} pairs scored.", file=sys.stderr)
     return scored
 
+def _run_batch_api(runner: BatchJobRunner, options: BatchAPIOptions, to_send: list[dict[str, Any]],
+                   lang: str, batch_size: int, token_budget: int, write_pairs: Any, already_written: Any,
+                   failed: Any = None, *, head: int = 0) -> int:
+    """Submit ``to_send`` as provider batch jobs and/or collect finished jobs; returns pairs written."""
+    if options.action in ("run", "submit") and to_send:
+        batches, prompts = _plan_batches(to_send, lang, batch_size, token_budget, head=head)
+        slim = [
+            [{"arabic_root": c["arabic_root"], "target_lemma": c["target_lemma"],
+              "discovery_score": float(c.get("discovery_score", 0.0)), "payload": c["payload"]} for c in batch]
+            for batch in batches
+        ]
+        runner.submit(list(zip(prompts, slim)))
+    if options.action == "submit":
+        print(f"[batch-api] Submitted; collect later with --batch-action collect. {runner.status()}", file=sys.stderr)
+        return 0
+    written = runner.collect(write_pairs, wait=options.action == "run", poll_interval=options.poll_interval,
+                             poll_max=options.poll_max, already_written=already_written, failed=failed)
+    status = runner.status()
+    print(f"[batch-api] Wrote {written} pairs; {status['states']['collected']}/{status['jobs']} jobs collected, "
+          f"{status['failed']} failed requests (resubmitted on the next run).", file=sys.stderr)
+    return written
+
 # -- CLI ---------------------------------------------------------------------
 
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Eye 2 Batch Scorer: LLM semantic scoring of Eye 1 candidates.")
-    p.add_argument("--input", required=True)
+    p.add_argument("--input", help="Eye 1 candidates JSONL (required unless --status).")
     p.add_argument("--output", required=True)
-    p.add_argument("--lang", required=True, help="Target lang code: lat, grc, eng, ...")
+    p.add_argument("--lang", help="Target lang code: lat, grc, eng, ... (required unless --status)")
     p.add_argument("--model", default="sonnet", choices=list(_MODEL_MAP))
     p.add_argument("--min-discovery-score", type=float, default=0.6)
     p.add_argument("--top-n-per-root", type=int, default=50)
-    p.add_argument("--batch-size", type=int, default=10)
+    p.add_argument("--batch-size", type=int, default=25, help="Max pairs per prompt (default: 25).")
+    p.add_argument("--token-budget", type=int, default=6000,
+                   help="Pack pairs grouped by Arabic root into prompts of ~N tokens (default: 6000; 0 = "
+                        "fixed --batch-size chunks, one context line per pair).")
+    p.add_argument("--concurrency", type=int, default=4, help="Batches in flight (default: 4).")
+    p.add_argument("--requests-per-minute", type=float, default=0, help="Request quota (default: 0 = none).")
+    p.add_argument("--tokens-per-minute", type=float, default=0, help="Input-token quota (default: 0 = none).")
     p.add_argument("--profiles", default=None, help="Path to arabic_semantic_profiles.jsonl.")
+    p.add_argument("--cache", default=None, help="LLM response cache (default: outputs/llm_cache/responses.sqlite).")
+    p.add_argument("--no-cache", action="store_true", help="Neither read nor write the LLM response cache.")
+    p.add_argument("--enrichment-store", default=None,
+                   help="Prebuilt lookup store (default: outputs/enrichment/lookups.sqlite if built; see enrichment_store).")
+    p.add_argument("--no-enrichment-store", action="store_true", help="Load the lookup files in full instead.")
+    p.add_argument("--no-telemetry", action="store_true", help="Do not log per-call telemetry (see llm_telemetry).")
+    p.add_argument("--mode", default="online", choices=["online", "batch-api"],
+                   help="online: concurrent Messages API calls; batch-api: provider batch jobs (default: online).")
+    p.add_argument("--batch-action", default="run", choices=["run", "submit", "collect", "status"],
+                   help="batch-api only: submit and wait (run), submit only, collect finished jobs, or print status.")
+    p.add_argument("--poll-interval", type=float, default=30.0, help="batch-api: first poll delay in s (default: 30).")
+    p.add_argument("--poll-max", type=float, default=600.0, help="batch-api: longest poll delay in s (default: 600).")
+    p.add_argument("--max-requests-per-job", type=int, default=MAX_REQUESTS_PER_JOB)
     p.add_argument("--resume", action="store_true")
     p.add_argument("--dry-run", action="store_true")
     p.add_argument("--batch-label", default=None)
-    return p.parse_args(argv)
+    p.add_argument("--status", action="store_true",
+                   help="Print done/failed/pending counts from the checkpoint index and exit.")
+    p.add_argument("--follow", action="store_true",
+                   help="Tail --input while Eye 1 (--stream) is still writing it; score roots as they finish.")
+    p.add_argument("--follow-timeout", type=float, default=0,
+                   help="--follow: give up if the input stops growing for N s before it is marked done (default: 0 = wait).")
+    args = p.parse_args(argv)
+    if not args.status and not (args.input and args.lang):
+        p.error("--input and --lang are required (unless --status)")
+    if args.follow and args.mode != "online":
+        p.error("--follow needs --mode online")
+    return args
 
 def main(argv: list[str] | None = None) -> None:
     args = _parse_args(argv)
-    input_path = Path(args.input)
     output_path = Path(args.output)
+    if args.status:
+        with Eye2Checkpoint(output_path) as ckpt:
+            print(json.dumps(ckpt.status(), indent=2, ensure_ascii=False))
+        return
+    input_path = Path(args.input)
     profiles_path = Path(args.profiles) if args.profiles else _default_profiles_path()
     batch_label = args.batch_label or f"eye2_discovery_{args.lang}"
-
-    print(f"[info] Loading Eye 1 candidates from {input_path}", file=sys.stderr)
-    candidates = load_eye1_candidates(input_path, min_discovery_score=args.min_discovery_score,
-                                      top_n_per_root=args.top_n_per_root, lang_filter=args.lang)
-    print(f"[info] {len(candidates)} candidates after filtering.", file=sys.stderr)
-    profiles = _load_profiles(profiles_path)
-    score_candidates(candidates=candidates, profiles=profiles, output_path=output_path,
-                     model_alias=args.model, lang=args.lang, batch_size=args.batch_size,
-                     resume=args.resume, dry_run=args.dry_run, batch_label=batch_label)
+    if args.mode == "batch-api" and args.batch_action == "status":
+        runner = BatchJobRunner(batch_workdir(output_path), BatchClient(), model_id=_MODEL_MAP[args.model])
+        print(json.dumps(runner.status(), indent=2))
+        return
+    batch_api = None
+    if args.mode == "batch-api":
+        batch_api = BatchAPIOptions(action=args.batch_action, poll_interval=args.poll_interval,
+                                    poll_max=args.poll_max, max_requests=args.max_requests_per_job)
+
+    store = None if args.no_enrichment_store else EnrichmentStore.open(args.enrichment_store)
+    if store is not None:
+        print(f"[enrich] Using lookup store {store.path}", file=sys.stderr)
+    profiles = _lookup(store, "profile", profiles_path, lambda: _load_profiles(profiles_path))
+    cache = None if args.no_cache else LLMCache(Path(args.cache) if args.cache else default_cache_path())
+    telemetry = None
+    if not args.no_telemetry and not args.dry_run:
+        telemetry = TelemetryRecorder.default("eye2_batch_scorer", tags={"lang": args.lang, "batch": batch_label})
+        if telemetry.enabled:
+            print(f"[info] Telemetry run {telemetry.run_id} -> {telemetry.path}", file=sys.stderr)
+    kwargs = dict(profiles=profiles, output_path=output_path,
+                  model_alias=args.model, lang=args.lang, batch_size=args.batch_size,
+                  resume=args.resume, dry_run=args.dry_run, batch_label=batch_label,
+                  concurrency=args.concurrency, requests_per_minute=args.requests_per_minute,
+                  tokens_per_minute=args.tokens_per_minute, cache=cache, batch_api=batch_api,
+                  token_budget=args.token_budget, telemetry=telemetry, enrichment=store)
+    try:
+        if args.follow:
+            print(f"[follow] Following Eye 1 output {input_path}", file=sys.stderr)
+            follower = Eye1Follower(input_path, min_discovery_score=args.min_discovery_score,
+                                    top_n_per_root=args.top_n_per_root, lang_filter=args.lang,
+                                    idle_timeout=args.follow_timeout)
+            score_followed(follower, min_pairs=args.concurrency * args.batch_size * 2, **kwargs)
+        else:
+            print(f"[info] Loading Eye 1 candidates from {input_path}", file=sys.stderr)
+            candidates = load_eye1_candidates(input_path, min_discovery_score=args.min_discovery_score,
+                                              top_n_per_root=args.top_n_per_root, lang_filter=args.lang)
+            print(f"[info] {len(candidates)} candidates after filtering.", file=sys.stderr)
+            score_candidates(candidates=candidates, **kwargs)
+    finally:
+        if cache is not None:
+            cache.close()
+        if store is not None:
+            store.close()
 
 if __name__ == "__main__":
     main()
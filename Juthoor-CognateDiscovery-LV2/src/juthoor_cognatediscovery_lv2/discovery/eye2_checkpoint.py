@@ -0,0 +1,253 @@
+"""Checkpoint index for long Eye 2 runs, kept next to the output JSONL.
+
+Resuming used to re-parse the whole output file to learn which pairs were
+done. The checkpoint keeps that knowledge in a small sqlite sidecar,
+``<output>.ckpt.sqlite``:
+
+- ``done``: one 64-bit hash per completed (source_lemma, target_lemma) pair;
+- ``failed``: pairs whose batch failed after retries, or that the model left
+  unanswered, with the reason and attempt count (the failed-batch queue:
+  resumed runs send these first);
+- ``candidates``: hashes of the pairs the latest run set out to score, so
+  pending counts need no input either;
+- ``meta``: the byte offset of the output file covered by the index, and the
+  file's identity (inode plus a hash of its first line).
+
+:meth:`Eye2Checkpoint.commit` records a flushed batch's pairs and the new
+output offset in one transaction, so the index never claims more than the
+output holds. If the process dies between the write and the commit,
+:meth:`Eye2Checkpoint.sync` finds the output longer than the recorded offset
+and indexes just that tail; a torn last line is cut off (its pair is simply
+scored again). An output that shrank or was replaced (different inode or first
+line, whatever its size) is re-indexed in full.
+
+CLI: python -m juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer --output eye2.jsonl --status
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS done (h INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS failed (
+    h INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS candidates (h INTEGER PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+Pair = tuple[str, str]
+
+
+def checkpoint_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".ckpt.sqlite")
+
+
+def pair_hash(source: str, target: str) -> int:
+    """Signed 64-bit key of one (source_lemma, target_lemma) pair."""
+    digest = hashlib.blake2b(f"{source}\t{target}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class Eye2Checkpoint:
+    """sqlite sidecar index of an Eye 2 output file; safe to share between threads."""
+
+    def __init__(self, output_path: Path, *, stream: Any = sys.stderr) -> None:
+        self.output_path = Path(output_path)
+        self.path = checkpoint_path(self.output_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "Eye2Checkpoint":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _log(self, msg: str) -> None:
+        if self.stream is not None:
+            print(msg, file=self.stream, flush=True)
+
+    # -- meta ---------------------------------------------------------------
+
+    def _meta(self, key: str, default: str = "") -> str:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, **values: Any) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [(k, str(v)) for k, v in values.items()],
+        )
+
+    def _identity(self) -> str:
+        """Inode and first-line hash of the output: changes when the file is replaced."""
+        try:
+            with open(self.output_path, "rb") as fh:
+                first = fh.readline()
+                ino = os.fstat(fh.fileno()).st_ino
+        except FileNotFoundError:
+            return ""
+        return f"{ino}:{hashlib.blake2b(first, digest_size=8).hexdigest()}" if first else ""
+
+    @property
+    def offset(self) -> int:
+        with self._lock:
+            return int(self._meta("offset", "0"))
+
+    def set_candidates(self, pairs: Iterable[Pair], *, replace: bool = True) -> None:
+        """Record the run's candidate set (for pending counts in :meth:`status`).
+
+        ``replace=False`` adds to the set instead (a run fed in chunks).
+        """
+        with self._lock:
+            self._db.execute("BEGIN")
+            if replace:
+                self._db.execute("DELETE FROM candidates")
+            self._db.executemany("INSERT OR IGNORE INTO candidates (h) VALUES (?)", ((pair_hash(s, t),) for s, t in pairs))
+            self._db.execute("COMMIT")
+
+    # -- reconcile with the output file -------------------------------------
+
+    def sync(self) -> int:
+        """Bring the index up to date with the output file; returns pairs newly indexed."""
+        exists = self.output_path.exists()
+        size = self.output_path.stat().st_size if exists else 0
+        with self._lock:
+            offset = int(self._meta("offset", "0"))
+            identity = self._meta("identity")
+        replaced = offset > 0 and identity != self._identity()
+        if size == offset and not replaced:
+            return 0
+        if size < offset or replaced:
+            if not exists:
+                why = "is gone"
+            elif replaced:
+                why = "was replaced" if identity else "has an index from before identity checks"
+            else:
+                why = "is shorter than its index"
+            self._log(f"[checkpoint] {self.output_path.name} {why}; re-indexing.")
+            with self._lock:
+                self._db.execute("DELETE FROM done")
+                self._set_meta(offset=0, identity="")
+            offset = 0
+        if not exists:
+            return 0
+        pairs: list[Pair] = []
+        end = offset
+        with open(self.output_path, "rb") as fh:
+            fh.seek(offset)
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break  # torn last line from a crash mid-write
+                end += len(raw)
+                try:
+                    obj = json.loads(raw)
+                    pairs.append((obj["source_lemma"], obj["target_lemma"]))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+        if end < size:
+            self._log(f"[checkpoint] Dropping a torn last line ({size - end} bytes) from {self.output_path.name}.")
+            with open(self.output_path, "r+b") as fh:
+                fh.truncate(end)
+        self.commit(pairs, end)
+        if offset == 0 and pairs:
+            self._log(f"[checkpoint] Indexed {len(pairs)} pairs from {self.output_path.name}.")
+        return len(pairs)
+
+    # -- writes -------------------------------------------------------------
+
+    def commit(self, pairs: Iterable[Pair], offset: int) -> None:
+        """Mark ``pairs`` done (dropping them from the failed queue) and record the output offset."""
+        hashes = [(pair_hash(s, t),) for s, t in pairs]
+        with self._lock:
+            # the identity is taken once, when the output gets its first line
+            identity = "" if offset == 0 or self._meta("identity") else self._identity()
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT OR IGNORE INTO done (h) VALUES (?)", hashes)
+            self._db.executemany("DELETE FROM failed WHERE h = ?", hashes)
+            self._set_meta(offset=offset, updated=time.time())
+            if identity:
+                self._set_meta(identity=identity)
+            self._db.execute("COMMIT")
+
+    def fail(self, pairs: Iterable[Pair], reason: str) -> None:
+        """Queue ``pairs`` for retry (attempts counts how often they have failed)."""
+        now = time.time()
+        rows = [(pair_hash(s, t), s, t, reason[:300], now) for s, t in pairs]
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT INTO failed (h, source, target, reason, attempts, updated) VALUES (?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT (h) DO UPDATE SET reason = excluded.reason, attempts = attempts + 1, "
+                "updated = excluded.updated",
+                rows,
+            )
+            self._db.execute("COMMIT")
+
+    # -- reads --------------------------------------------------------------
+
+    def done_among(self, pairs: Sequence[Pair]) -> set[Pair]:
+        """The subset of ``pairs`` already in the output."""
+        by_hash = {pair_hash(s, t): (s, t) for s, t in pairs}
+        hashes = list(by_hash)
+        found: set[Pair] = set()
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT h FROM done WHERE h IN ({','.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+                found.update(by_hash[h] for (h,) in rows)
+        return found
+
+    def failed_pairs(self) -> set[Pair]:
+        with self._lock:
+            return set(self._db.execute("SELECT source, target FROM failed").fetchall())
+
+    def status(self) -> dict[str, Any]:
+        """Done/failed/pending counts from the index alone (the output file is only stat'ed)."""
+        with self._lock:
+            done = self._db.execute("SELECT COUNT(*) FROM done").fetchone()[0]
+            failed, retried = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(attempts > 1), 0) FROM failed",
+            ).fetchone()
+            reasons = dict(self._db.execute(
+                "SELECT reason, COUNT(*) FROM failed GROUP BY reason ORDER BY COUNT(*) DESC LIMIT 5",
+            ).fetchall())
+            total, pending = self._db.execute(
+                "SELECT COUNT(*), COUNT(*) - COUNT(d.h) FROM candidates c LEFT JOIN done d ON d.h = c.h",
+            ).fetchone()
+            offset = int(self._meta("offset", "0"))
+            updated = self._meta("updated")
+        size = self.output_path.stat().st_size if self.output_path.exists() else 0
+        return {
+            "output": str(self.output_path),
+            "done": done,
+            "failed": failed,
+            "failed_more_than_once": retried,
+            "failed_reasons": reasons,
+            "candidates": total,
+            "pending": pending,
+            "unindexed_bytes": max(0, size - offset),
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(float(updated))) if updated else None,
+        }
@@ -0,0 +1,322 @@
+"""Content-addressed, on-disk cache of LLM answers, one entry per pair.
+
+Entries are keyed by ``(provider, model, prompt-template version, normalized
+pair payload)`` rather than by batch prompt, so a rerun that re-chunks,
+re-orders or extends its candidate list only sends the pairs it has never
+seen: callers split a batch into cached hits and misses, and re-assemble
+batches from the misses alone.
+
+- the template version is a digest of the template text
+  (:func:`template_version`), so editing a prompt invalidates its entries
+  without anyone remembering to bump a number;
+- payload strings are NFC-normalized and whitespace-collapsed and floats
+  rounded, so cosmetic differences still hit;
+- entries live in one sqlite file (default ``outputs/llm_cache/responses.sqlite``)
+  with created/accessed times, so :meth:`LLMCache.evict` can enforce an age
+  limit and a size budget (least recently used first).
+
+CLI::
+
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_cache stats
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_cache invalidate --provider anthropic --model claude-sonnet-4-6
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_cache evict --max-mb 512 --max-age-days 90
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Mapping, Sequence
+
+from ..lv3.discovery.embedding_store import normalize_text
+
+_DAY = 86400.0
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    template TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+def default_cache_path() -> Path:
+    return Path(__file__).resolve().parents[3] / "outputs" / "llm_cache" / "responses.sqlite"
+
+
+def template_version(template: str) -> str:
+    """12-hex-char digest of a prompt template's text."""
+    return hashlib.blake2b(template.encode("utf-8"), digest_size=6).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, float):
+        return round(value, 4)
+    if isinstance(value, Mapping):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def pair_key(provider: str, model: str, template: str, payload: Mapping[str, Any]) -> str:
+    """32-hex-char key of one pair's request under one provider/model/template."""
+    blob = json.dumps(
+        {"provider": provider, "model": model, "template": template, "payload": _canonical(payload)},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    puts: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        looked_up = self.hits + self.misses
+        return self.hits / looked_up if looked_up else 0.0
+
+    def __str__(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate), {self.puts} stored"
+
+
+class LLMCache:
+    """sqlite-backed response cache; safe to share between threads."""
+
+    def __init__(self, path: Path | str, *, max_bytes: int = 0, max_age_days: float = 0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def default(cls, **kwargs: Any) -> "LLMCache":
+        return cls(default_cache_path(), **kwargs)
+
+    def scope(self, provider: str, model: str, template: str) -> "CacheScope":
+        return CacheScope(self, provider, model, template)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    # -- reads and writes ---------------------------------------------------
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, Any]:
+        """Cached values for ``keys`` (absent and expired keys are misses)."""
+        now = time.time()
+        oldest = now - self.max_age_days * _DAY if self.max_age_days else 0.0
+        found: dict[str, Any] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                marks = ",".join("?" * len(chunk))
+                rows = self._db.execute(
+                    f"SELECT key, value FROM responses WHERE key IN ({marks}) AND created >= ?", [*chunk, oldest],
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+            if found:
+                self._db.executemany(
+                    "UPDATE responses SET accessed = ?, hits = hits + 1 WHERE key = ?", [(now, k) for k in found],
+                )
+        self.stats.hits += len(found)
+        self.stats.misses += len(set(keys)) - len(found)
+        return found
+
+    def get(self, key: str) -> Any | None:
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items: Iterable[tuple[str, Any]], *, provider: str, model: str, template: str) -> int:
+        now = time.time()
+        rows = []
+        for key, value in items:
+            blob = json.dumps(value, ensure_ascii=False)
+            rows.append((key, provider, model, template, blob, len(blob.encode("utf-8")), now, now))
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "INSERT OR REPLACE INTO responses (key, provider, model, template, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._db.execute("COMMIT")
+        self.stats.puts += len(rows)
+        return len(rows)
+
+    def put(self, key: str, value: Any, *, provider: str, model: str, template: str) -> None:
+        self.put_many([(key, value)], provider=provider, model=model, template=template)
+
+    # -- maintenance --------------------------------------------------------
+
+    def invalidate(
+        self,
+        *,
+        provider: str | None = None,
+        model: str | None = None,
+        template: str | None = None,
+        older_than_days: float | None = None,
+        keys: Sequence[str] | None = None,
+        everything: bool = False,
+    ) -> int:
+        """Delete matching entries; returns how many. Refuses an unfiltered delete unless ``everything``."""
+        where, args = [], []
+        for column, value in (("provider", provider), ("model", model), ("template", template)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        if older_than_days is not None:
+            where.append("created < ?")
+            args.append(time.time() - older_than_days * _DAY)
+        if keys is not None:
+            where.append(f"key IN ({','.join('?' * len(keys))})")
+            args.extend(keys)
+        if not where and not everything:
+            raise ValueError("invalidate() needs a filter (or everything=True)")
+        sql = "DELETE FROM responses" + (f" WHERE {' AND '.join(where)}" if where else "")
+        with self._lock:
+            return self._db.execute(sql, args).rowcount
+
+    def evict(self, *, max_bytes: int | None = None, max_age_days: float | None = None) -> int:
+        """Drop entries older than the age limit, then least recently used ones until under the size budget."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        removed = self.invalidate(older_than_days=max_age_days) if max_age_days else 0
+        if not max_bytes:
+            return removed
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= max_bytes:
+                return removed
+            doomed, freed = [], 0
+            for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                if total - freed <= max_bytes:
+                    break
+                doomed.append((key,))
+                freed += size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        return removed + len(doomed)
+
+    def summary(self) -> dict[str, Any]:
+        with self._lock:
+            entries, size, hits = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM responses",
+            ).fetchone()
+            groups = self._db.execute(
+                "SELECT provider, model, template, COUNT(*), SUM(size), SUM(hits) FROM responses "
+                "GROUP BY provider, model, template ORDER BY provider, model, template",
+            ).fetchall()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "lifetime_hits": hits,
+            "groups": [
+                {"provider": p, "model": m, "template": t, "entries": n, "bytes": b, "hits": h}
+                for p, m, t, n, b, h in groups
+            ],
+        }
+
+    def close(self) -> None:
+        if self.max_bytes or self.max_age_days:
+            self.evict()
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "LLMCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class CacheScope:
+    """An :class:`LLMCache` bound to one provider, model and template version."""
+
+    cache: LLMCache
+    provider: str
+    model: str
+    template: str
+    _tags: dict[str, str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._tags = {"provider": self.provider, "model": self.model, "template": self.template}
+
+    def key(self, payload: Mapping[str, Any]) -> str:
+        return pair_key(self.provider, self.model, self.template, payload)
+
+    def get(self, payload: Mapping[str, Any]) -> Any | None:
+        return self.cache.get(self.key(payload))
+
+    def put(self, payload: Mapping[str, Any], value: Any) -> None:
+        self.cache.put(self.key(payload), value, **self._tags)
+
+    def put_many(self, items: Iterable[tuple[Mapping[str, Any], Any]]) -> int:
+        return self.cache.put_many(((self.key(p), v) for p, v in items), **self._tags)
+
+    def split(self, payloads: Sequence[Mapping[str, Any]]) -> tuple[dict[int, Any], list[int]]:
+        """``({position: cached value}, [positions still to send])``."""
+        keys = [self.key(p) for p in payloads]
+        found = self.cache.get_many(keys)
+        hits = {i: found[k] for i, k in enumerate(keys) if k in found}
+        return hits, [i for i in range(len(keys)) if i not in hits]
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect and maintain the LLM response cache.")
+    ap.add_argument("--path", type=Path, default=None, help="Cache file (default: outputs/llm_cache/responses.sqlite).")
+    sub = ap.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entries, size and lifetime hits per provider/model/template.")
+    inv = sub.add_parser("invalidate", help="Delete entries matching the filters.")
+    inv.add_argument("--provider")
+    inv.add_argument("--model")
+    inv.add_argument("--template", help="Template version digest.")
+    inv.add_argument("--older-than-days", type=float)
+    inv.add_argument("--all", action="store_true", help="Delete every entry.")
+    ev = sub.add_parser("evict", help="Apply an age limit and a size budget.")
+    ev.add_argument("--max-mb", type=float, default=0)
+    ev.add_argument("--max-age-days", type=float, default=0)
+    args = ap.parse_args(argv)
+
+    with LLMCache(args.path or default_cache_path()) as cache:
+        if args.command == "stats":
+            print(json.dumps(cache.summary(), indent=2, ensure_ascii=False))
+        elif args.command == "invalidate":
+            try:
+                n = cache.invalidate(provider=args.provider, model=args.model, template=args.template,
+                                     older_than_days=args.older_than_days, everything=args.all)
+            except ValueError as exc:
+                print(f"[error] {exc}", file=sys.stderr)
+                return 2
+            print(f"[info] Invalidated {n} entries.", file=sys.stderr)
+        else:
+            n = cache.evict(max_bytes=int(args.max_mb * 1024 * 1024), max_age_days=args.max_age_days)
+            print(f"[info] Evicted {n} entries.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
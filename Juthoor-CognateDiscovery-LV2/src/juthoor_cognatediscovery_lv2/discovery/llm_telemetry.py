@@ -0,0 +1,262 @@
+"""Per-call telemetry for every LLM-backed scoring path, and run reports.
+
+Each LLM request appends one JSON line to an append-only log (default
+``outputs/llm_telemetry/calls.jsonl``; ``JUTHOOR_LLM_TELEMETRY`` overrides
+the path, ``off`` disables recording)::
+
+    {"ts": ..., "run": "eye2_batch_scorer-20261018T120000-4242", "source": "eye2_batch_scorer",
+     "provider": "anthropic", "model": "claude-sonnet-4-6", "lang": "grc", "pairs": 10,
+     "attempt": 1, "latency_s": 8.31, "input_tokens": 5120, "output_tokens": 940,
+     "tokens_estimated": false, "ok": true, "parse_ok": true, "status": null, "error": ""}
+
+Callers wrap a request in :meth:`TelemetryRecorder.call`. The context times
+it, and an exception raised inside is recorded (status, error) and re-raised.
+An exception after :meth:`LLMCall.response` counts as a parse failure. Costs
+are not stored; the report prices tokens with :data:`PRICES_PER_MTOK`, so a
+price update applies to old runs too.
+
+CLI::
+
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_telemetry report
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_telemetry report --by model lang --since-days 7
+    python -m juthoor_cognatediscovery_lv2.discovery.llm_telemetry report --run <run id> --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+ENV_VAR = "JUTHOOR_LLM_TELEMETRY"
+
+# USD per million (input, output) tokens, matched by model-id prefix (longest first).
+PRICES_PER_MTOK: dict[str, tuple[float, float]] = {
+    "claude-opus-4-6": (5.0, 25.0),
+    "claude-opus-4-5": (5.0, 25.0),
+    "claude-opus-4": (15.0, 75.0),
+    "claude-sonnet-4": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+    "claude-3-5-haiku": (0.8, 4.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-4o": (2.5, 10.0),
+}
+
+GROUP_FIELDS = ("run", "source", "provider", "model", "lang")
+
+
+def default_log_path() -> Path:
+    return Path(__file__).resolve().parents[3] / "outputs" / "llm_telemetry" / "calls.jsonl"
+
+
+def price(model: str) -> tuple[float, float] | None:
+    for prefix in sorted(PRICES_PER_MTOK, key=len, reverse=True):
+        if model.startswith(prefix):
+            return PRICES_PER_MTOK[prefix]
+    return None
+
+
+class LLMCall:
+    """One in-progress request; see :meth:`TelemetryRecorder.call`."""
+
+    def __init__(self, recorder: "TelemetryRecorder", fields: dict[str, Any], *, timed: bool = True) -> None:
+        self.recorder = recorder
+        self.fields = fields
+        self.timed = timed
+        self._t0 = time.perf_counter()
+        self._responded = False
+
+    def start(self) -> None:
+        """Restart the clock (call right before the request, after any queueing)."""
+        self._t0 = time.perf_counter()
+
+    def response(self, input_tokens: int, output_tokens: int, *, estimated: bool = False) -> None:
+        self._responded = True
+        self.fields.update(input_tokens=int(input_tokens), output_tokens=int(output_tokens),
+                           tokens_estimated=estimated)
+
+    def parsed(self, ok: bool) -> None:
+        self.fields["parse_ok"] = bool(ok)
+
+    def __enter__(self) -> "LLMCall":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and not isinstance(exc, Exception):
+            return  # cancelled / interrupted: not a finished call
+        self.fields["latency_s"] = round(time.perf_counter() - self._t0, 3) if self.timed else None
+        if exc is None:
+            self.fields.setdefault("parse_ok", True if self._responded else None)
+            self.fields["ok"] = self.fields["parse_ok"] is not False
+        else:
+            self.fields.setdefault("parse_ok", False if self._responded else None)
+            self.fields.update(ok=False, status=getattr(exc, "status", None),
+                               error=f"{type(exc).__name__}: {exc}"[:200])
+        self.recorder.record(**self.fields)
+
+
+class TelemetryRecorder:
+    """Appends call records to a JSONL log; safe to share between threads.
+
+    ``tags`` (e.g. ``lang``) are added to every record. A recorder without a
+    path records nothing, so call sites never need to check.
+    """
+
+    def __init__(self, path: Path | str | None, *, source: str = "", run_id: str | None = None,
+                 tags: dict[str, Any] | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self.source = source
+        self.run_id = run_id or f"{source or 'run'}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.tags = dict(tags or {})
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def default(cls, source: str, **kwargs: Any) -> "TelemetryRecorder":
+        """Recorder on the shared log (or ``$JUTHOOR_LLM_TELEMETRY``; ``off`` disables)."""
+        env = os.environ.get(ENV_VAR, "")
+        if env.lower() in ("off", "0", "false", "no"):
+            return cls(None, source=source, **kwargs)
+        return cls(Path(env) if env else default_log_path(), source=source, **kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def call(self, *, model: str, provider: str = "anthropic", attempt: int = 1, pairs: int = 1,
+             timed: bool = True, **extra: Any) -> LLMCall:
+        fields: dict[str, Any] = {
+            "provider": provider, "model": model, "pairs": pairs, "attempt": attempt,
+            "input_tokens": 0, "output_tokens": 0, "tokens_estimated": False, "status": None, "error": "",
+        }
+        fields.update(extra)
+        return LLMCall(self, fields, timed=timed)
+
+    def record(self, **fields: Any) -> None:
+        if self.path is None:
+            return
+        row = {"ts": round(time.time(), 3), "run": self.run_id, "source": self.source, **self.tags, **fields}
+        line = json.dumps(row, ensure_ascii=False) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+
+def read_records(path: Path, *, since: float = 0.0, run: str | None = None) -> Iterator[dict[str, Any]]:
+    if not path.exists():
+        return
+    with open(path, encoding="utf-8") as fh:
+        for raw in fh:
+            try:
+                row = json.loads(raw)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if row.get("ts", 0) >= since and (run is None or row.get("run") == run):
+                yield row
+
+
+def _percentile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    k = (len(values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return round(values[lo] + (values[hi] - values[lo]) * (k - lo), 3)
+
+
+def summarize(records: Iterable[dict[str, Any]], by: Iterable[str] = ("run",)) -> list[dict[str, Any]]:
+    """One cost/throughput/quality row per distinct ``by`` key, earliest first."""
+    by = tuple(by)
+    groups: dict[tuple, list[dict[str, Any]]] = {}
+    for row in records:
+        groups.setdefault(tuple(row.get(f) for f in by), []).append(row)
+    report = []
+    for key, rows in groups.items():
+        calls = len(rows)
+        start = min(r["ts"] - (r.get("latency_s") or 0.0) for r in rows)  # records are written on completion
+        end = max(r["ts"] for r in rows)
+        tin = sum(r.get("input_tokens", 0) for r in rows)
+        tout = sum(r.get("output_tokens", 0) for r in rows)
+        cost = 0.0
+        unpriced = 0
+        for r in rows:
+            rates = price(r.get("model") or "")
+            if rates is None:
+                unpriced += 1
+                continue
+            cost += (r.get("input_tokens", 0) * rates[0] + r.get("output_tokens", 0) * rates[1]) / 1e6
+        scored = sum(r.get("pairs", 0) for r in rows if r.get("ok"))
+        responded = [r for r in rows if r.get("parse_ok") is not None]
+        latencies = [r["latency_s"] for r in rows if r.get("latency_s") is not None]
+        wall = end - start
+        report.append({
+            **dict(zip(by, key)),
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start)),
+            "calls": calls,
+            "failed": sum(not r.get("ok") for r in rows),
+            "retries": sum(r.get("attempt", 1) > 1 for r in rows),
+            "parse_failure_rate": round(sum(r["parse_ok"] is False for r in responded) / len(responded), 4)
+            if responded else None,
+            "input_tokens": tin,
+            "output_tokens": tout,
+            "tokens_estimated": any(r.get("tokens_estimated") for r in rows),
+            "cost_usd": round(cost, 4),
+            "unpriced_calls": unpriced,
+            "pairs_scored": scored,
+            "tokens_per_pair": round((tin + tout) / scored, 1) if scored else None,
+            "usd_per_1k_pairs": round(cost / scored * 1000, 4) if scored and not unpriced else None,
+            "latency_p50_s": _percentile(latencies, 0.5),
+            "latency_p95_s": _percentile(latencies, 0.95),
+            "wall_s": round(wall, 1),
+            "pairs_per_s": round(scored / wall, 2) if wall > 0 else None,
+        })
+    report.sort(key=lambda r: r["started"])
+    return report
+
+
+def _format_table(report: list[dict[str, Any]], by: tuple[str, ...]) -> str:
+    columns = [*by, "calls", "failed", "retries", "parse_failure_rate", "input_tokens", "output_tokens",
+               "cost_usd", "pairs_scored", "tokens_per_pair", "latency_p50_s", "latency_p95_s", "pairs_per_s"]
+    cells = [[("-" if row.get(c) is None else str(row.get(c))) for c in columns] for row in report]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) if cells else len(c) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ["  ".join(v.ljust(w) for v, w in zip(r, widths)) for r in cells]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description="Report on the LLM call telemetry log.")
+    p.add_argument("--path", default=None, help="Telemetry log (default: $JUTHOOR_LLM_TELEMETRY or outputs/llm_telemetry/calls.jsonl).")
+    sub = p.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="Cost, throughput and quality per run (or other grouping).")
+    rep.add_argument("--by", nargs="+", default=["run", "source"], choices=GROUP_FIELDS)
+    rep.add_argument("--run", default=None, help="Only this run id.")
+    rep.add_argument("--since-days", type=float, default=0, help="Only calls from the last N days.")
+    rep.add_argument("--json", action="store_true", help="Print JSON instead of a table.")
+    args = p.parse_args(argv)
+
+    env = os.environ.get(ENV_VAR, "")
+    path = Path(args.path) if args.path else (Path(env) if env and env.lower() not in ("off", "0", "false", "no")
+                                              else default_log_path())
+    since = time.time() - args.since_days * 86400 if args.since_days else 0.0
+    report = summarize(read_records(path, since=since, run=args.run), by=args.by)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif not report:
+        print(f"No calls recorded in {path}.", file=sys.stderr)
+    else:
+        print(_format_table(report, tuple(args.by)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
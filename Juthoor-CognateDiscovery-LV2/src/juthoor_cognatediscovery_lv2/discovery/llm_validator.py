@@ -16,13 +16,69 @@ Usage:
     # result.confidence = 0.9
     # result.reasoning = "Direct phonetic match: r-th-a -> r-th. Semantic match: both mean compassion..."
     # result.method_used = "direct_skeleton"
+
+    # Many pairs: up to max_concurrent requests in flight, results in input order.
+    validator = LLMEtymologyValidator(max_concurrent=8, requests_per_minute=50, pairs_per_prompt=5)
+    results = validator.validate_batch(pairs)
 """
 
 import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
+from .llm_cache import LLMCache, template_version
+from .llm_telemetry import LLMCall, TelemetryRecorder
+
+_PAIR_FIELDS = (
+    "arabic_root", "arabic_meaning", "english_word", "english_meaning",
+    "phonetic_score", "additional_context",
+)
+
+_SOUND_RULES = """Known sound correspondence rules (Arabic -> English):
+- ق -> c/k/g (uvular -> velar)
+- ع -> silent/h (pharyngeal deletion)
+- ح -> h (pharyngeal -> glottal)
+- خ -> h/k/ch (velar fricative)
+- غ -> g (voiced uvular -> velar)
+- ص -> s (emphatic -> plain)
+- ط -> t (emphatic -> plain)
+- ض -> d (emphatic -> plain)
+- ث -> th/t/s
+- ذ -> th/d/z
+- ف -> f/p (labial interchange)
+- ب -> b/p/v (labial interchange)"""
+
+_RESULT_FIELDS = """  "confidence": 0.0-1.0,
+  "is_cognate": true/false,
+  "reasoning": "2-3 sentence explanation",
+  "method": "direct_match|morpheme_decomposition|semantic_drift|multi_hop_chain|metathesis|dialect_variant|article_absorption|other",
+  "phonetic_rules": ["rule1", "rule2"],
+  "semantic_link": "how meanings connect",
+  "intermediate_languages": ["Latin", "Greek"]"""
+
+
+class _RequestPacer:
+    """Thread-safe request pacing: at most ``per_minute`` request starts per minute."""
+
+    def __init__(self, per_minute: float = 0.0) -> None:
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
 
 @dataclass
 class LLMValidationResult:
@@ -39,10 +95,34 @@ class LLMValidationResult:
 class LLMEtymologyValidator:
     """Validates etymology candidates using Claude API."""
 
-    def __init__(self, model: str = "claude-haiku-4-5-20251001", max_concurrent: int = 5):
+    def __init__(
+        self,
+        model: str = "claude-haiku-4-5-20251001",
+        max_concurrent: int = 5,
+        cache: LLMCache | None = None,
+        requests_per_minute: float = 0.0,
+        pairs_per_prompt: int = 1,
+        telemetry: TelemetryRecorder | None = None,
+    ):
         self._model = model
         self._client = None
+        self._client_lock = threading.Lock()
         self._api_key = os.environ.get("ANTHROPIC_API_KEY", "")
+        self.max_concurrent = max(1, max_concurrent)
+        self.pairs_per_prompt = max(1, pairs_per_prompt)
+        # One pacer per validator, shared by every validate_batch worker.
+        self._pacer = _RequestPacer(requests_per_minute)
+        self._telemetry = telemetry if telemetry is not None else TelemetryRecorder(None)
+        # Responses are cached per pair under a digest of the prompt text with
+        # placeholder fields, so any edit to _build_prompt starts a fresh scope.
+        self._cache = None
+        self._packed_cache = None
+        if cache is not None:
+            placeholders = ("{arabic_root}", "{arabic_meaning}", "{english_word}", "{english_meaning}", 0.0, "{context}")
+            template = self._build_prompt(*placeholders)
+            self._cache = cache.scope("anthropic", model, template_version(template))
+            packed = self._build_packed_prompt([dict(zip(_PAIR_FIELDS, placeholders))])
+            self._packed_cache = cache.scope("anthropic", model, template_version(packed))
 
     @property
     def available(self) -> bool:
@@ -50,11 +130,50 @@ class LLMEtymologyValidator:
         return bool(self._api_key)
 
     def _get_client(self):
-        if self._client is None:
-            import anthropic
-            self._client = anthropic.Anthropic(api_key=self._api_key)
+        with self._client_lock:
+            if self._client is None:
+                import anthropic
+                self._client = anthropic.Anthropic(api_key=self._api_key)
         return self._client
 
+    def _complete(self, prompt: str, max_tokens: int, call: LLMCall) -> str:
+        """One Messages API call, paced by the shared rate limiter."""
+        self._pacer.wait()
+        call.start()
+        response = self._get_client().messages.create(
+            model=self._model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            call.response(usage.input_tokens, usage.output_tokens)
+        else:
+            call.response(len(prompt) // 3, len(response.content[0].text) // 3, estimated=True)
+        return response.content[0].text
+
+    @staticmethod
+    def _payload(pair: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "arabic_root": pair["arabic_root"], "arabic_meaning": pair["arabic_meaning"],
+            "english_word": pair["english_word"], "english_meaning": pair["english_meaning"],
+            "phonetic_score": round(pair.get("phonetic_score", 0.0), 2),
+            "additional_context": pair.get("additional_context", ""),
+        }
+
+    @staticmethod
+    def _failed(phonetic_score: float, error: Exception) -> LLMValidationResult:
+        return LLMValidationResult(
+            confidence=phonetic_score * 0.8,
+            reasoning=f"LLM call failed: {error}",
+            method_used="phonetic_fallback",
+            is_cognate=phonetic_score > 0.6,
+            phonetic_rules_identified=[],
+            semantic_link="",
+            intermediate_languages=[],
+            raw_response=str(error),
+        )
+
     def validate_pair(
         self,
         arabic_root: str,
@@ -82,45 +201,106 @@ class LLMEtymologyValidator:
             english_word, english_meaning,
             phonetic_score, additional_context,
         )
+        payload = self._payload({
+            "arabic_root": arabic_root, "arabic_meaning": arabic_meaning,
+            "english_word": english_word, "english_meaning": english_meaning,
+            "phonetic_score": phonetic_score, "additional_context": additional_context,
+        })
+        if self._cache is not None:
+            cached = self._cache.get(payload)
+            if cached is not None:
+                return self._parse_response(cached, phonetic_score)
 
         try:
-            client = self._get_client()
-            response = client.messages.create(
-                model=self._model,
-                max_tokens=500,
-                messages=[{"role": "user", "content": prompt}],
-            )
-            raw = response.content[0].text
-            return self._parse_response(raw, phonetic_score)
+            with self._telemetry.call(model=self._model) as call:
+                raw = self._complete(prompt, 500, call)
+                result = self._parse_response(raw, phonetic_score)
+                call.parsed(result.method_used != "parse_failed")
+            if self._cache is not None and result.method_used != "parse_failed":
+                self._cache.put(payload, raw)
+            return result
         except Exception as e:
-            return LLMValidationResult(
-                confidence=phonetic_score * 0.8,
-                reasoning=f"LLM call failed: {e}",
-                method_used="phonetic_fallback",
-                is_cognate=phonetic_score > 0.6,
-                phonetic_rules_identified=[],
-                semantic_link="",
-                intermediate_languages=[],
-                raw_response=str(e),
-            )
+            return self._failed(phonetic_score, e)
 
     def validate_batch(
         self,
         pairs: list[dict[str, Any]],
+        *,
+        pairs_per_prompt: int | None = None,
     ) -> list[LLMValidationResult]:
-        """Validate a batch of pairs.
+        """Validate a batch of pairs concurrently; results come back in input order.
 
         Each dict must contain: arabic_root, arabic_meaning, english_word,
         english_meaning, phonetic_score. Optional: additional_context.
+
+        Up to ``max_concurrent`` requests are in flight, all paced by the
+        validator's shared rate limiter. With ``pairs_per_prompt`` > 1 (default:
+        the constructor's), pairs are packed into multi-pair prompts; pairs a
+        packed reply does not answer are retried one by one. A failing pair
+        gets a ``phonetic_fallback`` result; the rest of the batch is unaffected.
         """
-        _allowed = {
-            "arabic_root", "arabic_meaning", "english_word", "english_meaning",
-            "phonetic_score", "additional_context",
-        }
-        return [
-            self.validate_pair(**{k: v for k, v in pair.items() if k in _allowed})
-            for pair in pairs
-        ]
+        clean = [{k: v for k, v in pair.items() if k in _PAIR_FIELDS} for pair in pairs]
+        if not self.available or not clean:
+            return [self.validate_pair(**pair) for pair in clean]
+
+        per_prompt = max(1, pairs_per_prompt or self.pairs_per_prompt)
+        results: list[LLMValidationResult | None] = [None] * len(clean)
+        if per_prompt == 1:
+            jobs = [[i] for i in range(len(clean))]
+        else:
+            pending = list(range(len(clean)))
+            if self._packed_cache is not None:
+                hits, misses = self._packed_cache.split([self._payload(pair) for pair in clean])
+                for i, raw in hits.items():
+                    results[i] = self._parse_response(raw, clean[i].get("phonetic_score", 0.0))
+                pending = misses
+            jobs = [pending[start:start + per_prompt] for start in range(0, len(pending), per_prompt)]
+
+        def run(indices: list[int]) -> None:
+            try:
+                if per_prompt == 1:
+                    results[indices[0]] = self.validate_pair(**clean[indices[0]])
+                    return
+                for i, result in self._validate_packed([clean[i] for i in indices]).items():
+                    results[indices[i]] = result
+                for i in indices:
+                    if results[i] is None:  # not answered by the packed reply
+                        results[i] = self.validate_pair(**clean[i])
+            except Exception as e:  # never let one job sink the batch
+                for i in indices:
+                    if results[i] is None:
+                        results[i] = self._failed(clean[i].get("phonetic_score", 0.0), e)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent, len(jobs) or 1)) as pool:
+            list(pool.map(run, jobs))
+        return results
+
+    def _validate_packed(self, pairs: list[dict[str, Any]]) -> dict[int, LLMValidationResult]:
+        """One multi-pair request; returns results for the pairs the reply answered."""
+        try:
+            with self._telemetry.call(model=self._model, pairs=len(pairs)) as call:
+                raw = self._complete(self._build_packed_prompt(pairs), 350 * len(pairs), call)
+                text = raw.strip()
+                if text.startswith("```"):
+                    text = text.split("```", 2)[1].removeprefix("json").rsplit("```", 1)[0]
+                items = json.loads(text.strip())
+                if not isinstance(items, list):
+                    raise ValueError("reply is not a JSON array")
+        except Exception:  # API error or unparseable reply: every pair is retried singly
+            return {}
+        answered: dict[int, LLMValidationResult] = {}
+        for item in items:
+            idx = item.get("pair_index") if isinstance(item, dict) else None
+            if not isinstance(idx, int) or not 0 <= idx < len(pairs) or idx in answered:
+                continue
+            item_raw = json.dumps({k: v for k, v in item.items() if k != "pair_index"}, ensure_ascii=False)
+            result = self._parse_response(item_raw, pairs[idx].get("phonetic_score", 0.0))
+            if result.method_used == "parse_failed":
+                continue
+            answered[idx] = result
+            if self._packed_cache is not None:
+                self._packed_cache.put(self._payload(pairs[idx]), item_raw)
+        return answered
 
     def _build_prompt(
         self,
@@ -143,31 +323,41 @@ English meaning: {english_meaning}
 Phonetic similarity score: {phonetic_score:.2f}
 {context_line}
 
-Known sound correspondence rules (Arabic -> English):
-- ق -> c/k/g (uvular -> velar)
-- ع -> silent/h (pharyngeal deletion)
-- ح -> h (pharyngeal -> glottal)
-- خ -> h/k/ch (velar fricative)
-- غ -> g (voiced uvular -> velar)
-- ص -> s (emphatic -> plain)
-- ط -> t (emphatic -> plain)
-- ض -> d (emphatic -> plain)
-- ث -> th/t/s
-- ذ -> th/d/z
-- ف -> f/p (labial interchange)
-- ب -> b/p/v (labial interchange)
+{_SOUND_RULES}
 
 Respond in this EXACT JSON format (no markdown, just JSON):
 {{
-  "confidence": 0.0-1.0,
-  "is_cognate": true/false,
-  "reasoning": "2-3 sentence explanation",
-  "method": "direct_match|morpheme_decomposition|semantic_drift|multi_hop_chain|metathesis|dialect_variant|article_absorption|other",
-  "phonetic_rules": ["rule1", "rule2"],
-  "semantic_link": "how meanings connect",
-  "intermediate_languages": ["Latin", "Greek"]
+{_RESULT_FIELDS}
 }}"""
 
+    def _build_packed_prompt(self, pairs: list[dict[str, Any]]) -> str:
+        blocks = []
+        for i, p in enumerate(pairs):
+            context = p.get("additional_context", "")
+            blocks.append(
+                f"Pair {i}:\n"
+                f"Arabic root: {p['arabic_root']}\n"
+                f"Arabic meaning: {p['arabic_meaning']}\n"
+                f"English word: {p['english_word']}\n"
+                f"English meaning: {p['english_meaning']}\n"
+                f"Phonetic similarity score: {p.get('phonetic_score', 0.0):.2f}"
+                + (f"\nAdditional context: {context}" if context else "")
+            )
+        pair_blocks = "\n\n".join(blocks)
+        return f"""You are a comparative linguistics expert specializing in Arabic-European etymology.
+
+Evaluate, for each numbered pair, whether the Arabic root and English word could be etymologically related.
+
+{pair_blocks}
+
+{_SOUND_RULES}
+
+Respond with a JSON array of exactly {len(pairs)} objects, one per pair, in this EXACT format (no markdown, just JSON):
+[{{
+  "pair_index": 0,
+{_RESULT_FIELDS}
+}}, ...]"""
+
     def _parse_response(self, raw: str, fallback_score: float) -> LLMValidationResult:
         """Parse LLM JSON response, handling optional markdown code fences."""
         try:
@@ -0,0 +1,295 @@
+"""Local stand-in for the Anthropic Messages API (``POST /v1/messages``).
+
+Answers Eye 2 scoring prompts with a deterministic JSON array (one object per
+numbered ``Arabic "..." <-> ... "..."`` line) in the Messages response shape,
+so :class:`~.eye2_async.RestTransport` and ``score_candidates`` can be
+exercised without a key or network access:
+
+    with MessagesStandIn(latency=0.05) as server:
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+        ...
+
+Failures can be injected: ``fail_next(n, status)`` makes the next ``n``
+requests fail with ``status`` (default 429, with ``retry-after``),
+``garble_next(n)`` returns text that is not JSON, and ``respond_with(...)``
+scripts a sequence. ``requests_per_window`` emulates a server-side request
+quota: requests beyond it within ``window`` seconds get a 429 carrying
+``retry-after`` and ``anthropic-ratelimit-requests-*`` headers.
+
+The Message Batches endpoints are emulated too (``POST /v1/messages/batches``,
+``GET .../{id}`` and ``GET .../{id}/results``): a job reports ``ended`` on
+its ``batch_polls``-th retrieve, results come back in reverse order, and
+custom ids listed in ``batch_errors`` come back ``errored``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+GARBLED = "garbled"
+_PAIR_LINE_RE = re.compile(r'^(\d+)\. Arabic "([^"]*)".*?<-> [^"]*"([^"]*)"')
+_ROOT_HEADER_RE = re.compile(r'^Arabic "([^"]*)"')
+_GROUPED_LINE_RE = re.compile(r'^\s+(\d+)\. <-> [^"]*"([^"]*)"')
+
+
+def standin_score(arabic_root: str, target_lemma: str) -> float:
+    """The score the stand-in gives a pair (stable across runs and batchings)."""
+    digest = hashlib.blake2b(f"{arabic_root}\t{target_lemma}".encode("utf-8"), digest_size=2).digest()
+    return round(int.from_bytes(digest, "big") / 65535, 2)
+
+
+def _prompt_pairs(prompt: str) -> list[tuple[str, str, str]]:
+    """(pair_index, root, lemma) from one-line-per-pair or root-grouped prompts."""
+    pairs: list[tuple[str, str, str]] = []
+    root = ""
+    for line in prompt.splitlines():
+        if m := _PAIR_LINE_RE.match(line):
+            pairs.append(m.groups())
+        elif m := _ROOT_HEADER_RE.match(line):
+            root = m.group(1)
+        elif m := _GROUPED_LINE_RE.match(line):
+            pairs.append((m.group(1), root, m.group(2)))
+    return pairs
+
+
+def standin_items(prompt: str) -> list[dict[str, Any]]:
+    return [
+        {
+            "pair_index": int(idx),
+            "score": standin_score(root, lemma),
+            "reasoning": f"stand-in: {root} ~ {lemma}",
+            "method": "masadiq_direct",
+        }
+        for idx, root, lemma in _prompt_pairs(prompt)
+    ]
+
+
+class MessagesStandIn:
+    """Threaded HTTP server on 127.0.0.1 that records every request it sees."""
+
+    def __init__(
+        self,
+        *,
+        port: int = 0,
+        latency: float = 0.0,
+        retry_after: float = 0.0,
+        requests_per_window: int = 0,
+        window: float = 60.0,
+        fence: bool = False,
+        batch_polls: int = 2,
+    ) -> None:
+        self.latency = latency
+        self.retry_after = retry_after
+        self.requests_per_window = requests_per_window
+        self.window = window
+        self.fence = fence
+        self.batch_polls = batch_polls
+        self.batch_errors: set[str] = set()
+        self.batches: dict[str, dict[str, Any]] = {}
+        self.requests: list[dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._script: list[int | str] = []
+        self._accepted: deque[float] = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, n: int, status: int = 429) -> None:
+        self.respond_with(*[status] * n)
+
+    def garble_next(self, n: int) -> None:
+        self.respond_with(*[GARBLED] * n)
+
+    def respond_with(self, *outcomes: int | str) -> None:
+        """Queue outcomes for the next requests (200 = serve normally, ``GARBLED`` = non-JSON text)."""
+        with self._lock:
+            self._script.extend(outcomes)
+
+    @property
+    def pairs_served(self) -> int:
+        return sum(r["pairs"] for r in self.requests if r["outcome"] == 200)
+
+    def _admit(self, now: float) -> tuple[int | str, dict[str, str]]:
+        """Next scripted outcome, or the quota's verdict (call with the lock held)."""
+        if self._script:
+            outcome = self._script.pop(0)
+            return outcome, {"retry-after": str(self.retry_after)} if outcome == 429 else {}
+        if not self.requests_per_window:
+            return 200, {}
+        while self._accepted and now - self._accepted[0] >= self.window:
+            self._accepted.popleft()
+        reset_in = self.window - (now - self._accepted[0]) if self._accepted else self.window
+        reset_at = datetime.now(timezone.utc) + timedelta(seconds=reset_in)
+        headers = {
+            "anthropic-ratelimit-requests-limit": str(self.requests_per_window),
+            "anthropic-ratelimit-requests-reset": reset_at.isoformat().replace("+00:00", "Z"),
+        }
+        if len(self._accepted) >= self.requests_per_window:
+            headers["anthropic-ratelimit-requests-remaining"] = "0"
+            headers["retry-after"] = f"{reset_in:.3f}"
+            return 429, headers
+        self._accepted.append(now)
+        headers["anthropic-ratelimit-requests-remaining"] = str(self.requests_per_window - len(self._accepted))
+        return 200, headers
+
+    def _create_batch(self, requests: list[dict[str, Any]]) -> dict[str, Any]:
+        with self._lock:
+            job_id = f"msgbatch_standin_{len(self.batches):04d}"
+            results = []
+            for req in requests:
+                params = req["params"]
+                items = standin_items(params["messages"][0]["content"])
+                self.requests.append({
+                    "model": params.get("model"), "pairs": len(items), "status": 200, "outcome": 200,
+                    "time": time.monotonic(), "batch": job_id,
+                })
+                if req["custom_id"] in self.batch_errors:
+                    result = {"type": "errored", "error": {"type": "error", "error": {"type": "api_error"}}}
+                    self.requests[-1]["outcome"] = "errored"
+                else:
+                    text = json.dumps(items, ensure_ascii=False)
+                    result = {"type": "succeeded", "message": {
+                        "type": "message", "role": "assistant", "model": params.get("model"),
+                        "content": [{"type": "text", "text": text}],
+                        "usage": {"input_tokens": len(params["messages"][0]["content"]) // 4,
+                                  "output_tokens": len(text) // 4},
+                    }}
+                results.append({"custom_id": req["custom_id"], "result": result})
+            self.batches[job_id] = {"results": results[::-1], "retrieves": 0, "created_at": datetime.now(timezone.utc)}
+        return self._batch_object(job_id)
+
+    def _batch_object(self, job_id: str) -> dict[str, Any]:
+        job = self.batches[job_id]
+        ended = job["retrieves"] >= self.batch_polls
+        errored = sum(r["result"]["type"] == "errored" for r in job["results"])
+        return {
+            "id": job_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(job["results"]),
+                "succeeded": len(job["results"]) - errored if ended else 0,
+                "errored": errored if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": job["created_at"].isoformat().replace("+00:00", "Z"),
+            "ended_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z") if ended else None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{job_id}/results" if ended else None,
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def _reply(self, status: int, payload: dict[str, Any], headers: dict[str, str]) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                parts = self.path.strip("/").split("/")
+                job_id = parts[3] if len(parts) >= 4 and parts[:3] == ["v1", "messages", "batches"] else None
+                if job_id not in standin.batches:
+                    self._reply(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}}, {})
+                    return
+                if len(parts) == 4:
+                    with standin._lock:
+                        standin.batches[job_id]["retrieves"] += 1
+                    self._reply(200, standin._batch_object(job_id), {})
+                    return
+                body = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in standin.batches[job_id]["results"])
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/binary")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                if self.path == "/v1/messages/batches":
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                    self._reply(200, standin._create_batch(payload["requests"]), {})
+                    return
+                if self.path != "/v1/messages":
+                    self._reply(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}}, {})
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = payload["messages"][0]["content"]
+                items = standin_items(prompt)
+                with standin._lock:
+                    now = time.monotonic()
+                    outcome, headers = standin._admit(now)
+                    status = outcome if isinstance(outcome, int) else 200
+                    standin.in_flight += 1
+                    standin.max_in_flight = max(standin.max_in_flight, standin.in_flight)
+                    standin.requests.append({
+                        "model": payload.get("model"),
+                        "pairs": len(items),
+                        "status": status,
+                        "outcome": outcome,
+                        "time": now,
+                    })
+                try:
+                    if standin.latency:
+                        time.sleep(standin.latency)
+                    if status != 200:
+                        kind = "rate_limit_error" if status == 429 else "api_error"
+                        self._reply(status, {"type": "error", "error": {"type": kind, "message": "injected"}}, headers)
+                        return
+                    text = "I cannot score these." if outcome == GARBLED else json.dumps(items, ensure_ascii=False)
+                    if standin.fence and outcome != GARBLED:
+                        text = f"```json\n{text}\n```"
+                    self._reply(200, {
+                        "id": f"msg_standin_{len(standin.requests)}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": payload.get("model"),
+                        "content": [{"type": "text", "text": text}],
+                        "stop_reason": "end_turn",
+                        "usage": {"input_tokens": max(1, len(prompt) // 4), "output_tokens": max(1, len(text) // 4)},
+                    }, headers)
+                finally:
+                    with standin._lock:
+                        standin.in_flight -= 1
+
+        return Handler
+
+    def start(self) -> "MessagesStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MessagesStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
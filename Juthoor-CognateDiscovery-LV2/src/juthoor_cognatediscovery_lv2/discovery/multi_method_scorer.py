@@ -36,8 +36,8 @@ from .phonetic_law_scorer import (
     _weighted_projection_score,
     _best_projection_match_ipa,
     LATIN_EQUIVALENTS,
-    _KNOWN_PREFIXES,
-    _KNOWN_SUFFIXES,
+    _KNOWN_PREFIX_TRIE,
+    _KNOWN_SUFFIX_TRIE,
 )
 
 try:
@@ -182,23 +182,19 @@ class MultiMethodScorer:
         w = word.lower().strip()
         results: list[tuple[str, str, str]] = [("", w, "")]  # always include full word
 
-        # Try every prefix
-        for p in sorted(_KNOWN_PREFIXES, key=len, reverse=True):
-            if w.startswith(p) and len(w) > len(p) + 2:
-                stem = w[len(p):]
-                # Try every suffix on this stem
-                for s in sorted(_KNOWN_SUFFIXES, key=len, reverse=True):
-                    if stem.endswith(s) and len(stem) > len(s) + 1:
-                        results.append((p, stem[: -len(s)], s))
-                        break
-                results.append((p, stem, ""))
-                break
+        # Longest prefix leaving a 3+ letter stem, then longest suffix on that stem
+        pre = _KNOWN_PREFIX_TRIE.strip_longest(w, 3)
+        if pre:
+            p, stem = pre
+            suf = _KNOWN_SUFFIX_TRIE.strip_longest(stem, 2)
+            if suf:
+                results.append((p, suf[1], suf[0]))
+            results.append((p, stem, ""))
 
         # Try suffix-only
-        for s in sorted(_KNOWN_SUFFIXES, key=len, reverse=True):
-            if w.endswith(s) and len(w) > len(s) + 1:
-                results.append(("", w[: -len(s)], s))
-                break
+        suf = _KNOWN_SUFFIX_TRIE.strip_longest(w, 2)
+        if suf:
+            results.append(("", suf[1], suf[0]))
 
         # Deduplicate
         seen: set[tuple[str, str, str]] = set()
@@ -0,0 +1,196 @@
+"""Shared normalization and consonant-skeleton primitives.
+
+These small pure functions run millions of times per discovery run, yet they
+see only a few tens of thousands of distinct inputs (roots, lemmas, IPA
+strings).  Every helper here is therefore memoized with a bounded
+``lru_cache`` and built on translate tables / regexes compiled once at import.
+
+``phonetic_law_scorer``, ``precomputed_assets``, ``eye2_batch_scorer`` and the
+Eye 1 script all delegate to this module, so there is exactly one Arabic
+normalizer (:func:`normalize_arabic`) instead of several hand-kept copies.
+
+The ``*_many`` helpers are whole-list variants for corpus preprocessing: each
+distinct input is computed once and the results are broadcast back in order.
+"""
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Callable, Iterable
+
+try:
+    from juthoor_arabicgenome_lv1.factory.sound_laws import (
+        normalize_arabic_root as _lv1_normalize_arabic_root,
+    )
+except ImportError:
+    # Same behaviour as the LV1 implementation.
+    _LV1_NORMALIZE_MAP = str.maketrans(
+        {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه"}
+    )
+    _LV1_CONSONANT_RE = re.compile(r"[\u0621-\u064A]")
+
+    def _lv1_normalize_arabic_root(root: str) -> str:  # type: ignore[misc]
+        return "".join(_LV1_CONSONANT_RE.findall(root.translate(_LV1_NORMALIZE_MAP)))
+
+
+# Bound for the per-string caches.  Distinct roots/lemmas in one run stay well
+# below this; anything beyond it is evicted LRU-first.
+CACHE_SIZE = 1 << 17
+
+# ---------------------------------------------------------------------------
+# Precompiled tables
+# ---------------------------------------------------------------------------
+
+# Harakat, superscript alif and tatweel.
+_ARABIC_DIACRITICS_RE = re.compile(r"[\u064B-\u065F\u0670\u0640]")
+_HAMZA_TR = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ء": "ا",
+})
+# Weak letters (alif / waw / ya / alif maqsura) dropped from consonant skeletons.
+_ARABIC_WEAK_DELETE = str.maketrans(dict.fromkeys("اويى"))
+# Scholarly transliteration marks → plain ASCII.
+_DIACRITICAL_MAP = str.maketrans(
+    {"ṭ": "t", "ṣ": "s", "ḥ": "h", "ḍ": "d", "ẓ": "z", "ʕ": "", "ġ": "g", "ḫ": "kh"}
+)
+_ENG_NON_CONSONANTS_RE = re.compile(r"[^bcdfghjklmnpqrstvwxyz]+")
+_IPA_PARENS_RE = re.compile(r"\([^)]*\)")
+_IPA_VOWEL_RE = re.compile(r"[aeiouɪɛæʌɒɔʊəɑɜɐɵøœɶɯɤɨʉyˈˌː\.ʔ̃]")
+_IPA_BRACKETS_DELETE = str.maketrans(dict.fromkeys("/[],"))
+
+_CONSONANT_CLASSES: dict[str, str] = {}
+for _label, _members in (
+    ("labial", "pbfv"),
+    ("dental", "tdszθðʃʒ"),
+    ("velar", "kg"),
+    ("nasal", "mn"),
+    ("liquid", "lr"),
+    ("glottal", "hw"),
+):
+    for _ch in _members:
+        _CONSONANT_CLASSES.setdefault(_ch, _label)
+
+
+# ---------------------------------------------------------------------------
+# Arabic
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_arabic(text: str) -> str:
+    """Canonical Arabic normalizer for roots and lookup keys.
+
+    Strips diacritics and tatweel, folds hamza carriers onto their bare
+    letters, trims whitespace and drops a leading definite article ال when at
+    least two letters remain.  Eye 1 writes ``arabic_root`` with this, and Eye 2
+    uses it to key glossary/profile lookups, so both sides always agree.
+    """
+    if not text:
+        return text
+    text = _ARABIC_DIACRITICS_RE.sub("", text)
+    text = text.translate(_HAMZA_TR).strip()
+    if text.startswith("ال") and len(text) >= 4:
+        text = text[2:]
+    return text
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_arabic_root(root: str) -> str:
+    """Memoized LV1 ``normalize_arabic_root`` (letters only, hamza/ta-marbuta folded)."""
+    return _lv1_normalize_arabic_root(root)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def arabic_consonant_skeleton(text: str) -> str:
+    """Arabic root → consonant skeleton (weak letters removed), in Arabic script."""
+    return normalize_arabic_root(text).translate(_ARABIC_WEAK_DELETE)
+
+
+# ---------------------------------------------------------------------------
+# Latin-script / English
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=CACHE_SIZE)
+def strip_diacriticals(text: str) -> str:
+    """Map scholarly transliteration marks (ṭ ṣ ḥ …) to plain ASCII."""
+    return text.translate(_DIACRITICAL_MAP)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def english_consonant_skeleton(word: str) -> str:
+    """Lower-case orthographic consonant skeleton of a Latin-script word."""
+    return _ENG_NON_CONSONANTS_RE.sub("", word.lower())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def english_ipa_skeleton(ipa: str) -> str:
+    """IPA transcription → consonant skeleton (vowels, stress, brackets removed)."""
+    collapsed = _IPA_PARENS_RE.sub("", str(ipa or "").strip().lower())
+    collapsed = collapsed.translate(_IPA_BRACKETS_DELETE)
+    return _IPA_VOWEL_RE.sub("", collapsed).strip()
+
+
+@lru_cache(maxsize=1024)
+def consonant_class(ch: str) -> str:
+    """Broad articulatory class of a consonant, or the character itself if unclassed."""
+    return _CONSONANT_CLASSES.get(ch, ch)
+
+
+# ---------------------------------------------------------------------------
+# Whole-list variants
+# ---------------------------------------------------------------------------
+
+def _map_distinct(fn: Callable[[str], str], items: Iterable[str]) -> list[str]:
+    """Apply *fn* once per distinct item and return results in input order."""
+    items = list(items)
+    done = {item: fn(item) for item in dict.fromkeys(items)}
+    return [done[item] for item in items]
+
+
+def normalize_arabic_many(texts: Iterable[str]) -> list[str]:
+    return _map_distinct(normalize_arabic, texts)
+
+
+def arabic_consonant_skeletons(texts: Iterable[str]) -> list[str]:
+    return _map_distinct(arabic_consonant_skeleton, texts)
+
+
+def english_consonant_skeletons(words: Iterable[str]) -> list[str]:
+    return _map_distinct(english_consonant_skeleton, words)
+
+
+def english_ipa_skeletons(ipas: Iterable[str]) -> list[str]:
+    return _map_distinct(english_ipa_skeleton, ipas)
+
+
+# ---------------------------------------------------------------------------
+# Cache management
+# ---------------------------------------------------------------------------
+
+_CACHED = (
+    normalize_arabic,
+    normalize_arabic_root,
+    arabic_consonant_skeleton,
+    strip_diacriticals,
+    english_consonant_skeleton,
+    english_ipa_skeleton,
+    consonant_class,
+)
+
+
+def cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss/size counters for every memoized primitive."""
+    stats: dict[str, dict[str, int]] = {}
+    for fn in _CACHED:
+        info = fn.cache_info()
+        stats[fn.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize or 0,
+        }
+    return stats
+
+
+def clear_caches() -> None:
+    for fn in _CACHED:
+        fn.cache_clear()
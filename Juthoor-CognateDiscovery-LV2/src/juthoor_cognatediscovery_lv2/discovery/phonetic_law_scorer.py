@@ -38,6 +38,15 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+from .affix_trie import AffixTrie
+from .normalization import (
+    _DIACRITICAL_MAP,
+    arabic_consonant_skeleton,
+    consonant_class,
+    english_consonant_skeleton,
+    strip_diacriticals,
+)
+
 # Try importing LV1 sound laws; fall back to inline copies if unavailable
 try:
     from juthoor_arabicgenome_lv1.factory.sound_laws import (
@@ -436,12 +445,6 @@ def get_language_equivalents(lang: str) -> dict[str, tuple[str, ...]]:
     return LATIN_EQUIVALENTS
 
 
-_DIACRITICAL_MAP = str.maketrans(
-    {"ṭ": "t", "ṣ": "s", "ḥ": "h", "ḍ": "d", "ẓ": "z", "ʕ": "", "ġ": "g", "ḫ": "kh"}
-)
-_ENG_CONSONANTS_RE = re.compile(r"[bcdfghjklmnpqrstvwxyz]")
-_ARABIC_WEAK = set("اويى")
-
 # ---------------------------------------------------------------------------
 # Position weights (LV1 H8 — positional semantics)
 # Default fallback if LV1 positional profile data is unavailable.
@@ -555,6 +558,7 @@ def _load_position_weight_profiles() -> dict[str, dict[int, float]]:
     return weights
 
 
+@lru_cache(maxsize=1024)
 def _position_weight_for(letter: str, position: int) -> float:
     profile_weights = _load_position_weight_profiles()
     if letter:
@@ -626,19 +630,15 @@ _KNOWN_SUFFIXES: tuple[str, ...] = (
     "ise", "ify", "ous", "ive", "ful", "age", "ure", "dom", "ify",
     "gen", "less", "al", "er", "or",
 )
+_KNOWN_PREFIX_TRIE = AffixTrie(_KNOWN_PREFIXES)
+_KNOWN_SUFFIX_TRIE = AffixTrie(_KNOWN_SUFFIXES, suffix=True)
 
 
-def _strip_diacriticals(text: str) -> str:
-    return text.translate(_DIACRITICAL_MAP)
-
-
-def _english_consonant_skeleton(word: str) -> str:
-    return "".join(_ENG_CONSONANTS_RE.findall(word.lower()))
-
-
-def _arabic_consonant_skeleton(text: str) -> str:
-    norm = normalize_arabic_root(text)
-    return "".join(ch for ch in norm if ch not in _ARABIC_WEAK)
+# Memoized primitives live in normalization.py; the private names are kept
+# because scripts and sibling modules import them from here.
+_strip_diacriticals = strip_diacriticals
+_english_consonant_skeleton = english_consonant_skeleton
+_arabic_consonant_skeleton = arabic_consonant_skeleton
 
 
 def _morpheme_decompose(word: str) -> tuple[str, str, str]:
@@ -652,19 +652,15 @@ def _morpheme_decompose(word: str) -> tuple[str, str, str]:
     suffix = ""
     stem = w
 
-    # Check prefix (longest first)
-    for p in _KNOWN_PREFIXES:
-        if w.startswith(p) and len(w) > len(p) + 2:
-            prefix = p
-            stem = w[len(p):]
-            break
+    # Check prefix (table order), keeping at least 3 stem characters
+    hit = _KNOWN_PREFIX_TRIE.strip_first(w, 3)
+    if hit:
+        prefix, stem = hit
 
-    # Check suffix on remaining stem (longest first)
-    for s in _KNOWN_SUFFIXES:
-        if stem.endswith(s) and len(stem) > len(s) + 1:
-            suffix = s
-            stem = stem[: -len(s)]
-            break
+    # Check suffix on remaining stem (table order), keeping at least 2 characters
+    hit = _KNOWN_SUFFIX_TRIE.strip_first(stem, 2)
+    if hit:
+        suffix, stem = hit
 
     return prefix, stem, suffix
 
@@ -698,20 +694,8 @@ def _consonant_class_diversity(arabic_skel: str, english_skel: str) -> int:
     return len(shared)
 
 
-def _consonant_class(ch: str) -> str:
-    """Return a broad consonant class for partial-match credit (0.5 score)."""
-    _CLASSES = [
-        frozenset("pbfv"),          # labials
-        frozenset("tdszθðʃʒ"),      # dentals / sibilants
-        frozenset("kg"),            # velars
-        frozenset("mn"),            # nasals
-        frozenset("lr"),            # liquids
-        frozenset("hw"),            # glottals / glides
-    ]
-    for cls in _CLASSES:
-        if ch in cls:
-            return str(id(cls))
-    return ch  # unique class — no cross-class credit
+# Broad consonant class for partial-match credit (0.5 score).
+_consonant_class = consonant_class
 
 
 def _correspondence_ratio(arabic_letter: str, latin_char: str) -> float:
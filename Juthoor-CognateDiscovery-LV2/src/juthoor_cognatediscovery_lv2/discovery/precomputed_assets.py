@@ -12,6 +12,8 @@ try:
 except ImportError:
     from .phonetic_law_scorer import normalize_arabic_root, project_root_by_target  # type: ignore[attr-defined]
 
+from .normalization import english_ipa_skeleton
+
 
 _CONTENT_POS = {
     "n",
@@ -47,8 +49,6 @@ _FUNCTION_POS = {
     "suffix",
 }
 _ASCII_LETTER_RE = re.compile(r"[a-z]+")
-_PARENS_RE = re.compile(r"\([^)]*\)")
-_IPA_VOWEL_RE = re.compile(r"[aeiouɪɛæʌɒɔʊəɑɜɐɵøœɶɯɤɨʉyˈˌː\.ʔ̃]")
 _NON_ALPHA_RE = re.compile(r"[^a-z]+")
 _HISTORICAL_PATTERNS = (
     re.compile(r"أصل الكلمة كان يعني\s*[\"“”'()]?\s*([^\"”'\n\.]+)"),
@@ -103,12 +103,6 @@ def _is_function_pos(pos_values: set[str]) -> bool:
     return bool(pos_values & _FUNCTION_POS)
 
 
-def english_ipa_skeleton(ipa: str) -> str:
-    collapsed = _PARENS_RE.sub("", str(ipa or "").strip().lower())
-    collapsed = collapsed.replace("/", "").replace("[", "").replace("]", "").replace(",", "")
-    return _IPA_VOWEL_RE.sub("", collapsed).strip()
-
-
 def english_orth_skeleton(word: str) -> str:
     return "".join(ch for ch in str(word or "").strip().lower() if ch in "bcdfghjklmnpqrstvwxyz")
 
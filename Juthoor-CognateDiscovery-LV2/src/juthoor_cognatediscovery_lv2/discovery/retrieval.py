@@ -5,6 +5,8 @@ Handles embedding, indexing, and searching.
 from __future__ import annotations
 
 import hashlib
+import sys
+from functools import partial
 import numpy as np
 from pathlib import Path
 from typing import Any
@@ -12,8 +14,13 @@ from typing import Any
 from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import (
     BgeM3Config, BgeM3Embedder, ByT5Config, ByT5Embedder, GeminiConfig, GeminiEmbedder
 )
-from juthoor_cognatediscovery_lv2.lv3.discovery.index import FaissIndex, build_flat_ip
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import EmbeddingServiceClient
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import EmbeddingStore, namespace_name
+from juthoor_cognatediscovery_lv2.lv3.discovery.index import (
+    FaissIndex, IndexSpec, build_flat_ip, build_index, set_search_params, with_fallback
+)
 from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow, read_jsonl_rows, write_jsonl
+from juthoor_cognatediscovery_lv2.lv3.discovery.vector_store import load_vectors, save_vectors
 from .corpora import CorpusSpec
 
 
@@ -51,13 +58,29 @@ def _rows_signature(rows: list[LexemeRow]) -> str:
     return hashlib.sha1(joined.encode("utf-8")).hexdigest()[:12]
 
 
-def _corpus_cache_key(spec: CorpusSpec, repo_root: Path, rows: list[LexemeRow] | None = None) -> str:
+def config_namespace(config: Any) -> str:
+    """Embedding-store namespace of a model config ("" for none).
+
+    ``config`` is a config dataclass or the fingerprint dict a running
+    embedding service reports; both map to the same namespace for the same
+    vector-relevant settings.
+    """
+    if config is None:
+        return ""
+    model_id = config["model_id"] if isinstance(config, dict) else config.model_id
+    return namespace_name(model_id, config)
+
+
+def _corpus_cache_key(spec: CorpusSpec, repo_root: Path, rows: list[LexemeRow] | None = None,
+                      config: Any = None) -> str:
     resolved = resolve_corpus_path(spec, repo_root)
     stem = resolved.stem or "corpus"
     safe_stem = "".join(ch if ch.isalnum() or ch in {"-", "_"} else "_" for ch in stem)
     digest_source = str(resolved)
     if rows is not None:
         digest_source = f"{digest_source}|n={len(rows)}|sig={_rows_signature(rows)}"
+    if config is not None:
+        digest_source = f"{digest_source}|cfg={config_namespace(config)}"
     digest = hashlib.sha1(digest_source.encode("utf-8")).hexdigest()[:12]
     return f"{safe_stem}_{digest}"
 
@@ -71,9 +94,17 @@ def get_cache_paths(
     model: str,
     spec: CorpusSpec,
     rows: list[LexemeRow] | None = None,
+    config: Any = None,
 ) -> tuple[Path, Path, Path, Path]:
+    """Snapshot and index paths of one corpus.
+
+    ``config`` is the embedder config the vectors come from (see
+    :func:`snapshot_config`); vectors embedded with different vector-relevant
+    settings (model, pooling, quantization, vector version) never share a
+    snapshot or an index.
+    """
     base = repo_root / "outputs"
-    corpus_key = _corpus_cache_key(spec, repo_root, rows)
+    corpus_key = _corpus_cache_key(spec, repo_root, rows, config)
     embeddings_dir = base / "embeddings" / model / spec.lang / (spec.stage or "unknown") / corpus_key
     vectors_path = embeddings_dir / "vectors.npy"
     rows_path = embeddings_dir / "rows.jsonl"
@@ -83,6 +114,49 @@ def get_cache_paths(
     meta_path = indexes_dir / "meta.json"
     return vectors_path, rows_path, index_path, meta_path
 
+def get_store_root(repo_root: Path) -> Path:
+    """Root of the shared, content-addressed embedding store."""
+    return repo_root / "outputs" / "embeddings" / "_store"
+
+
+def snapshot_config(
+    model: str,
+    backend: str = "local",
+    *,
+    semantic_cfg: BgeM3Config | None = None,
+    form_cfg: ByT5Config | None = None,
+) -> Any:
+    """The embedder config :func:`embed_corpus` uses for ``model`` / ``backend``.
+
+    Pass it as ``config`` to :func:`build_or_load_index` so the index is keyed
+    like the vectors it is built from.
+    """
+    if backend == "api":
+        task = "SEMANTIC_SIMILARITY" if model == "semantic" else "RETRIEVAL_DOCUMENT"
+        return GeminiConfig(task_type=task, dimensions=1024)
+    if model == "semantic":
+        return semantic_cfg or BgeM3Config()
+    if model == "form":
+        return form_cfg or ByT5Config()
+    raise ValueError(f"Unknown model {model!r}.")
+
+
+def corpus_texts(rows: list[LexemeRow], model: str) -> list[str]:
+    """Field-aware text selection: the string each row is embedded as."""
+    texts: list[str] = []
+    for r in rows:
+        if model == "semantic":
+            # Priority: meaning_text -> gloss_plain -> lemma
+            t = r.data.get("meaning_text") or r.data.get("gloss_plain") or r.lemma
+        else:
+            # Priority: form_text -> ipa -> translit -> lemma
+            t = r.data.get("form_text") or r.data.get("ipa") or r.data.get("translit") or r.lemma
+
+        t = " ".join(str(t or "").split()).strip()
+        texts.append(t if t else r.lexeme_id)
+    return texts
+
+
 def embed_corpus(
     *,
     repo_root: Path,
@@ -94,44 +168,88 @@ def embed_corpus(
     form_cfg: ByT5Config | None = None,
     rebuild_cache: bool = False,
     backend: str = "local",
+    use_store: bool = True,
+    vector_format: str = "float32",
+    mmap: bool = False,
 ):
+    """Embed a corpus, reusing cached vectors wherever possible.
+
+    The per-corpus ``vectors.npy`` snapshot is returned as-is when its row
+    signature and embedder config (:func:`snapshot_config`) still match. Otherwise vectors come from the shared
+    EmbeddingStore, keyed by (model, config, normalized text): only texts
+    never embedded with this model/config are sent to the embedder, and
+    identical texts in other corpora are reused. ``rebuild_cache`` only
+    bypasses the snapshot; pass ``use_store=False`` to re-embed everything.
+
+    ``vector_format`` ("float32", "float16" or "int8") sets how a new snapshot
+    is written; existing snapshots are read in whatever format they were
+    written. With ``mmap`` the snapshot is memory-mapped: float32 comes back as
+    an ``np.memmap``, reduced formats as a dequantize-on-read VectorMatrix.
+
+    ``backend="service"`` sends texts to a running embedding service (see
+    lv3.discovery.embedding_service). The service owns the shared store, so
+    the local store is skipped, and the service's own model config applies
+    (``semantic_cfg`` / ``form_cfg`` are ignored). The snapshot is keyed by
+    the config the service reports, so it never mixes with snapshots of
+    vectors embedded under another config.
+    """
     cache_model = f"api_{model}" if backend == "api" else model
-    v_path, r_path, _, _ = get_cache_paths(repo_root, cache_model, spec, rows)
+    config: Any = None
+    if backend == "service":
+        if model not in ("semantic", "form"):
+            raise ValueError(f"Unknown model {model!r}.")
+        use_store = False
+        client = EmbeddingServiceClient(model)
+        served = client.info()["models"].get(model)
+        if served is None:
+            raise RuntimeError(f"embedding service does not serve the {model} model")
+        config = served["config"]
+        make_embedder = lambda: client  # noqa: E731
+    else:
+        config = snapshot_config(model, backend, semantic_cfg=semantic_cfg, form_cfg=form_cfg)
+        if backend == "api":
+            make_embedder = partial(GeminiEmbedder, config=config)
+        elif model == "semantic":
+            make_embedder = partial(BgeM3Embedder, config=config)
+        else:
+            make_embedder = partial(ByT5Embedder, config=config, device=device)
 
+    v_path, r_path, _, _ = get_cache_paths(repo_root, cache_model, spec, rows, config)
     if not rebuild_cache and v_path.exists() and r_path.exists():
-        vecs = np.load(v_path)
+        vecs = load_vectors(v_path, mmap=mmap)
         cached_rows = read_jsonl_rows(r_path, limit=0)
         return vecs, cached_rows
 
-    # Field-aware text selection
-    texts: list[str] = []
-    for r in rows:
-        if model == "semantic":
-            # Priority: meaning_text -> gloss_plain -> lemma
-            t = r.data.get("meaning_text") or r.data.get("gloss_plain") or r.lemma
-        else:
-            # Priority: form_text -> ipa -> translit -> lemma
-            t = r.data.get("form_text") or r.data.get("ipa") or r.data.get("translit") or r.lemma
-        
-        t = " ".join(str(t or "").split()).strip()
-        texts.append(t if t else r.lexeme_id)
+    texts = corpus_texts(rows, model)
 
-    if backend == "api":
-        task = "SEMANTIC_SIMILARITY" if model == "semantic" else "RETRIEVAL_DOCUMENT"
-        embedder = GeminiEmbedder(config=GeminiConfig(task_type=task, dimensions=1024))
-        vecs = embedder.embed(texts)
-    elif model == "semantic":
-        embedder = BgeM3Embedder(config=semantic_cfg or BgeM3Config())
-        vecs = embedder.embed(texts)
-    elif model == "form":
-        embedder = ByT5Embedder(config=form_cfg or ByT5Config(), device=device)
-        vecs = embedder.embed(texts)
+    if use_store:
+        store = EmbeddingStore(get_store_root(repo_root), config.model_id, config)
+        embedder = None
+
+        # the Gemini client checkpoints each finished request into the store itself
+        chunk_size = 0 if backend == "api" else 4096
+        if backend == "api":
+            make_embedder = partial(make_embedder, store=store)
+
+        def embed_missing(batch: list[str]) -> np.ndarray:
+            nonlocal embedder
+            if embedder is None:
+                embedder = make_embedder()
+            return embedder.embed(batch)
+
+        vecs, n_embedded = store.get_or_embed(texts, embed_missing, chunk_size=chunk_size)
+        print(
+            f"[info] Embedding store: {n_embedded:,} new / {len(texts):,} texts "
+            f"({len(store):,} stored for {cache_model}).",
+            file=sys.stderr,
+        )
     else:
-        raise ValueError(f"Unknown model {model!r}.")
+        vecs = make_embedder().embed(texts)
 
-    v_path.parent.mkdir(parents=True, exist_ok=True)
-    np.save(v_path, vecs)
+    save_vectors(v_path, vecs, vector_format)
     write_jsonl(r_path, (r.data | {"_row_idx": r.row_idx} for r in rows))
+    if mmap or vector_format != "float32":
+        vecs = load_vectors(v_path, mmap=mmap)
     return vecs, rows
 
 def build_or_load_index(
@@ -142,17 +260,47 @@ def build_or_load_index(
     vectors: np.ndarray,
     rows: list[LexemeRow],
     rebuild_index: bool,
+    index_spec: IndexSpec | None = None,
+    config: Any = None,
 ):
+    """Build (or load the cached) FAISS index for a corpus.
+
+    ``config`` is the embedder config ``vectors`` came from (the
+    :func:`snapshot_config` passed to :func:`embed_corpus`), so indexes of
+    vectors from different configs are cached apart.
+
+    ``index_spec`` selects the index recipe (flat by default). Non-flat indexes
+    are cached next to the flat one under a recipe-specific file name, and the
+    recipe is recorded in the meta JSON. The spec's ``nprobe`` / ``ef_search``
+    knobs are applied to loaded indexes too, so they can change between runs.
+
+    A ``"numpy"`` spec (also the automatic fallback when faiss is missing)
+    searches ``vectors`` directly with NumpyFlatIndex; nothing is cached.
+    """
     cache_model = model # already prefixed if api
-    _, _, index_path, meta_path = get_cache_paths(repo_root, cache_model, spec, rows)
-    
+    _, _, index_path, meta_path = get_cache_paths(repo_root, cache_model, spec, rows, config)
+
+    index_spec = with_fallback(index_spec).resolve(int(vectors.shape[0]), int(vectors.shape[1]))
+    if index_spec.kind == "numpy":
+        return build_index(vectors, index_spec)[0]
+    if index_spec.kind != "flat":
+        slug = index_spec.slug()
+        index_path = index_path.with_name(f"index_{slug}.faiss")
+        meta_path = meta_path.with_name(f"meta_{slug}.json")
+
     idx_meta = FaissIndex(index_path=index_path, meta_path=meta_path, dim=int(vectors.shape[1]))
     if not rebuild_index and index_path.exists():
-        return idx_meta.load()
+        index = idx_meta.load()
+        if index_spec.kind != "flat":
+            set_search_params(index, nprobe=index_spec.nprobe, ef_search=index_spec.ef_search)
+        return index
 
-    index, dim = build_flat_ip(vectors)
+    if index_spec.kind == "flat":
+        index, dim = build_flat_ip(vectors)
+    else:
+        index, dim, index_spec = build_index(vectors, index_spec)
     idx_meta = FaissIndex(index_path=index_path, meta_path=meta_path, dim=dim)
-    idx_meta.save(index)
+    idx_meta.save(index, index_spec)
     return index
 
 def search_index(index, query_vectors: np.ndarray, topk: int):
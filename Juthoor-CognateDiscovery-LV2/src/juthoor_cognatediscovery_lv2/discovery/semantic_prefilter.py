@@ -0,0 +1,135 @@
+"""Semantic candidate retrieval from cached BGE-M3 vectors.
+
+A two-tower prefilter: source and target glosses are embedded independently
+(the same BGE-M3 tower for both), and each source entry's semantic top-k
+targets are found by inner-product search. Vectors are read from the shared
+embedding store (``outputs/embeddings/_store``) that ``embed_corpus`` and the
+embedding service fill, so a corpus embedded once is never embedded again.
+
+By default only cached vectors are used: texts the store has never seen get no
+semantic candidates, and nothing is embedded. Pass ``embed`` (any
+``texts -> vectors`` callable, e.g. ``get_embedder("semantic").embed``) to
+embed the missing texts and write them back to the store.
+
+Texts are chosen like ``retrieval.corpus_texts(rows, "semantic")``, so they
+hit the same store keys; entries with neither ``meaning_text`` nor
+``gloss_plain`` fall back to ``gloss`` / ``short_gloss`` before the lemma.
+
+Usage:
+    prefilter = SemanticPrefilter.from_repo(LV2_ROOT, k=50)
+    hits = prefilter.candidates(source_entries, target_entries)
+    hits[i]   # [(target_idx, cosine), ...] best first
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from ..lv3.discovery.embedding_store import EmbeddingStore
+from ..lv3.discovery.embeddings import BgeM3Config
+from ..lv3.discovery.index import IndexSpec, build_index, with_fallback
+from ..lv3.discovery.jsonl import LexemeRow
+from .retrieval import corpus_texts, get_store_root
+
+
+def semantic_texts(entries: Sequence[dict[str, Any]]) -> list[str]:
+    """The string each entry is (or would be) embedded as by the semantic model.
+
+    Priority: meaning_text -> gloss_plain -> gloss -> short_gloss -> lemma.
+    """
+    texts = corpus_texts([LexemeRow(i, e) for i, e in enumerate(entries)], "semantic")
+    for i, entry in enumerate(entries):
+        if entry.get("meaning_text") or entry.get("gloss_plain"):
+            continue
+        gloss = " ".join(str(entry.get("gloss") or entry.get("short_gloss") or "").split())
+        if gloss:
+            texts[i] = gloss
+    return texts
+
+
+class SemanticPrefilter:
+    """Semantic top-k per source entry over store-cached vectors."""
+
+    def __init__(
+        self,
+        store: EmbeddingStore,
+        *,
+        k: int = 50,
+        min_score: float = 0.0,
+        index_spec: str | IndexSpec = "flat",
+        embed: Callable[[list[str]], np.ndarray] | None = None,
+    ) -> None:
+        if k <= 0:
+            raise ValueError("k must be > 0")
+        self.store = store
+        self.k = k
+        self.min_score = min_score
+        self.index_spec = IndexSpec.from_string(index_spec) if isinstance(index_spec, str) else index_spec
+        self.embed = embed
+        self.coverage: dict[str, Any] = {}
+
+    @classmethod
+    def from_repo(cls, repo_root: Path, *, config: BgeM3Config | None = None, **kwargs) -> "SemanticPrefilter":
+        """Prefilter over the repo's shared store, in the BGE-M3 namespace ``embed_corpus`` uses."""
+        config = config or BgeM3Config()
+        return cls(EmbeddingStore(get_store_root(repo_root), config.model_id, config), **kwargs)
+
+    def vectors(self, texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """``(matrix, row_ids)``: vectors for the texts that have one, and their positions."""
+        if self.embed is not None:
+            todo = self.store.missing(texts)
+            if todo:
+                self.store.put(todo, self.embed(todo))
+        rows = np.asarray([i for i, t in enumerate(texts) if t in self.store], dtype="int64")
+        if not len(rows):
+            return np.zeros((0, self.store.dim or 0), dtype="float32"), rows
+        mat = self.store.get_matrix([texts[i] for i in rows])
+        mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-10
+        return mat, rows
+
+    def candidates(
+        self,
+        source_entries: Sequence[dict[str, Any]],
+        target_entries: Sequence[dict[str, Any]],
+    ) -> dict[int, list[tuple[int, float]]]:
+        """Source index -> ``[(target index, cosine), ...]``, best first.
+
+        Sources without a vector map to an empty list. ``self.coverage``
+        records how many texts on each side were cached.
+        """
+        src_texts = semantic_texts(source_entries)
+        tgt_texts = semantic_texts(target_entries)
+        src_mat, src_rows = self.vectors(src_texts)
+        tgt_mat, tgt_rows = self.vectors(tgt_texts)
+        self.coverage = {
+            "source": (len(src_rows), len(src_texts)),
+            "target": (len(tgt_rows), len(tgt_texts)),
+        }
+        out: dict[int, list[tuple[int, float]]] = {i: [] for i in range(len(src_texts))}
+        if not len(src_rows) or not len(tgt_rows):
+            return out
+
+        index, _dim, _spec = build_index(tgt_mat, with_fallback(self.index_spec))
+        scores, ids = index.search(src_mat, min(self.k, len(tgt_rows)))
+        for i, score_row, id_row in zip(src_rows, scores, ids):
+            out[int(i)] = [
+                (int(tgt_rows[j]), float(s))
+                for s, j in zip(score_row, id_row)
+                if j >= 0 and s >= self.min_score
+            ]
+        return out
+
+    @property
+    def low_coverage(self) -> bool:
+        """True when fewer than half the texts on either side were cached."""
+        return any(hit < total / 2 for hit, total in self.coverage.values())
+
+    def report(self) -> str:
+        (s_hit, s_all), (t_hit, t_all) = self.coverage["source"], self.coverage["target"]
+        return (
+            f"cached vectors: {s_hit:,}/{s_all:,} source, {t_hit:,}/{t_all:,} target "
+            f"({len(self.store):,} in store)"
+        )
+
@@ -0,0 +1,212 @@
+"""Edit-distance and prefix retrieval over consonant skeletons.
+
+The direct-skeleton, metathesis and dialect methods all ask the same question:
+*which target skeletons lie within a small edit distance of one of these
+projected variants?*  Scanning the whole target table answers it in linear
+time per query.  :class:`SkeletonIndex` answers it in roughly constant time
+with a symmetric-deletion index (the SymSpell scheme): every skeleton is
+stored under each string obtainable by deleting up to ``k`` characters, and a
+query probes the same deletion neighbourhood of itself.  Two strings within
+``k`` edits always share at least one such key, so the probe is complete; the
+few false candidates are removed by a bounded distance check.
+
+Distances are optimal-string-alignment distances by default, so an adjacent
+swap (metathesis, ``krm`` ↔ ``rkm``) costs one edit like a substitution.  Pass
+``transpositions=False`` for plain Levenshtein.
+
+Skeletons are also kept in sorted order, which gives prefix retrieval
+(:meth:`SkeletonIndex.with_prefix`) by binary search.
+
+Usage:
+    index = SkeletonIndex(max_distance=1)
+    for idx, entry in enumerate(target_entries):
+        for skel in entry["all_skeletons"]:
+            index.add(skel, idx)
+    index.search(["kmr", "qmr"])     # {target_idx: best distance}
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Iterable
+
+
+def _deletion_keys(skeleton: str, k: int) -> set[str]:
+    """*skeleton* plus every string obtained by deleting up to *k* characters."""
+    keys = {skeleton}
+    frontier = {skeleton}
+    for _ in range(k):
+        nxt: set[str] = set()
+        for s in frontier:
+            for i in range(len(s)):
+                nxt.add(s[:i] + s[i + 1:])
+        nxt -= keys
+        keys |= nxt
+        frontier = nxt
+    return keys
+
+
+def bounded_edit_distance(
+    a: str,
+    b: str,
+    max_distance: int,
+    *,
+    transpositions: bool = True,
+) -> int:
+    """Edit distance between *a* and *b*, or ``max_distance + 1`` if it is larger.
+
+    Uses optimal-string-alignment distance (adjacent transposition = 1) unless
+    ``transpositions`` is False.  Stops as soon as a whole DP row exceeds the bound.
+    """
+    if a == b:
+        return 0
+    la, lb = len(a), len(b)
+    if abs(la - lb) > max_distance:
+        return max_distance + 1
+    if la == 0 or lb == 0:
+        return max(la, lb)
+
+    over = max_distance + 1
+    prev2: list[int] = []
+    prev = list(range(lb + 1))
+    for i in range(1, la + 1):
+        cur = [i] + [0] * lb
+        ca = a[i - 1]
+        row_min = i
+        for j in range(1, lb + 1):
+            cb = b[j - 1]
+            cost = 0 if ca == cb else 1
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (
+                transpositions and i > 1 and j > 1
+                and ca == b[j - 2] and a[i - 2] == cb
+            ):
+                d = min(d, prev2[j - 2] + 1)
+            cur[j] = d
+            if d < row_min:
+                row_min = d
+        if row_min >= over:
+            return over
+        prev2, prev = prev, cur
+    return min(prev[lb], over)
+
+
+class SkeletonIndex:
+    """Symmetric-deletion index mapping skeletons to caller-defined item ids.
+
+    Parameters
+    ----------
+    max_distance:
+        Largest edit distance the index can answer.  Each skeleton of length
+        ``L`` is stored under O(L^k) deletion keys, so keep this small (1–2).
+    transpositions:
+        Count an adjacent swap as one edit (OSA distance).
+    """
+
+    __slots__ = (
+        "max_distance", "transpositions",
+        "_ids", "_skeletons", "_items", "_deletes", "_sorted",
+    )
+
+    def __init__(self, max_distance: int = 1, *, transpositions: bool = True) -> None:
+        if max_distance < 0:
+            raise ValueError("max_distance must be >= 0")
+        self.max_distance = max_distance
+        self.transpositions = transpositions
+        self._ids: dict[str, int] = {}
+        self._skeletons: list[str] = []
+        self._items: list[list[int]] = []
+        self._deletes: dict[str, list[int]] = {}
+        self._sorted: list[str] | None = None
+
+    @classmethod
+    def build(
+        cls,
+        skeletons: Iterable[tuple[str, int]],
+        max_distance: int = 1,
+        *,
+        transpositions: bool = True,
+    ) -> "SkeletonIndex":
+        """Build an index from ``(skeleton, item)`` pairs."""
+        index = cls(max_distance, transpositions=transpositions)
+        for skeleton, item in skeletons:
+            index.add(skeleton, item)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._skeletons)
+
+    def __contains__(self, skeleton: object) -> bool:
+        return skeleton in self._ids
+
+    def __repr__(self) -> str:
+        return (
+            f"SkeletonIndex(k={self.max_distance}, {len(self._skeletons)} skeletons, "
+            f"{len(self._deletes)} keys)"
+        )
+
+    @property
+    def n_keys(self) -> int:
+        """Number of deletion keys stored (the index's memory driver)."""
+        return len(self._deletes)
+
+    def add(self, skeleton: str, item: int = 0) -> None:
+        """Register *skeleton* as pointing at *item* (duplicates are ignored)."""
+        if not skeleton:
+            return
+        sid = self._ids.get(skeleton)
+        if sid is None:
+            sid = len(self._skeletons)
+            self._ids[skeleton] = sid
+            self._skeletons.append(skeleton)
+            self._items.append([item])
+            for key in _deletion_keys(skeleton, self.max_distance):
+                self._deletes.setdefault(key, []).append(sid)
+            self._sorted = None
+        elif item not in self._items[sid]:
+            self._items[sid].append(item)
+
+    def items(self, skeleton: str) -> list[int]:
+        """Item ids registered under *skeleton* (empty if unknown)."""
+        sid = self._ids.get(skeleton)
+        return list(self._items[sid]) if sid is not None else []
+
+    def lookup(self, query: str, k: int | None = None) -> dict[str, int]:
+        """All indexed skeletons within *k* edits of *query* → their distance."""
+        k = self.max_distance if k is None else k
+        if k > self.max_distance:
+            raise ValueError(f"index was built for k <= {self.max_distance}, got k={k}")
+        if not query:
+            return {}
+        seen: set[int] = set()
+        found: dict[str, int] = {}
+        for key in _deletion_keys(query, k):
+            for sid in self._deletes.get(key, ()):
+                if sid in seen:
+                    continue
+                seen.add(sid)
+                skel = self._skeletons[sid]
+                d = bounded_edit_distance(query, skel, k, transpositions=self.transpositions)
+                if d <= k:
+                    found[skel] = d
+        return found
+
+    def search(self, queries: Iterable[str], k: int | None = None) -> dict[int, int]:
+        """Items reachable from any query skeleton → best (smallest) distance."""
+        best: dict[int, int] = {}
+        for query in dict.fromkeys(queries):
+            for skel, d in self.lookup(query, k).items():
+                for item in self._items[self._ids[skel]]:
+                    if d < best.get(item, d + 1):
+                        best[item] = d
+        return best
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """Indexed skeletons starting with *prefix*, in sorted order."""
+        if self._sorted is None:
+            self._sorted = sorted(self._skeletons)
+        out: list[str] = []
+        for skel in self._sorted[bisect_left(self._sorted, prefix):]:
+            if not skel.startswith(prefix):
+                break
+            out.append(skel)
+        return out
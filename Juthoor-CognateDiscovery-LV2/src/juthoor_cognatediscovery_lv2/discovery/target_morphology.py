@@ -14,8 +14,11 @@ from __future__ import annotations
 
 import re
 import unicodedata
-from typing import Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Iterator
 
+from juthoor_cognatediscovery_lv2.discovery.affix_trie import AffixTrie
 from juthoor_cognatediscovery_lv2.discovery.artifact_paths import layer1_annotation_path
 
 
@@ -365,6 +368,32 @@ CY_VERB_SUFFIXES: tuple[str, ...] = (
 )
 
 
+# ---------------------------------------------------------------------------
+# Compiled affix tries (built once at import; see affix_trie.py)
+# ---------------------------------------------------------------------------
+
+_LATIN_SUFFIX_TRIE = AffixTrie(LATIN_SUFFIXES, suffix=True)
+_LATIN_PREFIX_TRIE = AffixTrie(LATIN_PREFIXES)
+_GREEK_SUFFIX_TRIE = AffixTrie(GREEK_SUFFIXES, suffix=True)
+_GREEK_PREFIX_TRIE = AffixTrie(GREEK_PREFIXES)
+_OE_SUFFIX_TRIE = AffixTrie(OE_SUFFIXES, suffix=True)
+_OE_PREFIX_TRIE = AffixTrie(OE_PREFIXES)
+_GOTHIC_SUFFIX_TRIE = AffixTrie(GOTHIC_SUFFIXES, suffix=True)
+_GOTHIC_PREFIX_TRIE = AffixTrie(GOTHIC_PREFIXES)
+_ON_PREFIX_TRIE = AffixTrie(ON_PREFIXES)
+_ON_NOUN_SUFFIX_TRIE = AffixTrie(ON_NOUN_SUFFIXES, suffix=True)
+_ON_VERB_SUFFIX_TRIE = AffixTrie(ON_VERB_SUFFIXES, suffix=True)
+_ON_ALL_SUFFIX_TRIE = AffixTrie(ON_NOUN_SUFFIXES + ON_VERB_SUFFIXES, suffix=True)
+_OI_PREFIX_TRIE = AffixTrie(OI_PREFIXES)
+_OI_NOUN_SUFFIX_TRIE = AffixTrie(OI_NOUN_SUFFIXES, suffix=True)
+_OI_VERB_SUFFIX_TRIE = AffixTrie(OI_VERB_SUFFIXES, suffix=True)
+_OI_ALL_SUFFIX_TRIE = AffixTrie(OI_NOUN_SUFFIXES + OI_VERB_SUFFIXES, suffix=True)
+_CY_PREFIX_TRIE = AffixTrie(CY_PREFIXES)
+_CY_NOUN_SUFFIX_TRIE = AffixTrie(CY_NOUN_SUFFIXES, suffix=True)
+_CY_VERB_SUFFIX_TRIE = AffixTrie(CY_VERB_SUFFIXES, suffix=True)
+_CY_ALL_SUFFIX_TRIE = AffixTrie(CY_NOUN_SUFFIXES + CY_VERB_SUFFIXES, suffix=True)
+
+
 # ---------------------------------------------------------------------------
 # Layer 1 annotation cache (lazy-loaded from llm_annotations/layer1_morphology.jsonl)
 # ---------------------------------------------------------------------------
@@ -396,41 +425,24 @@ def _load_layer1_annotations() -> dict[tuple[str, str], dict]:
 # Helper: strip one suffix from a word (returns None if no valid strip)
 # ---------------------------------------------------------------------------
 
-def _strip_suffix(word: str, suffixes: tuple[str, ...]) -> str | None:
-    """Strip the first (longest) matching suffix. Returns None if none match."""
-    for suf in suffixes:
-        if word.endswith(suf):
-            stem = word[: -len(suf)]
-            if len(stem) >= _MIN_STEM:
-                return stem
-    return None
+def _strip_suffix(word: str, suffixes: AffixTrie) -> str | None:
+    """Strip the first matching suffix (table order). Returns None if none match."""
+    hit = suffixes.strip_first(word, _MIN_STEM)
+    return hit[1] if hit else None
 
 
-def _strip_all_suffixes(word: str, suffixes: tuple[str, ...]) -> list[str]:
+def _strip_all_suffixes(word: str, suffixes: AffixTrie) -> list[str]:
     """Return stems for ALL matching suffixes (greedy: each suffix tried once).
 
     This allows "dominus" to yield both "dom" (strip "inus") and "domin" (strip "us").
     Results are sorted longest-first.
     """
-    stems: list[str] = []
-    seen: set[str] = set()
-    for suf in suffixes:
-        if word.endswith(suf):
-            stem = word[: -len(suf)]
-            if len(stem) >= _MIN_STEM and stem not in seen:
-                seen.add(stem)
-                stems.append(stem)
-    stems.sort(key=len, reverse=True)
-    return stems
+    return suffixes.strip_all(word, _MIN_STEM)
 
 
-def _strip_prefix(word: str, prefixes: tuple[str, ...]) -> str | None:
-    for pre in prefixes:
-        if word.startswith(pre):
-            stem = word[len(pre):]
-            if len(stem) >= _MIN_STEM:
-                return stem
-    return None
+def _strip_prefix(word: str, prefixes: AffixTrie) -> str | None:
+    hit = prefixes.strip_first(word, _MIN_STEM)
+    return hit[1] if hit else None
 
 
 # ---------------------------------------------------------------------------
@@ -556,14 +568,14 @@ def _decompose_latin(word: str) -> list[str]:
             break
 
     # 2. Strip ALL matching suffixes (allows "dominus" → both "dom" and "domin")
-    for suffix_stem in _strip_all_suffixes(word, LATIN_SUFFIXES):
+    for suffix_stem in _strip_all_suffixes(word, _LATIN_SUFFIX_TRIE):
         stems.append(suffix_stem)
         # Remove epenthetic from suffix-stripped stem
         ep = _remove_latin_epenthetic(suffix_stem)
         if ep and len(ep) >= _MIN_STEM:
             stems.append(ep)
         # Also try stripping prefix from the suffix-stripped stem
-        pre_of_suf = _strip_prefix(suffix_stem, LATIN_PREFIXES)
+        pre_of_suf = _strip_prefix(suffix_stem, _LATIN_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
             ep2 = _remove_latin_epenthetic(pre_of_suf)
@@ -571,11 +583,11 @@ def _decompose_latin(word: str) -> list[str]:
                 stems.append(ep2)
 
     # 3. Strip prefix from original
-    prefix_stem = _strip_prefix(word, LATIN_PREFIXES)
+    prefix_stem = _strip_prefix(word, _LATIN_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
         # Then suffix from that
-        suf_of_pre = _strip_suffix(prefix_stem, LATIN_SUFFIXES)
+        suf_of_pre = _strip_suffix(prefix_stem, _LATIN_SUFFIX_TRIE)
         if suf_of_pre:
             stems.append(suf_of_pre)
             ep3 = _remove_latin_epenthetic(suf_of_pre)
@@ -601,19 +613,19 @@ def _decompose_greek(word: str) -> list[str]:
             break
 
     # 2. Strip inflectional suffix
-    suffix_stem = _strip_suffix(word, GREEK_SUFFIXES)
+    suffix_stem = _strip_suffix(word, _GREEK_SUFFIX_TRIE)
     if suffix_stem:
         stems.append(suffix_stem)
         # Strip prefix from that
-        pre_of_suf = _strip_prefix(suffix_stem, GREEK_PREFIXES)
+        pre_of_suf = _strip_prefix(suffix_stem, _GREEK_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 3. Strip prefix from original
-    prefix_stem = _strip_prefix(word, GREEK_PREFIXES)
+    prefix_stem = _strip_prefix(word, _GREEK_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
-        suf_of_pre = _strip_suffix(prefix_stem, GREEK_SUFFIXES)
+        suf_of_pre = _strip_suffix(prefix_stem, _GREEK_SUFFIX_TRIE)
         if suf_of_pre:
             stems.append(suf_of_pre)
 
@@ -629,18 +641,18 @@ def _decompose_old_english(word: str) -> list[str]:
     stems.extend(compound_parts)
 
     # 2. Strip suffix
-    suffix_stem = _strip_suffix(word, OE_SUFFIXES)
+    suffix_stem = _strip_suffix(word, _OE_SUFFIX_TRIE)
     if suffix_stem:
         stems.append(suffix_stem)
-        pre_of_suf = _strip_prefix(suffix_stem, OE_PREFIXES)
+        pre_of_suf = _strip_prefix(suffix_stem, _OE_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 3. Strip prefix
-    prefix_stem = _strip_prefix(word, OE_PREFIXES)
+    prefix_stem = _strip_prefix(word, _OE_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
-        suf_of_pre = _strip_suffix(prefix_stem, OE_SUFFIXES)
+        suf_of_pre = _strip_suffix(prefix_stem, _OE_SUFFIX_TRIE)
         if suf_of_pre:
             stems.append(suf_of_pre)
 
@@ -661,17 +673,17 @@ def _decompose_gothic(word: str) -> list[str]:
     stems: list[str] = []
 
     # 1. Strip all matching suffixes
-    for suffix_stem in _strip_all_suffixes(word, GOTHIC_SUFFIXES):
+    for suffix_stem in _strip_all_suffixes(word, _GOTHIC_SUFFIX_TRIE):
         stems.append(suffix_stem)
-        pre_of_suf = _strip_prefix(suffix_stem, GOTHIC_PREFIXES)
+        pre_of_suf = _strip_prefix(suffix_stem, _GOTHIC_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 2. Strip prefix from original
-    prefix_stem = _strip_prefix(word, GOTHIC_PREFIXES)
+    prefix_stem = _strip_prefix(word, _GOTHIC_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
-        suf_of_pre = _strip_suffix(prefix_stem, GOTHIC_SUFFIXES)
+        suf_of_pre = _strip_suffix(prefix_stem, _GOTHIC_SUFFIX_TRIE)
         if suf_of_pre:
             stems.append(suf_of_pre)
 
@@ -694,24 +706,24 @@ def _decompose_old_norse(word: str) -> list[str]:
     stems: list[str] = []
 
     # 1. Strip ALL matching noun/adjective suffixes
-    for suf_stem in _strip_all_suffixes(word, ON_NOUN_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _ON_NOUN_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, ON_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _ON_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 2. Strip verb suffixes
-    for suf_stem in _strip_all_suffixes(word, ON_VERB_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _ON_VERB_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, ON_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _ON_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 3. Strip prefix from original
-    prefix_stem = _strip_prefix(word, ON_PREFIXES)
+    prefix_stem = _strip_prefix(word, _ON_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
-        for suf_stem in _strip_all_suffixes(prefix_stem, ON_NOUN_SUFFIXES + ON_VERB_SUFFIXES):
+        for suf_stem in _strip_all_suffixes(prefix_stem, _ON_ALL_SUFFIX_TRIE):
             stems.append(suf_stem)
 
     stems.sort(key=len, reverse=True)
@@ -756,24 +768,24 @@ def _decompose_welsh(word: str) -> list[str]:
                 stems.append(candidate)
 
     # 2. Strip ALL matching noun/adjective suffixes
-    for suf_stem in _strip_all_suffixes(word, CY_NOUN_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _CY_NOUN_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, CY_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _CY_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 3. Strip verb suffixes
-    for suf_stem in _strip_all_suffixes(word, CY_VERB_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _CY_VERB_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, CY_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _CY_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 4. Strip prefix from original
-    prefix_stem = _strip_prefix(word, CY_PREFIXES)
+    prefix_stem = _strip_prefix(word, _CY_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
-        for suf_stem in _strip_all_suffixes(prefix_stem, CY_NOUN_SUFFIXES + CY_VERB_SUFFIXES):
+        for suf_stem in _strip_all_suffixes(prefix_stem, _CY_ALL_SUFFIX_TRIE):
             stems.append(suf_stem)
 
     stems.sort(key=len, reverse=True)
@@ -817,25 +829,25 @@ def _decompose_old_irish(word: str) -> list[str]:
             break
 
     # 3. Strip verb suffixes
-    for suf_stem in _strip_all_suffixes(word, OI_VERB_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _OI_VERB_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, OI_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _OI_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 4. Strip noun suffixes
-    for suf_stem in _strip_all_suffixes(word, OI_NOUN_SUFFIXES):
+    for suf_stem in _strip_all_suffixes(word, _OI_NOUN_SUFFIX_TRIE):
         stems.append(suf_stem)
-        pre_of_suf = _strip_prefix(suf_stem, OI_PREFIXES)
+        pre_of_suf = _strip_prefix(suf_stem, _OI_PREFIX_TRIE)
         if pre_of_suf:
             stems.append(pre_of_suf)
 
     # 5. Strip preverb prefix from original
-    prefix_stem = _strip_prefix(word, OI_PREFIXES)
+    prefix_stem = _strip_prefix(word, _OI_PREFIX_TRIE)
     if prefix_stem:
         stems.append(prefix_stem)
         # Try suffix stripping on the de-prefixed stem
-        for suf_stem in _strip_all_suffixes(prefix_stem, OI_NOUN_SUFFIXES + OI_VERB_SUFFIXES):
+        for suf_stem in _strip_all_suffixes(prefix_stem, _OI_ALL_SUFFIX_TRIE):
             stems.append(suf_stem)
 
     stems.sort(key=len, reverse=True)
@@ -983,14 +995,185 @@ UNIVERSAL_CORRESPONDENCES: dict[str, list[str]] = {
     "w": ["v", "b"],
 }
 
-_MAX_VARIANTS = 25
+_MAX_VARIANTS = 25          # beam width: variants kept per skeleton
+_MAX_EXPANSION_STEPS = 1    # rewrite depth (1 = one substitution at a time)
+_MAX_WORD_SKELETONS = 40    # suggested per-word budget (opt-in: max_skeletons)
+
+# Rule plausibility: how likely one rewrite of each family reflects a real
+# sound change rather than noise.  A variant's score is the product of the
+# plausibilities of the rewrites that produced it (the original scores 1.0),
+# and budgets keep the highest-scoring variants instead of the first ones.
+_RULE_PLAUSIBILITY: dict[str, float] = {
+    "double": 0.95,      # ll → l, ss → s, ...
+    "epenthetic": 0.9,   # mb → b, nd → d, ...
+    "language": 0.85,    # Grimm / Latin / Greek / Old Irish / Welsh shifts
+    "universal": 0.7,    # bilabial / dental / velar / sibilant interchange
+    "deletion": 0.5,     # universal guttural deletion (h → ∅)
+}
+
+
+@dataclass
+class VariantBudgetStats:
+    """Counters for the variant budgets; pass one in to have it filled.
+
+    Worker processes fill their own and the parent merges them with
+    :meth:`add`.
+    """
+
+    words: int = 0
+    truncated_words: int = 0
+    skeletons_kept: int = 0
+    variants_dropped: int = 0
+    signature_duplicates: int = 0
+
+    def add(self, other: "VariantBudgetStats") -> None:
+        self.words += other.words
+        self.truncated_words += other.truncated_words
+        self.skeletons_kept += other.skeletons_kept
+        self.variants_dropped += other.variants_dropped
+        self.signature_duplicates += other.signature_duplicates
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            "words": self.words,
+            "truncated_words": self.truncated_words,
+            "skeletons_kept": self.skeletons_kept,
+            "variants_dropped": self.variants_dropped,
+            "signature_duplicates": self.signature_duplicates,
+        }
+
+
+@lru_cache(maxsize=1 << 17)
+def _variant_signature(skeleton: str) -> tuple[frozenset[str], frozenset[str]]:
+    """Order-insensitive signature: (consonants present, consonants repeated).
+
+    This is what Eye 1's set-Jaccard and sorted-pair index see, but not its
+    scoring: ``ordered_overlap`` and skeleton lengths tell "ktg" from "gtk",
+    and reverse discovery looks skeletons up by exact string.  Collapsing
+    equal signatures (``signature_dedup=True``) therefore trades recall for
+    index size and stays opt-in.
+    """
+    present: set[str] = set()
+    repeated: set[str] = set()
+    for ch in skeleton:
+        if ch in present:
+            repeated.add(ch)
+        else:
+            present.add(ch)
+    return frozenset(present), frozenset(repeated)
+
+
+def _expand_once(
+    skeleton: str,
+    lang: str,
+    emit: Callable[[str, float], None],
+) -> None:
+    """Emit every single-rewrite variant of *skeleton* with its rule plausibility."""
+    # 1. Epenthetic removals (all languages)
+    p_epenthetic = _RULE_PLAUSIBILITY["epenthetic"]
+    for pattern, replacement in _EPENTHETIC_PATTERNS:
+        if pattern in skeleton:
+            emit(skeleton.replace(pattern, replacement, 1), p_epenthetic)
+
+    # 2. Double-consonant normalization (all languages)
+    p_double = _RULE_PLAUSIBILITY["double"]
+    for double, single in _DOUBLES:
+        if double in skeleton:
+            emit(skeleton.replace(double, single, 1), p_double)
+
+    # 3. Universal consonant correspondences (all languages)
+    p_universal = _RULE_PLAUSIBILITY["universal"]
+    p_deletion = _RULE_PLAUSIBILITY["deletion"]
+    _apply_map_variants(
+        skeleton,
+        UNIVERSAL_CORRESPONDENCES,
+        lambda v: emit(v, p_deletion if len(v) < len(skeleton) else p_universal),
+    )
+
+    # 4. Language-specific shifts (on top of universal)
+    p_language = _RULE_PLAUSIBILITY["language"]
+    add_language = lambda v: emit(v, p_language)  # noqa: E731
+    if lang in ("ang", "got", "non"):
+        # Germanic languages: apply Grimm's Law stop series
+        _apply_map_variants(skeleton, GRIMM_MAP, add_language)
+    elif lang == "lat":
+        _apply_digraph_variants(skeleton, LATIN_PHONETIC, add_language)
+    elif lang == "grc":
+        _apply_digraph_variants(skeleton, GREEK_PHONETIC, add_language)
+    elif lang == "sga":
+        _apply_digraph_variants(skeleton, OLD_IRISH_PHONETIC, add_language)
+    elif lang == "cy":
+        _apply_digraph_variants(skeleton, WELSH_PHONETIC, add_language)
+
+
+def phonetic_variants_scored(
+    skeleton: str,
+    lang: str,
+    *,
+    max_variants: int = _MAX_VARIANTS,
+    max_steps: int = _MAX_EXPANSION_STEPS,
+    signature_dedup: bool = False,
+    stats: VariantBudgetStats | None = None,
+) -> list[tuple[str, float]]:
+    """Beam-limited variant generation; returns ``(variant, score)`` pairs.
+
+    Each step rewrites every skeleton on the beam once (see
+    :func:`_expand_once`), scores the children by rule plausibility and keeps
+    the best *max_variants* of them as the next beam.  Only exact duplicate
+    strings are dropped, unless *signature_dedup* also drops variants whose
+    :func:`_variant_signature` was already produced.  ``max_variants=0``
+    disables the cap.
+
+    The original skeleton comes first with score 1.0; the survivors follow
+    in generation order, not score order, because Eye 1 breaks Jaccard ties
+    by skeleton order.  Sort by score to rank them.
+    """
+    skel = skeleton.lower().strip()
+    stats = stats if stats is not None else VariantBudgetStats()
+    scores: dict[str, float] = {skel: 1.0}
+    signatures = {_variant_signature(skel)}
+    frontier: list[tuple[str, float]] = [(skel, 1.0)]
+
+    for _step in range(max(1, max_steps)):
+        children: dict[str, float] = {}
+        for parent, parent_score in frontier:
+            def _emit(variant: str, plausibility: float) -> None:
+                if not variant or variant in scores:
+                    return
+                score = parent_score * plausibility
+                if score > children.get(variant, 0.0):
+                    children[variant] = score
+
+            _expand_once(parent, lang, _emit)
+
+        kept: set[str] = set()
+        for variant, score in sorted(children.items(), key=lambda kv: -kv[1]):
+            if signature_dedup:
+                signature = _variant_signature(variant)
+                if signature in signatures:
+                    stats.signature_duplicates += 1
+                    continue
+            if max_variants and len(scores) + len(kept) >= max_variants:
+                stats.variants_dropped += 1
+                continue
+            if signature_dedup:
+                signatures.add(signature)
+            kept.add(variant)
+        # The beam selects by score but keeps generation order (see docstring)
+        frontier = [(variant, score) for variant, score in children.items() if variant in kept]
+        scores.update(frontier)
+        if not frontier:
+            break
+
+    return list(scores.items())
 
 
 def phonetic_variants(skeleton: str, lang: str) -> list[str]:
     """Generate consonant skeleton variants based on IE phonetic shift laws.
 
     Always includes the original skeleton. Limits output to _MAX_VARIANTS
-    entries. Substitutions are applied one at a time (not combinatorially).
+    entries, keeping the most plausible ones (see ``_RULE_PLAUSIBILITY``).
+    Substitutions are applied one at a time (not combinatorially).
 
     Applies three layers:
     1. Universal corridors (bilabial, dental, velar, sibilant interchange)
@@ -1009,48 +1192,13 @@ def phonetic_variants(skeleton: str, lang: str) -> list[str]:
     list[str]
         Unique skeleton strings, original first.
     """
-    skel = skeleton.lower().strip()
-    seen: dict[str, None] = {skel: None}
-    result: list[str] = [skel]
-
-    def _add(s: str) -> None:
-        if s and s not in seen and len(result) < _MAX_VARIANTS:
-            seen[s] = None
-            result.append(s)
-
-    # 1. Epenthetic removals (all languages)
-    for pattern, replacement in _EPENTHETIC_PATTERNS:
-        if pattern in skel:
-            _add(skel.replace(pattern, replacement, 1))
-
-    # 2. Double-consonant normalization (all languages)
-    for double, single in _DOUBLES:
-        if double in skel:
-            _add(skel.replace(double, single, 1))
-
-    # 3. Universal consonant correspondences (all languages)
-    _apply_map_variants(skel, UNIVERSAL_CORRESPONDENCES, _add)
-
-    # 4. Language-specific shifts (on top of universal)
-    if lang in ("ang", "got", "non"):
-        # Germanic languages: apply Grimm's Law stop series
-        _apply_map_variants(skel, GRIMM_MAP, _add)
-    elif lang == "lat":
-        _apply_digraph_variants(skel, LATIN_PHONETIC, _add)
-    elif lang == "grc":
-        _apply_digraph_variants(skel, GREEK_PHONETIC, _add)
-    elif lang == "sga":
-        _apply_digraph_variants(skel, OLD_IRISH_PHONETIC, _add)
-    elif lang == "cy":
-        _apply_digraph_variants(skel, WELSH_PHONETIC, _add)
-
-    return result
+    return [variant for variant, _score in phonetic_variants_scored(skeleton, lang)]
 
 
 def _apply_map_variants(
     skeleton: str,
     shift_map: dict[str, list[str]],
-    add_fn: "callable[[str], None]",
+    add_fn: Callable[[str], None],
 ) -> None:
     """Apply single-character substitutions from shift_map."""
     for i, ch in enumerate(skeleton):
@@ -1064,7 +1212,7 @@ def _apply_map_variants(
 def _apply_digraph_variants(
     skeleton: str,
     shift_map: dict[str, list[str]],
-    add_fn: "callable[[str], None]",
+    add_fn: Callable[[str], None],
 ) -> None:
     """Apply both digraph (2-char) and monograph substitutions from shift_map."""
     # Try digraphs first
@@ -1112,14 +1260,22 @@ def _extract_skeleton_from_text(text: str, is_ipa: bool = False) -> str:
         return "".join(_ENG_CONSONANTS_RE.findall(text.lower()))
 
 
-def extract_all_skeletons(word: str, ipa: str | None, lang: str) -> list[str]:
+def extract_all_skeletons(
+    word: str,
+    ipa: str | None,
+    lang: str,
+    *,
+    max_skeletons: int = 0,
+    signature_dedup: bool = False,
+    stats: VariantBudgetStats | None = None,
+) -> list[str]:
     """Main entry point: decompose word, extract skeletons, generate variants.
 
     Chains:
     1. ``decompose_target(word, lang)`` → list of candidate stems
     2. For each stem, extract consonant skeleton (from Latin script or IPA)
-    3. For each skeleton, generate ``phonetic_variants(skeleton, lang)``
-    4. Deduplicate and return
+    3. For each skeleton, generate scored ``phonetic_variants``
+    4. Deduplicate, rank by plausibility and keep at most *max_skeletons*
 
     Parameters
     ----------
@@ -1130,36 +1286,75 @@ def extract_all_skeletons(word: str, ipa: str | None, lang: str) -> list[str]:
         is added as an extra source alongside the orthographic skeleton.
     lang:
         Language code: "lat", "grc", "ang", etc.
+    max_skeletons:
+        Per-word budget; ``0`` (the default) keeps every skeleton.
+        ``_MAX_WORD_SKELETONS`` is the suggested value once its recall has
+        been checked on the benchmark.
+    signature_dedup:
+        Also collapse skeletons with the same :func:`_variant_signature`
+        (off by default: Eye 1 scoring tells reorderings apart).
+    stats:
+        Counters to update (words seen, truncated, dropped, collapsed).
 
     Returns
     -------
     list[str]
-        All unique consonant skeletons, most informative first.
+        All unique consonant skeletons, most informative first: the
+        word's own skeleton, the other stems' skeletons, then variants by
+        descending plausibility.
     """
-    seen: dict[str, None] = {}
-    result: list[str] = []
-
-    def _add_skel(s: str) -> None:
-        if s and s not in seen:
-            seen[s] = None
-            result.append(s)
+    stats = stats if stats is not None else VariantBudgetStats()
+    stats.words += 1
 
     # Step 1: decompose
     stems = decompose_target(word, lang)
 
-    # Step 2 + 3: extract skeleton + variants for each stem
+    # Step 2: orthographic skeleton per stem, plus the IPA skeleton if available
+    sources: list[str] = []
     for stem in stems:
-        # Orthographic skeleton
         orth_skel = _extract_skeleton_from_text(stem, is_ipa=False)
         if orth_skel:
-            for var in phonetic_variants(orth_skel, lang):
-                _add_skel(var)
-
-    # Also extract from IPA if available (applied to the original word's IPA)
+            sources.append(orth_skel)
     if ipa:
         ipa_skel = _extract_skeleton_from_text(ipa, is_ipa=True)
         if ipa_skel:
-            for var in phonetic_variants(ipa_skel, lang):
-                _add_skel(var)
-
+            sources.append(ipa_skel)
+
+    # Step 3: scored variants; the first source to produce a skeleton owns it
+    ranked: dict[str, tuple[float, int]] = {}
+    order = 0
+    for source in sources:
+        for var, score in phonetic_variants_scored(source, lang, signature_dedup=signature_dedup, stats=stats):
+            if var not in ranked:
+                ranked[var] = (score, order)
+                order += 1
+            elif score > ranked[var][0]:
+                ranked[var] = (score, ranked[var][1])
+
+    # Step 4: optionally collapse equal signatures and apply the word budget.
+    # Only a budget reorders by plausibility: Eye 1 breaks Jaccard ties by
+    # skeleton order, so the unbudgeted order stays source by source.
+    result: list[str] = []
+    signatures: set[tuple[frozenset[str], frozenset[str]]] = set()
+    dropped = 0
+    if max_skeletons:
+        candidates = [var for var, _key in sorted(ranked.items(), key=lambda kv: (-kv[1][0], kv[1][1]))]
+    else:
+        candidates = list(ranked)
+    for var in candidates:
+        if signature_dedup:
+            signature = _variant_signature(var)
+            if signature in signatures:
+                stats.signature_duplicates += 1
+                continue
+            signatures.add(signature)
+        if max_skeletons and len(result) >= max_skeletons:
+            dropped += 1
+            continue
+        result.append(var)
+
+    if dropped:
+        stats.truncated_words += 1
+        stats.variants_dropped += dropped
+    stats.skeletons_kept += len(result)
     return result
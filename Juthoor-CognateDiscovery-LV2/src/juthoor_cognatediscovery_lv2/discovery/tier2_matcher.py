@@ -9,6 +9,10 @@ No LLM calls — pure rule-based, runs in seconds.
 Usage (standalone):
     from juthoor_cognatediscovery_lv2.discovery.tier2_matcher import tier2_match
 
+Usage (corpus scale, over Eye 1 misses):
+    python scripts/discovery/run_tier2_batch.py --target lat \\
+        --eye1 outputs/eye1_full_scale_lat.jsonl --workers 4
+
 Usage (from Eye 1 script):
     import sys
     from pathlib import Path
@@ -17,8 +21,13 @@ Usage (from Eye 1 script):
 """
 from __future__ import annotations
 
+import heapq
+import json
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
@@ -437,6 +446,55 @@ def _discovery_score(
     )
 
 
+def tier2_variants(arabic_skeleton: str, lang: str) -> list[str]:
+    """All IE projections Tier 2 tries for one Arabic skeleton.
+
+    Merges :func:`expand_with_cross_family_shifts` and
+    :func:`apply_positional_rules` (deduplicated, order preserved).  Input that
+    is already a Latin/Greek projection is used as-is.
+    """
+    # Determine whether the input is Arabic script or already a Latin projection
+    _is_arabic = any("\u0600" <= ch <= "\u06ff" for ch in arabic_skeleton)
+
+    if _is_arabic:
+        shift_variants = expand_with_cross_family_shifts(arabic_skeleton)
+        pos_variants = apply_positional_rules(arabic_skeleton, lang)
+        arabic_variants = list(dict.fromkeys(
+            v for v in shift_variants + pos_variants if v
+        ))
+    else:
+        arabic_variants = [arabic_skeleton]
+
+    if not arabic_variants:
+        arabic_variants = [arabic_skeleton]
+
+    # Filter out empty variants for scoring
+    clean = [v for v in arabic_variants if v]
+    return clean if clean else arabic_variants
+
+
+def _best_variant_pair(
+    ar_variants: list[str],
+    ar_sets: list[frozenset],
+    tgt_skels: list[str],
+    tgt_sets: list[frozenset],
+) -> tuple[float, int, int, float, list[str]]:
+    """Best (score, ar_idx, tgt_idx, jaccard, ordered_overlap) over all pairs.
+
+    The first strictly-better pair wins ties, as in Tier 1.
+    """
+    best = (0.0, 0, 0, 0.0, [])
+    for ai, (ar_var, ar_set) in enumerate(zip(ar_variants, ar_sets)):
+        ar_len = len(ar_var)
+        for ti, (tgt_skel, tgt_set) in enumerate(zip(tgt_skels, tgt_sets)):
+            j = _jaccard(ar_set, tgt_set)
+            ord_ov = _ordered_overlap(ar_var, tgt_skel)
+            score = _discovery_score(j, len(ord_ov), ar_len, len(tgt_skel))
+            if score > best[0]:
+                best = (score, ai, ti, j, ord_ov)
+    return best
+
+
 # ---------------------------------------------------------------------------
 # tier2_match — main entry point
 # ---------------------------------------------------------------------------
@@ -489,62 +547,19 @@ def tier2_match(
             "n_target_skeletons": len(target_skeletons),
         }
 
-    # Determine whether the input is Arabic script or already a Latin projection
-    _is_arabic = any("\u0600" <= ch <= "\u06ff" for ch in arabic_skeleton)
-
-    if _is_arabic:
-        # Generate all IE projections
-        shift_variants = expand_with_cross_family_shifts(arabic_skeleton)
-        pos_variants = apply_positional_rules(arabic_skeleton, lang)
-        # Merge, deduplicating while preserving order
-        seen_av: dict[str, None] = {}
-        arabic_variants: list[str] = []
-        for v in shift_variants + pos_variants:
-            if v and v not in seen_av:
-                seen_av[v] = None
-                arabic_variants.append(v)
-    else:
-        # Already a Latin/Greek projection — use as-is, add simple single-step variants
-        arabic_variants = [arabic_skeleton]
-        # Still try positional expansion but treat it as opaque
-        # (just add what we have)
-
-    if not arabic_variants:
-        arabic_variants = [arabic_skeleton]
-
-    # Filter out empty variants for scoring
-    arabic_variants_clean = [v for v in arabic_variants if v]
-    if not arabic_variants_clean:
-        arabic_variants_clean = arabic_variants
+    arabic_variants_clean = tier2_variants(arabic_skeleton, lang)
 
     # Filter target skeletons
     target_skeletons_clean = [s for s in target_skeletons if s]
 
-    # Pre-compute frozensets
-    ar_sets = [frozenset(v) for v in arabic_variants_clean]
-    tgt_sets = [frozenset(s) for s in target_skeletons_clean]
-
-    best_score = 0.0
-    best_ar_var = arabic_variants_clean[0] if arabic_variants_clean else ""
-    best_tgt_skel = target_skeletons_clean[0] if target_skeletons_clean else ""
-    best_jaccard = 0.0
-    best_ord_ov: list[str] = []
-
-    for ai, (ar_var, ar_set) in enumerate(zip(arabic_variants_clean, ar_sets)):
-        ar_len = len(ar_var)
-        for ti, (tgt_skel, tgt_set) in enumerate(zip(target_skeletons_clean, tgt_sets)):
-            tgt_len = len(tgt_skel)
-
-            j = _jaccard(ar_set, tgt_set)
-            ord_ov = _ordered_overlap(ar_var, tgt_skel)
-            score = _discovery_score(j, len(ord_ov), ar_len, tgt_len)
-
-            if score > best_score:
-                best_score = score
-                best_ar_var = ar_var
-                best_tgt_skel = tgt_skel
-                best_jaccard = j
-                best_ord_ov = ord_ov
+    best_score, ai, ti, best_jaccard, best_ord_ov = _best_variant_pair(
+        arabic_variants_clean,
+        [frozenset(v) for v in arabic_variants_clean],
+        target_skeletons_clean,
+        [frozenset(s) for s in target_skeletons_clean],
+    )
+    best_ar_var = arabic_variants_clean[ai] if arabic_variants_clean else ""
+    best_tgt_skel = target_skeletons_clean[ti] if target_skeletons_clean else ""
 
     min_len = min(len(best_ar_var), len(best_tgt_skel))
     ord_ov_ratio = len(best_ord_ov) / min_len if min_len > 0 else 0.0
@@ -560,3 +575,322 @@ def tier2_match(
     }
 
     return round(best_score, 4), match_details
+
+
+# ---------------------------------------------------------------------------
+# Corpus-scale batch driver
+#
+# tier2_match() scores one root against one lemma's skeletons.  The batch
+# driver below runs the same scoring over a whole corpus: Arabic variants are
+# generated once per root, target skeletons are looked up through the same
+# sorted-pair inverted index Eye 1 uses, and pairs Eye 1 already surfaced are
+# skipped.  Records are written in the Eye 1 JSONL schema (plus "tier": 2) so
+# Eye 2 can consume them unchanged.
+# ---------------------------------------------------------------------------
+
+def _sorted_pairs(skel: str) -> set[str]:
+    """All sorted 2-char consonant combinations — identical to Eye 1's _sorted_pairs."""
+    pairs: set[str] = set()
+    for i in range(len(skel)):
+        for j in range(i + 1, len(skel)):
+            a, b = skel[i], skel[j]
+            pairs.add(a + b if a <= b else b + a)
+    return pairs
+
+
+def build_tier2_index(target_entries: list[dict[str, Any]]) -> dict[str, list[int]]:
+    """Map each sorted consonant pair → indices of targets containing it.
+
+    *target_entries* use the Eye 1 layout (``all_skeletons`` per entry, as
+    produced by ``build_target_skeleton_index``); every skeleton variant of a
+    target contributes its pairs.
+    """
+    inv: dict[str, list[int]] = {}
+    for idx, entry in enumerate(target_entries):
+        all_pairs: set[str] = set()
+        for skel in entry["all_skeletons"]:
+            if len(skel) >= 2:
+                all_pairs.update(_sorted_pairs(skel))
+        for pair in all_pairs:
+            inv.setdefault(pair, []).append(idx)
+    return inv
+
+
+def prepare_tier2_roots(
+    arabic_entries: list[dict[str, Any]],
+    lang: str,
+) -> list[dict[str, Any]]:
+    """Precompute Tier 2 projections once per Arabic root.
+
+    Each entry needs ``arabic_root``; its Arabic-script skeleton is taken from
+    ``ar_skel`` when present, otherwise derived with :func:`_arabic_skeleton`.
+    Roots whose projections are all shorter than two consonants are dropped.
+    """
+    prepared: list[dict[str, Any]] = []
+    for entry in arabic_entries:
+        root = entry["arabic_root"]
+        ar_skel = entry.get("ar_skel") or _arabic_skeleton(root)
+        if not ar_skel:
+            continue
+        variants = [v for v in tier2_variants(ar_skel, lang) if len(v) >= 2]
+        if not variants:
+            continue
+        pairs: set[str] = set()
+        for v in variants:
+            pairs.update(_sorted_pairs(v))
+        prepared.append({
+            "arabic_root": root,
+            "variants": variants,
+            "variant_sets": [frozenset(v) for v in variants],
+            "pairs": tuple(sorted(pairs)),
+        })
+    return prepared
+
+
+def load_eye1_pairs(path: Path | str) -> set[tuple[str, str]]:
+    """Read the (arabic_root, target_lemma) pairs already present in an Eye 1 JSONL file."""
+    seen: set[tuple[str, str]] = set()
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            root = row.get("arabic_root")
+            lemma = row.get("target_lemma")
+            if root and lemma:
+                seen.add((root, lemma))
+    return seen
+
+
+@dataclass
+class Tier2BatchStats:
+    """Counters from one :func:`tier2_batch_match` run."""
+
+    roots: int = 0
+    candidates: int = 0
+    excluded: int = 0
+    scored: int = 0
+    kept: int = 0
+    records: int = 0
+    elapsed: float = 0.0
+
+    def add(self, other: "Tier2BatchStats") -> None:
+        self.roots += other.roots
+        self.candidates += other.candidates
+        self.excluded += other.excluded
+        self.scored += other.scored
+        self.kept += other.kept
+        self.records += other.records
+
+    @property
+    def roots_per_sec(self) -> float:
+        return self.roots / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def pairs_per_sec(self) -> float:
+        return self.scored / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "roots": self.roots,
+            "candidates": self.candidates,
+            "excluded": self.excluded,
+            "scored": self.scored,
+            "kept": self.kept,
+            "records": self.records,
+            "elapsed": round(self.elapsed, 3),
+            "roots_per_sec": round(self.roots_per_sec, 1),
+            "pairs_per_sec": round(self.pairs_per_sec, 1),
+        }
+
+
+# Shared read-only state for worker processes (set by _init_worker).
+_WORKER: dict[str, Any] = {}
+
+
+def _init_worker(
+    target_entries: list[dict[str, Any]],
+    inv_index: dict[str, list[int]],
+    exclude: set[tuple[str, str]],
+    params: dict[str, Any],
+) -> None:
+    _WORKER["targets"] = target_entries
+    _WORKER["index"] = inv_index
+    _WORKER["exclude"] = exclude
+    _WORKER.update(params)
+
+
+def _match_root(root: dict[str, Any], stats: Tier2BatchStats) -> list[dict[str, Any]]:
+    """Score one prepared root against its indexed candidates (worker side)."""
+    targets = _WORKER["targets"]
+    inv_index = _WORKER["index"]
+    exclude = _WORKER["exclude"]
+    threshold = _WORKER["threshold"]
+    min_overlap = _WORKER["min_overlap"]
+    top_k = _WORKER["top_k"]
+    lang = _WORKER["lang"]
+    required_hits = max(2, min_overlap)
+    ar_root = root["arabic_root"]
+
+    candidate_counts: dict[int, int] = {}
+    for pair in root["pairs"]:
+        for idx in inv_index.get(pair, ()):
+            candidate_counts[idx] = candidate_counts.get(idx, 0) + 1
+
+    heap: list[tuple] = []
+    for idx, cnt in candidate_counts.items():
+        if cnt < required_hits:
+            continue
+        stats.candidates += 1
+        tgt = targets[idx]
+        lemmas = [(tgt["lemma"], False)] + [
+            (alt["lemma"] if isinstance(alt, dict) else alt, True)
+            for alt in tgt.get("alt_lemmas", [])
+        ]
+        open_lemmas = [(lem, alt) for lem, alt in lemmas if (ar_root, lem) not in exclude]
+        if not open_lemmas:
+            stats.excluded += 1
+            continue
+
+        stats.scored += 1
+        score, ai, ti, j, ord_ov = _best_variant_pair(
+            root["variants"], root["variant_sets"],
+            tgt["all_skeletons"], tgt["all_skels_sets"],
+        )
+        if j < threshold and len(ord_ov) < min_overlap:
+            continue
+
+        item = (score, -idx, idx, ai, ti, j, ord_ov, open_lemmas)
+        if top_k <= 0 or len(heap) < top_k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    records: list[dict[str, Any]] = []
+    stats.kept += len(heap)
+    for score, _neg, idx, ai, ti, j, ord_ov, open_lemmas in sorted(heap, reverse=True):
+        tgt = targets[idx]
+        ar_var = root["variants"][ai]
+        tgt_skel = tgt["all_skeletons"][ti]
+        min_len = min(len(ar_var), len(tgt_skel))
+        base = {
+            "arabic_root": ar_root,
+            "arabic_skeleton": ar_var,
+            "target_lemma": "",
+            "target_skeleton": tgt_skel,
+            "jaccard": round(j, 4),
+            "overlap_consonants": sorted(root["variant_sets"][ai] & tgt["all_skels_sets"][ti]),
+            "ordered_overlap": ord_ov,
+            "lang": lang,
+            "n_lemmas": 1 + len(tgt.get("alt_lemmas", [])),
+            "discovery_score": round(score, 4),
+            "ordered_overlap_ratio": round(len(ord_ov) / min_len if min_len > 0 else 0, 3),
+            "ar_skel_len": len(ar_var),
+            "tgt_skel_len": len(tgt_skel),
+            "tier": 2,
+        }
+        for lemma, is_alt in open_lemmas:
+            record = dict(base, target_lemma=lemma)
+            if is_alt:
+                record["is_alt"] = True
+            records.append(record)
+    stats.records += len(records)
+    stats.roots += 1
+    return records
+
+
+def _match_chunk(roots: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], Tier2BatchStats]:
+    stats = Tier2BatchStats()
+    records: list[dict[str, Any]] = []
+    for root in roots:
+        records.extend(_match_root(root, stats))
+    return records, stats
+
+
+def tier2_batch_match(
+    roots: list[dict[str, Any]],
+    target_entries: list[dict[str, Any]],
+    lang: str,
+    *,
+    inv_index: dict[str, list[int]] | None = None,
+    exclude: set[tuple[str, str]] | None = None,
+    threshold: float = 0.3,
+    min_overlap: int = 2,
+    top_k: int = 200,
+    workers: int = 1,
+    chunk_size: int = 64,
+    progress: bool = False,
+) -> tuple[list[dict[str, Any]], Tier2BatchStats]:
+    """Run Tier 2 over a whole corpus.
+
+    Parameters
+    ----------
+    roots:
+        Output of :func:`prepare_tier2_roots`.
+    target_entries:
+        Eye 1 target entries (``lemma``, ``all_skeletons``, ``all_skels_sets``,
+        ``alt_lemmas``).
+    inv_index:
+        Sorted-pair index over *target_entries*; built when omitted.
+    exclude:
+        ``(arabic_root, target_lemma)`` pairs to skip — normally the pairs Eye 1
+        already surfaced (see :func:`load_eye1_pairs`).
+    threshold, min_overlap, top_k:
+        Same gate and per-root cap as Eye 1 (``top_k=0`` keeps everything).
+    workers:
+        Number of worker processes; ``1`` runs in-process.
+
+    Returns
+    -------
+    (records, stats)
+        Records in Eye 1 JSONL schema, grouped by root in input order and
+        sorted by ``discovery_score`` within each root.
+    """
+    if inv_index is None:
+        inv_index = build_tier2_index(target_entries)
+    params = {
+        "lang": lang,
+        "threshold": threshold,
+        "min_overlap": min_overlap,
+        "top_k": top_k,
+    }
+    initargs = (target_entries, inv_index, exclude or set(), params)
+    chunks = [roots[i:i + chunk_size] for i in range(0, len(roots), max(1, chunk_size))]
+
+    stats = Tier2BatchStats()
+    records: list[dict[str, Any]] = []
+    t0 = time.time()
+    report_step = max(1, len(chunks) // 20)
+
+    def _collect(results) -> None:
+        for n, (chunk_records, chunk_stats) in enumerate(results, 1):
+            records.extend(chunk_records)
+            stats.add(chunk_stats)
+            if progress and (n % report_step == 0 or n == len(chunks)):
+                elapsed = time.time() - t0
+                rate = stats.roots / elapsed if elapsed > 0 else 0.0
+                print(
+                    f"  [{stats.roots}/{len(roots)}] {rate:.0f} roots/s | "
+                    f"scored: {stats.scored} | kept: {stats.kept}",
+                    file=sys.stderr,
+                )
+
+    if workers <= 1:
+        saved = dict(_WORKER)
+        _init_worker(*initargs)
+        try:
+            _collect(map(_match_chunk, chunks))
+        finally:
+            _WORKER.clear()
+            _WORKER.update(saved)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=initargs
+        ) as pool:
+            _collect(pool.map(_match_chunk, chunks))
+
+    stats.elapsed = time.time() - t0
+    return records, stats
@@ -0,0 +1,153 @@
+"""Length-bucketed, token-budgeted batching for encoder inference.
+
+Lemmas and glosses range from 2 to several hundred bytes/tokens. Batching them
+in input order with a fixed batch size pads every text to the longest one in
+its batch, so most CPU time is spent on padding. This scheduler instead:
+
+1. measures each text (bytes for ByT5, tokenizer tokens for BGE-M3);
+2. sorts by length, longest first, so any out-of-memory failure happens on
+   the first batch;
+3. cuts batches so ``longest_in_batch * batch_size`` stays under a token
+   budget (short texts get large batches, long ones small batches);
+4. scatters the results back into input order.
+
+Both LV2 embedders and the LV0 ``embed_canine`` / ``embed_sonar`` CLIs use it.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    """Batch limits: padded tokens per batch, texts per batch, per-text cap."""
+
+    max_tokens: int = 16_384
+    max_batch_size: int = 256
+    max_length: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_tokens <= 0 or self.max_batch_size <= 0:
+            raise ValueError("max_tokens and max_batch_size must be > 0")
+
+
+@dataclass
+class InferenceStats:
+    texts: int = 0
+    batches: int = 0
+    tokens: int = 0
+    padded_tokens: int = 0
+    seconds: float = 0.0
+    threads: int = 0
+    batch_sizes: list[int] = field(default_factory=list)
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.tokens / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def padding_ratio(self) -> float:
+        """Fraction of computed positions that were padding."""
+        return 1.0 - self.tokens / self.padded_tokens if self.padded_tokens else 0.0
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "texts": self.texts,
+            "batches": self.batches,
+            "tokens": self.tokens,
+            "padded_tokens": self.padded_tokens,
+            "padding_ratio": round(self.padding_ratio, 4),
+            "seconds": round(self.seconds, 3),
+            "tokens_per_sec": round(self.tokens_per_sec, 1),
+            "threads": self.threads,
+        }
+
+    def summary(self) -> str:
+        return (
+            f"{self.texts:,} texts in {self.batches:,} batches, {self.tokens:,} tokens "
+            f"({self.padding_ratio:.0%} padding), {self.tokens_per_sec:,.0f} tok/s "
+            f"on {self.threads or '?'} threads"
+        )
+
+
+def byte_length(text: str) -> int:
+    """ByT5 sequence length: UTF-8 bytes plus the end-of-sequence token."""
+    return len(text.encode("utf-8")) + 1
+
+
+def plan_batches(lengths: Sequence[int], budget: TokenBudget) -> list[list[int]]:
+    """Group text indices into batches under ``budget`` (longest texts first)."""
+    cap = budget.max_length
+    clipped = [max(1, min(n, cap) if cap else n) for n in lengths]
+    order = sorted(range(len(clipped)), key=lambda i: (-clipped[i], i))
+
+    batches: list[list[int]] = []
+    current: list[int] = []
+    longest = 0
+    for i in order:
+        n = clipped[i]
+        width = max(longest, n)
+        if current and (width * (len(current) + 1) > budget.max_tokens or len(current) >= budget.max_batch_size):
+            batches.append(current)
+            current, width = [], n
+        current.append(i)
+        longest = width
+    if current:
+        batches.append(current)
+    return batches
+
+
+def torch_threads(num_threads: int = 0) -> int:
+    """Apply ``num_threads`` (if > 0) via ``torch.set_num_threads``; return the active count."""
+    try:
+        import torch
+    except ImportError:
+        return 0
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    return int(torch.get_num_threads())
+
+
+def run_batched(
+    texts: Sequence[str],
+    encode: Callable[[list[str]], np.ndarray],
+    *,
+    budget: TokenBudget | None = None,
+    length_fn: Callable[[str], int] = byte_length,
+    lengths: Sequence[int] | None = None,
+    threads: int = 0,
+    progress: Callable[[InferenceStats], None] | None = None,
+) -> tuple[np.ndarray, InferenceStats]:
+    """Encode ``texts`` in length-sorted, budgeted batches; rows come back in input order.
+
+    ``encode`` gets one batch of texts and returns one row per text. Pass
+    precomputed ``lengths`` to skip ``length_fn``.
+    """
+    budget = budget or TokenBudget()
+    lengths = list(lengths) if lengths is not None else [length_fn(t) for t in texts]
+    stats = InferenceStats(texts=len(texts), threads=threads)
+    if not texts:
+        return np.zeros((0, 0), dtype="float32"), stats
+
+    out: np.ndarray | None = None
+    cap = budget.max_length
+    t0 = time.perf_counter()
+    for batch in plan_batches(lengths, budget):
+        vecs = np.asarray(encode([texts[i] for i in batch]))
+        if out is None:
+            out = np.empty((len(texts), vecs.shape[1]), dtype=vecs.dtype)
+        out[batch] = vecs
+        used = [min(lengths[i], cap) if cap else lengths[i] for i in batch]
+        stats.batches += 1
+        stats.batch_sizes.append(len(batch))
+        stats.tokens += sum(used)
+        stats.padded_tokens += max(used) * len(batch)
+        stats.seconds = time.perf_counter() - t0
+        if progress is not None:
+            progress(stats)
+    assert out is not None
+    return out, stats
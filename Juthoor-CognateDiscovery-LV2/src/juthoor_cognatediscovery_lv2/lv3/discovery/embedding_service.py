@@ -0,0 +1,481 @@
+"""Long-lived local embedding service with request coalescing.
+
+Loading BGE-M3 or ByT5 takes tens of seconds and gigabytes of RAM. Every
+script that loads its own copy pays that cost again, and two scripts running
+side by side hold two copies. The service loads each model once and answers
+``embed`` requests from any number of local clients:
+
+- concurrent requests for the same model are merged by a :class:`Coalescer`
+  (one worker thread per model) into large, de-duplicated batches, which the
+  embedder then schedules by length (see batching.py);
+- texts already in the content-addressed :class:`~.embedding_store.EmbeddingStore`
+  are served from disk; only new texts reach the model.
+
+Transport is ``multiprocessing.connection`` on a Unix socket (POSIX) or
+``127.0.0.1`` (elsewhere). Requests are JSON frames; vectors come back as one
+raw float32 frame, so nothing is pickled. Set ``$JUTHOOR_EMBED_SERVICE``
+(``unix:/path/to.sock`` or ``host:port``) to move the address. Connections
+are authenticated with ``$JUTHOOR_EMBED_SERVICE_KEY`` or, when that is unset,
+a random key kept in ``~/.juthoor/embed_service.key`` (created on first use,
+readable by its owner only; ``$JUTHOOR_EMBED_SERVICE_KEY_FILE`` moves it).
+
+Start the server with ``scripts/discovery/embedding_service.py serve``. Clients
+use :class:`EmbeddingServiceClient` (a drop-in ``embed(texts)`` object) or
+:func:`get_embedder`, which falls back to a local model when no service is
+running or the running one embeds with a different model config.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import secrets
+import socket
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from .embedding_store import EmbeddingStore, config_fingerprint
+from .embeddings import BgeM3Config, BgeM3Embedder, ByT5Config, ByT5Embedder
+
+ADDRESS_ENV = "JUTHOOR_EMBED_SERVICE"
+AUTHKEY_ENV = "JUTHOOR_EMBED_SERVICE_KEY"
+AUTHKEY_FILE_ENV = "JUTHOOR_EMBED_SERVICE_KEY_FILE"
+DEFAULT_PORT = 8765
+SERVICE_MODELS = ("semantic", "form")
+EMBED_BACKENDS = ("local", "service", "auto")
+
+Address = str | tuple[str, int]
+
+
+def parse_address(value: str) -> Address:
+    """``unix:/path`` or ``/path`` → socket path; ``host:port`` → TCP tuple."""
+    if value.startswith("unix:"):
+        return value[len("unix:"):]
+    host, sep, port = value.rpartition(":")
+    if sep and port.isdigit() and "/" not in value:
+        return (host or "127.0.0.1", int(port))
+    return value
+
+
+def default_address() -> Address:
+    env = os.environ.get(ADDRESS_ENV)
+    if env:
+        return parse_address(env)
+    if hasattr(socket, "AF_UNIX"):
+        return str(Path(tempfile.gettempdir()) / "juthoor-embed.sock")
+    return ("127.0.0.1", DEFAULT_PORT)
+
+
+def authkey_path() -> Path:
+    env = os.environ.get(AUTHKEY_FILE_ENV)
+    return Path(env) if env else Path.home() / ".juthoor" / "embed_service.key"
+
+
+def _authkey(authkey: bytes | None = None) -> bytes:
+    """``authkey``, else ``$JUTHOOR_EMBED_SERVICE_KEY``, else the per-user key file."""
+    if authkey:
+        return authkey
+    env = os.environ.get(AUTHKEY_ENV)
+    if env:
+        return env.encode("utf-8")
+    path = authkey_path()
+    try:
+        return path.read_bytes().strip()
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # another process created it first
+        return path.read_bytes().strip()
+    key = secrets.token_hex(32).encode("ascii")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(key)
+    return key
+
+
+def _send(conn: Connection, header: dict[str, Any], payload: np.ndarray | None = None) -> None:
+    conn.send_bytes(json.dumps(header).encode("utf-8"))
+    if payload is not None:
+        conn.send_bytes(np.ascontiguousarray(payload, dtype="float32").tobytes())
+
+
+# ---------------------------------------------------------------------------
+# Coalescing
+# ---------------------------------------------------------------------------
+
+
+class Coalescer:
+    """Merge concurrent ``embed`` calls for one model into shared batches.
+
+    A single worker thread owns ``embed_fn`` (models and the store are not
+    thread-safe). It waits for a request, gathers whatever else arrives within
+    ``max_wait_ms`` (up to ``max_batch_texts`` texts), embeds the distinct
+    texts once and hands each caller its own rows.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[list[str]], np.ndarray],
+        *,
+        max_batch_texts: int = 4096,
+        max_wait_ms: float = 20.0,
+    ) -> None:
+        self._embed = embed_fn
+        self.max_batch_texts = max_batch_texts
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue[tuple[list[str], Future] | None] = queue.Queue()
+        self.stats = {"requests": 0, "batches": 0, "texts": 0, "unique_texts": 0}
+        self._thread = threading.Thread(target=self._run, name="embed-coalescer", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: list[str]) -> Future:
+        fut: Future = Future()
+        self._queue.put((list(texts), fut))
+        return fut
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        return self.submit(texts).result()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            n_texts = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            closing = False
+            while n_texts < self.max_batch_texts:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    closing = True
+                    break
+                pending.append(nxt)
+                n_texts += len(nxt[0])
+            self._flush(pending)
+            if closing:
+                return
+
+    def _flush(self, pending: list[tuple[list[str], Future]]) -> None:
+        unique = list(dict.fromkeys(t for texts, _ in pending for t in texts))
+        self.stats["requests"] += len(pending)
+        self.stats["batches"] += 1
+        self.stats["texts"] += sum(len(texts) for texts, _ in pending)
+        self.stats["unique_texts"] += len(unique)
+        try:
+            vecs = np.asarray(self._embed(unique), dtype="float32") if unique else None
+        except Exception as exc:  # report to every waiting caller, keep serving
+            for _, fut in pending:
+                fut.set_exception(exc)
+            return
+        row = {t: i for i, t in enumerate(unique)}
+        for texts, fut in pending:
+            if vecs is None or not texts:
+                fut.set_result(np.zeros((0, 0 if vecs is None else vecs.shape[1]), dtype="float32"))
+            else:
+                fut.set_result(vecs[[row[t] for t in texts]])
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _ModelSlot:
+    name: str
+    config: Any
+    make: Callable[[], Any]
+    store: EmbeddingStore | None
+    embedder: Any = None
+    coalescer: Coalescer | None = None
+    loaded_s: float = 0.0
+    served: dict[str, int] = field(default_factory=lambda: {"texts": 0, "from_store": 0})
+
+    def load(self) -> Any:
+        if self.embedder is None:
+            t0 = time.perf_counter()
+            self.embedder = self.make()
+            self.embedder.embed(["warm-up"])  # embedders load their model lazily
+            self.loaded_s = time.perf_counter() - t0
+        return self.embedder
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        self.load()
+        self.served["texts"] += len(texts)
+        if self.store is None:
+            return self.embedder.embed(texts)
+        vecs, n_new = self.store.get_or_embed(texts, self.embedder.embed, chunk_size=4096)
+        self.served["from_store"] += len(texts) - n_new
+        return vecs
+
+
+class EmbeddingService:
+    """Model registry plus request handling; :meth:`serve_forever` runs it."""
+
+    def __init__(
+        self,
+        *,
+        models: tuple[str, ...] = SERVICE_MODELS,
+        semantic_cfg: BgeM3Config | None = None,
+        form_cfg: ByT5Config | None = None,
+        device: str = "cpu",
+        store_root: Path | None = None,
+        max_batch_texts: int = 4096,
+        max_wait_ms: float = 20.0,
+        embedders: dict[str, Callable[[], Any]] | None = None,
+    ) -> None:
+        configs = {"semantic": semantic_cfg or BgeM3Config(), "form": form_cfg or ByT5Config()}
+        factories: dict[str, Callable[[], Any]] = {
+            "semantic": lambda: BgeM3Embedder(config=configs["semantic"]),
+            "form": lambda: ByT5Embedder(config=configs["form"], device=device),
+        }
+        factories.update(embedders or {})
+        self.slots: dict[str, _ModelSlot] = {}
+        for name in models:
+            if name not in factories:
+                raise ValueError(f"Unknown model {name!r}; expected one of {SERVICE_MODELS}")
+            config = configs.get(name)
+            store = (
+                EmbeddingStore(store_root, config.model_id, config)
+                if store_root is not None and config is not None
+                else None
+            )
+            slot = _ModelSlot(name=name, config=config, make=factories[name], store=store)
+            slot.coalescer = Coalescer(slot.embed, max_batch_texts=max_batch_texts, max_wait_ms=max_wait_ms)
+            self.slots[name] = slot
+        self._stop = threading.Event()
+        self._address: Address | None = None
+        self._authkey = b""  # resolved by serve_forever
+        self.started = time.time()
+
+    def preload(self) -> None:
+        """Load every model now instead of on its first request (call before serving)."""
+        for slot in self.slots.values():
+            slot.load()
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "models": {
+                name: {
+                    "model_id": getattr(slot.config, "model_id", None),
+                    "config": config_fingerprint(slot.config),
+                    "loaded": slot.embedder is not None,
+                    "load_s": round(slot.loaded_s, 1),
+                    "store": slot.store.stats() if slot.store is not None else None,
+                    "served": dict(slot.served),
+                    "coalescer": dict(slot.coalescer.stats),
+                }
+                for name, slot in self.slots.items()
+            },
+        }
+
+    def handle(self, request: dict[str, Any]) -> tuple[dict[str, Any], np.ndarray | None]:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True}, None
+        if op == "info":
+            return {"ok": True, "info": self.info()}, None
+        if op == "shutdown":
+            self._stop.set()
+            return {"ok": True}, None
+        if op == "embed":
+            slot = self.slots.get(request.get("model", ""))
+            if slot is None:
+                return {"ok": False, "error": f"model {request.get('model')!r} not served"}, None
+            vecs = slot.coalescer.embed([str(t) for t in request.get("texts", [])])
+            return {"ok": True, "shape": list(vecs.shape)}, vecs
+        return {"ok": False, "error": f"unknown op {op!r}"}, None
+
+    def _serve_connection(self, conn: Connection) -> None:
+        with conn:
+            while not self._stop.is_set():
+                try:
+                    request = json.loads(conn.recv_bytes())
+                except (EOFError, OSError):
+                    return
+                try:
+                    header, payload = self.handle(request)
+                except Exception as exc:
+                    header, payload = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}, None
+                try:
+                    _send(conn, header, payload)
+                except OSError:
+                    return
+        if self._stop.is_set() and self._address is not None:
+            self._wake()
+
+    def _wake(self) -> None:
+        """Unblock ``accept()`` after a shutdown request with a throwaway connection."""
+        try:
+            Client(self._address, authkey=self._authkey).close()
+        except OSError:
+            pass
+
+    def serve_forever(self, address: Address | None = None, *, authkey: bytes | None = None) -> None:
+        address = address or default_address()
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)  # stale socket from a previous run
+        self._authkey = _authkey(authkey)
+        with Listener(address, authkey=self._authkey) as listener:
+            self._address = listener.address
+            while not self._stop.is_set():
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, ConnectionError):
+                    continue
+                if self._stop.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        for slot in self.slots.values():
+            slot.coalescer.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._address is not None:
+            self._wake()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class EmbeddingServiceClient:
+    """Drop-in ``embed(texts)`` backed by a running embedding service.
+
+    One connection per client, opened lazily; calls from several threads on
+    the same client are serialized, so give each worker its own client to
+    have the server coalesce their requests.
+    """
+
+    def __init__(self, model: str = "semantic", *, address: Address | None = None, authkey: bytes | None = None):
+        self.model = model
+        self.address = address or default_address()
+        self._authkey = authkey  # resolved on connect
+        self._conn: Connection | None = None
+        self._lock = threading.Lock()
+
+    def _call(self, request: dict[str, Any]) -> tuple[dict[str, Any], bytes | None]:
+        with self._lock:
+            if self._conn is None:
+                self._conn = Client(self.address, authkey=_authkey(self._authkey))
+            _send(self._conn, request)
+            header = json.loads(self._conn.recv_bytes())
+            payload = self._conn.recv_bytes() if header.get("ok") and "shape" in header else None
+        if not header.get("ok"):
+            raise RuntimeError(f"embedding service error: {header.get('error')}")
+        return header, payload
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        header, payload = self._call({"op": "embed", "model": self.model, "texts": list(texts)})
+        assert payload is not None
+        return np.frombuffer(payload, dtype="float32").reshape(header["shape"]).copy()
+
+    def info(self) -> dict[str, Any]:
+        return self._call({"op": "info"})[0]["info"]
+
+    def shutdown(self) -> None:
+        self._call({"op": "shutdown"})
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def service_available(address: Address | None = None, *, authkey: bytes | None = None) -> bool:
+    """True if a service answers ``ping`` at ``address``."""
+    address = address or default_address()
+    if isinstance(address, str) and not os.path.exists(address):
+        return False
+    client = EmbeddingServiceClient(address=address, authkey=authkey)
+    try:
+        client._call({"op": "ping"})
+        return True
+    except Exception:
+        return False
+    finally:
+        client.close()
+
+
+def config_mismatch(client: EmbeddingServiceClient, model: str, config: Any) -> str | None:
+    """Why the service would not embed ``model`` as ``config`` would, or None if it would.
+
+    Compares vector-relevant fields only (see ``config_fingerprint``), so a
+    service with a different batch size or thread count still matches.
+    """
+    served = client.info()["models"].get(model)
+    if served is None:
+        return f"does not serve the {model} model"
+    have = served["config"]
+    want = json.loads(json.dumps(config_fingerprint(config)))  # tuples -> lists, as on the wire
+    diff = [
+        f"{key}={have.get(key)!r} (want {want.get(key)!r})"
+        for key in sorted(have.keys() | want.keys())
+        if have.get(key) != want.get(key)
+    ]
+    return f"runs {model} with {', '.join(diff)}" if diff else None
+
+
+def get_embedder(
+    model: str,
+    *,
+    backend: str = "auto",
+    config: Any = None,
+    device: str = "cpu",
+    address: Address | None = None,
+):
+    """Embedder for ``model`` ("semantic" | "form").
+
+    ``backend="service"`` requires a running service; ``"local"`` loads the
+    model in-process; ``"auto"`` uses the service when one answers and its
+    model config matches ``config`` (default: the stock config), and loads
+    locally otherwise. With ``"service"`` and an explicit ``config``, a
+    mismatching service raises instead of silently embedding differently.
+    """
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"Unknown embed backend {backend!r}; expected one of {EMBED_BACKENDS}")
+    if model not in SERVICE_MODELS:
+        raise ValueError(f"Unknown model {model!r}; expected one of {SERVICE_MODELS}")
+    if backend == "service" or (backend == "auto" and service_available(address)):
+        client = EmbeddingServiceClient(model, address=address)
+        if backend == "service" and config is None:
+            return client
+        wanted = config or (BgeM3Config() if model == "semantic" else ByT5Config())
+        problem = config_mismatch(client, model, wanted)
+        if problem is None:
+            return client
+        client.close()
+        if backend == "service":
+            raise RuntimeError(f"embedding service {problem}")
+        print(f"[warn] embedding service {problem}; loading the {model} model locally", file=sys.stderr)
+    if model == "semantic":
+        return BgeM3Embedder(config=config)
+    return ByT5Embedder(config=config, device=device)
@@ -0,0 +1,301 @@
+"""Content-addressed, append-only embedding store.
+
+Vectors are keyed by ``(model id, model config, normalized text hash)`` rather
+than by corpus, so:
+
+- editing one gloss or appending lemmas only embeds the new texts;
+- corpora that contain the same text (identical glosses, shared lemmas) share
+  one stored vector.
+
+Layout under ``root``::
+
+    <model>_<config digest>/
+        manifest.json              model id, config, dim, dtype
+        shard_<stamp>.keys.npy     (n,) |S32 text-hash keys
+        shard_<stamp>.vecs.npy     (n, dim) vectors, row-aligned with keys
+        ...
+
+Shards are immutable and written atomically (temp file + rename); new vectors
+always go to a new shard. Shard names carry a nanosecond timestamp, the pid
+and a random suffix, so concurrent writers never pick the same name. Opening
+a store loads only the key index; ``.vecs.npy`` files are memory-mapped per
+lookup and released again, so a long-lived store holds no file handles.
+:meth:`EmbeddingStore.compact` merges many small shards into one.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+import uuid
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Sequence
+
+import numpy as np
+
+_WS_RE = re.compile(r"\s+")
+_KEY_DTYPE = "S32"
+_SHARD_RE = re.compile(r"shard_([0-9a-f_]+)\.keys\.npy$")
+
+# Config fields that change throughput but not the vectors themselves.
+NON_SEMANTIC_CONFIG_FIELDS = frozenset({
+    "batch_size", "max_tokens", "num_threads",
+    "concurrency", "requests_per_minute", "tokens_per_minute", "max_retries",
+})
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and collapse whitespace — the form texts are keyed by."""
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text or "")).strip()
+
+
+def text_key(text: str) -> bytes:
+    """32-hex-char BLAKE2b digest of the normalized text."""
+    return hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=16).hexdigest().encode("ascii")
+
+
+def config_fingerprint(config: Any) -> dict[str, Any]:
+    """Vector-relevant config fields as a plain dict (dataclass or mapping)."""
+    if config is None:
+        return {}
+    data = asdict(config) if is_dataclass(config) else dict(config)
+    return {k: v for k, v in sorted(data.items()) if k not in NON_SEMANTIC_CONFIG_FIELDS}
+
+
+def namespace_name(model_id: str, config: Any = None) -> str:
+    payload = json.dumps({"model": model_id, "config": config_fingerprint(config)}, sort_keys=True)
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+    safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in model_id)
+    return f"{safe}_{digest}"
+
+
+class EmbeddingStore:
+    """One model/config namespace of the content-addressed store."""
+
+    def __init__(self, root: Path, model_id: str, config: Any = None) -> None:
+        self.model_id = model_id
+        self.config = config_fingerprint(config)
+        self.path = Path(root) / namespace_name(model_id, config)
+        self._keys: dict[bytes, tuple[int, int]] = {}
+        self._shards: list[Path] = []  # .vecs.npy path per attached shard
+        self._shard_rows: list[int] = []
+        self._dim: int | None = None
+        self._dtype: str | None = None
+        self._load()
+
+    # -- loading -------------------------------------------------------------
+
+    def _shard_paths(self) -> list[tuple[Path, Path]]:
+        if not self.path.exists():
+            return []
+        out = []
+        for keys_path in sorted(self.path.glob("shard_*.keys.npy")):
+            vecs_path = keys_path.with_name(keys_path.name.replace(".keys.npy", ".vecs.npy"))
+            if _SHARD_RE.search(keys_path.name) and vecs_path.exists():
+                out.append((keys_path, vecs_path))
+        return out
+
+    def _load(self) -> None:
+        self._keys, self._shards, self._shard_rows = {}, [], []
+        manifest = self.path / "manifest.json"
+        if manifest.exists():
+            meta = json.loads(manifest.read_text(encoding="utf-8"))
+            self._dim = meta.get("dim")
+            self._dtype = meta.get("dtype")
+        for keys_path, vecs_path in self._shard_paths():
+            try:
+                keys = np.load(keys_path)
+            except FileNotFoundError:  # removed by a concurrent compact()
+                continue
+            self._attach(keys, vecs_path)
+
+    def _attach(self, keys: np.ndarray, vecs_path: Path) -> None:
+        shard = len(self._shards)
+        self._shards.append(vecs_path)
+        self._shard_rows.append(len(keys))
+        for row, key in enumerate(keys.tolist()):
+            self._keys.setdefault(key, (shard, row))
+
+    def refresh(self) -> None:
+        """Re-read the shard list, picking up other writers' shards and compactions."""
+        self._load()
+
+    # -- queries -------------------------------------------------------------
+
+    @property
+    def dim(self) -> int | None:
+        return self._dim
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, text: object) -> bool:
+        return isinstance(text, str) and text_key(text) in self._keys
+
+    def missing(self, texts: Iterable[str]) -> list[str]:
+        """Distinct texts (first spelling seen, input order) with no stored vector."""
+        out: dict[bytes, str] = {}
+        for text in texts:
+            key = text_key(text)
+            if key not in self._keys and key not in out:
+                out[key] = text
+        return list(out.values())
+
+    def get_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """Stack stored vectors for ``texts`` (in order) into a float32 matrix."""
+        if self._dim is None:
+            if texts:
+                raise KeyError("embedding store is empty")
+            return np.zeros((0, 0), dtype="float32")
+        try:
+            return self._gather(texts)
+        except FileNotFoundError:  # a shard was compacted away under us
+            self._load()
+            return self._gather(texts)
+
+    def _gather(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.empty((len(texts), self._dim), dtype="float32")
+        by_shard: dict[int, tuple[list[int], list[int]]] = {}
+        for i, text in enumerate(texts):
+            loc = self._keys.get(text_key(text))
+            if loc is None:
+                raise KeyError(f"no stored vector for text {text[:60]!r}")
+            dest, rows = by_shard.setdefault(loc[0], ([], []))
+            dest.append(i)
+            rows.append(loc[1])
+        for shard, (dest, rows) in by_shard.items():
+            vecs = np.load(self._shards[shard], mmap_mode="r")
+            out[dest] = vecs[rows]
+            del vecs  # drop the mapping (and its file handle) right away
+        return out
+
+    # -- writes --------------------------------------------------------------
+
+    def put(self, texts: Sequence[str], vectors: np.ndarray) -> int:
+        """Append vectors for texts not already stored; returns how many were written."""
+        vectors = np.asarray(vectors)
+        if vectors.ndim != 2 or len(texts) != vectors.shape[0]:
+            raise ValueError("texts and vectors must be row-aligned (n, dim)")
+        if self._dim is not None and vectors.shape[1] != self._dim:
+            raise ValueError(f"vector dim {vectors.shape[1]} != store dim {self._dim}")
+
+        keep_keys: list[bytes] = []
+        keep_rows: list[int] = []
+        seen: set[bytes] = set()
+        for i, text in enumerate(texts):
+            key = text_key(text)
+            if key in self._keys or key in seen:
+                continue
+            seen.add(key)
+            keep_keys.append(key)
+            keep_rows.append(i)
+        if not keep_keys:
+            return 0
+
+        dtype = self._dtype or str(vectors.dtype)
+        keys = np.asarray(keep_keys, dtype=_KEY_DTYPE)
+        vecs = np.ascontiguousarray(vectors[keep_rows], dtype=dtype)
+        self._write_shard(keys, vecs)
+        return len(keep_keys)
+
+    def _write_shard(self, keys: np.ndarray, vecs: np.ndarray) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        if self._dim is None or self._dtype is None:
+            self._dim, self._dtype = int(vecs.shape[1]), str(vecs.dtype)
+            manifest = {
+                "model_id": self.model_id,
+                "config": self.config,
+                "dim": self._dim,
+                "dtype": self._dtype,
+            }
+            (self.path / "manifest.json").write_text(
+                json.dumps(manifest, sort_keys=True, indent=2) + "\n", encoding="utf-8"
+            )
+        self._attach(keys, self._save_shard(keys, vecs))
+
+    def _save_shard(self, keys: np.ndarray, vecs: np.ndarray) -> Path:
+        # time-ordered and unique across processes: no shared counter to race on
+        stem = self.path / f"shard_{time.time_ns():019d}_{os.getpid():x}_{uuid.uuid4().hex[:8]}"
+        # vectors first, keys last: a shard only counts once its keys file exists
+        for suffix, array in ((".vecs.npy", vecs), (".keys.npy", keys)):
+            tmp = stem.with_name(stem.name + suffix + ".tmp")
+            with open(tmp, "wb") as fh:
+                np.save(fh, array)
+            os.replace(tmp, stem.with_name(stem.name + suffix))
+        return stem.with_name(stem.name + ".vecs.npy")
+
+    def compact(self, *, max_rows: int = 0) -> int:
+        """Merge shards into one, dropping duplicate keys; returns shards merged.
+
+        ``max_rows`` > 0 merges only shards with fewer rows than that, leaving
+        large shards alone. Concurrent writers are safe (their new shards are
+        not touched); a second concurrent ``compact`` is refused via a lock file.
+        """
+        self._load()
+        picked = [i for i, n in enumerate(self._shard_rows) if max_rows <= 0 or n < max_rows]
+        if len(picked) < 2:
+            return 0
+        lock = self.path / "compact.lock"
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            raise RuntimeError(f"compaction already running (remove {lock} if it is stale)") from None
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            by_shard: dict[int, tuple[list[int], list[int]]] = {i: ([], []) for i in picked}
+            merged: list[bytes] = []
+            for key, (shard, row) in self._keys.items():
+                if shard in by_shard:
+                    dest, rows = by_shard[shard]
+                    dest.append(len(merged))
+                    rows.append(row)
+                    merged.append(key)
+            keys = np.asarray(merged, dtype=_KEY_DTYPE)
+            vecs = np.empty((len(merged), self._dim), dtype=self._dtype)
+            for shard, (dest, rows) in by_shard.items():
+                src = np.load(self._shards[shard], mmap_mode="r")
+                vecs[dest] = src[rows]
+                del src
+            self._save_shard(keys, vecs)
+            for shard in picked:
+                vecs_path = self._shards[shard]
+                # keys first, so readers never see a keys file without vectors
+                vecs_path.with_name(vecs_path.name.replace(".vecs.npy", ".keys.npy")).unlink(missing_ok=True)
+                vecs_path.unlink(missing_ok=True)
+        finally:
+            lock.unlink(missing_ok=True)
+        self._load()
+        return len(picked)
+
+    def get_or_embed(
+        self,
+        texts: Sequence[str],
+        embed: Callable[[list[str]], np.ndarray],
+        *,
+        chunk_size: int = 0,
+    ) -> tuple[np.ndarray, int]:
+        """Embed only the texts not yet stored, then assemble the full matrix.
+
+        ``chunk_size`` > 0 embeds and persists missing texts in chunks, so an
+        interrupted run keeps what it finished. Returns ``(matrix, n_embedded)``.
+        """
+        todo = self.missing(texts)
+        step = chunk_size if chunk_size > 0 else max(len(todo), 1)
+        for start in range(0, len(todo), step):
+            batch = todo[start:start + step]
+            self.put(batch, embed(batch))
+        return self.get_matrix(texts), len(todo)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self.path),
+            "vectors": len(self._keys),
+            "shards": len(self._shards),
+            "dim": self._dim,
+            "dtype": self._dtype,
+        }
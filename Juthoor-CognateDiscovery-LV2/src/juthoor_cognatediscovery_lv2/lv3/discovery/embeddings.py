@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .batching import InferenceStats, TokenBudget, byte_length, run_batched, torch_threads
+from .quantization import cache_path, check_mode, default_cache_dir, load_or_quantize
 
 
 def _require(module: str, *, install_hint: str) -> None:
@@ -19,6 +24,14 @@ def l2_normalize(vectors):
     return vectors / norms
 
 
+def _cuda_available() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    return bool(torch.cuda.is_available())
+
+
 # ---------------------------------------------------------------------------
 # Cost estimation helpers (for API backend)
 # ---------------------------------------------------------------------------
@@ -52,8 +65,14 @@ def estimate_cost(
 @dataclass(frozen=True)
 class BgeM3Config:
     model_id: str = "BAAI/bge-m3"
-    use_fp16: bool = True
+    use_fp16: bool = True  # CUDA only; ignored on CPU
     max_length: int = 8192
+    quantize: str = "none"  # "none" | "int8" (dynamic int8 linears, CPU; see quantization.py)
+    # Scheduling (see batching.py): padded tokens per batch, texts per batch,
+    # torch CPU threads (0 = leave torch's setting alone).
+    max_tokens: int = 16_384
+    batch_size: int = 128
+    num_threads: int = 0
 
 
 class BgeM3Embedder:
@@ -63,9 +82,12 @@ class BgeM3Embedder:
     Output: L2-normalized 1024-dim vectors (same as former SONAR output).
     """
 
-    def __init__(self, *, config: BgeM3Config | None = None):
+    def __init__(self, *, config: BgeM3Config | None = None, cache_dir: Path | None = None):
         self.config = config or BgeM3Config()
+        check_mode(self.config.quantize)
+        self.cache_dir = cache_dir
         self._model = None
+        self.last_stats: InferenceStats | None = None
 
     def _get_model(self):
         _require(
@@ -75,22 +97,43 @@ class BgeM3Embedder:
         from FlagEmbedding import BGEM3FlagModel
 
         if self._model is None:
+            quantized = self.config.quantize == "int8"
             self._model = BGEM3FlagModel(
                 self.config.model_id,
-                use_fp16=self.config.use_fp16,
+                use_fp16=self.config.use_fp16 and not quantized and _cuda_available(),
             )
+            if quantized:
+                # The wrapper still loads fp32 weights; the cache saves the
+                # quantization pass and keeps the int8 module reproducible.
+                path = cache_path(self.cache_dir or default_cache_dir(), self.config.model_id, "bge-m3")
+                self._model.model, _ = load_or_quantize(path, lambda: self._model.model)
         return self._model
 
+    def _token_lengths(self, texts: list[str]) -> list[int]:
+        tokenizer = getattr(self._get_model(), "tokenizer", None)
+        if tokenizer is None:
+            return [max(1, len(t.encode("utf-8")) // 4) for t in texts]
+        ids = tokenizer(texts, add_special_tokens=True, truncation=True, max_length=self.config.max_length)
+        return [len(x) for x in ids["input_ids"]]
+
     def embed(self, texts: list[str]) -> "np.ndarray":
         import numpy as np
 
+        cfg = self.config
         model = self._get_model()
-        output = model.encode(
+        threads = torch_threads(cfg.num_threads)
+
+        def encode(batch: list[str]) -> "np.ndarray":
+            output = model.encode(batch, batch_size=len(batch), max_length=cfg.max_length)
+            return np.asarray(output["dense_vecs"], dtype="float32")
+
+        vecs, self.last_stats = run_batched(
             texts,
-            batch_size=12,
-            max_length=self.config.max_length,
+            encode,
+            budget=TokenBudget(cfg.max_tokens, cfg.batch_size, cfg.max_length),
+            lengths=self._token_lengths(list(texts)),
+            threads=threads,
         )
-        vecs = np.asarray(output["dense_vecs"], dtype="float32")
         return l2_normalize(vecs)
 
 
@@ -102,8 +145,16 @@ class BgeM3Embedder:
 @dataclass(frozen=True)
 class ByT5Config:
     model_id: str = "google/byt5-small"
-    pooling: str = "mean"  # "mean" | "cls"
-    batch_size: int = 16
+    pooling: str = "mean"  # "mean" (over non-padding bytes) | "cls"
+    # Bump whenever the vectors for a given config change (v2: mean pooling
+    # masks padding). It is part of the embedding-store namespace, so vectors
+    # cached under an older version are never reused.
+    vector_version: int = 2
+    batch_size: int = 64  # upper bound; batches are cut by max_tokens first
+    max_length: int = 1024
+    max_tokens: int = 8192
+    num_threads: int = 0  # torch CPU threads (0 = leave torch's setting alone)
+    quantize: str = "none"  # "none" | "int8" (dynamic int8 linears, CPU; see quantization.py)
 
 
 class ByT5Embedder:
@@ -114,11 +165,15 @@ class ByT5Embedder:
     Output: L2-normalized vectors (1472-dim for byt5-small).
     """
 
-    def __init__(self, *, config: ByT5Config | None = None, device: str = "cpu"):
+    def __init__(self, *, config: ByT5Config | None = None, device: str = "cpu", cache_dir: Path | None = None):
         self.config = config or ByT5Config()
+        if check_mode(self.config.quantize) == "int8" and device != "cpu":
+            raise ValueError("quantize='int8' is CPU-only; use device='cpu'")
         self.device = device
+        self.cache_dir = cache_dir
         self._tokenizer = None
         self._model = None
+        self.last_stats: InferenceStats | None = None
 
     def _load(self):
         _require(
@@ -135,9 +190,16 @@ class ByT5Embedder:
         if self._tokenizer is None:
             self._tokenizer = AutoTokenizer.from_pretrained(self.config.model_id)
         if self._model is None:
-            self._model = T5EncoderModel.from_pretrained(self.config.model_id)
+            if self.config.quantize == "int8":
+                # A cache hit skips loading the fp32 checkpoint entirely.
+                path = cache_path(self.cache_dir or default_cache_dir(), self.config.model_id, "byt5-encoder")
+                self._model, _ = load_or_quantize(
+                    path, lambda: T5EncoderModel.from_pretrained(self.config.model_id)
+                )
+            else:
+                self._model = T5EncoderModel.from_pretrained(self.config.model_id)
+                self._model.to(self.device)
             self._model.eval()
-            self._model.to(self.device)
         return torch
 
     def embed(self, texts: list[str]) -> "np.ndarray":
@@ -147,15 +209,15 @@ class ByT5Embedder:
         tokenizer = self._tokenizer
         model = self._model
         assert tokenizer is not None and model is not None
+        cfg = self.config
+        threads = torch_threads(cfg.num_threads)
 
-        all_vecs: list["np.ndarray"] = []
-        bs = self.config.batch_size
-        for i in range(0, len(texts), bs):
+        def encode(batch: list[str]) -> "np.ndarray":
             chunk = tokenizer(
-                texts[i : i + bs],
+                batch,
                 padding=True,
                 truncation=True,
-                max_length=1024,
+                max_length=cfg.max_length,
                 return_tensors="pt",
             )
             chunk = {k: v.to(self.device) for k, v in chunk.items()}
@@ -164,13 +226,22 @@ class ByT5Embedder:
                 outputs = model(**chunk)
 
             last = outputs.last_hidden_state  # [B, T, H]
-            if self.config.pooling == "cls":
+            if cfg.pooling == "cls":
                 pooled = last[:, 0, :]
             else:
-                pooled = last.mean(dim=1)
-            all_vecs.append(pooled.detach().cpu().numpy())
+                # Mask out padding so a text's vector does not depend on its batch.
+                mask = chunk["attention_mask"].unsqueeze(-1).to(last.dtype)
+                pooled = (last * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1.0)
+            return pooled.detach().cpu().numpy()
 
-        return l2_normalize(np.concatenate(all_vecs, axis=0))
+        vecs, self.last_stats = run_batched(
+            texts,
+            encode,
+            budget=TokenBudget(cfg.max_tokens, cfg.batch_size, cfg.max_length),
+            length_fn=byte_length,
+            threads=threads,
+        )
+        return l2_normalize(vecs)
 
 
 # ---------------------------------------------------------------------------
@@ -186,6 +257,10 @@ class GeminiConfig:
     dimensions: int = 1024  # flexible; matches BGE-M3 default
     task_type: str = "SEMANTIC_SIMILARITY"  # or "RETRIEVAL_DOCUMENT"
     batch_size: int = 100
+    concurrency: int = 4  # requests in flight
+    requests_per_minute: int = 0  # 0 = unlimited
+    tokens_per_minute: int = 0  # 0 = unlimited; counted with estimate_tokens()
+    max_retries: int = 6
 
 
 _PINNED_GEMINI_MODEL = "gemini-embedding-001"
@@ -194,11 +269,14 @@ _PINNED_GEMINI_MODEL = "gemini-embedding-001"
 class GeminiEmbedder:
     """Gemini embedding-001 via Google GenAI API (no local GPU needed).
 
-    Requires ``google-genai`` package and ``GOOGLE_API_KEY`` env var.
+    Requires ``google-genai`` (or ``$GEMINI_BASE_URL`` for the REST transport)
+    and ``GOOGLE_API_KEY``. Requests run concurrently under the config's rate
+    limits with retries; see :mod:`.gemini_async`. With ``store`` set, finished
+    batches are checkpointed so an interrupted run resumes where it stopped.
     Output: L2-normalized vectors of configurable dimensionality.
     """
 
-    def __init__(self, *, config: GeminiConfig | None = None):
+    def __init__(self, *, config: GeminiConfig | None = None, transport: Any = None, store: Any = None):
         self.config = config or GeminiConfig()
         if self.config.model_id != _PINNED_GEMINI_MODEL:
             import warnings
@@ -209,40 +287,16 @@ class GeminiEmbedder:
                 UserWarning,
                 stacklevel=2,
             )
-        self._client = None
-
-    def _get_client(self):
-        _require(
-            "google.genai",
-            install_hint="Install: `pip install google-genai`.",
-        )
-        if self._client is None:
-            from google import genai
-
-            self._client = genai.Client()
-        return self._client
+        self._transport = transport
+        self.store = store
+        self.last_usage: dict[str, Any] = {}
 
     def embed(self, texts: list[str]) -> "np.ndarray":
-        import numpy as np
-        from google.genai import types
+        from .gemini_async import AsyncGeminiEmbedder
 
-        client = self._get_client()
-        cfg = self.config
-        all_vecs: list[list[float]] = []
-
-        for i in range(0, len(texts), cfg.batch_size):
-            batch = texts[i : i + cfg.batch_size]
-            result = client.models.embed_content(
-                model=cfg.model_id,
-                contents=batch,
-                config=types.EmbedContentConfig(
-                    task_type=cfg.task_type,
-                    output_dimensionality=cfg.dimensions,
-                ),
-            )
-            for emb in result.embeddings:
-                all_vecs.append(emb.values)
-
-        vecs = np.asarray(all_vecs, dtype="float32")
-        return l2_normalize(vecs)
+        runner = AsyncGeminiEmbedder(config=self.config, transport=self._transport, store=self.store)
+        vecs = runner.embed(texts)
+        self._transport = runner.transport  # keep the client for the next call
+        self.last_usage = runner.last_usage
+        return vecs
 
@@ -0,0 +1,362 @@
+"""Concurrent, rate-limited, resumable client for Gemini embeddings.
+
+:class:`AsyncGeminiEmbedder` replaces the one-request-at-a-time loop of
+``GeminiEmbedder``:
+
+- up to ``GeminiConfig.concurrency`` ``batchEmbedContents`` requests are in flight;
+- :class:`TokenBucket` limiters keep within ``requests_per_minute`` and
+  ``tokens_per_minute`` (tokens counted with ``estimate_tokens``);
+- retryable failures (429, 5xx, timeouts, dropped connections) are retried
+  with capped exponential backoff and full jitter, honouring ``Retry-After``;
+- with a :class:`~.embedding_store.EmbeddingStore`, vectors are checkpointed
+  every ``checkpoint_every`` texts and on any exit (including Ctrl-C). The
+  store namespace is keyed by model id, dimensions and task type, so a rerun
+  after an interruption only requests the texts that are still missing.
+
+Transport: the REST endpoint via urllib (``$GEMINI_BASE_URL`` points it at a
+stand-in such as :mod:`.gemini_standin`) or the google-genai async client.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import random
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Protocol, Sequence
+
+import numpy as np
+
+from .embedding_store import EmbeddingStore, text_key
+from .embeddings import GeminiConfig, _require, estimate_tokens, l2_normalize
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+BASE_URL_ENV = "GEMINI_BASE_URL"
+RETRYABLE_STATUS = frozenset({0, 408, 429, 500, 502, 503, 504})
+
+
+class GeminiAPIError(RuntimeError):
+    """An embed request failed; ``status`` 0 means no HTTP response at all."""
+
+    def __init__(self, status: int, message: str, *, retry_after: float | None = None) -> None:
+        super().__init__(f"Gemini API error {status}: {message}")
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self) -> bool:
+        return self.status in RETRYABLE_STATUS
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting and retries
+# ---------------------------------------------------------------------------
+
+
+class TokenBucket:
+    """Async token bucket refilled at ``per_minute / 60`` units per second.
+
+    The bucket holds at most ``burst`` units (default: one second's worth), so
+    no minute ever sees much more than ``per_minute`` units. A request larger
+    than the bucket waits for a full bucket and then runs the balance
+    negative, so it cannot stall forever.
+    """
+
+    def __init__(self, per_minute: float, *, burst: float | None = None, clock=time.monotonic) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst or max(1.0, self.rate))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock: asyncio.Lock | None = None
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, n: float = 1.0) -> float:
+        """Wait until ``n`` units are available and take them; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        waited = 0.0
+        async with self._lock:
+            need = min(n, self.capacity)
+            while True:
+                self._refill()
+                if self._tokens >= need:
+                    self._tokens -= n
+                    return waited
+                delay = (need - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+    def debit(self, n: float) -> None:
+        """Take ``n`` units without waiting (settles an estimate against actual usage)."""
+        if self.rate > 0 and n > 0:
+            self._refill()
+            self._tokens -= n
+
+
+def retry_delay(
+    attempt: int,
+    *,
+    base: float = 1.0,
+    cap: float = 60.0,
+    retry_after: float | None = None,
+    rng: random.Random | None = None,
+) -> float:
+    """Full-jitter backoff: uniform(0, min(cap, base·2^attempt)), at least ``retry_after``."""
+    delay = (rng or random).uniform(0.0, min(cap, base * (2 ** attempt)))
+    return max(delay, retry_after or 0.0)
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+
+class GeminiTransport(Protocol):
+    async def embed(self, texts: list[str], config: GeminiConfig) -> list[list[float]]: ...
+
+
+class RestTransport:
+    """``models/{model}:batchEmbedContents`` over HTTPS with the stdlib (one thread per request)."""
+
+    def __init__(self, base_url: str | None = None, *, api_key: str | None = None, timeout: float = 60.0) -> None:
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV) or GEMINI_BASE_URL).rstrip("/")
+        self.api_key = api_key or os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY") or ""
+        self.timeout = timeout
+
+    def _post(self, texts: list[str], config: GeminiConfig) -> list[list[float]]:
+        model = f"models/{config.model_id}"
+        body = {
+            "requests": [
+                {
+                    "model": model,
+                    "content": {"parts": [{"text": t}]},
+                    "taskType": config.task_type,
+                    "outputDimensionality": config.dimensions,
+                }
+                for t in texts
+            ]
+        }
+        req = urllib.request.Request(
+            f"{self.base_url}/v1beta/{model}:batchEmbedContents",
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                payload = json.loads(resp.read())
+        except urllib.error.HTTPError as exc:
+            retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            raise GeminiAPIError(
+                exc.code,
+                exc.read().decode("utf-8", "replace")[:300],
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            ) from exc
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+            raise GeminiAPIError(0, str(exc)) from exc
+        embeddings = payload.get("embeddings") or []
+        if len(embeddings) != len(texts):
+            raise GeminiAPIError(0, f"expected {len(texts)} embeddings, got {len(embeddings)}")
+        return [e["values"] for e in embeddings]
+
+    async def embed(self, texts: list[str], config: GeminiConfig) -> list[list[float]]:
+        return await asyncio.to_thread(self._post, texts, config)
+
+
+class GenaiTransport:
+    """The google-genai SDK's async client (``client.aio``)."""
+
+    def __init__(self) -> None:
+        _require("google.genai", install_hint="Install: `pip install google-genai`.")
+        from google import genai
+
+        self._client = genai.Client()
+
+    async def embed(self, texts: list[str], config: GeminiConfig) -> list[list[float]]:
+        from google.genai import errors, types
+
+        try:
+            result = await self._client.aio.models.embed_content(
+                model=config.model_id,
+                contents=texts,
+                config=types.EmbedContentConfig(
+                    task_type=config.task_type,
+                    output_dimensionality=config.dimensions,
+                ),
+            )
+        except errors.APIError as exc:
+            raise GeminiAPIError(int(getattr(exc, "code", 0) or 0), str(exc)) from exc
+        return [emb.values for emb in result.embeddings]
+
+
+def default_transport() -> GeminiTransport:
+    """REST if ``$GEMINI_BASE_URL`` is set or google-genai is missing, else the SDK."""
+    if os.environ.get(BASE_URL_ENV):
+        return RestTransport()
+    try:
+        import google.genai  # noqa: F401
+    except ImportError:
+        return RestTransport()
+    return GenaiTransport()
+
+
+# ---------------------------------------------------------------------------
+# Embedder
+# ---------------------------------------------------------------------------
+
+
+class AsyncGeminiEmbedder:
+    """Drop-in ``embed(texts)`` for the Gemini backend, plus ``await aembed(texts)``."""
+
+    def __init__(
+        self,
+        *,
+        config: GeminiConfig | None = None,
+        transport: GeminiTransport | None = None,
+        store: EmbeddingStore | None = None,
+        store_root: Path | None = None,
+        checkpoint_every: int = 2000,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        seed: int | None = None,
+    ) -> None:
+        self.config = config or GeminiConfig()
+        self._transport = transport
+        if store is None and store_root is not None:
+            store = EmbeddingStore(store_root, self.config.model_id, self.config)
+        self.store = store
+        self.checkpoint_every = checkpoint_every
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._rng = random.Random(seed)
+        self.last_usage: dict[str, Any] = {}
+
+    @property
+    def transport(self) -> GeminiTransport:
+        if self._transport is None:
+            self._transport = default_transport()
+        return self._transport
+
+    async def _request(
+        self,
+        batch: list[str],
+        gate: asyncio.Semaphore,
+        rpm: TokenBucket,
+        tpm: TokenBucket,
+    ) -> np.ndarray:
+        cfg = self.config
+        n_tokens = estimate_tokens(batch)
+        async with gate:
+            for attempt in range(cfg.max_retries + 1):
+                await rpm.acquire(1)
+                await tpm.acquire(n_tokens)
+                self.last_usage["requests"] += 1
+                self.last_usage["est_tokens"] += n_tokens
+                try:
+                    values = await self.transport.embed(batch, cfg)
+                    return np.asarray(values, dtype="float32")
+                except GeminiAPIError as exc:
+                    if not exc.retryable or attempt == cfg.max_retries:
+                        raise
+                    self.last_usage["retries"] += 1
+                    await asyncio.sleep(retry_delay(
+                        attempt,
+                        base=self.backoff_base,
+                        cap=self.backoff_cap,
+                        retry_after=exc.retry_after,
+                        rng=self._rng,
+                    ))
+        raise AssertionError("unreachable")
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed ``texts`` (input order, L2-normalized), requesting only what is not stored."""
+        cfg = self.config
+        texts = list(texts)
+        store = self.store
+        if store is not None:
+            todo = store.missing(texts)
+        else:
+            first: dict[bytes, str] = {}
+            for text in texts:
+                first.setdefault(text_key(text), text)
+            todo = list(first.values())
+        self.last_usage = {
+            "texts": len(texts),
+            "sent": len(todo),
+            "requests": 0,
+            "retries": 0,
+            "est_tokens": 0,
+        }
+
+        gate = asyncio.Semaphore(max(1, cfg.concurrency))
+        rpm = TokenBucket(cfg.requests_per_minute)
+        tpm = TokenBucket(cfg.tokens_per_minute)
+        done: dict[bytes, np.ndarray] = {}
+        pending_texts: list[str] = []
+        pending_vecs: list[np.ndarray] = []
+
+        def checkpoint() -> None:
+            if store is not None and pending_texts:
+                store.put(pending_texts, np.concatenate(pending_vecs, axis=0))
+            pending_texts.clear()
+            pending_vecs.clear()
+
+        async def run(batch: list[str]) -> tuple[list[str], np.ndarray]:
+            return batch, await self._request(batch, gate, rpm, tpm)
+
+        batches = [todo[i:i + cfg.batch_size] for i in range(0, len(todo), cfg.batch_size)]
+        tasks = [asyncio.ensure_future(run(b)) for b in batches]
+        consumed: set[int] = set()
+
+        def collect(batch: list[str], vecs: np.ndarray) -> None:
+            vecs = l2_normalize(vecs)
+            if store is None:
+                done.update(zip(map(text_key, batch), vecs))
+                return
+            pending_texts.extend(batch)
+            pending_vecs.append(vecs)
+            if len(pending_texts) >= self.checkpoint_every:
+                checkpoint()
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                batch, vecs = await next_done
+                consumed.add(id(batch))
+                collect(batch, vecs)
+        finally:
+            # On failure or interruption, stop the rest but keep every batch
+            # that did finish, so a rerun only requests what is still missing.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for task in tasks:
+                if task.cancelled() or task.exception() is not None:
+                    continue
+                batch, vecs = task.result()
+                if id(batch) not in consumed:
+                    collect(batch, vecs)
+            checkpoint()
+
+        if store is not None:
+            return store.get_matrix(texts)
+        if not texts:
+            return np.zeros((0, cfg.dimensions), dtype="float32")
+        return np.stack([done[text_key(t)] for t in texts])
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Synchronous wrapper around :meth:`aembed` (not for use inside a running loop)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.aembed(texts))
+        raise RuntimeError("AsyncGeminiEmbedder.embed() called inside an event loop; use `await aembed()`")
@@ -0,0 +1,138 @@
+"""Local stand-in for the Gemini ``batchEmbedContents`` endpoint.
+
+Serves deterministic pseudo-embeddings (seeded by the text's store key) in
+the same JSON shape as ``POST /v1beta/models/{model}:batchEmbedContents``, so
+:class:`~.gemini_async.RestTransport` can be exercised without a key or
+network access, e.g. in tests or for a dry run of the ``backend="api"`` path:
+
+    with GeminiStandIn() as server:
+        os.environ["GEMINI_BASE_URL"] = server.base_url
+        ...
+
+Failures can be injected: ``fail_next(n, status)`` makes the next ``n``
+requests fail with ``status`` (default 429, with ``Retry-After: 0``), and
+``respond_with(200, 200, 400)`` scripts a sequence.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import numpy as np
+
+from .embedding_store import text_key
+
+_PATH_PREFIX = "/v1beta/models/"
+_PATH_SUFFIX = ":batchEmbedContents"
+
+
+def standin_vector(text: str, dim: int) -> np.ndarray:
+    """The unit vector the stand-in returns for ``text`` (normalized spelling)."""
+    seed = int(text_key(text)[:16], 16)
+    vec = np.random.default_rng(seed).standard_normal(dim).astype("float32")
+    return vec / np.linalg.norm(vec)
+
+
+class GeminiStandIn:
+    """Threaded HTTP server on 127.0.0.1 that records every request it sees."""
+
+    def __init__(self, *, port: int = 0, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests: list[dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures: list[int] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, n: int, status: int = 429) -> None:
+        self.respond_with(*[status] * n)
+
+    def respond_with(self, *statuses: int) -> None:
+        """Queue statuses for the next requests (200 = serve normally)."""
+        with self._lock:
+            self._failures.extend(statuses)
+
+    @property
+    def texts_served(self) -> int:
+        return sum(len(r["texts"]) for r in self.requests if r["status"] == 200)
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:  # keep test output quiet
+                pass
+
+            def _reply(self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                if not (self.path.startswith(_PATH_PREFIX) and self.path.endswith(_PATH_SUFFIX)):
+                    self._reply(404, {"error": {"code": 404, "message": f"no route {self.path}"}})
+                    return
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                reqs = payload.get("requests", [])
+                texts = [r["content"]["parts"][0]["text"] for r in reqs]
+                with standin._lock:
+                    status = standin._failures.pop(0) if standin._failures else 200
+                    standin.in_flight += 1
+                    standin.max_in_flight = max(standin.max_in_flight, standin.in_flight)
+                    standin.requests.append({
+                        "model": self.path[len(_PATH_PREFIX):-len(_PATH_SUFFIX)],
+                        "texts": texts,
+                        "task_type": reqs[0].get("taskType") if reqs else None,
+                        "status": status,
+                        "time": time.monotonic(),
+                    })
+                try:
+                    if standin.latency:
+                        time.sleep(standin.latency)
+                    if status != 200:
+                        self._reply(status, {"error": {"code": status, "message": "injected failure"}},
+                                    {"Retry-After": "0"} if status == 429 else None)
+                        return
+                    embeddings = [
+                        {"values": standin_vector(t, int(r.get("outputDimensionality") or 3072)).tolist()}
+                        for t, r in zip(texts, reqs)
+                    ]
+                    self._reply(200, {"embeddings": embeddings})
+                finally:
+                    with standin._lock:
+                        standin.in_flight -= 1
+
+        return Handler
+
+    def start(self) -> "GeminiStandIn":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "GeminiStandIn":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
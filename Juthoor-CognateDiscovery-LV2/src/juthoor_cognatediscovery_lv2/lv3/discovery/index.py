@@ -1,7 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass, fields, replace
 from pathlib import Path
+from typing import Any
+
+from .numpy_index import NumpyFlatIndex
+from .vector_store import add_in_blocks
+
+
+def faiss_available() -> bool:
+    try:
+        import faiss  # noqa: F401
+    except Exception:
+        return False
+    return True
 
 
 def _require_faiss() -> None:
@@ -13,19 +28,230 @@ def _require_faiss() -> None:
         ) from exc
 
 
+# ---------------------------------------------------------------------------
+# Index recipes
+# ---------------------------------------------------------------------------
+
+INDEX_KINDS = ("flat", "ivf_flat", "ivf_pq", "hnsw", "opq_ivf_pq", "numpy")
+
+# FAISS warns below ~39 training points per IVF centroid / PQ code.
+_MIN_POINTS_PER_CENTROID = 39
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """How to build (and search) an inner-product FAISS index.
+
+    ``kind`` is one of ``INDEX_KINDS``; ``"numpy"`` is the FAISS-free exact
+    :class:`~.numpy_index.NumpyFlatIndex` (tuned by ``block_rows`` /
+    ``query_block`` / ``threads``, 0 = default). Zero-valued sizes are resolved from the
+    corpus at build time (see ``resolve``): ``nlist`` ≈ 4·sqrt(n), ``pq_m`` = the
+    largest divisor of ``dim`` that is ≤ 64. ``nprobe`` / ``ef_search`` are search
+    knobs only; they do not change the stored index.
+
+    String form for CLIs: ``"ivf_pq:nlist=4096,pq_m=64,nprobe=32"``.
+    """
+
+    kind: str = "flat"
+    nlist: int = 0
+    pq_m: int = 0
+    pq_nbits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    train_size: int = 0
+    seed: int = 0
+    nprobe: int = 16
+    ef_search: int = 128
+    block_rows: int = 16_384
+    query_block: int = 256
+    threads: int = 0
+
+    def __post_init__(self) -> None:
+        if self.kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind {self.kind!r}; expected one of {INDEX_KINDS}")
+
+    @classmethod
+    def from_string(cls, text: str) -> "IndexSpec":
+        kind, _, params = text.strip().partition(":")
+        known = {f.name for f in fields(cls)}
+        kwargs: dict[str, Any] = {}
+        for item in filter(None, (p.strip() for p in params.split(","))):
+            key, sep, value = item.partition("=")
+            key = key.strip()
+            if not sep or key not in known or key == "kind":
+                raise ValueError(f"Bad index parameter {item!r} in {text!r}")
+            kwargs[key] = int(value)
+        return cls(kind=kind.strip() or "flat", **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "IndexSpec":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @property
+    def is_ivf(self) -> bool:
+        return self.kind in ("ivf_flat", "ivf_pq", "opq_ivf_pq")
+
+    @property
+    def uses_pq(self) -> bool:
+        return self.kind in ("ivf_pq", "opq_ivf_pq")
+
+    def resolve(self, n_vectors: int, dim: int) -> "IndexSpec":
+        """Fill in corpus-dependent sizes (nlist, pq_m, train_size)."""
+        spec = self
+        if spec.is_ivf and spec.nlist <= 0:
+            nlist = int(4 * math.sqrt(max(n_vectors, 1)))
+            nlist = min(nlist, max(1, n_vectors // _MIN_POINTS_PER_CENTROID))
+            spec = replace(spec, nlist=max(1, nlist))
+        if spec.uses_pq:
+            if spec.pq_m <= 0:
+                spec = replace(spec, pq_m=max(d for d in range(1, min(dim, 64) + 1) if dim % d == 0))
+            elif dim % spec.pq_m:
+                raise ValueError(f"pq_m={spec.pq_m} must divide the vector dimension {dim}")
+        if spec.train_size <= 0 and spec.kind not in ("flat", "hnsw", "numpy"):
+            need = spec.nlist if spec.is_ivf else 0
+            if spec.uses_pq:
+                need = max(need, 1 << spec.pq_nbits)
+            spec = replace(spec, train_size=min(n_vectors, max(need * _MIN_POINTS_PER_CENTROID, 10_000)))
+        return spec
+
+    def factory_string(self) -> str:
+        """The ``faiss.index_factory`` description for a resolved spec."""
+        if self.kind == "flat":
+            return "Flat"
+        if self.kind == "numpy":
+            return "NumpyFlatIP"  # not a FAISS factory string; see build_index
+        if self.kind == "hnsw":
+            return f"HNSW{self.hnsw_m},Flat"
+        if self.kind == "ivf_flat":
+            return f"IVF{self.nlist},Flat"
+        pq = f"PQ{self.pq_m}x{self.pq_nbits}"
+        if self.kind == "ivf_pq":
+            return f"IVF{self.nlist},{pq}"
+        return f"OPQ{self.pq_m},IVF{self.nlist},{pq}"
+
+    def slug(self) -> str:
+        """Filesystem-safe name covering the build parameters (not search knobs)."""
+        if self.kind in ("flat", "numpy"):
+            return self.kind
+        if self.kind == "hnsw":
+            return f"hnsw{self.hnsw_m}_ef{self.ef_construction}"
+        parts = [self.kind, f"nl{self.nlist}"]
+        if self.uses_pq:
+            parts.append(f"m{self.pq_m}x{self.pq_nbits}")
+        return "_".join(parts)
+
+
+def with_fallback(spec: IndexSpec | None = None) -> IndexSpec:
+    """``spec``, or an exact ``"numpy"`` spec when FAISS is not installed."""
+    spec = spec or IndexSpec()
+    if spec.kind == "numpy" or faiss_available():
+        return spec
+    print(
+        f"[warn] faiss is not installed; using exact NumPy search instead of {spec.kind!r}.",
+        file=sys.stderr,
+    )
+    return replace(spec, kind="numpy")
+
+
+def select_train_sample(vectors, n: int, seed: int = 0):
+    """Uniform random sample of ``n`` rows (all rows if ``n`` covers the corpus)."""
+    import numpy as np
+
+    total = int(vectors.shape[0])
+    if n <= 0 or n >= total:
+        return np.ascontiguousarray(vectors, dtype="float32")
+    rng = np.random.default_rng(seed)
+    picks = np.sort(rng.choice(total, size=n, replace=False))
+    return np.ascontiguousarray(vectors[picks], dtype="float32")
+
+
+def set_search_params(index, *, nprobe: int | None = None, ef_search: int | None = None) -> None:
+    """Apply IVF ``nprobe`` / HNSW ``efSearch`` to ``index`` (no-op where not applicable)."""
+    if isinstance(index, NumpyFlatIndex):
+        return
+    _require_faiss()
+    import faiss
+
+    if nprobe:
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = int(nprobe)
+    if ef_search:
+        hnsw = getattr(faiss.downcast_index(index), "hnsw", None)
+        if hnsw is not None:
+            hnsw.efSearch = int(ef_search)
+
+
+def build_index(vectors, spec: IndexSpec | None = None, *, add_batch_size: int = 65_536):
+    """Build an inner-product index following ``spec``.
+
+    Returns ``(index, dim, resolved_spec)``. Trainable indexes are trained on a
+    ``select_train_sample`` subset; vectors are added in batches, so an
+    ``np.memmap`` or ``VectorMatrix`` is streamed rather than loaded whole.
+    A ``"numpy"`` spec wraps ``vectors`` in a NumpyFlatIndex without copying.
+    """
+    n, dim = int(vectors.shape[0]), int(vectors.shape[1])
+    spec = (spec or IndexSpec()).resolve(n, dim)
+    if spec.kind == "numpy":
+        index = NumpyFlatIndex.from_vectors(
+            vectors, block_rows=spec.block_rows, query_block=spec.query_block, threads=spec.threads
+        )
+        return index, dim, spec
+
+    _require_faiss()
+    import faiss
+
+    index = faiss.index_factory(dim, spec.factory_string(), faiss.METRIC_INNER_PRODUCT)
+    if spec.kind == "hnsw":
+        faiss.downcast_index(index).hnsw.efConstruction = spec.ef_construction
+    if not index.is_trained:
+        index.train(select_train_sample(vectors, spec.train_size, spec.seed))
+    add_in_blocks(index, vectors, add_batch_size)
+    set_search_params(index, nprobe=spec.nprobe, ef_search=spec.ef_search)
+    return index, dim, spec
+
+
+# ---------------------------------------------------------------------------
+# Persistence
+# ---------------------------------------------------------------------------
+
+
 @dataclass(frozen=True)
 class FaissIndex:
     index_path: Path
     meta_path: Path
     dim: int
 
-    def save(self, index) -> None:
+    def save(self, index, spec: IndexSpec | None = None) -> None:
         _require_faiss()
         import faiss
 
         self.index_path.parent.mkdir(parents=True, exist_ok=True)
         faiss.write_index(index, str(self.index_path))
-        self.meta_path.write_text(f'{{"dim": {self.dim}}}\n', encoding="utf-8")
+        self.write_meta(spec, ntotal=int(index.ntotal))
+
+    def write_meta(self, spec: IndexSpec | None = None, **extra: Any) -> None:
+        meta: dict[str, Any] = {"dim": self.dim}
+        if spec is not None:
+            meta["recipe"] = spec.to_dict()
+            meta["factory"] = spec.factory_string()
+        meta.update(extra)
+        self.meta_path.parent.mkdir(parents=True, exist_ok=True)
+        self.meta_path.write_text(json.dumps(meta, sort_keys=True) + "\n", encoding="utf-8")
+
+    def read_meta(self) -> dict[str, Any]:
+        if not self.meta_path.exists():
+            return {}
+        return json.loads(self.meta_path.read_text(encoding="utf-8"))
+
+    def recipe(self) -> IndexSpec:
+        """The persisted build recipe (a flat index for metadata written before recipes)."""
+        recipe = self.read_meta().get("recipe")
+        return IndexSpec.from_dict(recipe) if recipe else IndexSpec()
 
     def load(self):
         _require_faiss()
@@ -40,5 +266,5 @@ def build_flat_ip(vectors):
 
     dim = int(vectors.shape[1])
     index = faiss.IndexFlatIP(dim)
-    index.add(vectors)
+    add_in_blocks(index, vectors)
     return index, dim
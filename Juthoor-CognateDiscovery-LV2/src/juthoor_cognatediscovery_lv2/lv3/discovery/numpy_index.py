@@ -0,0 +1,151 @@
+"""Exact inner-product top-k in pure NumPy (FAISS-free fallback).
+
+:class:`NumpyFlatIndex` mirrors the part of the FAISS index API that
+retrieval uses (``d``, ``ntotal``, ``add``, ``search``), so it can stand in
+for ``IndexFlatIP`` when faiss-cpu is not installed. It can also be chosen on
+purpose (``IndexSpec(kind="numpy")``) for small corpora, where it needs no
+build step and no index file.
+
+Search is blocked: queries are processed ``query_block`` at a time against
+``block_rows`` target rows at a time, keeping a running top-k per query with
+``argpartition``. The target matrix is only read block by block, so it can
+stay an ``np.memmap`` or a dequantize-on-read ``VectorMatrix``. Peak scratch
+memory is about ``threads × query_block × block_rows × 4`` bytes plus one
+dequantized block per thread. Target blocks are split across ``threads``
+worker threads (NumPy's matmul releases the GIL) and the per-thread top-k
+lists are merged at the end.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+
+# FAISS fills missing inner-product results with -FLT_MAX and id -1.
+_MISSING_SCORE = -np.finfo("float32").max
+
+
+def _default_threads() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _topk(scores: np.ndarray, ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise top-k (unordered) of ``scores`` with the matching ``ids``."""
+    if scores.shape[1] <= k:
+        return scores, ids
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, part, axis=1), np.take_along_axis(ids, part, axis=1)
+
+
+def _merge(a: tuple[np.ndarray, np.ndarray], b: tuple[np.ndarray, np.ndarray], k: int):
+    return _topk(np.concatenate([a[0], b[0]], axis=1), np.concatenate([a[1], b[1]], axis=1), k)
+
+
+class NumpyFlatIndex:
+    """Exact inner-product search over one or more (possibly memory-mapped) matrices."""
+
+    is_trained = True
+
+    def __init__(
+        self,
+        d: int,
+        *,
+        block_rows: int = 16_384,
+        query_block: int = 256,
+        threads: int = 0,
+    ) -> None:
+        if block_rows <= 0 or query_block <= 0:
+            raise ValueError("block_rows and query_block must be > 0")
+        self.d = int(d)
+        self.block_rows = int(block_rows)
+        self.query_block = int(query_block)
+        self.threads = int(threads) if threads > 0 else _default_threads()
+        self._parts: list[Any] = []
+        self._offsets: list[int] = []
+        self.ntotal = 0
+
+    @classmethod
+    def from_vectors(cls, vectors, **kwargs) -> "NumpyFlatIndex":
+        """Wrap ``vectors`` (ndarray, memmap or VectorMatrix) without copying it."""
+        index = cls(int(vectors.shape[1]), **kwargs)
+        index._attach(vectors)
+        return index
+
+    def _attach(self, vectors) -> None:
+        if int(vectors.shape[1]) != self.d:
+            raise ValueError(f"vector dim {vectors.shape[1]} != index dim {self.d}")
+        self._offsets.append(self.ntotal)
+        self._parts.append(vectors)
+        self.ntotal += int(vectors.shape[0])
+
+    def add(self, vectors) -> None:
+        """Append a copy of ``vectors`` (FAISS semantics: the caller may reuse its buffer)."""
+        self._attach(np.array(vectors, dtype="float32", copy=True, ndmin=2))
+
+    def reset(self) -> None:
+        self._parts, self._offsets, self.ntotal = [], [], 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(getattr(p, "nbytes", 0) for p in self._parts))
+
+    def _spans(self) -> list[tuple[Any, int, int, int]]:
+        """``(part, start, stop, global offset of start)`` for every target block."""
+        spans = []
+        for part, offset in zip(self._parts, self._offsets):
+            for start in range(0, int(part.shape[0]), self.block_rows):
+                stop = min(start + self.block_rows, int(part.shape[0]))
+                spans.append((part, start, stop, offset + start))
+        return spans
+
+    def _scan(self, queries: np.ndarray, spans, k: int) -> tuple[np.ndarray, np.ndarray]:
+        nq = len(queries)
+        best = (
+            np.full((nq, k), _MISSING_SCORE, dtype="float32"),
+            np.full((nq, k), -1, dtype="int64"),
+        )
+        for part, start, stop, offset in spans:
+            block = np.asarray(part[start:stop], dtype="float32")
+            scores = queries @ block.T
+            ids = np.broadcast_to(np.arange(offset, offset + (stop - start), dtype="int64"), scores.shape)
+            best = _merge(best, _topk(scores, ids, k), k)
+        return best
+
+    def search(self, queries, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Top-``k`` inner products per query, best first: ``(scores, ids)``."""
+        k = int(k)
+        if k <= 0:
+            raise ValueError("k must be > 0")
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype="float32")
+        if queries.shape[1] != self.d:
+            raise ValueError(f"query dim {queries.shape[1]} != index dim {self.d}")
+        nq = len(queries)
+        out_s = np.full((nq, k), _MISSING_SCORE, dtype="float32")
+        out_i = np.full((nq, k), -1, dtype="int64")
+        spans = self._spans()
+        if not nq or not spans:
+            return out_s, out_i
+
+        n_workers = min(self.threads, len(spans))
+        groups = [spans[w::n_workers] for w in range(n_workers)]
+        pool = ThreadPoolExecutor(n_workers) if n_workers > 1 else None
+        try:
+            for q0 in range(0, nq, self.query_block):
+                qb = queries[q0:q0 + self.query_block]
+                if pool is None:
+                    s, i = self._scan(qb, spans, k)
+                else:
+                    partials = list(pool.map(lambda g: self._scan(qb, g, k), groups))
+                    s, i = partials[0]
+                    for other in partials[1:]:
+                        s, i = _merge((s, i), other, k)
+                order = np.lexsort((i, -s), axis=-1)  # best score first, ties by id
+                out_s[q0:q0 + len(qb)] = np.take_along_axis(s, order, axis=1)
+                out_i[q0:q0 + len(qb)] = np.take_along_axis(i, order, axis=1)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        out_i[out_s <= _MISSING_SCORE] = -1
+        return out_s, out_i
@@ -0,0 +1,180 @@
+"""Dynamic int8 quantization for CPU encoder inference, plus an accuracy guard.
+
+``quantize="int8"`` on :class:`~.embeddings.ByT5Config` /
+:class:`~.embeddings.BgeM3Config` replaces every ``nn.Linear`` in the encoder
+with a dynamically quantized one (int8 weights, activations quantized per
+batch at run time). Embedding tables and layer norms stay float32. On CPU this
+typically gives ~2x throughput and ~3-4x smaller linear weights.
+
+The quantized module is pickled under :func:`default_cache_dir` together with
+the torch/transformers versions it was built with. A version mismatch
+triggers a rebuild.
+
+Quantized vectors are not bit-identical to fp32 ones. Before switching a
+corpus run over, check them with :func:`agreement_report` and
+:class:`AccuracyGuard` (``scripts/discovery/bench_quantized_embedders.py``
+does this on the benchmark corpora).
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+QUANTIZE_MODES = ("none", "int8")
+CACHE_ENV = "JUTHOOR_QUANTIZED_CACHE"
+
+
+def check_mode(mode: str) -> str:
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(f"Unknown quantize mode {mode!r}; expected one of {QUANTIZE_MODES}")
+    return mode
+
+
+def default_cache_dir() -> Path:
+    """``$JUTHOOR_QUANTIZED_CACHE`` or ``~/.cache/juthoor/quantized``."""
+    env = os.environ.get(CACHE_ENV)
+    return Path(env) if env else Path.home() / ".cache" / "juthoor" / "quantized"
+
+
+def cache_path(cache_dir: Path, model_id: str, part: str, mode: str = "int8") -> Path:
+    safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in model_id)
+    return Path(cache_dir) / f"{safe}.{part}.{mode}.pt"
+
+
+def _versions() -> dict[str, str]:
+    import torch
+
+    out = {"torch": str(torch.__version__)}
+    try:
+        import transformers
+
+        out["transformers"] = str(transformers.__version__)
+    except ImportError:
+        pass
+    return out
+
+
+def quantize_linear_int8(module: Any) -> Any:
+    """Dynamic int8 quantization of all ``nn.Linear`` layers (CPU only)."""
+    import torch
+
+    try:
+        from torch.ao.quantization import quantize_dynamic
+    except ImportError:  # torch < 1.10
+        from torch.quantization import quantize_dynamic
+
+    module = module.to("cpu").float().eval()
+    return quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_or_quantize(path: Path, build) -> tuple[Any, bool]:
+    """Return ``(quantized module, from_cache)``.
+
+    Loads the pickled module at ``path`` if it was written by the current
+    torch/transformers versions; otherwise calls ``build()`` for the fp32
+    module, quantizes it and writes the cache (temp file + rename).
+    """
+    import torch
+
+    path = Path(path)
+    meta_path = path.with_suffix(".json")
+    versions = _versions()
+    if path.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("versions") == versions:
+            return torch.load(path, map_location="cpu", weights_only=False), True
+
+    module = quantize_linear_int8(build())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    torch.save(module, tmp)
+    os.replace(tmp, path)
+    meta_path.write_text(json.dumps({"versions": versions}, indent=2) + "\n", encoding="utf-8")
+    return module, False
+
+
+# ---------------------------------------------------------------------------
+# Accuracy guard
+# ---------------------------------------------------------------------------
+
+
+def cosine_agreement(ref: np.ndarray, test: np.ndarray) -> np.ndarray:
+    """Per-row cosine between the fp32 and quantized vector of each text."""
+    ref = np.asarray(ref, dtype="float32")
+    test = np.asarray(test, dtype="float32")
+    if ref.shape != test.shape:
+        raise ValueError(f"shape mismatch {ref.shape} vs {test.shape}")
+    num = (ref * test).sum(axis=1)
+    den = np.linalg.norm(ref, axis=1) * np.linalg.norm(test, axis=1)
+    return num / np.where(den > 0, den, 1.0)
+
+
+def _topk_ids(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ vectors.T
+    scores[np.arange(len(queries)), np.arange(len(queries))] = -np.inf  # drop self-match
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return top
+
+
+def neighbour_recall(ref: np.ndarray, test: np.ndarray, k: int = 10, *, max_queries: int = 1000, seed: int = 0) -> float:
+    """Mean overlap of each text's fp32 top-k neighbours with its quantized top-k."""
+    ref = np.asarray(ref, dtype="float32")
+    test = np.asarray(test, dtype="float32")
+    n = len(ref)
+    k = min(k, n - 1)
+    if k <= 0:
+        return 1.0
+    rows = np.arange(n)
+    if n > max_queries:
+        rows = np.sort(np.random.default_rng(seed).choice(n, size=max_queries, replace=False))
+    # put the sampled queries first so the self-match sits on the diagonal
+    order = np.concatenate([rows, np.setdiff1d(np.arange(n), rows)])
+    ref_o, test_o = ref[order], test[order]
+    a = _topk_ids(ref_o, ref_o[: len(rows)], k)
+    b = _topk_ids(test_o, test_o[: len(rows)], k)
+    return float(np.mean([len(set(x) & set(y)) / k for x, y in zip(a, b)]))
+
+
+def agreement_report(ref: np.ndarray, test: np.ndarray, *, k: int = 10, max_queries: int = 1000) -> dict[str, float]:
+    cos = cosine_agreement(ref, test)
+    return {
+        "n": int(len(cos)),
+        "mean_cosine": float(cos.mean()) if len(cos) else 1.0,
+        "p01_cosine": float(np.percentile(cos, 1)) if len(cos) else 1.0,
+        "min_cosine": float(cos.min()) if len(cos) else 1.0,
+        f"recall@{k}": neighbour_recall(ref, test, k, max_queries=max_queries),
+    }
+
+
+@dataclass(frozen=True)
+class AccuracyGuard:
+    """Minimum agreement a quantized embedder must reach against fp32."""
+
+    min_mean_cosine: float = 0.99
+    min_p01_cosine: float = 0.95
+    min_recall: float = 0.90
+    k: int = 10
+
+    def failures(self, report: dict[str, float]) -> list[str]:
+        out = []
+        if report["mean_cosine"] < self.min_mean_cosine:
+            out.append(f"mean cosine {report['mean_cosine']:.4f} < {self.min_mean_cosine}")
+        if report["p01_cosine"] < self.min_p01_cosine:
+            out.append(f"p01 cosine {report['p01_cosine']:.4f} < {self.min_p01_cosine}")
+        recall = report[f"recall@{self.k}"]
+        if recall < self.min_recall:
+            out.append(f"recall@{self.k} {recall:.4f} < {self.min_recall}")
+        return out
+
+    def check(self, ref: np.ndarray, test: np.ndarray) -> dict[str, float]:
+        """Compute the report and raise ValueError if any threshold is missed."""
+        report = agreement_report(ref, test, k=self.k)
+        failed = self.failures(report)
+        if failed:
+            raise ValueError("int8 embeddings disagree with fp32: " + "; ".join(failed))
+        return report
@@ -0,0 +1,154 @@
+"""Reduced-precision, memory-mapped storage for embedding matrices.
+
+On-disk formats (all plain ``.npy`` so they stay ``np.load``-able):
+
+``float32``  the matrix as-is.
+``float16``  half precision; half the bytes, ~1e-3 relative error.
+``int8``     symmetric per-row quantization: ``x ≈ q * scale`` with
+             ``scale = max|x| / 127``; a quarter of the bytes. Scales live in a
+             ``<name>.scales.npy`` sidecar.
+
+:func:`open_vectors` memory-maps the file and returns a :class:`VectorMatrix`
+that dequantizes to float32 only for the rows actually read, so several large
+matrices can be open in one process. ``np.asarray(matrix)`` still gives a full
+float32 array for code that needs one.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+VECTOR_FORMATS = ("float32", "float16", "int8")
+
+
+def scales_path(path: Path) -> Path:
+    """``vectors.npy`` → ``vectors.scales.npy`` (int8 sidecar)."""
+    return path.with_name(f"{path.name.removesuffix('.npy')}.scales.npy")
+
+
+def quantize(vectors: np.ndarray, fmt: str = "float32") -> tuple[np.ndarray, np.ndarray | None]:
+    """Encode ``vectors`` as ``fmt``; returns ``(data, per-row scales or None)``."""
+    if fmt not in VECTOR_FORMATS:
+        raise ValueError(f"Unknown vector format {fmt!r}; expected one of {VECTOR_FORMATS}")
+    vectors = np.asarray(vectors, dtype="float32")
+    if fmt == "float32":
+        return vectors, None
+    if fmt == "float16":
+        return vectors.astype("float16"), None
+    scales = np.abs(vectors).max(axis=1) / 127.0 if vectors.size else np.zeros(len(vectors), "float32")
+    scales = scales.astype("float32")
+    safe = np.where(scales > 0, scales, 1.0)[:, None]
+    data = np.clip(np.rint(vectors / safe), -127, 127).astype("int8")
+    return data, scales
+
+
+def dequantize(data: np.ndarray, scales: np.ndarray | None = None) -> np.ndarray:
+    """Inverse of :func:`quantize` for any slice of rows (float32 output)."""
+    out = np.asarray(data, dtype="float32")
+    if scales is not None:
+        out = out * np.asarray(scales, dtype="float32")[:, None]
+    return out
+
+
+def save_vectors(path: Path, vectors: np.ndarray, fmt: str = "float32") -> Path:
+    """Write ``vectors`` to ``path`` (``.npy``) in ``fmt``; returns ``path``."""
+    path = Path(path)
+    data, scales = quantize(vectors, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.save(path, data)
+    sidecar = scales_path(path)
+    if scales is not None:
+        np.save(sidecar, scales)
+    elif sidecar.exists():
+        sidecar.unlink()
+    return path
+
+
+class VectorMatrix:
+    """Read-only, dequantize-on-read view of a stored matrix."""
+
+    def __init__(self, data: np.ndarray, scales: np.ndarray | None = None) -> None:
+        if data.ndim != 2:
+            raise ValueError("VectorMatrix needs a 2-D array")
+        if data.dtype == np.int8 and scales is None:
+            raise ValueError("int8 vectors need per-row scales")
+        self.data = data
+        self.scales = scales
+
+    @property
+    def fmt(self) -> str:
+        return "int8" if self.data.dtype == np.int8 else str(self.data.dtype)
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return tuple(self.data.shape)  # type: ignore[return-value]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype("float32")
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the stored representation (what the page cache holds)."""
+        return int(self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+
+    def __len__(self) -> int:
+        return int(self.data.shape[0])
+
+    def __getitem__(self, rows) -> np.ndarray:
+        if isinstance(rows, tuple):
+            picked = self[rows[0]]
+            # an integer row index already dropped the row axis
+            return picked[rows[1:] if picked.ndim == 1 else (slice(None),) + rows[1:]]
+        block = self.data[rows]
+        scales = self.scales[rows] if self.scales is not None else None
+        if block.ndim == 1:
+            return dequantize(block[None], None if scales is None else np.atleast_1d(scales))[0]
+        return dequantize(block, scales)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        out = self.to_array()
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def iter_blocks(self, block_rows: int = 65_536) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield ``(start_row, float32 block)`` pairs covering the matrix."""
+        for start in range(0, len(self), block_rows):
+            yield start, self[start:start + block_rows]
+
+    def to_array(self) -> np.ndarray:
+        if not len(self):
+            return np.zeros(self.shape, dtype="float32")
+        return np.concatenate([block for _, block in self.iter_blocks()], axis=0)
+
+
+def open_vectors(path: Path, *, mmap: bool = True) -> VectorMatrix:
+    """Open a matrix written by :func:`save_vectors` (or any plain ``.npy``)."""
+    path = Path(path)
+    data = np.load(path, mmap_mode="r" if mmap else None)
+    sidecar = scales_path(path)
+    scales = np.load(sidecar) if data.dtype == np.int8 and sidecar.exists() else None
+    return VectorMatrix(data, scales)
+
+
+def load_vectors(path: Path, *, mmap: bool = False) -> np.ndarray | VectorMatrix:
+    """Load a stored matrix for general use.
+
+    Without ``mmap`` the result is a float32 ndarray, whatever the on-disk
+    format. With ``mmap``, float32 files come back as an ``np.memmap`` and
+    reduced-precision files as a :class:`VectorMatrix`.
+    """
+    matrix = open_vectors(path, mmap=mmap)
+    if not mmap:
+        return matrix.to_array()
+    if matrix.fmt == "float32":
+        return matrix.data
+    return matrix
+
+
+def add_in_blocks(index, vectors, block_rows: int = 65_536) -> None:
+    """Stream ``vectors`` (ndarray, memmap or VectorMatrix) into a FAISS index."""
+    n = int(vectors.shape[0])
+    for start in range(0, n, block_rows):
+        index.add(np.ascontiguousarray(vectors[start:start + block_rows], dtype="float32"))
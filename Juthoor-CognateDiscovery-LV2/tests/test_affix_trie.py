@@ -0,0 +1,272 @@
+"""Tests for the compiled affix tries and decomposition equivalence."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import target_morphology as tm
+from juthoor_cognatediscovery_lv2.discovery.affix_trie import AffixTrie
+from juthoor_cognatediscovery_lv2.discovery.multi_method_scorer import MultiMethodScorer
+from juthoor_cognatediscovery_lv2.discovery.phonetic_law_scorer import (
+    _KNOWN_PREFIXES,
+    _KNOWN_SUFFIXES,
+    _morpheme_decompose,
+)
+
+LV2_ROOT = Path(__file__).resolve().parents[1]
+LV0_PROCESSED = LV2_ROOT.parent / "Juthoor-DataCore-LV0" / "data" / "processed"
+SAMPLES = LV2_ROOT / "resources" / "samples" / "processed"
+
+# Sample lemmas always ship with the repo; the full lists are used when present.
+_LEMMA_SOURCES: dict[str, list[Path]] = {
+    "lat": [
+        SAMPLES / "Latin-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl",
+        LV2_ROOT / "data" / "processed" / "latin_unique_lemmas.jsonl",
+        LV0_PROCESSED / "latin" / "classical" / "sources" / "kaikki.jsonl",
+    ],
+    "grc": [
+        SAMPLES / "Ancient_Greek-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl",
+        LV2_ROOT / "data" / "processed" / "greek_unique_lemmas.jsonl",
+        LV0_PROCESSED / "ancient_greek" / "sources" / "kaikki.jsonl",
+    ],
+}
+
+# Hand-picked forms that exercise overlapping affixes (e.g. Greek "sis"/"psis").
+_EXTRA_LEMMAS: dict[str, list[str]] = {
+    "lat": [
+        "september", "october", "dominus", "aquarius", "regis", "stella",
+        "transformatio", "superficies", "interrogator", "circumstantia",
+        "nobilitas", "capabilis", "fundamentum", "a", "us", "abus", "ber",
+    ],
+    "grc": [
+        "philosophia", "lepsis", "psis", "xpsis", "anthropos", "hyperbole",
+        "amphitheatron", "kataklysmos", "metamorphosis", "apokalypsis",
+        "λόγος", "φιλοσοφία", "ἄγγελος", "a", "os",
+    ],
+}
+
+
+def _load_lemmas(lang: str) -> list[str]:
+    lemmas: dict[str, None] = dict.fromkeys(_EXTRA_LEMMAS[lang])
+    for path in _LEMMA_SOURCES[lang]:
+        if not path.exists():
+            continue
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                lemma = str(json.loads(line).get("lemma", "") or "").strip().lower()
+                if lemma:
+                    lemmas[lemma] = None
+    return list(lemmas)
+
+
+# ---------------------------------------------------------------------------
+# Reference (linear-scan) implementations the tries replaced
+# ---------------------------------------------------------------------------
+
+def _ref_strip_suffix(word: str, suffixes: tuple[str, ...]) -> str | None:
+    for suf in suffixes:
+        if word.endswith(suf):
+            stem = word[: -len(suf)]
+            if len(stem) >= tm._MIN_STEM:
+                return stem
+    return None
+
+
+def _ref_strip_all_suffixes(word: str, suffixes: tuple[str, ...]) -> list[str]:
+    stems: list[str] = []
+    seen: set[str] = set()
+    for suf in suffixes:
+        if word.endswith(suf):
+            stem = word[: -len(suf)]
+            if len(stem) >= tm._MIN_STEM and stem not in seen:
+                seen.add(stem)
+                stems.append(stem)
+    stems.sort(key=len, reverse=True)
+    return stems
+
+
+def _ref_strip_prefix(word: str, prefixes: tuple[str, ...]) -> str | None:
+    for pre in prefixes:
+        if word.startswith(pre):
+            stem = word[len(pre):]
+            if len(stem) >= tm._MIN_STEM:
+                return stem
+    return None
+
+
+def _ref_decompose_latin(word: str) -> list[str]:
+    stems: list[str] = []
+    for num_stem, stripped in tm._LATIN_NUMBER_STEMS.items():
+        if word.startswith(num_stem) and word.endswith("ber"):
+            stems.append(num_stem)
+            stems.append(stripped)
+            ep = tm._remove_latin_epenthetic(word[:-3])
+            if ep and len(ep) >= tm._MIN_STEM:
+                stems.append(ep)
+            break
+    for suffix_stem in _ref_strip_all_suffixes(word, tm.LATIN_SUFFIXES):
+        stems.append(suffix_stem)
+        ep = tm._remove_latin_epenthetic(suffix_stem)
+        if ep and len(ep) >= tm._MIN_STEM:
+            stems.append(ep)
+        pre_of_suf = _ref_strip_prefix(suffix_stem, tm.LATIN_PREFIXES)
+        if pre_of_suf:
+            stems.append(pre_of_suf)
+            ep2 = tm._remove_latin_epenthetic(pre_of_suf)
+            if ep2 and len(ep2) >= tm._MIN_STEM:
+                stems.append(ep2)
+    prefix_stem = _ref_strip_prefix(word, tm.LATIN_PREFIXES)
+    if prefix_stem:
+        stems.append(prefix_stem)
+        suf_of_pre = _ref_strip_suffix(prefix_stem, tm.LATIN_SUFFIXES)
+        if suf_of_pre:
+            stems.append(suf_of_pre)
+            ep3 = tm._remove_latin_epenthetic(suf_of_pre)
+            if ep3 and len(ep3) >= tm._MIN_STEM:
+                stems.append(ep3)
+    stems.sort(key=len, reverse=True)
+    return stems
+
+
+def _ref_decompose_greek(word: str) -> list[str]:
+    stems: list[str] = []
+    for compound_suf in tm.GREEK_COMPOUND_SUFFIXES:
+        if word.endswith(compound_suf) and len(word) > len(compound_suf) + 1:
+            first_part = word[: -len(compound_suf)]
+            if len(first_part) >= tm._MIN_STEM:
+                stems.append(first_part)
+                stems.append(compound_suf)
+            break
+    suffix_stem = _ref_strip_suffix(word, tm.GREEK_SUFFIXES)
+    if suffix_stem:
+        stems.append(suffix_stem)
+        pre_of_suf = _ref_strip_prefix(suffix_stem, tm.GREEK_PREFIXES)
+        if pre_of_suf:
+            stems.append(pre_of_suf)
+    prefix_stem = _ref_strip_prefix(word, tm.GREEK_PREFIXES)
+    if prefix_stem:
+        stems.append(prefix_stem)
+        suf_of_pre = _ref_strip_suffix(prefix_stem, tm.GREEK_SUFFIXES)
+        if suf_of_pre:
+            stems.append(suf_of_pre)
+    stems.sort(key=len, reverse=True)
+    return stems
+
+
+def _ref_decompose_english(word: str) -> list[tuple[str, str, str]]:
+    w = word.lower().strip()
+    results = [("", w, "")]
+    for p in sorted(_KNOWN_PREFIXES, key=len, reverse=True):
+        if w.startswith(p) and len(w) > len(p) + 2:
+            stem = w[len(p):]
+            for s in sorted(_KNOWN_SUFFIXES, key=len, reverse=True):
+                if stem.endswith(s) and len(stem) > len(s) + 1:
+                    results.append((p, stem[: -len(s)], s))
+                    break
+            results.append((p, stem, ""))
+            break
+    for s in sorted(_KNOWN_SUFFIXES, key=len, reverse=True):
+        if w.endswith(s) and len(w) > len(s) + 1:
+            results.append(("", w[: -len(s)], s))
+            break
+    return list(dict.fromkeys(results))
+
+
+# ---------------------------------------------------------------------------
+# AffixTrie unit tests
+# ---------------------------------------------------------------------------
+
+class TestAffixTrie:
+    def test_suffix_matches_longest_first(self):
+        trie = AffixTrie(("us", "inus", "s", "nus"), suffix=True)
+        assert trie.matches("dominus") == ["inus", "nus", "us", "s"]
+
+    def test_prefix_matches_longest_first(self):
+        trie = AffixTrie(("a", "an", "ana", "apo"))
+        assert trie.matches("anabasis") == ["ana", "an", "a"]
+
+    def test_no_match(self):
+        assert AffixTrie(("us",), suffix=True).matches("rex") == []
+        assert AffixTrie(("pro",)).matches("") == []
+
+    def test_strip_first_honours_table_order(self):
+        trie = AffixTrie(("sis", "psis"), suffix=True)
+        assert trie.strip_first("lepsis", 2) == ("sis", "lep")
+
+    def test_strip_first_respects_min_stem(self):
+        trie = AffixTrie(("sis", "psis"), suffix=True)
+        assert trie.strip_first("xpsis", 2) == ("sis", "xp")
+        assert trie.strip_first("psis", 2) is None
+
+    def test_strip_longest(self):
+        trie = AffixTrie(("al", "ology", "logy"), suffix=True)
+        assert trie.strip_longest("geology", 2) == ("ology", "ge")
+        assert trie.strip_longest("geology", 3) == ("logy", "geo")
+
+    def test_strip_all_longest_stem_first(self):
+        trie = AffixTrie(("us", "inus"), suffix=True)
+        assert trie.strip_all("dominus", 2) == ["domin", "dom"]
+
+    def test_duplicate_affixes_collapse(self):
+        trie = AffixTrie(("an", "a", "an"), suffix=True)
+        assert trie.matches("stan") == ["an"]
+        assert trie.strip_all("stan", 2) == ["st"]
+
+
+# ---------------------------------------------------------------------------
+# Decomposition equivalence over the lemma lists
+# ---------------------------------------------------------------------------
+
+def test_latin_decomposition_matches_linear_scan():
+    mismatches = [
+        w for w in _load_lemmas("lat")
+        if tm._decompose_latin(w) != _ref_decompose_latin(w)
+    ]
+    assert not mismatches, mismatches[:20]
+
+
+def test_greek_decomposition_matches_linear_scan():
+    mismatches = []
+    for lemma in _load_lemmas("grc"):
+        word = tm._to_latin(lemma) if any(ord(ch) > 127 for ch in lemma) else lemma
+        if tm._decompose_greek(word) != _ref_decompose_greek(word):
+            mismatches.append(lemma)
+    assert not mismatches, mismatches[:20]
+
+
+@pytest.mark.parametrize(
+    ("tables", "words"),
+    [
+        ((tm.GOTHIC_SUFFIXES, tm.GOTHIC_PREFIXES), ["gasaihwan", "fairwaurkjan", "andbahts"]),
+        ((tm.ON_NOUN_SUFFIXES + tm.ON_VERB_SUFFIXES, tm.ON_PREFIXES), ["víkingar", "fram", "samligr"]),
+        ((tm.OI_NOUN_SUFFIXES + tm.OI_VERB_SUFFIXES, tm.OI_PREFIXES), ["flaithemnacht", "frithorcaid"]),
+        ((tm.CY_NOUN_SUFFIXES + tm.CY_VERB_SUFFIXES, tm.CY_PREFIXES), ["gwrthryfel", "cydweithrediad"]),
+    ],
+)
+def test_compiled_tables_match_linear_scan(tables, words):
+    suffixes, prefixes = tables
+    suf_trie = AffixTrie(suffixes, suffix=True)
+    pre_trie = AffixTrie(prefixes)
+    for word in words:
+        assert tm._strip_all_suffixes(word, suf_trie) == _ref_strip_all_suffixes(word, suffixes)
+        assert tm._strip_suffix(word, suf_trie) == _ref_strip_suffix(word, suffixes)
+        assert tm._strip_prefix(word, pre_trie) == _ref_strip_prefix(word, prefixes)
+
+
+def test_english_decomposition_matches_sorted_scan():
+    scorer = MultiMethodScorer()
+    words = _load_lemmas("lat") + [
+        "geology", "transformation", "preconception", "unkindness",
+        "antidisestablishment", "overage", "reward", "exist", "imposter",
+    ]
+    for word in words:
+        assert scorer._decompose_english(word) == _ref_decompose_english(word), word
+
+
+def test_morpheme_decompose_uses_table_order():
+    assert _morpheme_decompose("transformation") == ("trans", "forma", "tion")
+    assert _morpheme_decompose("geology") == ("geo", "logy", "")
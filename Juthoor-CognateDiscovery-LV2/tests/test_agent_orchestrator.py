@@ -0,0 +1,183 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.agent_orchestrator
+
+Covers:
+- parse_findings() / check_findings(): fences, {"findings": [...]}, prose
+  around the array, unanswered pairs and unknown finding kinds rejected
+- Orchestrator: concurrent workers, timed-out / invalid / failing attempts
+  re-queued onto another backend, failure after max_attempts, report counts
+- leases: a batch leased by another live orchestrator is left alone, an
+  expired lease is taken over, finished batches are skipped
+- CommandBackend (stdin prompt, placeholders, timeout) and HttpBackend
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery.agent_orchestrator import (
+    Backend,
+    BackendTimeout,
+    BatchJob,
+    CommandBackend,
+    HttpBackend,
+    LeaseDir,
+    Orchestrator,
+    StubBackend,
+    check_findings,
+    parse_backend,
+    parse_findings,
+)
+from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder, read_records
+
+
+def _jobs(tmp_path: Path, n: int, pairs: int = 2) -> list[BatchJob]:
+    jobs = []
+    for b in range(n):
+        prompt = tmp_path / f"batch_{b:03d}.txt"
+        ids = [f"GOT_{b:02d}{i:02d}" for i in range(pairs)]
+        prompt.write_text("Investigate.\n\nPair IDs to return: " + ", ".join(ids), encoding="utf-8")
+        jobs.append(BatchJob(key=f"batch_{b:03d}", prompt_path=prompt, pairs=pairs))
+    return jobs
+
+
+def _ids(job: BatchJob) -> list[str]:
+    return job.prompt_path.read_text(encoding="utf-8").rsplit(": ", 1)[1].split(", ")
+
+
+def test_parse_and_check_findings():
+    rows = [{"pair_id": "A", "finding": "path_found"}, {"pair_id": "B", "finding": "no_path"}]
+    assert parse_findings("```json\n" + json.dumps(rows) + "\n```") == rows
+    assert parse_findings(json.dumps({"findings": rows})) == rows
+    assert parse_findings("Here are my findings:\n" + json.dumps(rows) + "\nDone.") == rows
+    for bad in ("", "no json here", '{"pair_id": "A"}', "[1, 2]"):
+        with pytest.raises(ValueError):
+            parse_findings(bad)
+
+    check_findings(rows, ["A", "B"])
+    with pytest.raises(ValueError, match="1/3 pairs unanswered"):
+        check_findings(rows, ["A", "B", "C"])
+    with pytest.raises(ValueError, match="finding 'maybe'"):
+        check_findings([*rows, {"pair_id": "C", "finding": "maybe"}], ["A", "B", "C"])
+
+
+class _Flaky(Backend):
+    """Always fails, in turn by timing out, garbling its reply and crashing."""
+
+    name = "flaky"
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def run(self, prompt: str, *, job: BatchJob, timeout: float) -> str:
+        with self._lock:
+            self.calls += 1
+            n = self.calls
+        if n % 3 == 1:
+            raise BackendTimeout("too slow")
+        if n % 3 == 2:
+            return "I could not decide."
+        raise RuntimeError("agent crashed")
+
+
+def test_orchestrator_requeues_onto_other_backends(tmp_path: Path):
+    jobs = _jobs(tmp_path, 6)
+    ingested: dict[str, str] = {}
+
+    def handle(job: BatchJob, reply: str, backend: Backend) -> int:
+        findings = parse_findings(reply)
+        check_findings(findings, _ids(job))
+        assert job.key not in ingested
+        ingested[job.key] = backend.name
+        return len(findings)
+
+    log = tmp_path / "calls.jsonl"
+    flaky = _Flaky()
+    report = Orchestrator(
+        jobs, [flaky, StubBackend(latency=0.01)], handle, lease_dir=tmp_path / "leases", workers=4,
+        max_attempts=3, telemetry=TelemetryRecorder(log, source="t"), stream=None,
+    ).run()
+
+    assert sorted(ingested) == [j.key for j in jobs] and set(ingested.values()) == {"stub"}
+    assert (report["done"], report["failed"], report["pairs"], report["unfinished"]) == (6, 0, 12, 0)
+    assert report["requeued"] == flaky.calls and report["attempts"] == 6 + flaky.calls
+    flaky_stats = report["backends"]["flaky"]
+    assert flaky_stats["ok"] == 0 and flaky_stats["attempts"] == flaky.calls
+    assert flaky_stats["timeouts"] + flaky_stats["invalid"] + flaky_stats["errors"] == flaky.calls
+    assert report["backends"]["stub"]["pairs"] == 12
+    rows = list(read_records(log))
+    assert len(rows) == report["attempts"] and sum(r["ok"] for r in rows) == 6
+    assert not list((tmp_path / "leases").iterdir())  # every lease released
+
+    only_flaky = Orchestrator(_jobs(tmp_path, 1), [_Flaky()], handle, lease_dir=tmp_path / "leases",
+                              max_attempts=3, stream=None).run()
+    assert only_flaky["failed"] == 1 and only_flaky["done"] == 0
+    assert only_flaky["failures"]["batch_000"] == "RuntimeError: agent crashed"
+
+
+def test_leases_and_finished_batches(tmp_path: Path):
+    jobs = _jobs(tmp_path, 3)
+    other = LeaseDir(tmp_path / "leases", owner="other-host-1")
+    assert other.acquire("batch_000", ttl=600)
+    assert not LeaseDir(tmp_path / "leases", owner="me").acquire("batch_000", ttl=600)
+    assert other.acquire("batch_001", ttl=-1)  # already expired: its owner died
+
+    handled: list[str] = []
+    report = Orchestrator(
+        jobs, [StubBackend()], lambda job, reply, backend: handled.append(job.key) or job.pairs,
+        lease_dir=tmp_path / "leases", is_done=lambda job: job.key == "batch_002", stream=None,
+    ).run()
+    assert handled == ["batch_001"]
+    assert (report["done"], report["leased_elsewhere"], report["skipped"]) == (1, 1, 1)
+    assert other.holder("batch_000")["owner"] == "other-host-1"  # left in place
+
+
+def test_command_and_http_backends(tmp_path: Path):
+    (job,) = _jobs(tmp_path, 1)
+    script = ("import json, sys; ids = sys.stdin.read().rsplit(': ', 1)[1].split(', '); "
+              "print(json.dumps([{'pair_id': i, 'finding': 'no_path', 'batch': sys.argv[1]} for i in ids]))")
+    echo = parse_backend(f'cmd:"{sys.executable}" -c "{script}" {{batch}}')
+    assert isinstance(echo, CommandBackend)
+    findings = parse_findings(echo.run(job.prompt_path.read_text(encoding="utf-8"), job=job, timeout=30))
+    assert [f["pair_id"] for f in findings] == _ids(job) and findings[0]["batch"] == "batch_000"
+    slow = CommandBackend(f'"{sys.executable}" -c "import time; time.sleep(5)"')
+    t0 = time.monotonic()
+    with pytest.raises(BackendTimeout):
+        slow.run("", job=job, timeout=0.2)
+    assert time.monotonic() - t0 < 4
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+            reply = {"content": [{"type": "text", "text": StubBackend().run(body["prompt"], job=job, timeout=1)}]}
+            data = json.dumps(reply).encode("utf-8")
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        http = parse_backend(f"http://127.0.0.1:{server.server_address[1]}/investigate")
+        assert isinstance(http, HttpBackend)
+        reply = http.run(job.prompt_path.read_text(encoding="utf-8"), job=job, timeout=10)
+        check_findings(parse_findings(reply), _ids(job))
+    finally:
+        server.shutdown()
+        server.server_close()
+    with pytest.raises(ValueError):
+        parse_backend("ftp://nowhere")
+    with pytest.raises(TypeError):
+        Backend()  # run() is abstract
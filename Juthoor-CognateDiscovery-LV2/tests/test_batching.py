@@ -0,0 +1,107 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.batching
+
+Covers:
+- plan_batches(): token budget, batch-size cap, max_length clipping, coverage
+- run_batched(): input-order restoration, stats accounting, empty input
+- embedding store namespaces ignore scheduling-only config fields
+"""
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.lv3.discovery.batching import (
+    InferenceStats,
+    TokenBudget,
+    byte_length,
+    plan_batches,
+    run_batched,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import namespace_name
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Config, ByT5Config
+
+
+def _lengths(seed: int = 0, n: int = 200) -> list[int]:
+    return np.random.default_rng(seed).integers(1, 300, size=n).tolist()
+
+
+class TestPlanBatches:
+    def test_covers_every_index_once(self):
+        lengths = _lengths()
+        batches = plan_batches(lengths, TokenBudget(max_tokens=1000, max_batch_size=64))
+        flat = sorted(i for b in batches for i in b)
+        assert flat == list(range(len(lengths)))
+
+    def test_respects_token_budget(self):
+        lengths = _lengths()
+        for batch in plan_batches(lengths, TokenBudget(max_tokens=1000, max_batch_size=64)):
+            width = max(lengths[i] for i in batch)
+            assert len(batch) == 1 or width * len(batch) <= 1000
+
+    def test_respects_batch_size_cap(self):
+        batches = plan_batches([3] * 50, TokenBudget(max_tokens=10_000, max_batch_size=8))
+        assert [len(b) for b in batches] == [8] * 6 + [2]
+
+    def test_longest_first_and_short_texts_share_batches(self):
+        lengths = [5, 400, 5, 5, 200]
+        batches = plan_batches(lengths, TokenBudget(max_tokens=300, max_batch_size=64))
+        assert batches[0] == [1]
+        assert batches[-1] == [0, 2, 3]
+
+    def test_oversized_text_gets_own_batch(self):
+        assert plan_batches([5000, 1], TokenBudget(max_tokens=100)) == [[0], [1]]
+
+    def test_max_length_clips(self):
+        budget = TokenBudget(max_tokens=100, max_batch_size=64, max_length=10)
+        assert plan_batches([1000] * 10, budget) == [list(range(10))]
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            TokenBudget(max_tokens=0)
+
+
+class TestRunBatched:
+    def test_restores_input_order(self):
+        texts = [f"{'x' * (i * 7 % 50)}#{i}" for i in range(60)]
+        seen: list[int] = []
+
+        def encode(batch):
+            seen.append(len(batch))
+            return np.array([[float(t.split("#")[1]), len(t)] for t in batch], dtype="float32")
+
+        vecs, stats = run_batched(texts, encode, budget=TokenBudget(max_tokens=200, max_batch_size=16))
+        np.testing.assert_array_equal(vecs[:, 0], np.arange(60, dtype="float32"))
+        assert stats.batches == len(seen) > 1
+        assert stats.batch_sizes == seen and sum(seen) == 60
+        assert stats.tokens == sum(byte_length(t) for t in texts)
+        assert 0.0 <= stats.padding_ratio < 1.0
+
+    def test_precomputed_lengths_and_clipping(self):
+        vecs, stats = run_batched(
+            ["a", "b", "c"],
+            lambda batch: np.ones((len(batch), 2)),
+            budget=TokenBudget(max_tokens=100, max_length=8),
+            lengths=[50, 3, 8],
+        )
+        assert vecs.shape == (3, 2)
+        assert stats.tokens == 8 + 3 + 8
+
+    def test_empty(self):
+        vecs, stats = run_batched([], lambda batch: pytest.fail("no batches expected"))
+        assert vecs.shape[0] == 0 and stats.batches == 0
+
+    def test_stats_reporting(self):
+        stats = InferenceStats(texts=4, batches=2, tokens=300, padded_tokens=400, seconds=1.5, threads=4)
+        assert stats.tokens_per_sec == 200.0
+        assert stats.padding_ratio == 0.25
+        assert stats.as_dict()["tokens_per_sec"] == 200.0
+        assert "4 threads" in stats.summary()
+
+
+def test_scheduling_fields_do_not_change_store_namespace():
+    assert namespace_name("m", BgeM3Config()) == namespace_name(
+        "m", BgeM3Config(max_tokens=1024, batch_size=4, num_threads=2)
+    )
+    assert namespace_name("m", ByT5Config()) == namespace_name("m", ByT5Config(max_tokens=99, num_threads=8))
+    assert namespace_name("m", ByT5Config()) != namespace_name("m", ByT5Config(max_length=64))
@@ -7,6 +7,7 @@ from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusInfo, CorpusSpe
 from juthoor_cognatediscovery_lv2.discovery.reporting import build_evidence_card, write_leads
 from juthoor_cognatediscovery_lv2.discovery.rerank import DiscoveryReranker
 from juthoor_cognatediscovery_lv2.discovery.retrieval import get_cache_paths, resolve_corpus_path
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import ByT5Config
 from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
 from juthoor_cognatediscovery_lv2.discovery.scoring import DiscoveryScorer, rank_candidates
 
@@ -236,6 +237,15 @@ def test_cache_paths_differ_when_row_content_changes(tmp_path: Path):
     assert paths_a != paths_b
 
 
+def test_cache_paths_differ_for_embedder_config(tmp_path: Path):
+    spec = CorpusSpec(lang="ara", stage="classical", path=Path("same.jsonl"))
+    rows = [LexemeRow(0, {"id": "lex:a", "lemma": "أرض"})]
+    current = get_cache_paths(tmp_path, "form", spec, rows, ByT5Config())
+    # snapshots from before the masked-mean pooling (vector_version 1) are not reused
+    assert get_cache_paths(tmp_path, "form", spec, rows, ByT5Config(vector_version=1)) != current
+    assert get_cache_paths(tmp_path, "form", spec, rows, ByT5Config(batch_size=8)) == current
+
+
 def test_resolve_corpus_path_prefers_existing_relative_path(tmp_path: Path, monkeypatch):
     corpus = tmp_path / "subset.jsonl"
     corpus.write_text(json.dumps({"lemma": "name"}) + "\n", encoding="utf-8")
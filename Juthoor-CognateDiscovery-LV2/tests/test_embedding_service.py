@@ -0,0 +1,244 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service
+
+Covers:
+- parse_address(): unix paths vs host:port
+- auth key: explicit / environment / generated per-user key file
+- Coalescer: concurrent requests merged and de-duplicated, errors propagated
+- EmbeddingService.handle(): ops, unknown model, store reuse
+- client/server round trip over a Unix socket, shutdown
+- get_embedder() backend selection, service config mismatch -> local / error;
+  embed_corpus(backend="service")
+"""
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import (
+    AUTHKEY_ENV,
+    AUTHKEY_FILE_ENV,
+    Coalescer,
+    EmbeddingService,
+    EmbeddingServiceClient,
+    _authkey,
+    get_embedder,
+    parse_address,
+    service_available,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import config_fingerprint
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Config, BgeM3Embedder, ByT5Embedder
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+
+needs_unix = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _vec(text: str, dim: int = 8) -> np.ndarray:
+    rng = np.random.default_rng(sum(text.encode("utf-8")) + len(text))
+    v = rng.standard_normal(dim).astype("float32")
+    return v / np.linalg.norm(v)
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed(self, texts):
+        self.calls.append(list(texts))
+        return np.stack([_vec(t) for t in texts])
+
+
+@pytest.fixture(autouse=True)
+def _key_file(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    monkeypatch.setenv(AUTHKEY_FILE_ENV, str(tmp_path / "keys" / "embed_service.key"))
+
+
+def test_authkey_sources(tmp_path: Path, monkeypatch):
+    key = _authkey()
+    path = tmp_path / "keys" / "embed_service.key"
+    assert len(key) == 64 and path.read_bytes() == key
+    if os.name == "posix":
+        assert path.stat().st_mode & 0o077 == 0
+    assert _authkey() == key  # reused, not regenerated
+    assert _authkey(b"explicit") == b"explicit"
+    monkeypatch.setenv(AUTHKEY_ENV, "from-env")
+    assert _authkey() == b"from-env"
+
+
+def test_parse_address():
+    assert parse_address("unix:/tmp/x.sock") == "/tmp/x.sock"
+    assert parse_address("/tmp/x.sock") == "/tmp/x.sock"
+    assert parse_address("127.0.0.1:9000") == ("127.0.0.1", 9000)
+    assert parse_address(":9000") == ("127.0.0.1", 9000)
+
+
+class TestCoalescer:
+    def test_merges_concurrent_requests(self):
+        fake = FakeEmbedder()
+
+        def slow_embed(texts):
+            time.sleep(0.02)
+            return fake.embed(texts)
+
+        co = Coalescer(slow_embed, max_wait_ms=50)
+        try:
+            requests = [[f"w{i}", "shared"] for i in range(8)]
+            with ThreadPoolExecutor(8) as pool:
+                results = list(pool.map(co.embed, requests))
+        finally:
+            co.close()
+        for texts, vecs in zip(requests, results):
+            np.testing.assert_allclose(vecs, np.stack([_vec(t) for t in texts]))
+        assert co.stats["requests"] == 8 and co.stats["batches"] < 8
+        assert co.stats["unique_texts"] == sum(len(set(c)) for c in fake.calls)
+        assert all(len(c) == len(set(c)) for c in fake.calls)
+
+    def test_error_reaches_every_caller(self):
+        def broken(texts):
+            raise RuntimeError("model exploded")
+
+        co = Coalescer(broken, max_wait_ms=1)
+        try:
+            with pytest.raises(RuntimeError, match="exploded"):
+                co.embed(["a"])
+            with pytest.raises(RuntimeError):
+                co.embed(["b"])  # worker survives
+        finally:
+            co.close()
+
+    def test_empty_request(self):
+        co = Coalescer(FakeEmbedder().embed, max_wait_ms=1)
+        try:
+            assert co.embed([]).shape[0] == 0
+        finally:
+            co.close()
+
+
+def _service(tmp_path: Path | None = None, fake: FakeEmbedder | None = None) -> EmbeddingService:
+    fake = fake or FakeEmbedder()
+    return EmbeddingService(
+        models=("semantic",),
+        store_root=tmp_path,
+        max_wait_ms=1,
+        embedders={"semantic": lambda: fake},
+    )
+
+
+class TestHandle:
+    def test_embed_and_info(self, tmp_path: Path):
+        fake = FakeEmbedder()
+        service = _service(tmp_path, fake)
+        header, vecs = service.handle({"op": "embed", "model": "semantic", "texts": ["a", "b"]})
+        assert header == {"ok": True, "shape": [2, 8]}
+        np.testing.assert_allclose(vecs[1], _vec("b"))
+        service.handle({"op": "embed", "model": "semantic", "texts": ["b", "c"]})
+        # warm-up, then only texts the store has not seen reach the model
+        assert fake.calls == [["warm-up"], ["a", "b"], ["c"]]
+        info = service.handle({"op": "info"})[0]["info"]["models"]["semantic"]
+        assert info["loaded"] and info["served"] == {"texts": 4, "from_store": 1}
+        assert info["store"]["vectors"] == 3
+
+    def test_errors(self):
+        service = _service()
+        assert not service.handle({"op": "embed", "model": "form", "texts": ["a"]})[0]["ok"]
+        assert not service.handle({"op": "frobnicate"})[0]["ok"]
+        with pytest.raises(ValueError):
+            EmbeddingService(models=("phonetic",))
+
+
+@needs_unix
+def test_round_trip_over_socket(tmp_path: Path):
+    address = str(tmp_path / "embed.sock")
+    service = _service()
+    server = threading.Thread(target=service.serve_forever, args=(address,), daemon=True)
+    server.start()
+    for _ in range(100):
+        if service_available(address):
+            break
+        time.sleep(0.02)
+
+    clients = [EmbeddingServiceClient("semantic", address=address) for _ in range(4)]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda c: c.embed(["x", "y", "z"]), clients))
+    for vecs in results:
+        np.testing.assert_allclose(vecs, np.stack([_vec(t) for t in "xyz"]))
+    assert clients[0].info()["models"]["semantic"]["served"]["texts"] >= 3
+    with pytest.raises(RuntimeError):
+        EmbeddingServiceClient("form", address=address).embed(["x"])
+
+    clients[0].shutdown()
+    server.join(timeout=5)
+    assert not server.is_alive()
+    for client in clients[1:]:
+        client.close()
+
+
+def test_get_embedder_backends(tmp_path: Path):
+    missing = str(tmp_path / "none.sock")
+    assert not service_available(missing)
+    assert isinstance(get_embedder("semantic", backend="auto", address=missing), BgeM3Embedder)
+    assert isinstance(get_embedder("form", backend="service", address=missing), EmbeddingServiceClient)
+    with pytest.raises(ValueError):
+        get_embedder("semantic", backend="gpu")
+
+
+@needs_unix
+def test_get_embedder_checks_service_config(tmp_path: Path, capsys):
+    address = str(tmp_path / "embed.sock")
+    service = _service()  # serves "semantic" with the stock BgeM3Config
+    server = threading.Thread(target=service.serve_forever, args=(address,), daemon=True)
+    server.start()
+    for _ in range(100):
+        if service_available(address):
+            break
+        time.sleep(0.02)
+    try:
+        assert isinstance(get_embedder("semantic", address=address), EmbeddingServiceClient)
+        # scheduling-only fields do not count as a mismatch
+        same = get_embedder("semantic", config=BgeM3Config(batch_size=8), address=address)
+        assert isinstance(same, EmbeddingServiceClient)
+        other = BgeM3Config(max_length=512)
+        assert isinstance(get_embedder("semantic", config=other, address=address), BgeM3Embedder)
+        assert "max_length=8192 (want 512)" in capsys.readouterr().err
+        assert isinstance(get_embedder("form", address=address), ByT5Embedder)
+        with pytest.raises(RuntimeError, match="max_length"):
+            get_embedder("semantic", backend="service", config=other, address=address)
+    finally:
+        service.stop()
+        server.join(timeout=5)
+
+
+def test_embed_corpus_service_backend(tmp_path: Path, monkeypatch):
+    served = {"config": config_fingerprint(BgeM3Config(max_length=512))}
+
+    class FakeClient:
+        def __init__(self, model):
+            assert model == "semantic"
+
+        def info(self):
+            return {"models": {"semantic": served}}
+
+        def embed(self, texts):
+            return np.stack([_vec(t) for t in texts])
+
+    monkeypatch.setattr(retrieval, "EmbeddingServiceClient", FakeClient)
+    spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+    rows = [LexemeRow(i, {"id": f"x:{i}", "meaning_text": f"gloss {i}"}) for i in range(3)]
+    vecs, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec, rows=rows, backend="service")
+    np.testing.assert_allclose(vecs[2], _vec("gloss 2"))
+    assert not retrieval.get_store_root(tmp_path).exists()
+    # the snapshot is keyed by the service's config: same as a local run with that config ...
+    v_path = retrieval.get_cache_paths(tmp_path, "semantic", spec, rows, BgeM3Config(max_length=512))[0]
+    assert v_path.exists()
+    # ... and a local run with the stock config does not pick it up
+    assert not retrieval.get_cache_paths(tmp_path, "semantic", spec, rows, BgeM3Config())[0].exists()
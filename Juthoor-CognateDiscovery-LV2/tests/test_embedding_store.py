@@ -0,0 +1,196 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store
+
+Covers:
+- text keys: normalization (NFC, whitespace), stability
+- namespaces: model id / vector-relevant config only
+- EmbeddingStore: put/missing/get_matrix, dedup, append-only shards, reopen
+- shards: unique names across writers, no mappings held open, compact()
+- embed_corpus(): only new texts are embedded, vectors shared across corpora
+"""
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Config, ByT5Config
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import (
+    EmbeddingStore,
+    namespace_name,
+    text_key,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+
+
+def _vec(text: str, dim: int = 4) -> np.ndarray:
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+    return rng.standard_normal(dim).astype("float32")
+
+
+class _CountingEmbed:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.stack([_vec(t) for t in texts])
+
+
+# ---------------------------------------------------------------------------
+# Keys and namespaces
+# ---------------------------------------------------------------------------
+
+class TestKeys:
+    def test_whitespace_and_nfc_share_a_key(self):
+        assert text_key("  the  earth ") == text_key("the earth")
+        assert text_key("é") == text_key("é")
+
+    def test_distinct_texts_differ(self):
+        assert text_key("earth") != text_key("Earth")
+        assert len(text_key("earth")) == 32
+
+    def test_namespace_ignores_batch_size(self):
+        assert namespace_name("google/byt5-small", ByT5Config(batch_size=4)) == namespace_name(
+            "google/byt5-small", ByT5Config(batch_size=64)
+        )
+        assert namespace_name("google/byt5-small", ByT5Config(pooling="cls")) != namespace_name(
+            "google/byt5-small", ByT5Config()
+        )
+        # vectors from before the masked mean pooling live in another namespace
+        assert namespace_name("google/byt5-small", ByT5Config(vector_version=1)) != namespace_name(
+            "google/byt5-small", ByT5Config()
+        )
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class TestEmbeddingStore:
+    def test_put_and_get(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m", BgeM3Config())
+        texts = ["earth", "water", "fire"]
+        assert store.put(texts, np.stack([_vec(t) for t in texts])) == 3
+        mat = store.get_matrix(["fire", "earth", "fire"])
+        np.testing.assert_array_equal(mat, np.stack([_vec("fire"), _vec("earth"), _vec("fire")]))
+        assert "water" in store and "air" not in store
+
+    def test_missing_is_distinct_and_ordered(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        store.put(["a"], _vec("a")[None])
+        assert store.missing(["b", "a", "c", "b", " b "]) == ["b", "c"]
+
+    def test_put_skips_known_and_duplicate_texts(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        store.put(["a", "b"], np.stack([_vec("a"), _vec("b")]))
+        n = store.put(["a", "c", "c"], np.stack([_vec("x"), _vec("c"), _vec("c")]))
+        assert n == 1
+        np.testing.assert_array_equal(store.get_matrix(["a"])[0], _vec("a"))
+        assert store.stats()["shards"] == 2
+
+    def test_reopen_loads_only_the_key_index(self, tmp_path: Path):
+        EmbeddingStore(tmp_path, "m").put(["a", "b"], np.stack([_vec("a"), _vec("b")]))
+        EmbeddingStore(tmp_path, "m").put(["c"], _vec("c")[None])
+        reopened = EmbeddingStore(tmp_path, "m")
+        assert len(reopened) == 3 and reopened.dim == 4
+        assert all(isinstance(s, Path) for s in reopened._shards)  # nothing mapped yet
+        np.testing.assert_array_equal(reopened.get_matrix(["c", "a"])[0], _vec("c"))
+
+    def test_concurrent_writers_get_distinct_shards(self, tmp_path: Path):
+        # two stores opened on the same directory both see "no shards yet"
+        first, second = EmbeddingStore(tmp_path, "m"), EmbeddingStore(tmp_path, "m")
+        first.put(["a"], _vec("a")[None])
+        second.put(["b"], _vec("b")[None])
+        reopened = EmbeddingStore(tmp_path, "m")
+        assert len(reopened) == 2 and reopened.stats()["shards"] == 2
+        np.testing.assert_array_equal(reopened.get_matrix(["a", "b"]), np.stack([_vec("a"), _vec("b")]))
+
+    def test_compact_merges_small_shards(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        for t in "abcd":
+            store.put([t], _vec(t)[None])
+        store.put(["e", "f", "g"], np.stack([_vec(t) for t in "efg"]))
+        EmbeddingStore(tmp_path, "m").put(["h"], _vec("h")[None])  # unseen by `store`
+        assert store.compact(max_rows=2) == 5
+        assert store.stats()["shards"] == 2 and len(store) == 8
+        assert len(list(store.path.glob("shard_*.keys.npy"))) == 2
+        np.testing.assert_array_equal(store.get_matrix(list("hagb")), np.stack([_vec(t) for t in "hagb"]))
+        assert store.compact() == 2 and store.stats()["shards"] == 1
+        assert store.compact() == 0
+
+    def test_reader_survives_compaction_elsewhere(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        store.put(["a"], _vec("a")[None])
+        store.put(["b"], _vec("b")[None])
+        reader = EmbeddingStore(tmp_path, "m")
+        assert store.compact() == 2
+        np.testing.assert_array_equal(reader.get_matrix(["b"])[0], _vec("b"))
+        (store.path / "compact.lock").write_text("1")
+        store.put(["c"], _vec("c")[None])
+        with pytest.raises(RuntimeError, match="already running"):
+            store.compact()
+
+    def test_namespaces_are_isolated(self, tmp_path: Path):
+        EmbeddingStore(tmp_path, "m", ByT5Config()).put(["a"], _vec("a")[None])
+        assert "a" not in EmbeddingStore(tmp_path, "m", ByT5Config(pooling="cls"))
+
+    def test_dim_mismatch_and_unknown_text(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        store.put(["a"], _vec("a")[None])
+        with pytest.raises(ValueError):
+            store.put(["b"], np.zeros((1, 8), dtype="float32"))
+        with pytest.raises(KeyError):
+            store.get_matrix(["zzz"])
+
+    def test_get_or_embed_chunks(self, tmp_path: Path):
+        store = EmbeddingStore(tmp_path, "m")
+        embed = _CountingEmbed()
+        mat, n = store.get_or_embed(["a", "b", "c", "a"], embed, chunk_size=2)
+        assert n == 3 and embed.calls == [["a", "b"], ["c"]]
+        assert mat.shape == (4, 4)
+        _, n = store.get_or_embed(["a", "d"], embed)
+        assert n == 1 and embed.calls[-1] == ["d"]
+
+
+# ---------------------------------------------------------------------------
+# embed_corpus integration
+# ---------------------------------------------------------------------------
+
+def test_embed_corpus_embeds_only_new_texts(tmp_path: Path, monkeypatch):
+    calls: list[list[str]] = []
+
+    class FakeBgeM3:
+        def __init__(self, *, config=None):
+            self.config = config
+
+        def embed(self, texts):
+            calls.append(list(texts))
+            return np.stack([_vec(t) for t in texts])
+
+    monkeypatch.setattr(retrieval, "BgeM3Embedder", FakeBgeM3)
+
+    def rows(glosses):
+        return [LexemeRow(i, {"id": f"x:{i}", "lemma": f"w{i}", "meaning_text": g}) for i, g in enumerate(glosses)]
+
+    spec_a = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+    spec_b = CorpusSpec(lang="eng", stage="modern", path=Path("b.jsonl"))
+
+    vecs, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec_a, rows=rows(["earth", "water"]))
+    assert calls == [["earth", "water"]]
+
+    # one gloss edited + one row appended: only the two new texts are embedded
+    vecs2, _ = retrieval.embed_corpus(
+        repo_root=tmp_path, model="semantic", spec=spec_a, rows=rows(["earth", "sea", "fire"])
+    )
+    assert calls[-1] == ["sea", "fire"]
+    np.testing.assert_array_equal(vecs2[0], vecs[0])
+
+    # a different corpus with already-seen texts embeds nothing
+    vecs3, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec_b, rows=rows(["fire", "earth"]))
+    assert len(calls) == 2
+    np.testing.assert_array_equal(vecs3[1], vecs[0])
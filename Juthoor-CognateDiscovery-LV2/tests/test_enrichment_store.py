@@ -0,0 +1,126 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.enrichment_store
+
+Covers:
+- write_store(): point lookups, lazy StoreView, source stamps (fresh until
+  the source changes, stale on another path or store version)
+- build() from Eye 2's loaders, then enrich_candidates() from the store
+  gives the same context as from the files, without loading the files
+- a stale kind falls back to the whole-file loader
+- status / get CLI
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import enrichment_store, eye2_batch_scorer
+from juthoor_cognatediscovery_lv2.discovery.enrichment_store import EnrichmentStore, build, write_store
+
+
+def _jsonl(path: Path, rows: list[dict]) -> Path:
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows), encoding="utf-8")
+    return path
+
+
+def test_write_store_lookups_and_stamps(tmp_path: Path, monkeypatch):
+    source = _jsonl(tmp_path / "lv0.jsonl", [{"root_norm": "كتب"}])
+    path = tmp_path / "lookups.sqlite"
+    assert write_store(path, [("lv0", source, lambda: {"كتب": "writing", "قلم": "pen"})]) == {"lv0": 2}
+    with EnrichmentStore(path, stream=None) as store:
+        assert store.get("lv0", "كتب") == "writing" and store.get("lv0", "x") is None
+        view = store.view("lv0")
+        assert view.get("قلم") == "pen" and "x" not in view and len(view) == 2
+        assert sorted(view) == sorted(["كتب", "قلم"])
+        with pytest.raises(KeyError):
+            view["x"]
+        assert store.fresh("lv0", source) and not store.fresh("deep", source)
+        assert not store.fresh("lv0", tmp_path / "other.jsonl")
+
+        source.write_text(source.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+        assert not store.fresh("lv0", source)
+        assert store.status()["kinds"]["lv0"]["fresh"] is False
+
+    monkeypatch.setattr(enrichment_store, "STORE_VERSION", "999")
+    with EnrichmentStore(path, stream=None) as store:
+        assert not store.fresh("lv0", source)
+
+
+@pytest.fixture
+def lookups(tmp_path: Path, monkeypatch) -> Path:
+    """Lookup files in tmp_path, wired into Eye 2's loaders (with empty caches)."""
+    profiles = _jsonl(tmp_path / "profiles.jsonl", [
+        {"lemma": "كتب", "masadiq": {"short_gloss": "to write"}, "mafahim": {"axial_meaning": "gathering"}},
+    ])
+    lv0 = _jsonl(tmp_path / "lexemes.jsonl", [
+        {"root_norm": "قلم", "short_gloss": "(K:) قطع"}, {"root_norm": "كتب", "short_gloss": "كتابة"},
+    ])
+    deep = _jsonl(tmp_path / "deep.jsonl", [{"root_norm": "قلم", "meanings": [{"sense": "pen"}], "extra": "x" * 50}])
+    (tmp_path / "grc_gloss.json").write_text(
+        json.dumps({"κάλαμος": {"ipa": "kálamos", "gloss": "reed, pen"}}, ensure_ascii=False), encoding="utf-8",
+    )
+    monkeypatch.setattr(eye2_batch_scorer, "_lv2_root", lambda: tmp_path)
+    monkeypatch.setattr(eye2_batch_scorer, "_IPA_GLOSS_PATHS", {"grc": "grc_gloss.json"})
+    monkeypatch.setattr(eye2_batch_scorer, "_default_lv0_lexemes_path", lambda: lv0)
+    monkeypatch.setattr(eye2_batch_scorer, "_deep_glossary_path", lambda: deep)
+    for cache, empty in (("_lv0_cache", None), ("_deep_glossary_cache", None), ("_profiles_cache", None),
+                         ("_target_glosses_cache", {})):
+        monkeypatch.setattr(eye2_batch_scorer, cache, empty)
+    return profiles
+
+
+def _candidates() -> list[dict]:
+    return [{"arabic_root": "كتب", "target_lemma": "γράφω"}, {"arabic_root": "قلم", "target_lemma": "κάλαμος"}]
+
+
+def _context(candidates: list[dict]) -> list[tuple]:
+    keys = ("masadiq_gloss", "mafahim_gloss", "target_meaning", "arabic_meanings_expanded")
+    return [tuple(json.dumps(c[k], ensure_ascii=False) for k in keys) for c in candidates]
+
+
+def test_enrich_from_store_matches_files(tmp_path: Path, lookups: Path, monkeypatch):
+    from_files = _candidates()
+    hits = eye2_batch_scorer.enrich_candidates(from_files, eye2_batch_scorer._load_profiles(lookups), "grc")
+    assert hits == {"arabic": 2, "target": 1, "deep": 1}
+    assert from_files[1]["masadiq_gloss"] == "قطع"  # LV0 fallback, prefix stripped
+
+    path = tmp_path / "lookups.sqlite"
+    build(path, profiles_path=lookups, langs=["grc"])
+    for loader in ("_load_profiles", "_load_lv0_definitions", "_load_deep_glossary", "_load_target_glosses"):
+        monkeypatch.setattr(eye2_batch_scorer, loader, lambda *a, name=loader: pytest.fail(f"{name} called"))
+    from_store = _candidates()
+    with EnrichmentStore(path, stream=None) as store:
+        profiles = eye2_batch_scorer._lookup(store, "profile", lookups, lambda: {})
+        assert eye2_batch_scorer.enrich_candidates(from_store, profiles, "grc", store=store) == hits
+    assert _context(from_store) == _context(from_files)
+
+
+def test_stale_kind_reads_the_file(tmp_path: Path, lookups: Path, capsys):
+    path = tmp_path / "lookups.sqlite"
+    build(path, profiles_path=lookups, langs=["grc"])
+    gloss = tmp_path / "grc_gloss.json"
+    gloss.write_text(json.dumps({"κάλαμος": {"ipa": "", "gloss": "reed"}}, ensure_ascii=False), encoding="utf-8")
+    os.utime(gloss, ns=(0, 0))
+    eye2_batch_scorer._target_glosses_cache.clear()
+    candidates = _candidates()
+    with EnrichmentStore(path, stream=sys.stderr) as store:
+        eye2_batch_scorer.enrich_candidates(candidates, {}, "grc", store=store)
+    assert candidates[1]["target_meaning"] == "reed"
+    assert "gloss:grc does not match" in capsys.readouterr().err
+
+
+def test_cli_status_and_get(tmp_path: Path, lookups: Path, capsys):
+    path = tmp_path / "lookups.sqlite"
+    assert enrichment_store.main(["--path", str(path), "status"]) == 1  # not built yet
+    assert enrichment_store.main(["--path", str(path), "build", "--profiles", str(lookups), "--langs", "grc"]) == 0
+    capsys.readouterr()
+    enrichment_store.main(["--path", str(path), "status"])
+    kinds = json.loads(capsys.readouterr().out)["kinds"]
+    assert {k: v["entries"] for k, v in kinds.items()} == {"deep": 1, "gloss:grc": 1, "lv0": 2, "profile": 1}
+    assert all(v["fresh"] for v in kinds.values())
+    enrichment_store.main(["--path", str(path), "get", "deep", "قلم"])
+    assert json.loads(capsys.readouterr().out) == {"meanings": [{"sense": "pen"}]}
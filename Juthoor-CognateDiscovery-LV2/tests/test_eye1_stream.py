@@ -0,0 +1,132 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.eye1_stream
+
+Covers:
+- Eye1Follower.poll(): a root is handed out only once the next root (or the
+  done marker) appears, half-written lines wait, min score / lang / top-N
+  applied per root as in load_eye1_candidates(), a shrinking file is an error
+- follow(): chunks held back until min_pairs, idle timeout
+- score_followed(): scoring while the Eye 1 output grows, same pairs as a
+  whole-file run, checkpoint candidate set extended per chunk
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import eye2_batch_scorer
+from juthoor_cognatediscovery_lv2.discovery.eye1_stream import Eye1Follower, done_marker, mark_done
+from juthoor_cognatediscovery_lv2.discovery.eye2_async import RestTransport
+from juthoor_cognatediscovery_lv2.discovery.eye2_checkpoint import Eye2Checkpoint
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn
+
+
+def _root(root: str, scores: list[float], lang: str = "lat") -> str:
+    return "".join(
+        json.dumps({"arabic_root": root, "target_lemma": f"{root}_{i}", "discovery_score": s, "lang": lang}) + "\n"
+        for i, s in enumerate(scores)
+    )
+
+
+def _append(path: Path, text: str) -> None:
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(text)
+
+
+def _follower(path: Path, **kwargs) -> Eye1Follower:
+    return Eye1Follower(path, **{"min_discovery_score": 0.5, "top_n_per_root": 2, "lang_filter": "lat",
+                                 "stream": None, "sleep": lambda s: None} | kwargs)
+
+
+def test_poll_hands_out_finished_roots_only(tmp_path: Path):
+    eye1 = tmp_path / "eye1.jsonl"
+    follower = _follower(eye1)
+    assert follower.poll() == [] and not follower.finished  # Eye 1 has not started yet
+
+    _append(eye1, _root("a", [0.9, 0.4, 0.7, 0.8]))
+    assert follower.poll() == []  # "a" may still get lines
+    _append(eye1, _root("b", [0.6], lang="grc") + '{"arabic_root": "c", "target')
+    assert [c["target_lemma"] for c in follower.poll()] == ["a_0", "a_3"]
+    assert follower.roots == 1
+
+    _append(eye1, '_lemma": "c_0", "discovery_score": 0.95, "lang": "lat"}\n')
+    mark_done(eye1, matches=7)
+    ready = follower.poll()
+    assert [c["target_lemma"] for c in ready] == ["c_0"]  # "b" filtered out by lang
+    assert follower.finished and (follower.roots, follower.candidates, follower.lines) == (3, 3, 6)
+
+    expected = eye2_batch_scorer.load_eye1_candidates(eye1, 0.5, 2, "lat")
+    assert {c["target_lemma"] for c in expected} == {"a_0", "a_3", "c_0"}
+
+
+def test_shrinking_input_is_an_error(tmp_path: Path):
+    eye1 = tmp_path / "eye1.jsonl"
+    _append(eye1, _root("a", [0.9]) + _root("b", [0.9]))
+    follower = _follower(eye1)
+    follower.poll()
+    eye1.write_text(_root("a", [0.9]), encoding="utf-8")
+    with pytest.raises(RuntimeError, match="shrank"):
+        follower.poll()
+
+
+def test_follow_chunks_and_idle_timeout(tmp_path: Path):
+    eye1 = tmp_path / "eye1.jsonl"
+    roots = iter(["a", "b", "c", "d"])
+
+    def produce(seconds: float) -> None:  # each poll interval, Eye 1 finishes one more root
+        root = next(roots, None)
+        if root is None:
+            mark_done(eye1)
+        else:
+            _append(eye1, _root(root, [0.9, 0.8, 0.7]))
+
+    follower = _follower(eye1, sleep=produce)
+    chunks = [[c["arabic_root"] for c in chunk] for chunk in follower.follow(min_pairs=3)]
+    assert chunks == [["a", "a", "b", "b"], ["c", "c", "d", "d"]]
+    assert follower.finished and done_marker(eye1).exists()
+
+    clock = iter(range(0, 1000, 10))
+    stalled = _follower(tmp_path / "never.jsonl", idle_timeout=25, clock=lambda: next(clock))
+    with pytest.raises(TimeoutError):
+        list(stalled.follow())
+
+
+def test_score_followed_scores_while_eye1_writes(tmp_path: Path, monkeypatch):
+    eye1 = tmp_path / "eye1.jsonl"
+    out = tmp_path / "eye2.jsonl"
+    roots = iter(f"r{i}" for i in range(6))
+    seen_by_eye1_when_scored: list[int] = []
+
+    def produce(seconds: float) -> None:
+        root = next(roots, None)
+        if root is None:
+            mark_done(eye1)
+        else:
+            _append(eye1, _root(root, [0.9, 0.8, 0.3]))
+
+    original = eye2_batch_scorer.score_candidates
+
+    def spy(candidates, **kwargs):
+        seen_by_eye1_when_scored.append(eye1.read_text(encoding="utf-8").count("\n"))
+        return original(candidates, **kwargs)
+
+    monkeypatch.setattr(eye2_batch_scorer, "score_candidates", spy)
+    follower = _follower(eye1, sleep=produce)
+    with MessagesStandIn() as server:
+        scored = eye2_batch_scorer.score_followed(
+            follower, min_pairs=4, profiles={}, output_path=out, model_alias="sonnet", lang="lat",
+            batch_size=3, resume=False, dry_run=False, batch_label="t", concurrency=2,
+            transport=RestTransport(server.base_url, api_key="test"),
+        )
+
+    assert scored == 12
+    assert seen_by_eye1_when_scored[0] < 18  # first chunk went out before Eye 1 finished
+    expected = eye2_batch_scorer.load_eye1_candidates(eye1, 0.5, 2, "lat")
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert sorted((r["source_lemma"], r["target_lemma"]) for r in rows) == \
+        sorted((c["arabic_root"], c["target_lemma"]) for c in expected)
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        status = ckpt.status()
+    assert (status["candidates"], status["done"], status["pending"]) == (12, 12, 0)
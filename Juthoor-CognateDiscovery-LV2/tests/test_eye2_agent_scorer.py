@@ -0,0 +1,97 @@
+"""
+Tests for scripts/discovery/eye2_agent_scorer.py --orchestrate
+
+Covers:
+- cmd_orchestrate() end to end with the stub backend over a tmp batches dir:
+  results written, report saved, findings merged, finished batches skipped
+- _write_findings(): results renamed into place, no temp files left behind
+- _results_cover_batch(): stale results count only if they answer every pair;
+  a torn or corrupt line means "not covered" instead of an exception
+- batches leased by another run: exit code 1 and no merge
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery.agent_orchestrator import LeaseDir
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "discovery" / "eye2_agent_scorer.py"
+
+
+@pytest.fixture
+def scorer(tmp_path: Path, monkeypatch):
+    spec = importlib.util.spec_from_file_location("eye2_agent_scorer", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "_outputs_dir", lambda: tmp_path / "outputs")
+    return module
+
+
+def _prepare(scorer, lang: str, n_batches: int, pairs: int = 2) -> None:
+    batches = scorer._batches_dir(lang)
+    batches.mkdir(parents=True)
+    for b in range(n_batches):
+        meta = [
+            {"pair_id": f"GOT_{b:02d}{i:02d}", "arabic_root": f"r{b}{i}", "target_lemma": f"t{b}{i}",
+             "lang": lang, "discovery_score": 0.5}
+            for i in range(pairs)
+        ]
+        (batches / f"batch_{b:03d}_meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        ids = ", ".join(mp["pair_id"] for mp in meta)
+        (batches / f"batch_{b:03d}.txt").write_text(f"Investigate.\n\nPair IDs to return: {ids}", encoding="utf-8")
+
+
+def _orchestrate(scorer, lang: str = "got") -> None:
+    scorer.main(["--orchestrate", "--lang", lang, "--backend", "stub", "--workers", "2", "--no-telemetry"])
+
+
+def test_orchestrate_end_to_end(scorer):
+    _prepare(scorer, "got", 3)
+    _orchestrate(scorer)
+
+    results = scorer._results_dir("got")
+    assert sorted(p.name for p in results.glob("batch_*.jsonl")) == [f"batch_{b:03d}.jsonl" for b in range(3)]
+    assert not list(results.glob("*.tmp"))
+    rows = [json.loads(line) for line in (results / "batch_001.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["pair_id"] for r in rows] == ["GOT_0100", "GOT_0101"]
+    assert {r["model"] for r in rows} == {"agent_stub"} and {r["verdict"] for r in rows} == {"no_connection"}
+    report = json.loads((results / "orchestrate_report.json").read_text(encoding="utf-8"))
+    assert (report["done"], report["pairs"], report["failed"]) == (3, 6, 0)
+    assert len(scorer._final_path("got").read_text(encoding="utf-8").splitlines()) == 6
+
+    _orchestrate(scorer)  # nothing left to do
+    report = json.loads((results / "orchestrate_report.json").read_text(encoding="utf-8"))
+    assert (report["done"], report["skipped"]) == (0, 3)
+
+
+def test_results_cover_batch(scorer, tmp_path: Path):
+    meta = tmp_path / "batch_000_meta.json"
+    meta.write_text(json.dumps([{"pair_id": "A"}, {"pair_id": "B"}]), encoding="utf-8")
+    results = tmp_path / "batch_000.jsonl"
+    assert not scorer._results_cover_batch(results, meta)
+
+    def stale(text: str) -> bool:
+        results.write_text(text, encoding="utf-8")
+        os.utime(results, (0, 0))  # older than the (re-prepared) meta file
+        return scorer._results_cover_batch(results, meta)
+
+    assert stale('{"pair_id": "A"}\n{"pair_id": "B"}\n')
+    assert not stale('{"pair_id": "A"}\n')
+    assert not stale('{"pair_id": "A"}\n{"pair_id": "B"}\n{"pair_id": "C", "fin')  # torn last line
+    assert not stale('{"pair_id": "A"}\n[1, 2]\n{"pair_id": "B"}\n')
+
+
+def test_orchestrate_does_not_merge_around_leased_batches(scorer):
+    _prepare(scorer, "got", 2)
+    LeaseDir(scorer._results_dir("got") / ".leases", owner="other-host-1").acquire("batch_000", ttl=600)
+    with pytest.raises(SystemExit) as exc:
+        _orchestrate(scorer)
+    assert exc.value.code == 1
+    report = json.loads((scorer._results_dir("got") / "orchestrate_report.json").read_text(encoding="utf-8"))
+    assert (report["done"], report["leased_elsewhere"]) == (1, 1)
+    assert not scorer._final_path("got").exists()
@@ -0,0 +1,226 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.eye2_async
+
+Covers:
+- parse_llm_json(), rate_limit_delay(), OrderedWriter, AdaptiveLimit
+- AsyncEye2Engine against the local stand-in (messages_standin):
+  bounded concurrency, ordered emits, retries on 429/529 and garbled
+  replies, no retry on 400, server-side quota shrinking the window
+- score_candidates() end to end: batch-order output, resume
+- prompt packing: roots stated once, token budget respected, pair_index
+  mapped back, fewer prompt tokens per pair than fixed batches, retry queue
+  packed ahead of the rest, grouped and flat prompts cached apart
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import eye2_batch_scorer
+from juthoor_cognatediscovery_lv2.discovery.eye2_async import (
+    AdaptiveLimit,
+    AsyncEye2Engine,
+    EngineConfig,
+    OrderedWriter,
+    RestTransport,
+    parse_llm_json,
+    rate_limit_delay,
+)
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn, standin_score
+
+
+@pytest.fixture
+def standin():
+    with MessagesStandIn() as server:
+        yield server
+
+
+def _engine(server: MessagesStandIn, **cfg) -> AsyncEye2Engine:
+    config = EngineConfig(**{"model_id": "test-model", "concurrency": 3, "max_retries": 3, "backoff_base": 0.001} | cfg)
+    return AsyncEye2Engine(config, transport=RestTransport(server.base_url, api_key="test"), seed=0, stream=None)
+
+
+def _prompt(i: int, n: int = 2) -> str:
+    return "\n".join(f'{j}. Arabic "r{i}" (x) <-> Latin "w{i}_{j}"' for j in range(n))
+
+
+def _run(engine: AsyncEye2Engine, prompts: list[str]) -> tuple[list[int], dict, dict]:
+    order: list[int] = []
+    results: dict = {}
+
+    def emit(i, items):
+        order.append(i)
+        results[i] = items
+
+    return order, results, engine.run(prompts, emit)
+
+
+# ── helpers ──────────────────────────────────────────────────────
+
+def test_parse_llm_json():
+    assert parse_llm_json('[{"pair_index": 0}]') == [{"pair_index": 0}]
+    assert parse_llm_json('```json\n[{"pair_index": 1}]\n```') == [{"pair_index": 1}]
+    with pytest.raises(ValueError):
+        parse_llm_json('{"pair_index": 0}')
+    with pytest.raises(ValueError):
+        parse_llm_json("Sorry, I cannot do that.")
+
+
+def test_rate_limit_delay():
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    reset = (now + timedelta(seconds=12)).isoformat().replace("+00:00", "Z")
+    assert rate_limit_delay({"Retry-After": "3"}, now=now) == 3.0
+    exhausted = {"anthropic-ratelimit-tokens-remaining": "0", "anthropic-ratelimit-tokens-reset": reset}
+    assert rate_limit_delay(exhausted, now=now) == pytest.approx(12.0)
+    assert rate_limit_delay({**exhausted, "anthropic-ratelimit-tokens-remaining": "5"}, now=now) is None
+    assert rate_limit_delay({}, now=now) is None
+
+
+def test_ordered_writer_holds_back_and_drains():
+    out: list[int] = []
+    writer = OrderedWriter(lambda i, v: out.append(i))
+    writer.put(1, "b")
+    writer.put(3, "d")
+    assert out == [] and writer.held == 2
+    writer.put(0, "a")
+    assert out == [0, 1] and 3 in writer and 2 not in writer
+    writer.drain()
+    assert out == [0, 1, 3] and writer.held == 0
+
+
+def test_adaptive_limit_halves_and_recovers():
+    limit = AdaptiveLimit(8, increase_every=2)
+    limit.throttled()
+    limit.throttled()
+    assert limit.limit == 2
+    for _ in range(4):
+        limit.succeeded()
+    assert limit.limit == 4
+
+
+# ── engine against the stand-in ──────────────────────────────────
+
+def test_concurrent_and_ordered():
+    with MessagesStandIn(latency=0.05, fence=True) as server:
+        order, results, stats = _run(_engine(server, concurrency=4), [_prompt(i) for i in range(12)])
+    assert order == list(range(12))
+    assert server.max_in_flight == 4 and stats["max_in_flight"] == 4
+    assert results[5][1]["score"] == standin_score("r5", "w5_1")
+    assert stats["requests"] == 12 and stats["failed_batches"] == 0
+    assert stats["input_tokens"] > 0 and stats["pairs_per_s"] > 0
+
+
+def test_retries_throttling_and_garbled(standin):
+    standin.respond_with(429, 529, "garbled")
+    _, results, stats = _run(_engine(standin, concurrency=1), [_prompt(i) for i in range(3)])
+    assert all(results[i] for i in range(3))
+    assert stats["retries"] == 3 and stats["throttled"] == 2 and stats["parse_failures"] == 1
+    assert standin.pairs_served == 6
+
+
+def test_client_error_fails_only_its_batch(standin):
+    standin.fail_next(1, 400)
+    order, results, stats = _run(_engine(standin, concurrency=1), [_prompt(i) for i in range(3)])
+    assert order == [0, 1, 2] and results[0] is None and results[1] and results[2]
+    assert stats["failed_batches"] == 1 and stats["retries"] == 0
+
+
+def test_server_quota_shrinks_window():
+    with MessagesStandIn(requests_per_window=3, window=0.2) as server:
+        _, results, stats = _run(_engine(server, concurrency=6, max_retries=10), [_prompt(i) for i in range(9)])
+    assert all(results[i] for i in range(9))
+    assert stats["throttled"] >= 1 and stats["failed_batches"] == 0
+
+
+# ── score_candidates end to end ──────────────────────────────────
+
+def test_score_candidates_writes_in_batch_order(tmp_path: Path, standin):
+    standin.latency = 0.02
+    candidates = [
+        {"arabic_root": f"r{i // 3}", "target_lemma": f"w{i}", "discovery_score": 0.9} for i in range(10)
+    ]
+    out = tmp_path / "eye2.jsonl"
+    transport = RestTransport(standin.base_url, api_key="test")
+    kwargs = dict(profiles={}, output_path=out, model_alias="sonnet", lang="lat", batch_size=3,
+                  dry_run=False, batch_label="t", concurrency=3, transport=transport)
+    assert eye2_batch_scorer.score_candidates(candidates[:7], resume=False, **kwargs) == 7
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert [r["target_lemma"] for r in rows] == [f"w{i}" for i in range(7)]
+    assert rows[4]["semantic_score"] == standin_score("r1", "w4") and rows[4]["lang_pair"] == "ara-lat"
+
+    assert eye2_batch_scorer.score_candidates(candidates, resume=True, **kwargs) == 3
+    assert standin.pairs_served == 10
+
+
+# ── prompt packing ───────────────────────────────────────────────
+
+def _rich(n_roots: int, per_root: int) -> list[dict]:
+    senses = [{"sense": f"meaning {k} of the root, with a long explanatory gloss"} for k in range(7)]
+    return [
+        {"arabic_root": f"r{i}", "target_lemma": f"w{i}_{j}", "discovery_score": 0.9,
+         "masadiq_gloss": "a fairly long dictionary gloss " * 4, "mafahim_gloss": "core concept",
+         "arabic_meanings_expanded": senses, "target_meaning": f"gloss {j}"}
+        for i in range(n_roots) for j in range(per_root)
+    ]
+
+
+def test_pack_batches_groups_roots_within_budget():
+    pairs = _rich(6, 4)
+    pairs = pairs[::2] + pairs[1::2]  # interleaved roots; packing regroups them
+    batches = eye2_batch_scorer._pack_batches(pairs, "lat", max_pairs=25, token_budget=3300)
+    assert sorted(p["target_lemma"] for b in batches for p in b) == sorted(p["target_lemma"] for p in pairs)
+    assert len(batches) > 1
+    for batch in batches:
+        prompt = eye2_batch_scorer._build_prompt(batch, "lat", grouped=True)
+        assert eye2_batch_scorer.estimate_prompt_tokens(prompt) <= 3300
+        roots = [p["arabic_root"] for p in batch]
+        assert prompt.count("ALL MEANINGS") == len(dict.fromkeys(roots))  # each root's context once
+        assert roots == sorted(roots, key=roots.index)  # a root's targets are contiguous
+    assert all(len(b) <= 3 for b in eye2_batch_scorer._pack_batches(pairs, "lat", 3, 10**6))
+
+
+def test_plan_batches_packs_retry_queue_first(capsys):
+    pairs = _rich(3, 3)
+    head = [pairs[0], pairs[4]]  # failed-batch retries from roots r0 and r1
+    pending = head + [p for p in pairs if p not in head]
+    regrouped = eye2_batch_scorer._plan_batches(pending, "lat", 25, 10**6)[0]
+    assert regrouped[0][:3] == pairs[:3]  # r0's later targets jump ahead of r1's retry
+    batches, prompts = eye2_batch_scorer._plan_batches(pending, "lat", 25, 10**6, head=len(head))
+    assert batches[0] == head and len(prompts) == 2
+    assert sorted(p["target_lemma"] for p in batches[1]) == sorted(p["target_lemma"] for p in pending[2:])
+
+
+def test_cache_scope_separates_prompt_layouts():
+    flat = eye2_batch_scorer._cache_template_version(0)
+    assert flat == eye2_batch_scorer.template_version(eye2_batch_scorer._load_prompt_template())
+    assert eye2_batch_scorer._cache_template_version(6000) != flat
+
+
+def test_packed_prompts_score_fewer_tokens_per_pair(tmp_path: Path, standin, capsys):
+    candidates = [dict(c, arabic_root=f"r{i // 4}") for i, c in enumerate(_rich(1, 12))]
+    out = tmp_path / "eye2.jsonl"
+    kwargs = dict(profiles={}, output_path=out, model_alias="sonnet", lang="lat", batch_size=25, resume=False,
+                  dry_run=False, batch_label="t", transport=RestTransport(standin.base_url, api_key="test"))
+    # score_candidates re-enriches from profiles, so check packing on the enriched prompts directly
+    batches, prompts = eye2_batch_scorer._plan_batches(candidates, "lat", 5, 4000)
+    assert "tokens/pair" in capsys.readouterr().err
+    fixed = eye2_batch_scorer._plan_batches(candidates, "lat", 5, 0)[1]
+    per_pair = lambda ps: sum(map(eye2_batch_scorer.estimate_prompt_tokens, ps)) / len(candidates)
+    assert per_pair(prompts) < per_pair(fixed)
+
+    assert eye2_batch_scorer.score_candidates(candidates, token_budget=4000, **kwargs) == 12
+    rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+    assert {r["target_lemma"]: r["semantic_score"] for r in rows} == {
+        c["target_lemma"]: standin_score(c["arabic_root"], c["target_lemma"]) for c in candidates
+    }
+    assert standin.requests[-1]["pairs"] == 12 and len(standin.requests) == 1
+
+
+def test_result_records_drop_bad_and_repeated_indices():
+    batch = [{"arabic_root": "r", "target_lemma": f"w{i}"} for i in range(2)]
+    items = [{"pair_index": 1, "score": 0.5}, {"pair_index": 1, "score": 0.9}, {"pair_index": 7}, {"pair_index": "0"}]
+    records = eye2_batch_scorer._result_records(batch, items, "lat", "sonnet", "t")
+    assert [(r["target_lemma"], r["semantic_score"]) for r in records] == [("w1", 0.5)]
@@ -0,0 +1,120 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.eye2_batch_api
+
+Covers:
+- score_candidates(batch_api=...) against the local stand-in: submit, poll,
+  collect into the usual output rows, manifest states
+- submit now / collect later with a fresh runner (resume after a restart)
+- errored requests are resubmitted on the next run, in-flight pairs are not
+- a job interrupted mid-collection skips pairs already written
+- jobs are split at max_requests
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import eye2_batch_scorer
+from juthoor_cognatediscovery_lv2.discovery.eye2_batch_api import (
+    BatchAPIOptions,
+    BatchClient,
+    BatchJobRunner,
+    batch_workdir,
+)
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn, standin_score
+
+
+@pytest.fixture
+def standin():
+    with MessagesStandIn(batch_polls=2) as server:
+        yield server
+
+
+def _candidates(n: int) -> list[dict]:
+    return [{"arabic_root": f"r{i // 3}", "target_lemma": f"w{i}", "discovery_score": 0.9} for i in range(n)]
+
+
+def _score(server: MessagesStandIn, candidates: list[dict], out: Path, **options) -> int:
+    client = BatchClient(server.base_url, api_key="test", sleep=lambda s: None)
+    batch_api = BatchAPIOptions(**{"poll_interval": 0.0, "client": client} | options)
+    return eye2_batch_scorer.score_candidates(
+        candidates, profiles={}, output_path=out, model_alias="sonnet", lang="lat", batch_size=3,
+        resume=False, dry_run=False, batch_label="t", batch_api=batch_api,
+    )
+
+
+def _rows(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _manifest(out: Path) -> dict:
+    return json.loads((batch_workdir(out) / "manifest.json").read_text(encoding="utf-8"))
+
+
+def test_run_submits_polls_and_collects(tmp_path: Path, standin):
+    out = tmp_path / "eye2.jsonl"
+    assert _score(standin, _candidates(7), out) == 7
+    rows = {r["target_lemma"]: r for r in _rows(out)}
+    assert len(rows) == 7 and rows["w4"]["semantic_score"] == standin_score("r1", "w4")
+    assert rows["w4"]["lang_pair"] == "ara-lat" and rows["w4"]["discovery_score"] == 0.9
+    jobs = _manifest(out)["jobs"]
+    assert [(j["state"], j["requests"], j["pairs"], j["succeeded"]) for j in jobs] == [("collected", 3, 7, 3)]
+    assert all(r.get("batch") for r in standin.requests) and standin.pairs_served == 7
+
+    assert _score(standin, _candidates(7), out) == 0  # everything already in the output
+    assert len(standin.batches) == 1
+
+
+def test_submit_then_collect_with_fresh_runner(tmp_path: Path, standin):
+    out = tmp_path / "eye2.jsonl"
+    assert _score(standin, _candidates(6), out, action="submit") == 0
+    assert not out.exists() or not out.read_text(encoding="utf-8")
+    assert _manifest(out)["jobs"][0]["state"] == "submitted"
+
+    # a later invocation (e.g. after a reboot) does not resubmit in-flight pairs
+    assert _score(standin, _candidates(6), out, action="collect") == 0  # first poll: still in progress
+    assert _score(standin, _candidates(6), out, action="collect") == 6
+    assert len(standin.batches) == 1 and _manifest(out)["jobs"][0]["state"] == "collected"
+
+
+def test_errored_requests_are_resubmitted(tmp_path: Path, standin):
+    out = tmp_path / "eye2.jsonl"
+    standin.batch_errors.add("j0000-r000001")
+    assert _score(standin, _candidates(9), out) == 6
+    assert _manifest(out)["jobs"][0]["failed"] == 1
+    standin.batch_errors.clear()
+    assert _score(standin, _candidates(9), out) == 3
+    jobs = _manifest(out)["jobs"]
+    assert [j["pairs"] for j in jobs] == [9, 3]
+    assert sorted(r["target_lemma"] for r in _rows(out)) == sorted(f"w{i}" for i in range(9))
+
+
+def test_interrupted_collection_skips_written_pairs(tmp_path: Path, standin):
+    out = tmp_path / "eye2.jsonl"
+    _score(standin, _candidates(6), out, action="submit")
+    runner = BatchJobRunner(batch_workdir(out), BatchClient(standin.base_url, api_key="test"), model_id="m", stream=None)
+    written: list[tuple[str, str]] = []
+
+    def crash_after_first(pairs, items, skip):
+        written.extend((p["arabic_root"], p["target_lemma"]) for p in pairs)
+        with open(out, "a", encoding="utf-8") as fh:
+            for p in pairs:
+                fh.write(json.dumps({"source_lemma": p["arabic_root"], "target_lemma": p["target_lemma"]}) + "\n")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.collect(crash_after_first, sleep=lambda s: None, poll_interval=0.0)
+    assert _manifest(out)["jobs"][0]["state"] == "collecting" and len(written) == 3
+
+    assert _score(standin, _candidates(6), out, action="collect") == 3
+    assert sorted(r["target_lemma"] for r in _rows(out)) == sorted(f"w{i}" for i in range(6))
+
+
+def test_jobs_split_at_max_requests(tmp_path: Path, standin):
+    out = tmp_path / "eye2.jsonl"
+    assert _score(standin, _candidates(10), out, max_requests=2) == 10
+    jobs = _manifest(out)["jobs"]
+    assert [j["requests"] for j in jobs] == [2, 2] and len(standin.batches) == 2
+    assert (batch_workdir(out) / "job_0001.jsonl").exists()
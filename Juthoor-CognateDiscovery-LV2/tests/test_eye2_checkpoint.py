@@ -0,0 +1,137 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.eye2_checkpoint
+
+Covers:
+- Eye2Checkpoint: commit/done_among, failed queue attempts, status counts
+- sync(): indexes only an un-indexed tail, cuts a torn last line,
+  re-indexes an output that shrank or was replaced (same size or larger),
+  forgets one that was deleted
+- score_candidates(): resume from the index (output not re-read), failed
+  batches queued and retried first, --status CLI
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import eye2_batch_scorer
+from juthoor_cognatediscovery_lv2.discovery.eye2_async import RestTransport
+from juthoor_cognatediscovery_lv2.discovery.eye2_checkpoint import Eye2Checkpoint, checkpoint_path
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn
+
+
+def _line(source: str, target: str) -> str:
+    return json.dumps({"source_lemma": source, "target_lemma": target}) + "\n"
+
+
+def test_commit_fail_and_status(tmp_path: Path):
+    out = tmp_path / "eye2.jsonl"
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        ckpt.set_candidates([("r", f"w{i}") for i in range(5)])
+        ckpt.fail([("r", "w3"), ("r", "w4")], "batch failed after retries")
+        ckpt.fail([("r", "w4")], "no result for pair_index")
+        out.write_text(_line("r", "w0") + _line("r", "w3"), encoding="utf-8")
+        ckpt.commit([("r", "w0"), ("r", "w3")], out.stat().st_size)
+        assert ckpt.done_among([("r", "w0"), ("r", "w1"), ("r", "w3")]) == {("r", "w0"), ("r", "w3")}
+        assert ckpt.failed_pairs() == {("r", "w4")}
+        status = ckpt.status()
+    assert (status["done"], status["failed"], status["pending"], status["candidates"]) == (2, 1, 3, 5)
+    assert status["failed_more_than_once"] == 1 and status["unindexed_bytes"] == 0
+
+
+def test_sync_tail_torn_line_and_shrink(tmp_path: Path):
+    out = tmp_path / "eye2.jsonl"
+    out.write_text(_line("r", "a") + _line("r", "b"), encoding="utf-8")
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        assert ckpt.sync() == 2  # first use indexes the existing output
+        with open(out, "a", encoding="utf-8") as fh:  # written, then crashed before commit
+            fh.write(_line("r", "c") + '{"source_lemma": "r", "targ')
+        assert ckpt.sync() == 1
+        assert out.read_text(encoding="utf-8").endswith(_line("r", "c"))
+        assert ckpt.offset == out.stat().st_size
+        out.write_text(_line("r", "z"), encoding="utf-8")  # replaced by a shorter file
+        assert ckpt.sync() == 1
+        assert ckpt.done_among([("r", "a"), ("r", "z")]) == {("r", "z")}
+
+
+def test_sync_reindexes_a_replaced_output_of_any_size(tmp_path: Path):
+    out = tmp_path / "eye2.jsonl"
+    out.write_text(_line("r", "a") + _line("r", "b"), encoding="utf-8")
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        assert ckpt.sync() == 2
+        out.write_text(_line("r", "x") + _line("r", "y"), encoding="utf-8")  # same size, rewritten in place
+        assert ckpt.sync() == 2
+        assert ckpt.done_among([("r", "a"), ("r", "x"), ("r", "y")]) == {("r", "x"), ("r", "y")}
+        new = tmp_path / "other.jsonl"  # same first line, longer, swapped in by rename
+        new.write_text(_line("r", "x") + _line("r", "p") + _line("r", "q"), encoding="utf-8")
+        new.replace(out)
+        assert ckpt.sync() == 3
+        assert ckpt.done_among([("r", "y"), ("r", "q")]) == {("r", "q")}
+        with open(out, "a", encoding="utf-8") as fh:  # a plain append is still just a tail
+            fh.write(_line("r", "t"))
+        assert ckpt.sync() == 1
+
+
+def test_sync_forgets_a_deleted_output(tmp_path: Path):
+    out = tmp_path / "eye2.jsonl"
+    out.write_text(_line("r", "a") + _line("r", "b"), encoding="utf-8")
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        assert ckpt.sync() == 2
+        out.unlink()  # output removed, sqlite sidecar kept
+        assert ckpt.sync() == 0
+        assert ckpt.done_among([("r", "a"), ("r", "b")]) == set()
+        assert ckpt.sync() == 0
+        out.write_text(_line("r", "c"), encoding="utf-8")
+        assert ckpt.sync() == 1
+        assert ckpt.done_among([("r", "a"), ("r", "c")]) == {("r", "c")}
+
+
+@pytest.fixture
+def standin():
+    with MessagesStandIn() as server:
+        yield server
+
+
+def _kwargs(server: MessagesStandIn, out: Path) -> dict:
+    return dict(profiles={}, output_path=out, model_alias="sonnet", lang="lat", batch_size=3, dry_run=False,
+                batch_label="t", concurrency=1, transport=RestTransport(server.base_url, api_key="test"))
+
+
+def test_failed_batches_are_retried_first_on_resume(tmp_path: Path, standin, monkeypatch):
+    candidates = [{"arabic_root": f"r{i // 3}", "target_lemma": f"w{i}", "discovery_score": 0.9} for i in range(9)]
+    out = tmp_path / "eye2.jsonl"
+    standin.respond_with(200, 400)  # second batch fails for good
+    assert eye2_batch_scorer.score_candidates(candidates, resume=False, **_kwargs(standin, out)) == 6
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        assert ckpt.failed_pairs() == {("r1", f"w{i}") for i in range(3, 6)}
+        assert ckpt.status()["pending"] == 3
+
+    def no_rescan(path):
+        raise AssertionError("resume must use the checkpoint index")
+
+    monkeypatch.setattr(eye2_batch_scorer, "load_scored_pairs", no_rescan)
+    more = candidates + [{"arabic_root": "r9", "target_lemma": "w9", "discovery_score": 0.9}]
+    served = len(standin.requests)
+    assert eye2_batch_scorer.score_candidates(more, resume=True, **_kwargs(standin, out)) == 4
+    first_retry = standin.requests[served]
+    assert first_retry["pairs"] == 3 and first_retry["outcome"] == 200
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["target_lemma"] for line in lines[6:9]] == ["w3", "w4", "w5"]
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        status = ckpt.status()
+    assert (status["done"], status["failed"], status["pending"]) == (10, 0, 0)
+
+
+def test_status_cli(tmp_path: Path, capsys):
+    out = tmp_path / "eye2.jsonl"
+    out.write_text(_line("r", "a"), encoding="utf-8")
+    with Eye2Checkpoint(out, stream=None) as ckpt:
+        ckpt.sync()
+        ckpt.fail([("r", "b")], "batch failed after retries")
+    eye2_batch_scorer.main(["--output", str(out), "--status"])
+    status = json.loads(capsys.readouterr().out)
+    assert status["done"] == 1 and status["failed"] == 1
+    assert status["failed_reasons"] == {"batch failed after retries": 1}
+    assert checkpoint_path(out).exists()
@@ -0,0 +1,206 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.gemini_async
+
+Covers:
+- TokenBucket pacing and retry_delay() bounds
+- AsyncGeminiEmbedder against the local stand-in (gemini_standin):
+  bounded concurrency, retries on 429/503, no retry on 400, dedupe
+- EmbeddingStore caching: cached texts are never re-requested, store key
+  depends on dimensions/task type but not on throughput settings
+- resume after a failed run only requests the missing texts
+- embed_corpus(backend="api") through $GEMINI_BASE_URL
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import EmbeddingStore, namespace_name
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import GeminiConfig, GeminiEmbedder
+from juthoor_cognatediscovery_lv2.lv3.discovery.gemini_async import (
+    AsyncGeminiEmbedder,
+    GeminiAPIError,
+    RestTransport,
+    TokenBucket,
+    retry_delay,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.gemini_standin import GeminiStandIn, standin_vector
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+
+DIM = 16
+
+
+@pytest.fixture
+def standin():
+    with GeminiStandIn() as server:
+        yield server
+
+
+def _embedder(server: GeminiStandIn, store: EmbeddingStore | None = None, **cfg) -> AsyncGeminiEmbedder:
+    config = GeminiConfig(**{"dimensions": DIM, "batch_size": 4, "concurrency": 3, "max_retries": 3} | cfg)
+    return AsyncGeminiEmbedder(
+        config=config,
+        transport=RestTransport(server.base_url, api_key="test"),
+        store=store,
+        backoff_base=0.001,
+        seed=0,
+    )
+
+
+def _texts(n: int) -> list[str]:
+    return [f"word {i}" for i in range(n)]
+
+
+class TestTokenBucket:
+    def test_paces_after_burst(self):
+        async def run() -> float:
+            bucket = TokenBucket(600, burst=2)  # 10 per second
+            waited = 0.0
+            for _ in range(4):
+                waited += await bucket.acquire(1)
+            return waited
+
+        assert 0.15 <= asyncio.run(run()) < 0.5
+
+    def test_unlimited_and_oversized(self):
+        async def run() -> tuple[float, float]:
+            assert await TokenBucket(0).acquire(10**9) == 0.0
+            bucket = TokenBucket(6000, burst=5)
+            first = await bucket.acquire(50)  # larger than the bucket: allowed once full
+            return first, await bucket.acquire(1)
+
+        first, second = asyncio.run(run())
+        assert first == 0.0 and second > 0.4
+
+    def test_retry_delay_bounds(self):
+        rng = random.Random(1)
+        assert all(0 <= retry_delay(a, base=1, cap=4, rng=rng) <= 4 for a in range(10))
+        assert retry_delay(0, base=0.01, retry_after=2.0, rng=rng) == 2.0
+
+
+class TestAsyncEmbedder:
+    def test_vectors_in_input_order(self, standin):
+        texts = ["b", "a", "b", " a ", "c"]
+        emb = _embedder(standin)
+        vecs = emb.embed(texts)
+        np.testing.assert_allclose(vecs[0], standin_vector("b", DIM), rtol=1e-5)
+        np.testing.assert_allclose(vecs[3], vecs[1])  # same normalized text
+        assert emb.last_usage["sent"] == 3 and standin.texts_served == 3
+
+    def test_bounded_concurrency(self, standin):
+        standin.latency = 0.05
+        _embedder(standin, concurrency=2, batch_size=1).embed(_texts(8))
+        assert standin.max_in_flight == 2
+        assert len(standin.requests) == 8
+
+    def test_retries_transient_errors(self, standin):
+        standin.fail_next(2, 429)
+        standin.fail_next(1, 503)
+        emb = _embedder(standin, concurrency=1)
+        assert emb.embed(_texts(6)).shape == (6, DIM)
+        assert emb.last_usage["retries"] == 3
+        assert [r["status"] for r in standin.requests] == [429, 429, 503, 200, 200]
+
+    def test_gives_up(self, standin):
+        standin.fail_next(1, 400)
+        with pytest.raises(GeminiAPIError) as err:
+            _embedder(standin, concurrency=1).embed(_texts(2))
+        assert err.value.status == 400 and len(standin.requests) == 1
+
+        standin.fail_next(10, 503)
+        with pytest.raises(GeminiAPIError):
+            _embedder(standin, concurrency=1, max_retries=2).embed(_texts(2))
+        assert len(standin.requests) == 4
+
+    def test_rate_limit_spreads_requests(self, standin):
+        _embedder(standin, concurrency=4, batch_size=1, requests_per_minute=1200).embed(_texts(25))
+        times = sorted(r["time"] for r in standin.requests)
+        # 20 requests in the initial burst, the remaining 5 at 20/s
+        assert times[-1] - times[0] >= 0.2
+
+    def test_unreachable_server(self):
+        emb = AsyncGeminiEmbedder(
+            config=GeminiConfig(dimensions=DIM, max_retries=1),
+            transport=RestTransport("http://127.0.0.1:9", timeout=1),
+            backoff_base=0.001,
+        )
+        with pytest.raises(GeminiAPIError) as err:
+            emb.embed(["x"])
+        assert err.value.status == 0 and emb.last_usage["retries"] == 1
+
+
+class TestStore:
+    def test_cache_hits_skip_requests(self, standin, tmp_path: Path):
+        config = GeminiConfig(dimensions=DIM, batch_size=4)
+        store = EmbeddingStore(tmp_path, config.model_id, config)
+        first = _embedder(standin, store).embed(_texts(10))
+        assert len(store) == 10
+        n_requests = len(standin.requests)
+
+        again = _embedder(standin, EmbeddingStore(tmp_path, config.model_id, config))
+        vecs = again.embed(_texts(12))
+        np.testing.assert_allclose(vecs[:10], first)
+        assert again.last_usage["sent"] == 2
+        assert len(standin.requests) == n_requests + 1
+
+    def test_namespace_keys(self):
+        base = GeminiConfig()
+        assert namespace_name(base.model_id, base) == namespace_name(
+            base.model_id, GeminiConfig(concurrency=16, requests_per_minute=60, batch_size=10)
+        )
+        assert namespace_name(base.model_id, base) != namespace_name(base.model_id, GeminiConfig(dimensions=768))
+        assert namespace_name(base.model_id, base) != namespace_name(
+            base.model_id, GeminiConfig(task_type="RETRIEVAL_DOCUMENT")
+        )
+
+    def test_resume_after_failure(self, standin, tmp_path: Path):
+        config = GeminiConfig(dimensions=DIM, batch_size=4)
+        texts = _texts(20)
+        # the 3rd request fails for good; finished batches must still be stored
+        standin.respond_with(200, 200, 400)
+        emb = _embedder(standin, EmbeddingStore(tmp_path, config.model_id, config), concurrency=1)
+        emb.checkpoint_every = 1000
+        with pytest.raises(GeminiAPIError):
+            emb.embed(texts)
+        store = EmbeddingStore(tmp_path, config.model_id, config)
+        assert len(store) == 8
+
+        standin.requests.clear()
+        resumed = _embedder(standin, store)
+        vecs = resumed.embed(texts)
+        assert resumed.last_usage["sent"] == 12
+        assert sorted(t for r in standin.requests for t in r["texts"]) == sorted(texts[8:])
+        np.testing.assert_allclose(vecs[19], standin_vector(texts[19], DIM), rtol=1e-5)
+
+
+def test_embed_corpus_api_backend(standin, tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("GEMINI_BASE_URL", standin.base_url)
+    spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+    rows = [LexemeRow(i, {"id": f"x:{i}", "meaning_text": f"gloss {i % 3}"}) for i in range(5)]
+    vecs, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec, rows=rows, backend="api")
+    assert vecs.shape == (5, 1024)
+    np.testing.assert_allclose(vecs[4], standin_vector("gloss 1", 1024), rtol=1e-5)
+    assert standin.texts_served == 3
+    assert {r["task_type"] for r in standin.requests} == {"SEMANTIC_SIMILARITY"}
+
+    # a new corpus reuses the store; only the unseen gloss is requested
+    spec2 = CorpusSpec(lang="heb", stage="classical", path=Path("b.jsonl"))
+    rows2 = [LexemeRow(0, {"id": "y:0", "meaning_text": "gloss 0"}), LexemeRow(1, {"id": "y:1", "meaning_text": "new"})]
+    retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec2, rows=rows2, backend="api")
+    assert standin.texts_served == 4
+
+
+def test_gemini_embedder_delegates(standin):
+    emb = GeminiEmbedder(
+        config=GeminiConfig(dimensions=DIM),
+        transport=RestTransport(standin.base_url),
+    )
+    vecs = emb.embed(["x", "y"])
+    np.testing.assert_allclose(np.linalg.norm(vecs, axis=1), 1.0, rtol=1e-5)
+    assert emb.last_usage["requests"] == 1
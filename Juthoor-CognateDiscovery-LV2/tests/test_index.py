@@ -0,0 +1,144 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.index
+
+Covers:
+- IndexSpec: string parsing, size resolution, factory strings, cache slugs
+- select_train_sample(): size, determinism, passthrough
+- FaissIndex metadata: recipe round-trip, legacy {"dim": ...} files
+- build_index(): every recipe against the flat index (requires faiss)
+"""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.lv3.discovery.index import (
+    FaissIndex,
+    IndexSpec,
+    select_train_sample,
+)
+
+
+# ---------------------------------------------------------------------------
+# IndexSpec
+# ---------------------------------------------------------------------------
+
+class TestIndexSpec:
+    def test_default_is_flat(self):
+        spec = IndexSpec()
+        assert spec.kind == "flat"
+        assert spec.factory_string() == "Flat"
+        assert spec.slug() == "flat"
+
+    def test_from_string(self):
+        spec = IndexSpec.from_string("ivf_pq:nlist=1024, pq_m=64,nprobe=32")
+        assert (spec.kind, spec.nlist, spec.pq_m, spec.nprobe) == ("ivf_pq", 1024, 64, 32)
+        assert IndexSpec.from_string("hnsw").kind == "hnsw"
+
+    @pytest.mark.parametrize("text", ["annoy", "ivf_flat:bogus=1", "ivf_flat:nlist"])
+    def test_from_string_rejects_bad_input(self, text):
+        with pytest.raises(ValueError):
+            IndexSpec.from_string(text)
+
+    def test_resolve_nlist_and_train_size(self):
+        spec = IndexSpec(kind="ivf_flat").resolve(1_000_000, 1024)
+        assert spec.nlist == 4000
+        assert spec.train_size >= spec.nlist * 39
+
+    def test_resolve_caps_nlist_on_small_corpora(self):
+        spec = IndexSpec(kind="ivf_flat").resolve(1000, 64)
+        assert spec.nlist == 1000 // 39
+        assert spec.train_size == 1000
+
+    def test_resolve_pq_m_divides_dim(self):
+        assert IndexSpec(kind="ivf_pq").resolve(100_000, 1024).pq_m == 64
+        assert IndexSpec(kind="ivf_pq").resolve(100_000, 1000).pq_m == 50
+        with pytest.raises(ValueError):
+            IndexSpec(kind="ivf_pq", pq_m=60).resolve(100_000, 1024)
+
+    def test_factory_strings(self):
+        assert IndexSpec(kind="ivf_flat", nlist=256).factory_string() == "IVF256,Flat"
+        assert IndexSpec(kind="ivf_pq", nlist=256, pq_m=16).factory_string() == "IVF256,PQ16x8"
+        assert IndexSpec(kind="opq_ivf_pq", nlist=256, pq_m=16).factory_string() == "OPQ16,IVF256,PQ16x8"
+        assert IndexSpec(kind="hnsw", hnsw_m=48).factory_string() == "HNSW48,Flat"
+
+    def test_slug_ignores_search_knobs(self):
+        a = IndexSpec(kind="ivf_pq", nlist=256, pq_m=16, nprobe=8)
+        b = IndexSpec(kind="ivf_pq", nlist=256, pq_m=16, nprobe=64)
+        assert a.slug() == b.slug() == "ivf_pq_nl256_m16x8"
+
+    def test_dict_round_trip(self):
+        spec = IndexSpec(kind="hnsw", hnsw_m=16, ef_search=64)
+        assert IndexSpec.from_dict(spec.to_dict() | {"unknown": 1}) == spec
+
+
+# ---------------------------------------------------------------------------
+# Train sample / metadata
+# ---------------------------------------------------------------------------
+
+class TestTrainSample:
+    def test_sample_size_and_determinism(self):
+        vecs = np.arange(200, dtype="float32").reshape(100, 2)
+        a = select_train_sample(vecs, 10, seed=3)
+        b = select_train_sample(vecs, 10, seed=3)
+        assert a.shape == (10, 2)
+        np.testing.assert_array_equal(a, b)
+        assert len({tuple(r) for r in a}) == 10
+
+    def test_full_corpus_when_n_covers_it(self):
+        vecs = np.ones((5, 3), dtype="float64")
+        out = select_train_sample(vecs, 0)
+        assert out.shape == (5, 3) and out.dtype == np.float32
+
+
+class TestFaissIndexMeta:
+    def test_recipe_round_trip(self, tmp_path):
+        meta = FaissIndex(tmp_path / "i.faiss", tmp_path / "m.json", dim=8)
+        spec = IndexSpec(kind="ivf_flat", nlist=4, train_size=100)
+        meta.write_meta(spec, ntotal=100)
+        data = json.loads((tmp_path / "m.json").read_text(encoding="utf-8"))
+        assert data["dim"] == 8 and data["ntotal"] == 100
+        assert data["factory"] == "IVF4,Flat"
+        assert meta.recipe() == spec
+
+    def test_legacy_meta_is_flat(self, tmp_path):
+        (tmp_path / "m.json").write_text('{"dim": 8}\n', encoding="utf-8")
+        assert FaissIndex(tmp_path / "i.faiss", tmp_path / "m.json", dim=8).recipe() == IndexSpec()
+
+
+# ---------------------------------------------------------------------------
+# build_index (faiss)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize(
+    "text,min_recall",
+    [
+        ("ivf_flat:nprobe=8", 0.9),
+        ("hnsw:hnsw_m=16,ef_search=64", 0.9),
+        ("ivf_pq:pq_m=8,pq_nbits=6,nprobe=8", 0.3),
+        ("opq_ivf_pq:pq_m=8,pq_nbits=6,nprobe=8", 0.3),
+    ],
+)
+def test_build_index_recall_against_flat(tmp_path, text, min_recall):
+    pytest.importorskip("faiss")
+    from juthoor_cognatediscovery_lv2.lv3.discovery.index import build_flat_ip, build_index
+
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((2000, 32)).astype("float32")
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    queries = vecs[:50]
+
+    flat, _ = build_flat_ip(vecs)
+    _, exact = flat.search(queries, 5)
+    index, dim, spec = build_index(vecs, IndexSpec.from_string(text))
+    assert dim == 32 and index.ntotal == 2000
+    _, approx = index.search(queries, 5)
+    recall = np.mean([len(set(e) & set(a)) / 5 for e, a in zip(exact, approx)])
+    assert recall >= min_recall
+
+    meta = FaissIndex(tmp_path / "i.faiss", tmp_path / "m.json", dim=dim)
+    meta.save(index, spec)
+    assert meta.load().ntotal == 2000
+    assert meta.recipe() == spec
@@ -0,0 +1,113 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.llm_cache
+
+Covers:
+- pair_key(): normalized payloads collide, provider/model/template do not
+- LLMCache: get/put round trip, hit-rate stats, age expiry, LRU size eviction,
+  filtered invalidate and the CLI
+- score_candidates(): a re-chunked, extended rerun only sends the misses
+- LLMEtymologyValidator: a cached pair is not sent twice
+"""
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import eye2_batch_scorer, llm_cache
+from juthoor_cognatediscovery_lv2.discovery.eye2_async import RestTransport
+from juthoor_cognatediscovery_lv2.discovery.llm_cache import LLMCache, pair_key, template_version
+from juthoor_cognatediscovery_lv2.discovery.llm_validator import LLMEtymologyValidator
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    with LLMCache(tmp_path / "cache.sqlite") as c:
+        yield c
+
+
+def test_pair_key_normalizes_payload():
+    base = pair_key("anthropic", "m", "t1", {"root": "كتب", "gloss": "to write", "score": 0.5})
+    assert base == pair_key("anthropic", "m", "t1", {"gloss": " to   write ", "score": 0.50001, "root": "كتب"})
+    assert base != pair_key("anthropic", "m", "t2", {"root": "كتب", "gloss": "to write", "score": 0.5})
+    assert base != pair_key("gemini-cli", "m", "t1", {"root": "كتب", "gloss": "to write", "score": 0.5})
+    assert template_version("a {X}") != template_version("a {X}.")
+
+
+def test_round_trip_and_stats(cache):
+    scope = cache.scope("anthropic", "m", "t")
+    hits, misses = scope.split([{"p": 1}, {"p": 2}])
+    assert hits == {} and misses == [0, 1]
+    scope.put_many([({"p": 1}, {"score": 0.8}), ({"p": 2}, "raw text")])
+    hits, misses = scope.split([{"p": 2}, {"p": 3}, {"p": 1}])
+    assert hits == {0: "raw text", 2: {"score": 0.8}} and misses == [1]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.puts) == (2, 3, 2)
+    assert cache.stats.hit_rate == pytest.approx(0.4)
+    assert cache.summary()["groups"][0]["hits"] == 2
+
+
+def test_age_expiry_and_lru_eviction(tmp_path: Path):
+    cache = LLMCache(tmp_path / "c.sqlite", max_age_days=1)
+    tags = {"provider": "p", "model": "m", "template": "t"}
+    cache.put("old", "x" * 100, **tags)
+    cache._db.execute("UPDATE responses SET created = ?, accessed = ? WHERE key = 'old'", (time.time() - 3 * 86400,) * 2)
+    cache.put("a", "x" * 100, **tags)
+    cache.put("b", "x" * 100, **tags)
+    assert cache.get("old") is None  # expired entries are misses before eviction runs
+    cache._db.execute("UPDATE responses SET accessed = accessed - 10 WHERE key = 'b'")
+    cache.get("a")
+    assert cache.evict(max_bytes=150) == 2  # "old" by age, then "b" as least recently used
+    assert cache.get("a") is not None and len(cache) == 1
+    cache.close()
+
+
+def test_invalidate_filters_and_cli(tmp_path: Path, capsys):
+    path = tmp_path / "c.sqlite"
+    with LLMCache(path) as cache:
+        cache.put("k1", 1, provider="anthropic", model="a", template="t")
+        cache.put("k2", 2, provider="anthropic", model="b", template="t")
+        cache.put("k3", 3, provider="gemini-cli", model="gemini", template="t")
+        with pytest.raises(ValueError):
+            cache.invalidate()
+        assert cache.invalidate(provider="anthropic", model="a") == 1
+    assert llm_cache.main(["--path", str(path), "invalidate", "--provider", "gemini-cli"]) == 0
+    assert llm_cache.main(["--path", str(path), "stats"]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["entries"] == 1 and summary["groups"][0]["model"] == "b"
+    assert llm_cache.main(["--path", str(path), "invalidate"]) == 2
+
+
+def test_score_candidates_sends_only_misses(tmp_path: Path, cache):
+    candidates = [{"arabic_root": f"r{i % 4}", "target_lemma": f"w{i}", "discovery_score": 0.9} for i in range(12)]
+    with MessagesStandIn() as server:
+        kwargs = dict(profiles={}, model_alias="sonnet", lang="lat", resume=False, dry_run=False,
+                      batch_label="t", transport=RestTransport(server.base_url, api_key="test"), cache=cache)
+        first = tmp_path / "first.jsonl"
+        assert eye2_batch_scorer.score_candidates(candidates[:8], output_path=first, batch_size=3, **kwargs) == 8
+        # re-ordered, re-chunked and extended: only the 4 new pairs are sent
+        second = tmp_path / "second.jsonl"
+        assert eye2_batch_scorer.score_candidates(candidates[::-1], output_path=second, batch_size=5, **kwargs) == 12
+    assert server.pairs_served == 12 and cache.stats.hits == 8
+    scores = lambda p: {r["target_lemma"]: r["semantic_score"] for r in map(json.loads, p.read_text("utf-8").splitlines())}
+    assert all(scores(second)[k] == v for k, v in scores(first).items())
+
+
+def test_validator_uses_cache(monkeypatch, cache):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test-fake-key")
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        text = '{"confidence": 0.9, "is_cognate": true, "reasoning": "r", "method": "direct_match"}'
+        return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+    v = LLMEtymologyValidator(cache=cache)
+    v._client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    first = v.validate_pair("رثى", "pity", "ruth", "pity", 0.8)
+    again = v.validate_pair("رثى", "pity", "ruth", " pity ", 0.8)
+    other = v.validate_pair("رثى", "pity", "ruth", "pity", 0.5)
+    assert len(calls) == 2 and first == again and other.confidence == 0.9
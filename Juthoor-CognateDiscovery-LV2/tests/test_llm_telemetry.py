@@ -0,0 +1,93 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.llm_telemetry
+
+Covers:
+- TelemetryRecorder: one JSONL record per call, parse failures and
+  exceptions recorded (and re-raised), disabled recorder writes nothing
+- summarize(): cost from the price table, latency percentiles, retries,
+  tokens per pair, unpriced models
+- AsyncEye2Engine: one record per attempt against the local stand-in
+- report CLI
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import llm_telemetry
+from juthoor_cognatediscovery_lv2.discovery.eye2_async import AsyncEye2Engine, EngineConfig, RestTransport
+from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder, read_records, summarize
+from juthoor_cognatediscovery_lv2.discovery.messages_standin import MessagesStandIn
+
+
+def test_recorder_writes_one_record_per_call(tmp_path: Path):
+    log = tmp_path / "calls.jsonl"
+    rec = TelemetryRecorder(log, source="t", run_id="run-1", tags={"lang": "grc"})
+    with rec.call(model="claude-sonnet-4-6", pairs=5) as call:
+        call.response(1000, 200)
+    with rec.call(model="claude-sonnet-4-6", pairs=5, attempt=2) as call:
+        call.response(1000, 50)
+        call.parsed(False)
+    with pytest.raises(RuntimeError):
+        with rec.call(model="claude-sonnet-4-6", pairs=5, attempt=3):
+            raise RuntimeError("boom")
+    rows = list(read_records(log))
+    assert [(r["ok"], r["parse_ok"]) for r in rows] == [(True, True), (False, False), (False, None)]
+    assert all(r["run"] == "run-1" and r["source"] == "t" and r["lang"] == "grc" for r in rows)
+    assert rows[2]["error"] == "RuntimeError: boom" and rows[0]["latency_s"] >= 0
+
+    off = TelemetryRecorder(None)
+    with off.call(model="m") as call:
+        call.response(1, 1)
+    assert not off.enabled
+
+
+def test_summarize_cost_latency_and_pairs():
+    base = {"run": "r", "model": "claude-sonnet-4-6", "pairs": 10, "attempt": 1, "parse_ok": True, "ok": True}
+    rows = [
+        {**base, "ts": 100.0 + i, "latency_s": float(i + 1), "input_tokens": 1_000_000, "output_tokens": 100_000}
+        for i in range(4)
+    ]
+    rows.append({**base, "ts": 105.0, "latency_s": 2.0, "attempt": 2, "ok": False, "parse_ok": False,
+                 "input_tokens": 0, "output_tokens": 0})
+    (row,) = summarize(rows)
+    assert row["calls"] == 5 and row["failed"] == 1 and row["retries"] == 1
+    assert row["parse_failure_rate"] == 0.2
+    assert row["cost_usd"] == pytest.approx(4 * (3.0 + 1.5))
+    assert row["pairs_scored"] == 40 and row["tokens_per_pair"] == 110_000.0
+    assert row["usd_per_1k_pairs"] == pytest.approx(450.0)
+    assert row["latency_p50_s"] == 2.0 and row["latency_p95_s"] == pytest.approx(3.8)
+
+    (gemini,) = summarize([{**base, "ts": 1.0, "model": "gemini", "input_tokens": 10, "output_tokens": 10}])
+    assert gemini["unpriced_calls"] == 1 and gemini["usd_per_1k_pairs"] is None
+
+
+def test_engine_records_every_attempt(tmp_path: Path):
+    log = tmp_path / "calls.jsonl"
+    rec = TelemetryRecorder(log, source="eye2", tags={"lang": "lat"})
+    prompts = [f'0. Arabic "r{i}" (x) <-> Latin "w{i}"\n1. Arabic "r{i}" (x) <-> Latin "v{i}"' for i in range(3)]
+    with MessagesStandIn() as server:
+        server.respond_with(200, "garbled")
+        config = EngineConfig(model_id="test-model", concurrency=1, max_retries=3, backoff_base=0.001)
+        engine = AsyncEye2Engine(config, transport=RestTransport(server.base_url, api_key="test"),
+                                 seed=0, stream=None, telemetry=rec)
+        engine.run(prompts, lambda i, items: None, sizes=[2, 2, 2])
+    rows = list(read_records(log))
+    assert len(rows) == 4 and sum(r["parse_ok"] is False for r in rows) == 1
+    assert all(r["pairs"] == 2 and r["input_tokens"] > 0 and r["lang"] == "lat" for r in rows)
+    assert max(r["attempt"] for r in rows) == 2
+    assert summarize(rows)[0]["pairs_scored"] == 6
+
+
+def test_report_cli(tmp_path: Path, capsys):
+    log = tmp_path / "calls.jsonl"
+    rec = TelemetryRecorder(log, source="t", run_id="run-1")
+    with rec.call(model="claude-haiku-4-5", pairs=4) as call:
+        call.response(2000, 400)
+    llm_telemetry.main(["--path", str(log), "report", "--json"])
+    (row,) = json.loads(capsys.readouterr().out)
+    assert row["run"] == "run-1" and row["pairs_scored"] == 4 and row["cost_usd"] == pytest.approx(0.004)
+    llm_telemetry.main(["--path", str(log), "report", "--by", "model"])
+    assert "claude-haiku-4-5" in capsys.readouterr().out
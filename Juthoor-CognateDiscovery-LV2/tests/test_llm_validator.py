@@ -1,6 +1,11 @@
 """Tests for LLMEtymologyValidator."""
 
+import json
 import os
+import re
+import threading
+import time
+from types import SimpleNamespace
 
 import pytest
 
@@ -200,3 +205,101 @@ def test_client_lazy_init():
     finally:
         if old_key:
             os.environ["ANTHROPIC_API_KEY"] = old_key
+
+
+# ---------------------------------------------------------------------------
+# Concurrent validate_batch (mocked client)
+# ---------------------------------------------------------------------------
+
+class _MockClient:
+    """Thread-safe stand-in for anthropic.Anthropic; answers from the prompt text."""
+
+    def __init__(self, latency: float = 0.02, fail_words: tuple[str, ...] = (), garble_packed: bool = False):
+        self.latency = latency
+        self.fail_words = fail_words
+        self.garble_packed = garble_packed
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.messages = SimpleNamespace(create=self.create)
+
+    @staticmethod
+    def confidence(word: str) -> float:
+        return round(len(word) / 10, 2)
+
+    def create(self, *, model, max_tokens, messages):
+        prompt = messages[0]["content"]
+        with self._lock:
+            self.calls.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            words = re.findall(r"^English word: (.*)$", prompt, re.MULTILINE)
+            if any(w in self.fail_words for w in words):
+                raise RuntimeError("overloaded")
+            items = [
+                {"pair_index": i, "confidence": self.confidence(w), "is_cognate": True,
+                 "reasoning": f"mock {w}", "method": "direct_match"}
+                for i, w in enumerate(words)
+            ]
+            if "Pair 0:" in prompt:
+                text = "not json" if self.garble_packed else json.dumps(items[1:] if len(items) > 1 else items)
+            else:
+                text = json.dumps(items[0])
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _pairs(n: int) -> list[dict]:
+    return [
+        {"arabic_root": f"r{i}", "arabic_meaning": "m", "english_word": "w" * (i % 9 + 1),
+         "english_meaning": "e", "phonetic_score": 0.5, "rank": i}
+        for i in range(n)
+    ]
+
+
+def _validator(monkeypatch, client: _MockClient, **kwargs) -> LLMEtymologyValidator:
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-test-fake-key")
+    v = LLMEtymologyValidator(**kwargs)
+    v._client = client
+    return v
+
+
+def test_batch_runs_concurrently_in_input_order(monkeypatch):
+    client = _MockClient(latency=0.05)
+    pairs = _pairs(12)
+    results = _validator(monkeypatch, client, max_concurrent=4).validate_batch(pairs)
+    assert client.max_in_flight == 4 and len(client.calls) == 12
+    assert [r.confidence for r in results] == [_MockClient.confidence(p["english_word"]) for p in pairs]
+
+
+def test_batch_degrades_per_pair(monkeypatch):
+    client = _MockClient(fail_words=("www",))
+    results = _validator(monkeypatch, client, max_concurrent=3).validate_batch(_pairs(6))
+    assert [r.method_used for r in results] == ["direct_match"] * 2 + ["phonetic_fallback"] + ["direct_match"] * 3
+    assert results[2].confidence == pytest.approx(0.4)
+
+
+def test_packed_batch_retries_unanswered_pairs_singly(monkeypatch):
+    client = _MockClient()  # packed replies of 2+ pairs drop pair 0
+    pairs = _pairs(7)
+    results = _validator(monkeypatch, client, max_concurrent=2, pairs_per_prompt=3).validate_batch(pairs)
+    packed = [c for c in client.calls if "Pair 0:" in c]
+    assert len(packed) == 3 and len(client.calls) == 3 + 2  # prompts of 3, 3 and 1 pairs
+    assert [r.confidence for r in results] == [_MockClient.confidence(p["english_word"]) for p in pairs]
+
+    garbled = _MockClient(garble_packed=True)
+    results = _validator(monkeypatch, garbled, pairs_per_prompt=4).validate_batch(pairs)
+    assert len(garbled.calls) == 2 + 7 and all(r.method_used == "direct_match" for r in results)
+
+
+def test_rate_limiter_is_shared_across_workers(monkeypatch):
+    client = _MockClient(latency=0.0)
+    v = _validator(monkeypatch, client, max_concurrent=4, requests_per_minute=600)  # one start per 0.1s
+    start = time.monotonic()
+    v.validate_batch(_pairs(4))
+    assert time.monotonic() - start >= 0.29
@@ -0,0 +1,135 @@
+"""Tests for the shared, memoized normalization / skeleton primitives."""
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import normalization as norm
+from juthoor_cognatediscovery_lv2.discovery.eye2_batch_scorer import _norm_arabic_lookup
+from juthoor_cognatediscovery_lv2.discovery.phonetic_law_scorer import (
+    _arabic_consonant_skeleton,
+    _consonant_class,
+    _english_consonant_skeleton,
+    _strip_diacriticals,
+)
+from juthoor_cognatediscovery_lv2.discovery.precomputed_assets import english_ipa_skeleton
+
+SAMPLES = Path(__file__).resolve().parents[1] / "resources" / "samples" / "processed"
+
+
+def _sample_values(name: str, key: str) -> list[str]:
+    path = SAMPLES / name
+    if not path.exists():
+        return []
+    values = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if line.strip():
+                value = json.loads(line).get(key)
+                if isinstance(value, str) and value:
+                    values.append(value)
+    return values
+
+
+# Reference implementations the module replaced.
+_ENG_RE = re.compile(r"[bcdfghjklmnpqrstvwxyz]")
+_PARENS_RE = re.compile(r"\([^)]*\)")
+_IPA_VOWEL_RE = re.compile(r"[aeiouɪɛæʌɒɔʊəɑɜɐɵøœɶɯɤɨʉyˈˌː\.ʔ̃]")
+
+
+def _ref_english_skeleton(word: str) -> str:
+    return "".join(_ENG_RE.findall(word.lower()))
+
+
+def _ref_ipa_skeleton(ipa: str) -> str:
+    collapsed = _PARENS_RE.sub("", str(ipa or "").strip().lower())
+    collapsed = collapsed.replace("/", "").replace("[", "").replace("]", "").replace(",", "")
+    return _IPA_VOWEL_RE.sub("", collapsed).strip()
+
+
+def _ref_arabic_skeleton(text: str) -> str:
+    return "".join(ch for ch in norm._lv1_normalize_arabic_root(text) if ch not in "اويى")
+
+
+class TestNormalizeArabic:
+    def test_strips_diacritics_and_tatweel(self):
+        assert norm.normalize_arabic("كَتَبَ") == "كتب"
+        assert norm.normalize_arabic("كـتـب") == "كتب"
+
+    def test_folds_hamza(self):
+        assert norm.normalize_arabic("أكل") == "اكل"
+        assert norm.normalize_arabic("سؤال") == "سوال"
+
+    def test_strips_article_when_root_remains(self):
+        assert norm.normalize_arabic("الكتاب") == "كتاب"
+        assert norm.normalize_arabic("الم") == "الم"
+
+    def test_empty(self):
+        assert norm.normalize_arabic("") == ""
+
+    def test_eye2_lookup_is_canonical(self):
+        assert _norm_arabic_lookup is norm.normalize_arabic
+
+
+class TestSkeletons:
+    @pytest.mark.parametrize("word", ["Camera", "numerus", "strength", "", "ἄγγελος"])
+    def test_english_skeleton_matches_reference(self, word):
+        assert norm.english_consonant_skeleton(word) == _ref_english_skeleton(word)
+
+    def test_english_skeleton_on_samples(self):
+        words = _sample_values("english_ipa_merged_pos_sample.jsonl", "lemma")
+        words += _sample_values(
+            "Latin-English_Wiktionary_dictionary_stardict_filtered_sample.jsonl", "lemma"
+        )
+        assert [_english_consonant_skeleton(w) for w in words] == [
+            _ref_english_skeleton(w) for w in words
+        ]
+
+    def test_ipa_skeleton_on_samples(self):
+        ipas = _sample_values("english_ipa_merged_pos_sample.jsonl", "ipa") + [
+            "/ˈkæm(ə)ɹə/", "[ˈnʌm.bɚ], /x/", "",
+        ]
+        assert [english_ipa_skeleton(i) for i in ipas] == [_ref_ipa_skeleton(i) for i in ipas]
+
+    def test_arabic_skeleton_on_samples(self):
+        roots = _sample_values("hf_roots_sample.jsonl", "root") + ["قَمَر", "وعد", "ىسر"]
+        assert [_arabic_consonant_skeleton(r) for r in roots] == [
+            _ref_arabic_skeleton(r) for r in roots
+        ]
+
+    def test_strip_diacriticals(self):
+        assert _strip_diacriticals("ṣaḥīḥ") == "sahīh"
+        assert _strip_diacriticals("ʕabd") == "abd"
+
+
+class TestConsonantClass:
+    def test_same_class(self):
+        assert _consonant_class("p") == _consonant_class("f")
+        assert _consonant_class("θ") == _consonant_class("s")
+
+    def test_different_class(self):
+        assert _consonant_class("p") != _consonant_class("k")
+
+    def test_unclassed_is_itself(self):
+        assert _consonant_class("x") == "x"
+
+
+class TestListVariantsAndCaches:
+    def test_many_preserves_order_and_duplicates(self):
+        roots = ["كتب", "الكتاب", "كتب", "قَمَر"]
+        assert norm.normalize_arabic_many(roots) == [norm.normalize_arabic(r) for r in roots]
+        assert norm.arabic_consonant_skeletons(roots) == [
+            norm.arabic_consonant_skeleton(r) for r in roots
+        ]
+        words = ["camera", "Camera", "camera"]
+        assert norm.english_consonant_skeletons(words) == ["cmr", "cmr", "cmr"]
+        assert norm.english_ipa_skeletons(["/kæt/", "/kæt/"]) == ["kt", "kt"]
+
+    def test_caches_are_bounded_and_counted(self):
+        norm.clear_caches()
+        for _ in range(3):
+            norm.english_consonant_skeleton("camera")
+        stats = norm.cache_stats()["english_consonant_skeleton"]
+        assert stats == {"hits": 2, "misses": 1, "size": 1, "maxsize": norm.CACHE_SIZE}
+        assert all(s["maxsize"] > 0 for s in norm.cache_stats().values())
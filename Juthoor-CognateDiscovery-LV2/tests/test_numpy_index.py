@@ -0,0 +1,112 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.numpy_index
+
+Covers:
+- NumpyFlatIndex.search(): exact top-k vs brute force, ordering, k > ntotal
+- blocking / threading / multiple add() calls give identical results
+- memmap and int8 VectorMatrix inputs are searched without a full copy
+- IndexSpec("numpy") through build_index(), with_fallback(), build_or_load_index()
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery import index as index_mod
+from juthoor_cognatediscovery_lv2.lv3.discovery.index import IndexSpec, build_index, set_search_params, with_fallback
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+from juthoor_cognatediscovery_lv2.lv3.discovery.numpy_index import NumpyFlatIndex
+from juthoor_cognatediscovery_lv2.lv3.discovery.vector_store import open_vectors, save_vectors
+
+
+def _unit(n: int, dim: int = 24, seed: int = 0) -> np.ndarray:
+    vecs = np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+def _brute(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    return np.argsort(-(queries @ corpus.T), axis=1, kind="stable")[:, :k]
+
+
+class TestSearch:
+    def test_matches_brute_force(self):
+        corpus, queries = _unit(1000), _unit(37, seed=1)
+        index = NumpyFlatIndex.from_vectors(corpus, block_rows=128, query_block=10, threads=1)
+        scores, ids = index.search(queries, 7)
+        np.testing.assert_array_equal(ids, _brute(corpus, queries, 7))
+        assert np.all(np.diff(scores, axis=1) <= 0)
+        np.testing.assert_allclose(scores[:, 0], (queries @ corpus.T).max(axis=1), rtol=1e-5)
+
+    @pytest.mark.parametrize("block_rows,threads", [(64, 1), (64, 4), (5000, 3), (1, 2)])
+    def test_blocking_and_threads_agree(self, block_rows, threads):
+        corpus, queries = _unit(300), _unit(20, seed=2)
+        ref = NumpyFlatIndex.from_vectors(corpus, threads=1).search(queries, 5)
+        got = NumpyFlatIndex.from_vectors(corpus, block_rows=block_rows, threads=threads).search(queries, 5)
+        np.testing.assert_array_equal(got[1], ref[1])
+        np.testing.assert_allclose(got[0], ref[0], rtol=1e-6)
+
+    def test_k_larger_than_corpus_pads_like_faiss(self):
+        index = NumpyFlatIndex.from_vectors(_unit(3))
+        scores, ids = index.search(_unit(2, seed=3), 5)
+        assert (ids[:, 3:] == -1).all() and (ids[:, :3] >= 0).all()
+        assert (scores[:, 3:] < -1e30).all()
+
+    def test_add_appends_parts(self):
+        corpus, queries = _unit(200), _unit(5, seed=4)
+        index = NumpyFlatIndex(24, block_rows=50)
+        index.add(corpus[:120])
+        index.add(corpus[120:])
+        assert index.ntotal == 200
+        np.testing.assert_array_equal(index.search(queries, 4)[1], _brute(corpus, queries, 4))
+
+    def test_empty_and_bad_input(self):
+        index = NumpyFlatIndex(8)
+        assert (index.search(np.ones((2, 8)), 3)[1] == -1).all()
+        with pytest.raises(ValueError):
+            index.search(np.ones((1, 9)), 3)
+        with pytest.raises(ValueError):
+            index.search(np.ones((1, 8)), 0)
+
+    def test_memmap_and_int8_inputs(self, tmp_path: Path):
+        corpus, queries = _unit(400), _unit(6, seed=5)
+        mm = np.load(save_vectors(tmp_path / "f.npy", corpus), mmap_mode="r")
+        index = NumpyFlatIndex.from_vectors(mm, block_rows=100)
+        assert index._parts[0] is mm
+        np.testing.assert_array_equal(index.search(queries, 3)[1], _brute(corpus, queries, 3))
+
+        q8 = open_vectors(save_vectors(tmp_path / "q.npy", corpus, "int8"))
+        hits = NumpyFlatIndex.from_vectors(q8, block_rows=100).search(queries, 3)[1]
+        assert np.mean(hits[:, 0] == _brute(corpus, queries, 1)[:, 0]) >= 0.8
+
+
+class TestIndexSpec:
+    def test_numpy_spec_builds_without_faiss(self):
+        spec = IndexSpec.from_string("numpy:block_rows=64,threads=2")
+        index, dim, resolved = build_index(_unit(100), spec)
+        assert isinstance(index, NumpyFlatIndex) and dim == 24
+        assert (index.block_rows, index.threads) == (64, 2)
+        assert resolved.slug() == "numpy" and resolved.train_size == 0
+        set_search_params(index, nprobe=8, ef_search=64)  # no-op, no faiss needed
+
+    def test_fallback_when_faiss_missing(self, monkeypatch):
+        monkeypatch.setattr(index_mod, "faiss_available", lambda: False)
+        assert with_fallback(IndexSpec.from_string("hnsw")).kind == "numpy"
+        assert with_fallback(None).kind == "numpy"
+        monkeypatch.setattr(index_mod, "faiss_available", lambda: True)
+        assert with_fallback(IndexSpec.from_string("hnsw")).kind == "hnsw"
+
+    def test_build_or_load_index_numpy(self, tmp_path: Path):
+        vecs = _unit(50)
+        spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+        rows = [LexemeRow(i, {"id": f"x:{i}"}) for i in range(50)]
+        index = retrieval.build_or_load_index(
+            repo_root=tmp_path, model="semantic", spec=spec, vectors=vecs, rows=rows,
+            rebuild_index=False, index_spec=IndexSpec(kind="numpy"),
+        )
+        _, ids = retrieval.search_index(index, vecs[:3], 1)
+        assert ids[:, 0].tolist() == [0, 1, 2]
+        assert not list(tmp_path.rglob("*.faiss"))
@@ -0,0 +1,150 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.quantization
+
+Covers:
+- config validation: quantize mode, CPU-only int8, store namespace and
+  separate per-corpus snapshots for int8 and full-precision vectors
+- cosine_agreement() / neighbour_recall() / agreement_report()
+- AccuracyGuard thresholds
+- load_or_quantize(): int8 linears, cache hit, version-mismatch rebuild (torch only)
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import namespace_name
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import (
+    BgeM3Config,
+    BgeM3Embedder,
+    ByT5Config,
+    ByT5Embedder,
+)
+from juthoor_cognatediscovery_lv2.lv3.discovery.quantization import (
+    CACHE_ENV,
+    AccuracyGuard,
+    agreement_report,
+    cache_path,
+    cosine_agreement,
+    default_cache_dir,
+    load_or_quantize,
+    neighbour_recall,
+)
+
+
+def _unit(n: int = 200, dim: int = 32, seed: int = 0) -> np.ndarray:
+    vecs = np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+class TestConfig:
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError):
+            ByT5Embedder(config=ByT5Config(quantize="int4"))
+        with pytest.raises(ValueError):
+            BgeM3Embedder(config=BgeM3Config(quantize="fp8"))
+
+    def test_int8_is_cpu_only(self):
+        with pytest.raises(ValueError):
+            ByT5Embedder(config=ByT5Config(quantize="int8"), device="cuda")
+
+    def test_int8_vectors_get_their_own_store_namespace(self):
+        assert namespace_name("m", ByT5Config()) != namespace_name("m", ByT5Config(quantize="int8"))
+        assert namespace_name("m", BgeM3Config()) != namespace_name("m", BgeM3Config(quantize="int8"))
+
+    def test_int8_and_full_precision_keep_separate_snapshots(self, tmp_path: Path, monkeypatch):
+        class FakeBgeM3:
+            def __init__(self, *, config):
+                self.config = config
+
+            def embed(self, texts):
+                return np.full((len(texts), 4), 2.0 if self.config.quantize == "int8" else 1.0, dtype="float32")
+
+        monkeypatch.setattr(retrieval, "BgeM3Embedder", FakeBgeM3)
+        spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+        rows = [retrieval.LexemeRow(i, {"id": f"x:{i}", "meaning_text": f"gloss {i}"}) for i in range(3)]
+        embed = lambda cfg: retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec,
+                                                    rows=rows, semantic_cfg=cfg)[0]
+        assert (embed(BgeM3Config(quantize="int8")) == 2.0).all()
+        assert (embed(BgeM3Config()) == 1.0).all()  # not the int8 snapshot
+        assert (embed(BgeM3Config(quantize="int8")) == 2.0).all()
+        assert len(list(tmp_path.rglob("vectors.npy"))) == 2
+
+    def test_cache_location(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setenv(CACHE_ENV, str(tmp_path))
+        assert default_cache_dir() == tmp_path
+        assert cache_path(tmp_path, "google/byt5-small", "byt5-encoder").name == "google_byt5-small.byt5-encoder.int8.pt"
+
+
+class TestAgreement:
+    def test_identical_vectors(self):
+        vecs = _unit()
+        report = agreement_report(vecs, vecs, k=5)
+        assert report["mean_cosine"] == pytest.approx(1.0)
+        assert report["recall@5"] == 1.0
+
+    def test_small_noise_keeps_neighbours(self):
+        ref = _unit()
+        noisy = ref + 1e-3 * np.random.default_rng(1).standard_normal(ref.shape).astype("float32")
+        assert cosine_agreement(ref, noisy).min() > 0.99
+        assert neighbour_recall(ref, noisy, k=5) > 0.9
+
+    def test_unrelated_vectors_fail_guard(self):
+        ref, other = _unit(seed=0), _unit(seed=1)
+        failed = AccuracyGuard(k=5).failures(agreement_report(ref, other, k=5))
+        assert len(failed) == 3
+        with pytest.raises(ValueError):
+            AccuracyGuard(k=5).check(ref, other)
+
+    def test_query_sampling(self):
+        ref = _unit(300)
+        assert neighbour_recall(ref, ref, k=3, max_queries=50) == 1.0
+
+    def test_shape_mismatch(self):
+        with pytest.raises(ValueError):
+            cosine_agreement(_unit(10), _unit(11))
+
+
+class TestLoadOrQuantize:
+    @pytest.fixture()
+    def torch(self):
+        return pytest.importorskip("torch")
+
+    def _model(self, torch):
+        torch.manual_seed(0)
+        return torch.nn.Sequential(torch.nn.Linear(16, 32), torch.nn.ReLU(), torch.nn.Linear(32, 8))
+
+    def test_quantizes_and_caches(self, torch, tmp_path: Path):
+        path = tmp_path / "m.int8.pt"
+        calls = []
+
+        def build():
+            calls.append(1)
+            return self._model(torch)
+
+        q, cached = load_or_quantize(path, build)
+        assert not cached and path.exists() and "Linear" in type(q[0]).__name__
+        assert type(q[0]) is not torch.nn.Linear
+
+        x = torch.randn(4, 16)
+        with torch.no_grad():
+            ref = self._model(torch)(x).numpy()
+            out = q(x).numpy()
+        assert cosine_agreement(ref, out).min() > 0.99
+
+        again, cached = load_or_quantize(path, build)
+        assert cached and len(calls) == 1
+        with torch.no_grad():
+            np.testing.assert_allclose(again(x).numpy(), out, rtol=1e-5, atol=1e-6)
+
+    def test_version_mismatch_rebuilds(self, torch, tmp_path: Path):
+        path = tmp_path / "m.int8.pt"
+        load_or_quantize(path, lambda: self._model(torch))
+        path.with_suffix(".json").write_text(json.dumps({"versions": {"torch": "0.0"}}), encoding="utf-8")
+        _, cached = load_or_quantize(path, lambda: self._model(torch))
+        assert not cached
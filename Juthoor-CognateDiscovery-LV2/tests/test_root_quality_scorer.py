@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from pathlib import Path
-from uuid import uuid4
 
 import pytest
 
@@ -13,12 +12,9 @@ from juthoor_cognatediscovery_lv2.discovery.scoring import (
 )
 from juthoor_cognatediscovery_lv2.lv3.discovery.hybrid_scoring import HybridWeights
 
-_TEST_TMP_DIR = Path(__file__).resolve().parents[2] / ".codex_tmp" / "root_quality_tests"
 
-
-def _write_predictions() -> Path:
-    _TEST_TMP_DIR.mkdir(parents=True, exist_ok=True)
-    path = _TEST_TMP_DIR / f"{uuid4().hex}.jsonl"
+def _write_predictions(tmp_path: Path) -> Path:
+    path = tmp_path / "root_predictions.jsonl"
     path.write_text(
         "\n".join(
             (
@@ -46,25 +42,25 @@ def _make_candidates(source_root: str | None = None, semantic: float = 0.5, form
     }
 
 
-def test_root_quality_returns_known_root_score():
-    scorer = RootQualityScorer(_write_predictions())
+def test_root_quality_returns_known_root_score(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     assert scorer.root_quality("كتب") == pytest.approx(0.731234)
 
 
-def test_root_quality_normalizes_variants():
-    scorer = RootQualityScorer(_write_predictions())
+def test_root_quality_normalizes_variants(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     assert scorer.root_quality("ذرى") == pytest.approx(0.812345)
     assert scorer.root_quality("ذرو") == pytest.approx(0.812345)
     assert scorer.root_quality("ملا") == pytest.approx(0.190001)
 
 
-def test_root_quality_unknown_root_returns_zero():
-    scorer = RootQualityScorer(_write_predictions())
+def test_root_quality_unknown_root_returns_zero(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     assert scorer.root_quality("جهل") == pytest.approx(0.0)
 
 
-def test_apply_root_quality_bonus_caps_at_point_zero_eight():
-    scorer = RootQualityScorer(_write_predictions())
+def test_apply_root_quality_bonus_caps_at_point_zero_eight(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     result = _apply_root_quality_bonus(
         {"combined_score": 0.5, "components": {}},
         source_fields={"root_norm": "ذرى"},
@@ -74,8 +70,8 @@ def test_apply_root_quality_bonus_caps_at_point_zero_eight():
     assert result["combined_score"] == pytest.approx(0.58)
 
 
-def test_apply_hybrid_scoring_records_root_quality_bonus():
-    scorer = RootQualityScorer(_write_predictions())
+def test_apply_hybrid_scoring_records_root_quality_bonus(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     candidates = _make_candidates(source_root="كتب")
     apply_hybrid_scoring(candidates, HybridWeights(), root_quality_scorer=scorer)
     hybrid = candidates["cand1"]["hybrid"]
@@ -89,8 +85,8 @@ def test_apply_hybrid_scoring_sets_zero_bonus_without_scorer():
     assert hybrid["components"]["root_quality_bonus"] == pytest.approx(0.0)
 
 
-def test_discovery_scorer_applies_root_quality_bonus():
-    scorer = RootQualityScorer(_write_predictions())
+def test_discovery_scorer_applies_root_quality_bonus(tmp_path: Path):
+    scorer = RootQualityScorer(_write_predictions(tmp_path))
     discovery_scorer = DiscoveryScorer(root_quality_scorer=scorer)
     results = discovery_scorer.score(_make_candidates(source_root="كتب"))
     assert results[0]["hybrid"]["components"]["root_quality_bonus"] == pytest.approx(0.08)
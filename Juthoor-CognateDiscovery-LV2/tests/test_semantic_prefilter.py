@@ -0,0 +1,111 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.discovery.semantic_prefilter
+
+Covers:
+- semantic_texts(): same strings (and store keys) as retrieval.corpus_texts,
+  gloss / short_gloss fallback before the lemma
+- candidates(): top-k from cached vectors only, uncached texts skipped, coverage
+- optional embed callable fills and persists missing vectors
+- from_repo(): reads the namespace embed_corpus writes
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.discovery.semantic_prefilter import SemanticPrefilter, semantic_texts
+from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_store import EmbeddingStore
+from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Config
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+
+# 4-d "meaning space": water, fire, house, dog
+MEANINGS = {
+    "water": [1, 0, 0, 0], "sea water": [0.9, 0.1, 0, 0], "aqua": [1, 0.05, 0, 0],
+    "fire": [0, 1, 0, 0], "flame": [0, 0.95, 0.1, 0],
+    "house": [0, 0, 1, 0], "home": [0, 0, 0.9, 0.2],
+    "dog": [0, 0, 0, 1],
+}
+
+
+def _vecs(texts) -> np.ndarray:
+    return np.asarray([MEANINGS[t] for t in texts], dtype="float32")
+
+
+def _store(tmp_path: Path, texts) -> EmbeddingStore:
+    store = EmbeddingStore(tmp_path, "toy", None)
+    store.put(list(texts), _vecs(texts))
+    return store
+
+
+SOURCE = [{"lemma": "ماء", "meaning_text": "water"}, {"lemma": "نار", "meaning_text": "fire"},
+          {"lemma": "بيت", "gloss_plain": "house"}, {"lemma": "كلب", "meaning_text": "dog"}]
+TARGET = [{"lemma": "flamma", "meaning_text": "flame"}, {"lemma": "aqua", "meaning_text": "aqua"},
+          {"lemma": "domus", "meaning_text": "home"}, {"lemma": "mare", "meaning_text": "sea water"}]
+
+
+def test_semantic_texts_match_corpus_texts():
+    entries = [{"meaning_text": " big   dog "}, {"gloss_plain": "cat", "lemma": "x"}, {"lemma": "y"}, {}]
+    rows = [LexemeRow(i, e) for i, e in enumerate(entries)]
+    assert semantic_texts(entries) == retrieval.corpus_texts(rows, "semantic")
+    assert semantic_texts(entries)[:3] == ["big dog", "cat", "y"]
+
+
+def test_semantic_texts_fall_back_to_gloss_before_lemma():
+    entries = [{"lemma": "a", "gloss": " water  body "}, {"lemma": "b", "short_gloss": "fire"},
+               {"lemma": "c", "gloss": "x", "meaning_text": "house"}, {"lemma": "d", "gloss": "  "}]
+    assert semantic_texts(entries) == ["water body", "fire", "house", "d"]
+
+
+def test_candidates_from_cache(tmp_path: Path):
+    store = _store(tmp_path, ["water", "fire", "house", "flame", "aqua", "home", "sea water"])
+    prefilter = SemanticPrefilter(store, k=2, index_spec="numpy")
+    hits = prefilter.candidates(SOURCE, TARGET)
+    assert [j for j, _ in hits[0]] == [1, 3]
+    assert hits[1][0][0] == 0 and hits[2][0][0] == 2
+    assert hits[0][0][1] == pytest.approx(1.0, abs=0.01)
+    assert hits[3] == []  # "dog" was never embedded
+    assert prefilter.coverage == {"source": (3, 4), "target": (4, 4)}
+    assert not prefilter.low_coverage
+    assert "3/4 source" in prefilter.report()
+
+
+def test_min_score_and_empty_store(tmp_path: Path):
+    store = _store(tmp_path / "a", ["water", "fire", "house", "flame", "aqua", "home", "sea water"])
+    hits = SemanticPrefilter(store, k=4, min_score=0.5, index_spec="numpy").candidates(SOURCE, TARGET)
+    assert [j for j, _ in hits[0]] == [1, 3]
+
+    empty = SemanticPrefilter(EmbeddingStore(tmp_path / "b", "toy", None), k=3)
+    assert empty.candidates(SOURCE, TARGET) == {0: [], 1: [], 2: [], 3: []}
+    assert empty.low_coverage
+
+
+def test_embed_fills_missing(tmp_path: Path):
+    store = _store(tmp_path, ["water", "aqua"])
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return _vecs(texts) * 3.0  # unnormalized on purpose
+
+    prefilter = SemanticPrefilter(store, k=1, index_spec="numpy", embed=embed)
+    hits = prefilter.candidates(SOURCE, TARGET)
+    assert sorted(t for c in calls for t in c) == ["dog", "fire", "flame", "home", "house", "sea water"]
+    assert hits[1][0][0] == 0 and hits[1][0][1] == pytest.approx(1.0, abs=0.01)
+    assert len(EmbeddingStore(tmp_path, "toy", None)) == 8
+
+
+def test_from_repo_reads_embed_corpus_namespace(tmp_path: Path):
+    store = EmbeddingStore(retrieval.get_store_root(tmp_path), BgeM3Config().model_id, BgeM3Config())
+    store.put(["water", "aqua"], _vecs(["water", "aqua"]))
+    prefilter = SemanticPrefilter.from_repo(tmp_path, k=1, index_spec="numpy")
+    hits = prefilter.candidates(SOURCE[:1], TARGET[1:2])
+    assert hits == {0: [(0, pytest.approx(1.0, abs=0.01))]}
+    # the same namespace embed_corpus uses for model="semantic"
+    spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+    rows = [LexemeRow(0, {"id": "a:0", "meaning_text": "water"})]
+    vecs, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec, rows=rows)
+    np.testing.assert_allclose(vecs[0], MEANINGS["water"])
@@ -0,0 +1,93 @@
+"""Tests for the edit-distance / prefix skeleton index."""
+import itertools
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery.skeleton_index import (
+    SkeletonIndex,
+    bounded_edit_distance,
+)
+
+_SKELETONS = ["kmr", "qmr", "rkm", "kbr", "kmrt", "km", "nhr", "ktb", "ktbr", "mrk", "klm"]
+
+
+class TestBoundedEditDistance:
+    @pytest.mark.parametrize(
+        "a,b,expected",
+        [
+            ("kmr", "kmr", 0),
+            ("kmr", "qmr", 1),
+            ("kmr", "km", 1),
+            ("kmr", "kmrt", 1),
+            ("kmr", "mkr", 1),  # adjacent transposition
+            ("kmr", "rmk", 2),
+            ("", "ab", 2),
+        ],
+    )
+    def test_distance(self, a, b, expected):
+        assert bounded_edit_distance(a, b, 3) == expected
+
+    def test_plain_levenshtein_counts_swap_twice(self):
+        assert bounded_edit_distance("kmr", "mkr", 3, transpositions=False) == 2
+
+    def test_bounded(self):
+        assert bounded_edit_distance("kmr", "ntbl", 1) == 2
+        assert bounded_edit_distance("k", "kmrtb", 2) == 3
+
+
+class TestSkeletonIndex:
+    def _index(self, k=2):
+        return SkeletonIndex.build(((s, i) for i, s in enumerate(_SKELETONS)), k)
+
+    @pytest.mark.parametrize("k", [0, 1, 2])
+    def test_lookup_matches_brute_force(self, k):
+        index = self._index(k)
+        queries = _SKELETONS + ["kmbr", "x", "krm", "qtb"]
+        for q in queries:
+            expected = {
+                s: bounded_edit_distance(q, s, k)
+                for s in _SKELETONS
+                if bounded_edit_distance(q, s, k) <= k
+            }
+            assert index.lookup(q) == expected
+
+    def test_lookup_smaller_k_than_built(self):
+        index = self._index(2)
+        assert set(index.lookup("kmr", 0)) == {"kmr"}
+        assert set(index.lookup("kmr", 1)) == {"kmr", "qmr", "km", "kmrt", "kbr"}
+
+    def test_lookup_rejects_larger_k(self):
+        with pytest.raises(ValueError):
+            self._index(1).lookup("kmr", 2)
+
+    def test_search_keeps_best_distance_per_item(self):
+        index = SkeletonIndex(1)
+        index.add("kmr", 7)
+        index.add("kbr", 7)
+        index.add("nhr", 8)
+        assert index.search(["kbr", "kmr"]) == {7: 0}
+        assert index.search(["khr"]) == {7: 1, 8: 1}
+
+    def test_duplicate_skeletons_share_entry(self):
+        index = SkeletonIndex(1)
+        index.add("kmr", 1)
+        index.add("kmr", 2)
+        index.add("kmr", 1)
+        index.add("", 3)
+        assert len(index) == 1
+        assert index.items("kmr") == [1, 2]
+        assert "kmr" in index and "" not in index
+
+    def test_with_prefix(self):
+        index = self._index(1)
+        assert index.with_prefix("kt") == ["ktb", "ktbr"]
+        assert index.with_prefix("km") == ["km", "kmr", "kmrt"]
+        assert index.with_prefix("z") == []
+        index.add("kta", 99)
+        assert index.with_prefix("kt") == ["kta", "ktb", "ktbr"]
+
+    def test_exhaustive_small_alphabet(self):
+        words = ["".join(p) for n in range(1, 4) for p in itertools.product("abc", repeat=n)]
+        index = SkeletonIndex.build(((w, 0) for w in words), 1)
+        for q in ["ab", "cab", "abca"]:
+            assert set(index.lookup(q)) == {w for w in words if bounded_edit_distance(q, w, 1) <= 1}
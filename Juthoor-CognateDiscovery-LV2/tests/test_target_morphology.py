@@ -5,6 +5,8 @@ from juthoor_cognatediscovery_lv2.discovery.target_morphology import (
     decompose_target,
     extract_all_skeletons,
     phonetic_variants,
+    phonetic_variants_scored,
+    VariantBudgetStats,
 )
 
 
@@ -206,6 +208,69 @@ class TestPhoneticVariants:
         assert len(variants) == len(set(variants)), f"Duplicates in {variants}"
 
 
+# ---------------------------------------------------------------------------
+# Variant budget: ranking, beam, signature dedup, counters
+# ---------------------------------------------------------------------------
+
+class TestVariantBudget:
+    def test_scored_original_first_then_generation_order(self):
+        # Eye 1 breaks Jaccard ties by skeleton order, so the beam must not reorder
+        scored = phonetic_variants_scored("smb", "lat")
+        assert scored[0] == ("smb", 1.0)
+        assert scored[1] == ("sb", 0.9)  # epenthetic rules are emitted first
+        assert [v for v, _s in scored][2:4] == ["zmb", "shmb"]  # then universal, left to right
+
+    def test_beam_keeps_most_plausible(self):
+        # Epenthetic mb→b outranks the universal bilabial swaps
+        scored = phonetic_variants_scored("smb", "lat", max_variants=2)
+        assert [v for v, _s in scored] == ["smb", "sb"]
+
+    def test_two_step_expansion_combines_rules(self):
+        variants = [v for v, _s in phonetic_variants_scored("smb", "lat", max_steps=2)]
+        assert "zb" in variants, f"Expected epenthetic + sibilant shift in {variants}"
+
+    def test_reorderings_kept_by_default(self):
+        # k→g at either end: same consonant set, but Eye 1 scores order
+        variants = phonetic_variants("ktk", "lat")
+        assert "gtk" in variants and "ktg" in variants
+        assert len(variants) == len(set(variants))
+
+    def test_signature_dedup_collapses_reorderings(self):
+        stats = VariantBudgetStats()
+        variants = [v for v, _s in phonetic_variants_scored("ktk", "lat", signature_dedup=True, stats=stats)]
+        assert "gtk" in variants
+        assert "ktg" not in variants
+        assert stats.signature_duplicates >= 1
+
+    def test_signature_dedup_keeps_geminates(self):
+        variants = [v for v, _s in phonetic_variants_scored("stll", "lat", signature_dedup=True)]
+        assert "stll" in variants and "stl" in variants
+
+    def test_word_budget_is_opt_in(self):
+        default = extract_all_skeletons("circumstantia", None, "lat")
+        assert default == extract_all_skeletons("circumstantia", None, "lat", max_skeletons=0)
+        assert len(default) > 40
+
+    def test_word_budget_truncates_and_counts(self):
+        stats = VariantBudgetStats()
+        full = extract_all_skeletons("circumstantia", None, "lat", stats=stats)
+        capped = extract_all_skeletons("circumstantia", None, "lat", max_skeletons=10, stats=stats)
+        assert len(capped) == 10 < len(full)
+        assert capped[0] == full[0] == "crcmstnt"
+        assert stats.words == 2
+        assert stats.truncated_words == 1
+        assert stats.variants_dropped == len(full) - 10
+
+        merged = VariantBudgetStats()
+        merged.add(stats)
+        merged.add(stats)
+        assert merged.words == 4 and merged.variants_dropped == 2 * stats.variants_dropped
+
+    def test_stem_skeletons_rank_before_variants(self):
+        skeletons = extract_all_skeletons("dominus", None, "lat", max_skeletons=3)
+        assert skeletons == ["dmns", "dmn", "dm"]
+
+
 # ---------------------------------------------------------------------------
 # Full pipeline: extract_all_skeletons
 # ---------------------------------------------------------------------------
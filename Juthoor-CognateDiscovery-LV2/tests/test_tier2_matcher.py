@@ -0,0 +1,137 @@
+"""Tests for tier2_matcher: single-pair scoring and the corpus-scale batch driver."""
+import json
+
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery.target_morphology import extract_all_skeletons
+from juthoor_cognatediscovery_lv2.discovery.tier2_matcher import (
+    build_tier2_index,
+    load_eye1_pairs,
+    prepare_tier2_roots,
+    tier2_batch_match,
+    tier2_match,
+    tier2_variants,
+)
+
+_EYE1_KEYS = {
+    "arabic_root", "arabic_skeleton", "target_lemma", "target_skeleton",
+    "jaccard", "overlap_consonants", "ordered_overlap", "lang", "n_lemmas",
+    "discovery_score", "ordered_overlap_ratio", "ar_skel_len", "tgt_skel_len",
+}
+
+
+def _target_entries(lemmas, lang="lat"):
+    """Minimal Eye 1 target entries (no skeleton dedup)."""
+    entries = []
+    for lemma in lemmas:
+        skels = [s for s in extract_all_skeletons(lemma, None, lang) if len(s) >= 2]
+        entries.append({
+            "lemma": lemma,
+            "lang": lang,
+            "all_skeletons": skels,
+            "all_skels_sets": [frozenset(s) for s in skels],
+            "alt_lemmas": [],
+        })
+    return entries
+
+
+_ROOTS = [{"arabic_root": r} for r in ("قمر", "نهر", "كتب", "علم")]
+_LEMMAS = ["camera", "numerus", "nervus", "capto", "clamo", "liber", "caput", "gula"]
+
+
+class TestTier2Match:
+    def test_variants_merge_shift_and_positional(self):
+        variants = tier2_variants("قمر", "lat")
+        assert variants[0] == "kmr"
+        assert "kwr" in variants  # م → w shift
+        assert len(variants) == len(set(variants))
+
+    def test_latin_input_used_as_is(self):
+        assert tier2_variants("kmr", "lat") == ["kmr"]
+
+    def test_match_reports_best_pair(self):
+        score, details = tier2_match("قمر", ["kmr", "xyz"], "lat")
+        assert score > 0.9
+        assert details["best_target_skeleton"] == "kmr"
+        assert details["ordered_overlap"] == ["k", "m", "r"]
+
+    def test_empty_inputs(self):
+        score, details = tier2_match("", ["kmr"], "lat")
+        assert score == 0.0
+        assert details["n_arabic_variants"] == 0
+
+
+class TestTier2Batch:
+    def test_records_match_single_pair_scorer(self):
+        roots = prepare_tier2_roots(_ROOTS, "lat")
+        targets = _target_entries(_LEMMAS)
+        records, stats = tier2_batch_match(roots, targets, "lat", top_k=0)
+        assert records and stats.roots == len(roots)
+        by_lemma = {t["lemma"]: t for t in targets}
+        for rec in records:
+            assert _EYE1_KEYS <= set(rec)
+            assert rec["tier"] == 2
+            score, _details = tier2_match(
+                rec["arabic_root"], by_lemma[rec["target_lemma"]]["all_skeletons"], "lat"
+            )
+            assert rec["discovery_score"] == pytest.approx(score, abs=1e-4)
+
+    def test_sorted_within_root(self):
+        roots = prepare_tier2_roots(_ROOTS, "lat")
+        records, _ = tier2_batch_match(roots, _target_entries(_LEMMAS), "lat", top_k=0)
+        per_root: dict[str, list[float]] = {}
+        for rec in records:
+            per_root.setdefault(rec["arabic_root"], []).append(rec["discovery_score"])
+        for scores in per_root.values():
+            assert scores == sorted(scores, reverse=True)
+
+    def test_top_k_caps_per_root(self):
+        roots = prepare_tier2_roots(_ROOTS, "lat")
+        records, _ = tier2_batch_match(roots, _target_entries(_LEMMAS), "lat", top_k=1)
+        roots_seen = [r["arabic_root"] for r in records]
+        assert len(roots_seen) == len(set(roots_seen))
+
+    def test_eye1_pairs_are_skipped(self, tmp_path):
+        roots = prepare_tier2_roots(_ROOTS, "lat")
+        targets = _target_entries(_LEMMAS)
+        full, _ = tier2_batch_match(roots, targets, "lat", top_k=0)
+        assert any(r["target_lemma"] == "camera" and r["arabic_root"] == "قمر" for r in full)
+
+        eye1 = tmp_path / "eye1.jsonl"
+        eye1.write_text(
+            json.dumps({"arabic_root": "قمر", "target_lemma": "camera"}, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        exclude = load_eye1_pairs(eye1)
+        assert exclude == {("قمر", "camera")}
+        rest, stats = tier2_batch_match(roots, targets, "lat", exclude=exclude, top_k=0)
+        assert stats.excluded == 1
+        assert not any(r["target_lemma"] == "camera" and r["arabic_root"] == "قمر" for r in rest)
+        assert len(rest) == len(full) - 1
+
+    def test_alt_lemmas_emitted_unless_excluded(self):
+        roots = prepare_tier2_roots([{"arabic_root": "قمر"}], "lat")
+        targets = _target_entries(["camera"])
+        targets[0]["alt_lemmas"] = [{"lemma": "camara", "ipa": "", "lang": "lat"}]
+        records, _ = tier2_batch_match(roots, targets, "lat", top_k=0)
+        assert [(r["target_lemma"], r.get("is_alt", False)) for r in records] == [
+            ("camera", False), ("camara", True),
+        ]
+        assert records[0]["n_lemmas"] == 2
+
+        records, stats = tier2_batch_match(
+            roots, targets, "lat", exclude={("قمر", "camera")}, top_k=0
+        )
+        assert [r["target_lemma"] for r in records] == ["camara"]
+        assert stats.excluded == 0
+
+    def test_workers_match_in_process(self):
+        roots = prepare_tier2_roots(_ROOTS, "lat")
+        targets = _target_entries(_LEMMAS)
+        index = build_tier2_index(targets)
+        serial, _ = tier2_batch_match(roots, targets, "lat", inv_index=index, top_k=0)
+        parallel, stats = tier2_batch_match(
+            roots, targets, "lat", inv_index=index, top_k=0, workers=2, chunk_size=1
+        )
+        assert parallel == serial
+        assert stats.as_dict()["roots"] == len(roots)
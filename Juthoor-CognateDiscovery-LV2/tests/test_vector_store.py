@@ -0,0 +1,145 @@
+"""
+Tests for juthoor_cognatediscovery_lv2.lv3.discovery.vector_store
+
+Covers:
+- quantize()/dequantize(): float16 and per-row int8 error bounds, zero rows
+- save_vectors()/open_vectors(): formats on disk, sidecar scales, mmap
+- VectorMatrix: row/slice/fancy indexing, blocks, np.asarray
+- load_vectors(): plain ndarray vs memmap vs VectorMatrix
+- embed_corpus(): reduced-precision snapshot round trip
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_cognatediscovery_lv2.discovery import retrieval
+from juthoor_cognatediscovery_lv2.discovery.corpora import CorpusSpec
+from juthoor_cognatediscovery_lv2.lv3.discovery.jsonl import LexemeRow
+from juthoor_cognatediscovery_lv2.lv3.discovery.vector_store import (
+    VectorMatrix,
+    add_in_blocks,
+    dequantize,
+    load_vectors,
+    open_vectors,
+    quantize,
+    save_vectors,
+    scales_path,
+)
+
+
+def _unit(n: int = 50, dim: int = 16, seed: int = 0) -> np.ndarray:
+    vecs = np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+# ---------------------------------------------------------------------------
+# Quantization
+# ---------------------------------------------------------------------------
+
+class TestQuantize:
+    def test_float16(self):
+        vecs = _unit()
+        data, scales = quantize(vecs, "float16")
+        assert data.dtype == np.float16 and scales is None
+        np.testing.assert_allclose(dequantize(data), vecs, atol=1e-3)
+
+    def test_int8_per_row_error(self):
+        vecs = _unit() * np.linspace(0.1, 10, 50, dtype="float32")[:, None]
+        data, scales = quantize(vecs, "int8")
+        assert data.dtype == np.int8 and scales.shape == (50,)
+        err = np.abs(dequantize(data, scales) - vecs).max(axis=1)
+        assert np.all(err <= scales / 2 + 1e-6)
+
+    def test_int8_zero_row(self):
+        data, scales = quantize(np.zeros((2, 4), dtype="float32"), "int8")
+        np.testing.assert_array_equal(dequantize(data, scales), np.zeros((2, 4)))
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            quantize(_unit(), "bfloat16")
+
+
+# ---------------------------------------------------------------------------
+# Files / VectorMatrix
+# ---------------------------------------------------------------------------
+
+class TestStorage:
+    @pytest.mark.parametrize("fmt,ratio", [("float32", 1.0), ("float16", 0.5), ("int8", 0.25)])
+    def test_size_on_disk(self, tmp_path: Path, fmt, ratio):
+        vecs = _unit(1000, 64)
+        path = save_vectors(tmp_path / "v.npy", vecs, fmt)
+        assert np.load(path, mmap_mode="r").nbytes == int(vecs.nbytes * ratio)
+        assert scales_path(path).exists() == (fmt == "int8")
+
+    def test_resave_drops_stale_scales(self, tmp_path: Path):
+        path = save_vectors(tmp_path / "v.npy", _unit(), "int8")
+        save_vectors(path, _unit(), "float16")
+        assert not scales_path(path).exists()
+
+    @pytest.mark.parametrize("fmt", ["float16", "int8"])
+    def test_matrix_indexing_dequantizes(self, tmp_path: Path, fmt):
+        vecs = _unit()
+        matrix = open_vectors(save_vectors(tmp_path / "v.npy", vecs, fmt))
+        assert isinstance(matrix.data, np.memmap)
+        assert matrix.shape == vecs.shape and matrix.fmt == fmt
+        atol = 1e-2
+        np.testing.assert_allclose(matrix[3], vecs[3], atol=atol)
+        np.testing.assert_allclose(matrix[5:9], vecs[5:9], atol=atol)
+        np.testing.assert_allclose(matrix[[1, 7]], vecs[[1, 7]], atol=atol)
+        np.testing.assert_allclose(matrix[3, 5], vecs[3, 5], atol=atol)
+        np.testing.assert_allclose(matrix[3, 2:6], vecs[3, 2:6], atol=atol)
+        np.testing.assert_allclose(matrix[5:9, 1], vecs[5:9, 1], atol=atol)
+        assert matrix[2:4].dtype == np.float32
+        np.testing.assert_allclose(np.asarray(matrix), vecs, atol=atol)
+        blocks = list(matrix.iter_blocks(16))
+        assert [s for s, _ in blocks] == [0, 16, 32, 48]
+
+    def test_int8_needs_scales(self):
+        with pytest.raises(ValueError):
+            VectorMatrix(np.zeros((2, 2), dtype=np.int8))
+
+    def test_load_vectors_types(self, tmp_path: Path):
+        vecs = _unit()
+        f32 = save_vectors(tmp_path / "a.npy", vecs, "float32")
+        i8 = save_vectors(tmp_path / "b.npy", vecs, "int8")
+        assert isinstance(load_vectors(f32, mmap=True), np.memmap)
+        assert isinstance(load_vectors(i8, mmap=True), VectorMatrix)
+        plain = load_vectors(i8)
+        assert type(plain) is np.ndarray and plain.dtype == np.float32
+
+    def test_add_in_blocks(self, tmp_path: Path):
+        class Sink:
+            def __init__(self):
+                self.blocks = []
+
+            def add(self, block):
+                assert block.dtype == np.float32 and block.flags["C_CONTIGUOUS"]
+                self.blocks.append(len(block))
+
+        sink = Sink()
+        add_in_blocks(sink, open_vectors(save_vectors(tmp_path / "v.npy", _unit(), "int8")), 20)
+        assert sink.blocks == [20, 20, 10]
+
+
+def test_embed_corpus_int8_snapshot(tmp_path: Path, monkeypatch):
+    class FakeBgeM3:
+        def __init__(self, *, config=None):
+            pass
+
+        def embed(self, texts):
+            return _unit(len(texts))
+
+    monkeypatch.setattr(retrieval, "BgeM3Embedder", FakeBgeM3)
+    spec = CorpusSpec(lang="ara", stage="classical", path=Path("a.jsonl"))
+    rows = [LexemeRow(i, {"id": f"x:{i}", "meaning_text": f"gloss {i}"}) for i in range(5)]
+
+    vecs, _ = retrieval.embed_corpus(
+        repo_root=tmp_path, model="semantic", spec=spec, rows=rows, vector_format="int8", mmap=True
+    )
+    assert isinstance(vecs, VectorMatrix) and vecs.fmt == "int8"
+    again, _ = retrieval.embed_corpus(repo_root=tmp_path, model="semantic", spec=spec, rows=rows)
+    assert type(again) is np.ndarray
+    np.testing.assert_array_equal(again, np.asarray(vecs))
@@ -15,7 +15,7 @@ For direct API usage, import from LV2:
 
 Usage:
     python -m juthoor_datacore_lv0.embeddings.embed_canine \\
-        input.jsonl output_dir/ --batch-size 32 --device cpu
+        input.jsonl output_dir/ --batch-size 32 --max-tokens 8192 --threads 8 --device cpu
 """
 
 from __future__ import annotations
@@ -93,7 +93,20 @@ def main() -> int:
     ap.add_argument("out_dir", type=Path, help="Output directory for vectors.npy, ids.json, meta.json, coverage.json.")
     ap.add_argument("--text-field", default="form_text", help="Field to embed (default: form_text).")
     ap.add_argument("--fallback-field", default="lemma", help="Fallback field if text-field is empty (default: lemma).")
-    ap.add_argument("--batch-size", type=int, default=32, help="Batch size for embedding (default: 32).")
+    ap.add_argument("--batch-size", type=int, default=32, help="Max texts per batch (default: 32).")
+    ap.add_argument(
+        "--max-tokens",
+        type=int,
+        default=8192,
+        help="Padded bytes per batch; texts are length-sorted and batched under this budget (default: 8192).",
+    )
+    ap.add_argument("--threads", type=int, default=0, help="torch CPU threads (default: 0 = torch default).")
+    ap.add_argument(
+        "--quantize",
+        default="none",
+        choices=["none", "int8"],
+        help="Dynamic int8 quantization of the encoder linears, CPU only (default: none).",
+    )
     ap.add_argument("--device", default="cpu", help="Device for inference: cpu or cuda (default: cpu).")
     ap.add_argument("--model-id", default="google/byt5-small", help="ByT5 model from HuggingFace.")
     ap.add_argument("--pooling", default="mean", choices=["mean", "cls"], help="Pooling strategy (default: mean).")
@@ -112,7 +125,14 @@ def main() -> int:
     logger.info("Output: %s", args.out_dir)
 
     # Initialize embedder
-    config = ByT5Config(model_id=args.model_id, pooling=args.pooling)
+    config = ByT5Config(
+        model_id=args.model_id,
+        pooling=args.pooling,
+        batch_size=args.batch_size,
+        max_tokens=args.max_tokens,
+        num_threads=args.threads,
+        quantize=args.quantize,
+    )
     embedder = ByT5Embedder(config=config, device=args.device)
 
     # Collect texts and IDs
@@ -141,20 +161,14 @@ def main() -> int:
         logger.warning("No texts to embed. Writing empty output.")
         mat = np.zeros((0, 1472), dtype="float32")  # ByT5-small hidden size
     else:
-        # Batch embedding
-        logger.info("Embedding %d texts in batches of %d...", len(texts), args.batch_size)
-        all_vecs: list[np.ndarray] = []
-
-        for i in range(0, len(texts), args.batch_size):
-            batch = texts[i:i + args.batch_size]
-            batch_num = i // args.batch_size + 1
-            total_batches = (len(texts) + args.batch_size - 1) // args.batch_size
-            logger.debug("Batch %d/%d (%d texts)...", batch_num, total_batches, len(batch))
-
-            vecs = embedder.embed(batch)
-            all_vecs.append(vecs)
-
-        mat = np.vstack(all_vecs)
+        # Length-bucketed batching happens inside the embedder
+        logger.info(
+            "Embedding %d texts (max %d per batch, %d-byte budget)...",
+            len(texts), args.batch_size, args.max_tokens,
+        )
+        mat = embedder.embed(texts)
+        if embedder.last_stats is not None:
+            logger.info("Inference: %s", embedder.last_stats.summary())
 
     # Write outputs
     logger.info("Writing outputs...")
@@ -168,6 +182,7 @@ def main() -> int:
     meta = {
         "model_id": args.model_id,
         "pooling": args.pooling,
+        "vector_version": config.vector_version,
         "device": args.device,
         "dim": int(mat.shape[1]) if mat.size else 1472,
         "text_field": args.text_field,
@@ -176,6 +191,9 @@ def main() -> int:
         "source_jsonl": str(args.jsonl.resolve()),
         "source_sha256": sha256_file(args.jsonl),
         "batch_size": args.batch_size,
+        "max_tokens": args.max_tokens,
+        "quantize": args.quantize,
+        "inference": embedder.last_stats.as_dict() if embedder.last_stats is not None else None,
     }
     (args.out_dir / "meta.json").write_text(
         json.dumps(meta, ensure_ascii=False, indent=2),
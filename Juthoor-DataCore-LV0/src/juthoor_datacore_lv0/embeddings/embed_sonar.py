@@ -14,7 +14,7 @@ For direct API usage, import from LV2:
 
 Usage:
     python -m juthoor_datacore_lv0.embeddings.embed_sonar \\
-        input.jsonl output_dir/ --batch-size 32
+        input.jsonl output_dir/ --batch-size 32 --max-tokens 16384 --threads 8
 """
 
 from __future__ import annotations
@@ -92,7 +92,20 @@ def main() -> int:
     ap.add_argument("out_dir", type=Path, help="Output directory for vectors.npy, ids.json, meta.json, coverage.json.")
     ap.add_argument("--text-field", default="meaning_text", help="Field to embed (default: meaning_text).")
     ap.add_argument("--fallback-field", default="lemma", help="Fallback field if text-field is empty (default: lemma).")
-    ap.add_argument("--batch-size", type=int, default=32, help="Batch size for embedding (default: 32).")
+    ap.add_argument("--batch-size", type=int, default=32, help="Max texts per batch (default: 32).")
+    ap.add_argument(
+        "--max-tokens",
+        type=int,
+        default=16384,
+        help="Padded tokens per batch; texts are length-sorted and batched under this budget (default: 16384).",
+    )
+    ap.add_argument("--threads", type=int, default=0, help="torch CPU threads (default: 0 = torch default).")
+    ap.add_argument(
+        "--quantize",
+        default="none",
+        choices=["none", "int8"],
+        help="Dynamic int8 quantization of the encoder linears, CPU only (default: none).",
+    )
     ap.add_argument("--model-id", default="BAAI/bge-m3", help="BGE-M3 model from HuggingFace.")
     ap.add_argument("--max-length", type=int, default=8192, help="Max token length (default: 8192).")
     args = ap.parse_args()
@@ -108,7 +121,14 @@ def main() -> int:
     logger.info("Output: %s", args.out_dir)
 
     # Initialize embedder
-    config = BgeM3Config(model_id=args.model_id, max_length=args.max_length)
+    config = BgeM3Config(
+        model_id=args.model_id,
+        max_length=args.max_length,
+        batch_size=args.batch_size,
+        max_tokens=args.max_tokens,
+        num_threads=args.threads,
+        quantize=args.quantize,
+    )
     embedder = BgeM3Embedder(config=config)
 
     # Collect texts and IDs
@@ -137,20 +157,14 @@ def main() -> int:
         logger.warning("No texts to embed. Writing empty output.")
         mat = np.zeros((0, 1024), dtype="float32")
     else:
-        # Batch embedding
-        logger.info("Embedding %d texts in batches of %d...", len(texts), args.batch_size)
-        all_vecs: list[np.ndarray] = []
-
-        for i in range(0, len(texts), args.batch_size):
-            batch = texts[i:i + args.batch_size]
-            batch_num = i // args.batch_size + 1
-            total_batches = (len(texts) + args.batch_size - 1) // args.batch_size
-            logger.debug("Batch %d/%d (%d texts)...", batch_num, total_batches, len(batch))
-
-            vecs = embedder.embed(batch)
-            all_vecs.append(vecs)
-
-        mat = np.vstack(all_vecs)
+        # Length-bucketed batching happens inside the embedder
+        logger.info(
+            "Embedding %d texts (max %d per batch, %d-token budget)...",
+            len(texts), args.batch_size, args.max_tokens,
+        )
+        mat = embedder.embed(texts)
+        if embedder.last_stats is not None:
+            logger.info("Inference: %s", embedder.last_stats.summary())
 
     # Write outputs
     logger.info("Writing outputs...")
@@ -170,6 +184,9 @@ def main() -> int:
         "source_jsonl": str(args.jsonl.resolve()),
         "source_sha256": sha256_file(args.jsonl),
         "batch_size": args.batch_size,
+        "max_tokens": args.max_tokens,
+        "quantize": args.quantize,
+        "inference": embedder.last_stats.as_dict() if embedder.last_stats is not None else None,
     }
     (args.out_dir / "meta.json").write_text(
         json.dumps(meta, ensure_ascii=False, indent=2),
@@ -12,7 +12,8 @@ LV2 module which has a more complete API:
     )
 
 The build_faiss.py script in this module is for batch index generation
-during the data pipeline.
+during the data pipeline: sharded, trained indexes from any faiss factory
+string (see sharded.py), searched in batch by tools/search_index.py.
 """
 
 __all__: list[str] = []
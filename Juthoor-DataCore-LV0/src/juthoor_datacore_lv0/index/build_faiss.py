@@ -1,58 +1,71 @@
-from __future__ import annotations
-
 """
-Scaffold for building FAISS indexes from embeddings.
+Build sharded FAISS indexes from an embedding directory.
+
+Input (as written by the embeddings CLIs):
+- vectors.npy (float32; read memory-mapped, in row batches)
+- ids.json (ordered list of ids; converted once to a compact ids.npy)
 
-Input:
-- ids.json (ordered list of ids)
-- vectors.npy (float32)
+Output (in the embedding directory, or --out-dir):
+- index.faiss, or shard_NNNNN.faiss per --shard-size rows
+- trained.faiss (trainable factories only)
+- ids.npy
+- index_meta.json (factory, metric, shard row ranges, timings)
 
-Output:
-- index.faiss
-- index_meta.json
+Any faiss.index_factory string works: Flat (exact), IVF4096,Flat,
+IVF4096,PQ32, OPQ32,IVF4096,PQ32, HNSW32, ... Trainable indexes are
+trained once on a --train-size sample and cloned into every shard.
 
-NOTE: Placeholder using flat L2 index; tune parameters as needed.
+Usage:
+    python -m juthoor_datacore_lv0.index.build_faiss emb_dir/
+    python -m juthoor_datacore_lv0.index.build_faiss emb_dir/ --factory IVF4096,PQ32 --shard-size 500000
+    python -m juthoor_datacore_lv0.index.build_faiss emb_dir/ --merge-only --remove-shards
 """
 
+from __future__ import annotations
+
 import argparse
-import json
 from pathlib import Path
 
-import faiss
-import numpy as np
+from juthoor_datacore_lv0.index.sharded import METRICS, BuildConfig, build_sharded, merge_shards
 
 
-def main() -> None:
-    ap = argparse.ArgumentParser(description="Build a FAISS index from vectors.npy/ids.json (scaffold).")
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Build (sharded) FAISS indexes from vectors.npy/ids.json.")
     ap.add_argument("emb_dir", type=Path, help="Directory containing ids.json and vectors.npy.")
-    ap.add_argument("--metric", choices=["l2", "ip"], default="ip", help="FAISS metric (ip ~= cosine if vectors are normalized).")
-    args = ap.parse_args()
-
-    ids_path = args.emb_dir / "ids.json"
-    vec_path = args.emb_dir / "vectors.npy"
-    if not ids_path.exists() or not vec_path.exists():
-        raise FileNotFoundError("ids.json or vectors.npy missing in embedding dir.")
-
-    ids = json.loads(ids_path.read_text(encoding="utf-8"))
-    vecs = np.load(vec_path)
-
-    if args.metric == "ip":
-        index = faiss.IndexFlatIP(vecs.shape[1])
-    else:
-        index = faiss.IndexFlatL2(vecs.shape[1])
-
-    index.add(vecs)
-    faiss.write_index(index, str(args.emb_dir / "index.faiss"))
+    ap.add_argument("--out-dir", type=Path, default=None, help="Where to write the index (default: emb_dir).")
+    ap.add_argument("--factory", default="Flat", help="faiss.index_factory string (default: Flat).")
+    ap.add_argument("--metric", choices=METRICS, default="ip", help="FAISS metric (ip ~= cosine if vectors are normalized).")
+    ap.add_argument("--shard-size", type=int, default=0, help="Rows per shard (default: 0 = one index).")
+    ap.add_argument("--train-size", type=int, default=100_000, help="Training sample for IVF/PQ factories (default: 100000).")
+    ap.add_argument("--add-batch-size", type=int, default=65_536, help="Rows read and added per batch (default: 65536).")
+    ap.add_argument("--normalize", action="store_true", help="L2-normalize vectors before training/adding.")
+    ap.add_argument("--merge", action="store_true", help="Merge the shards into index.faiss after building.")
+    ap.add_argument("--merge-only", action="store_true", help="Only merge an existing sharded index in --out-dir/emb_dir.")
+    ap.add_argument("--remove-shards", action="store_true", help="Delete shard files after merging.")
+    args = ap.parse_args(argv)
 
-    meta = {
-        "metric": args.metric,
-        "dim": int(vecs.shape[1]) if vecs.size else 0,
-        "n": int(vecs.shape[0]),
-        "source": str(args.emb_dir),
-    }
-    (args.emb_dir / "index_meta.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
-    print(f"Built index for {meta['n']} vectors, dim={meta['dim']}, metric={args.metric}")
+    out_dir = args.out_dir or args.emb_dir
+    if not args.merge_only:
+        if not (args.emb_dir / "vectors.npy").exists():
+            raise FileNotFoundError(f"vectors.npy missing in {args.emb_dir}")
+        config = BuildConfig(
+            factory=args.factory,
+            metric=args.metric,
+            shard_size=args.shard_size,
+            train_size=args.train_size,
+            add_batch_size=args.add_batch_size,
+            normalize=args.normalize,
+        )
+        meta = build_sharded(args.emb_dir, out_dir, config)
+        print(
+            f"Built {args.factory} index for {meta['n']} vectors, dim={meta['dim']}, metric={args.metric}, "
+            f"{len(meta['shards'])} shard(s); timings={meta['timings']}"
+        )
+    if args.merge or args.merge_only:
+        meta = merge_shards(out_dir, remove_shards=args.remove_shards)
+        print(f"Merged into {out_dir / 'index.faiss'} ({meta['shards'][0]['stop']} vectors)")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,366 @@
+"""
+Sharded FAISS indexes over LV0 embedding directories.
+
+An embedding directory (as written by the embeddings CLIs) holds:
+- vectors.npy (float32, row i = lexeme i)
+- ids.json (ordered list of lexeme ids)
+
+build_sharded() reads vectors.npy memory-mapped, in row batches, and writes:
+- ids.npy          fixed-width UTF-8 id array (row -> id), memory-mappable
+- trained.faiss    the trained empty index (only for trainable factories)
+- shard_NNNNN.faiss one index per contiguous row range (or index.faiss if one)
+- index_meta.json  factory, metric, dim, shard row ranges and build timings
+
+Shard-local FAISS ids are row offsets, so global row = shard start + local id.
+ShardedIndex searches every shard (in parallel threads) and merges the per-shard
+top-k. merge_shards() folds all shards into a single index.faiss.
+
+faiss is imported lazily; everything except building and loading indexes
+(id maps, shard plans, top-k merging, recall) works without it.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+META_FILE = "index_meta.json"
+IDS_NPY = "ids.npy"
+TRAINED_FILE = "trained.faiss"
+METRICS = ("ip", "l2")
+
+
+def _require_faiss():
+    try:
+        import faiss
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "faiss is required to build or load indexes. Install: `pip install faiss-cpu`."
+        ) from exc
+    return faiss
+
+
+# ---------------------------------------------------------------------------
+# Id mapping
+# ---------------------------------------------------------------------------
+
+
+class IdMap:
+    """Row -> id over a fixed-width UTF-8 byte array (``ids.npy``)."""
+
+    def __init__(self, ids: np.ndarray) -> None:
+        self._ids = ids
+        self._rows: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return int(self._ids.shape[0])
+
+    def __getitem__(self, row: int) -> str:
+        return bytes(self._ids[row]).decode("utf-8")
+
+    def rows(self, ids: Iterable[str]) -> np.ndarray:
+        """Rows for ``ids`` (-1 where unknown). Builds the reverse map on first use."""
+        if self._rows is None:
+            self._rows = {self[i]: i for i in range(len(self))}
+        return np.asarray([self._rows.get(i, -1) for i in ids], dtype="int64")
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._ids.nbytes)
+
+
+def write_id_map(ids: Sequence[str], path: Path) -> Path:
+    encoded = [str(i).encode("utf-8") for i in ids]
+    width = max((len(b) for b in encoded), default=1) or 1
+    np.save(path, np.asarray(encoded, dtype=f"S{width}"))
+    return path
+
+
+def load_id_map(path: Path, *, mmap: bool = True) -> IdMap:
+    return IdMap(np.load(path, mmap_mode="r" if mmap else None))
+
+
+def ensure_id_map(emb_dir: Path) -> IdMap:
+    """Load ``ids.npy``, converting ``ids.json`` once if needed."""
+    npy = emb_dir / IDS_NPY
+    src = emb_dir / "ids.json"
+    if not npy.exists() or (src.exists() and src.stat().st_mtime > npy.stat().st_mtime):
+        if not src.exists():
+            raise FileNotFoundError(f"Neither {npy.name} nor ids.json in {emb_dir}")
+        write_id_map(json.loads(src.read_text(encoding="utf-8")), npy)
+    return load_id_map(npy)
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class BuildConfig:
+    factory: str = "Flat"  # any faiss.index_factory string, e.g. "IVF4096,PQ32" or "HNSW32"
+    metric: str = "ip"  # ip ~= cosine if vectors are normalized
+    shard_size: int = 0  # rows per shard; 0 = single shard
+    train_size: int = 100_000
+    add_batch_size: int = 65_536
+    normalize: bool = False
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+
+
+def plan_shards(n_rows: int, shard_size: int) -> list[tuple[int, int]]:
+    """Contiguous ``(start, stop)`` row ranges; one range if ``shard_size`` <= 0."""
+    if n_rows <= 0:
+        return []
+    step = shard_size if shard_size > 0 else n_rows
+    return [(s, min(s + step, n_rows)) for s in range(0, n_rows, step)]
+
+
+def iter_batches(vectors, start: int, stop: int, batch: int, normalize: bool = False) -> Iterator[np.ndarray]:
+    """Contiguous float32 row batches of ``vectors[start:stop]`` (works on a memmap)."""
+    for s in range(start, stop, batch):
+        block = np.ascontiguousarray(vectors[s:min(s + batch, stop)], dtype="float32")
+        if normalize:
+            block /= np.linalg.norm(block, axis=1, keepdims=True) + 1e-12
+        yield block
+
+
+def train_sample(vectors, n: int, *, seed: int = 0, normalize: bool = False) -> np.ndarray:
+    """Up to ``n`` rows sampled uniformly without replacement (sorted, so memmap reads stay local)."""
+    total = int(vectors.shape[0])
+    if n <= 0 or n >= total:
+        rows = np.arange(total)
+    else:
+        rows = np.sort(np.random.default_rng(seed).choice(total, size=n, replace=False))
+    sample = np.ascontiguousarray(vectors[rows], dtype="float32")
+    if normalize:
+        sample /= np.linalg.norm(sample, axis=1, keepdims=True) + 1e-12
+    return sample
+
+
+def _faiss_metric(faiss, metric: str):
+    return faiss.METRIC_INNER_PRODUCT if metric == "ip" else faiss.METRIC_L2
+
+
+def shard_name(i: int, n_shards: int) -> str:
+    return "index.faiss" if n_shards == 1 else f"shard_{i:05d}.faiss"
+
+
+def build_sharded(emb_dir: Path, out_dir: Path | None = None, config: BuildConfig | None = None) -> dict[str, Any]:
+    """Build (trained) FAISS shards for ``emb_dir/vectors.npy``; returns the meta dict."""
+    faiss = _require_faiss()
+    config = config or BuildConfig()
+    out_dir = out_dir or emb_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    vectors = np.load(emb_dir / "vectors.npy", mmap_mode="r")
+    id_map = ensure_id_map(emb_dir)
+    n, dim = int(vectors.shape[0]), int(vectors.shape[1])
+    if len(id_map) != n:
+        raise ValueError(f"{len(id_map)} ids but {n} vectors in {emb_dir}")
+    if out_dir != emb_dir:
+        (out_dir / IDS_NPY).write_bytes((emb_dir / IDS_NPY).read_bytes())
+
+    timings: dict[str, float] = {}
+    template = faiss.index_factory(dim, config.factory, _faiss_metric(faiss, config.metric))
+    if not template.is_trained:
+        t0 = time.perf_counter()
+        template.train(train_sample(vectors, config.train_size, seed=config.seed, normalize=config.normalize))
+        timings["train_s"] = round(time.perf_counter() - t0, 3)
+        faiss.write_index(template, str(out_dir / TRAINED_FILE))
+
+    shards = []
+    plan = plan_shards(n, config.shard_size)
+    t0 = time.perf_counter()
+    for i, (start, stop) in enumerate(plan):
+        index = faiss.clone_index(template)
+        for block in iter_batches(vectors, start, stop, config.add_batch_size, config.normalize):
+            index.add(block)
+        name = shard_name(i, len(plan))
+        faiss.write_index(index, str(out_dir / name))
+        shards.append({"file": name, "start": start, "stop": stop})
+    timings["add_s"] = round(time.perf_counter() - t0, 3)
+
+    meta = {
+        **asdict(config),
+        "dim": dim,
+        "n": n,
+        "ids": IDS_NPY,
+        "shards": shards,
+        "source": str(emb_dir),
+        "timings": timings,
+    }
+    write_meta(out_dir, meta)
+    return meta
+
+
+def write_meta(index_dir: Path, meta: dict[str, Any]) -> None:
+    (index_dir / META_FILE).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def read_meta(index_dir: Path) -> dict[str, Any]:
+    meta = json.loads((index_dir / META_FILE).read_text(encoding="utf-8"))
+    if "shards" not in meta:  # index built by the old flat-only scaffold
+        meta["shards"] = [{"file": "index.faiss", "start": 0, "stop": meta.get("n", 0)}]
+        meta.setdefault("factory", "Flat")
+    return meta
+
+
+def merge_shards(index_dir: Path, *, remove_shards: bool = False) -> dict[str, Any]:
+    """Fold every shard into ``index.faiss`` (flat and IVF indexes support this)."""
+    faiss = _require_faiss()
+    meta = read_meta(index_dir)
+    shards = meta["shards"]
+    if len(shards) <= 1:
+        return meta
+    t0 = time.perf_counter()
+    merged = faiss.read_index(str(index_dir / shards[0]["file"]))
+    for shard in shards[1:]:
+        other = faiss.read_index(str(index_dir / shard["file"]))
+        try:
+            merged.merge_from(other, merged.ntotal)
+        except RuntimeError as exc:
+            raise ValueError(
+                f"Index type {meta.get('factory')!r} cannot be merged in place; "
+                "rebuild with --shard-size 0 instead."
+            ) from exc
+    faiss.write_index(merged, str(index_dir / "index.faiss"))
+    if remove_shards:
+        for shard in shards:
+            if shard["file"] != "index.faiss":
+                (index_dir / shard["file"]).unlink(missing_ok=True)
+    meta["shards"] = [{"file": "index.faiss", "start": 0, "stop": int(merged.ntotal)}]
+    meta.setdefault("timings", {})["merge_s"] = round(time.perf_counter() - t0, 3)
+    write_meta(index_dir, meta)
+    return meta
+
+
+# ---------------------------------------------------------------------------
+# Searching
+# ---------------------------------------------------------------------------
+
+
+def merge_topk(
+    parts: Sequence[tuple[np.ndarray, np.ndarray]],
+    k: int,
+    *,
+    largest: bool = True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge per-shard ``(scores, global rows)`` into the overall top-k, best first.
+
+    Missing entries (row -1) always sort last.
+    """
+    scores = np.concatenate([p[0] for p in parts], axis=1).astype("float32")
+    rows = np.concatenate([p[1] for p in parts], axis=1).astype("int64")
+    key = -scores if largest else scores.copy()
+    key[rows < 0] = np.inf
+    order = np.argsort(key, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+
+class ShardedIndex:
+    """Searches a list of ``(index, row offset)`` shards as one index."""
+
+    def __init__(self, shards: Sequence[tuple[Any, int]], *, metric: str = "ip", id_map: IdMap | None = None):
+        self.shards = list(shards)
+        self.metric = metric
+        self.id_map = id_map
+
+    @classmethod
+    def open(cls, index_dir: Path, *, mmap: bool = True, params: str = "") -> "ShardedIndex":
+        """Load every shard listed in ``index_meta.json`` (memory-mapped when supported)."""
+        faiss = _require_faiss()
+        meta = read_meta(index_dir)
+        flags = faiss.IO_FLAG_MMAP if mmap else 0
+        shards = []
+        for shard in meta["shards"]:
+            try:
+                index = faiss.read_index(str(index_dir / shard["file"]), flags)
+            except RuntimeError:  # index type without mmap support
+                index = faiss.read_index(str(index_dir / shard["file"]))
+            if params:
+                faiss.ParameterSpace().set_index_parameters(index, params)
+            shards.append((index, int(shard["start"])))
+        ids_path = index_dir / meta.get("ids", IDS_NPY)
+        id_map = load_id_map(ids_path) if ids_path.exists() else ensure_id_map(index_dir)
+        return cls(shards, metric=meta.get("metric", "ip"), id_map=id_map)
+
+    @property
+    def ntotal(self) -> int:
+        return int(sum(index.ntotal for index, _ in self.shards))
+
+    def _search_shard(self, shard: tuple[Any, int], queries: np.ndarray, k: int):
+        index, offset = shard
+        scores, local = index.search(queries, min(k, max(int(index.ntotal), 1)))
+        return scores, np.where(local >= 0, local + offset, -1)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        *,
+        threads: int = 1,
+        query_batch: int = 4096,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Top-``k`` ``(scores, global rows)`` per query; shards searched ``threads`` at a time."""
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype="float32")
+        out_s = np.empty((len(queries), k), dtype="float32")
+        out_r = np.empty((len(queries), k), dtype="int64")
+        pool = ThreadPoolExecutor(threads) if threads > 1 and len(self.shards) > 1 else None
+        try:
+            for q0 in range(0, len(queries), query_batch):
+                qb = queries[q0:q0 + query_batch]
+                mapper = pool.map if pool is not None else map
+                parts = list(mapper(lambda shard: self._search_shard(shard, qb, k), self.shards))
+                pad = [(np.full((len(qb), k), np.nan, "float32"), np.full((len(qb), k), -1, "int64"))]
+                s, r = merge_topk(parts + pad, k, largest=self.metric == "ip")
+                out_s[q0:q0 + len(qb)], out_r[q0:q0 + len(qb)] = s, r
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return out_s, out_r
+
+
+def exact_search(
+    vectors,
+    queries: np.ndarray,
+    k: int,
+    *,
+    metric: str = "ip",
+    normalize: bool = False,
+    block: int = 65_536,
+):
+    """Brute-force top-k over ``vectors`` (memmap-friendly), the recall reference."""
+    queries = np.ascontiguousarray(np.atleast_2d(queries), dtype="float32")
+    parts = []
+    n = int(vectors.shape[0])
+    for start, rows in zip(range(0, n, block), iter_batches(vectors, 0, n, block, normalize)):
+        if metric == "ip":
+            scores = queries @ rows.T
+        else:
+            scores = (queries ** 2).sum(1)[:, None] - 2 * queries @ rows.T + (rows ** 2).sum(1)[None, :]
+        ids = np.broadcast_to(np.arange(start, start + len(rows), dtype="int64"), scores.shape)
+        parts.append(merge_topk([(scores, ids)], min(k, scores.shape[1]), largest=metric == "ip"))
+    return merge_topk(parts, k, largest=metric == "ip") if parts else (
+        np.zeros((len(queries), 0), "float32"), np.zeros((len(queries), 0), "int64")
+    )
+
+
+def recall_at_k(approx_rows: np.ndarray, exact_rows: np.ndarray, k: int) -> float:
+    """Mean fraction of each query's exact top-k found in its approximate top-k."""
+    if not len(exact_rows):
+        return 1.0
+    hits = [
+        len(set(a[:k][a[:k] >= 0]) & set(e[:k][e[:k] >= 0])) / max(1, int((e[:k] >= 0).sum()))
+        for a, e in zip(approx_rows, exact_rows)
+    ]
+    return float(np.mean(hits))
@@ -1,39 +1,228 @@
-from __future__ import annotations
-
 """
-Scaffold search utility for FAISS indexes built from embeddings.
+Batch search over (sharded) FAISS indexes built by index.build_faiss.
+
+Queries come from any of:
+- --query        one comma-separated vector (the old single-query mode)
+- --query-vectors  a .npy matrix of query vectors
+- --ids          ids, one per line (or JSONL with an "id" field); their vectors
+                 are looked up in the embedding directory
+- --lemmas       lemmas, one per line (or JSONL with a "lemma" field); resolved
+                 to ids through --lexicon (default: the source JSONL recorded in
+                 the embedding meta.json), every homograph becomes a query
+
+Neighbours are written as JSONL (one line per query) to --out or stdout.
+Timing (load, lookup, search, queries/s) is reported on stderr and, with
+--report, as JSON; --recall-sample N also measures recall@k against exact
+search for N of the queries.
+
+Usage:
+    python -m juthoor_datacore_lv0.tools.search_index emb_dir/ --lemmas words.txt --topk 20 --out nn.jsonl
+    python -m juthoor_datacore_lv0.tools.search_index idx_dir/ --emb-dir emb_dir/ --ids ids.txt \\
+        --threads 8 --params nprobe=32 --exclude-self --recall-sample 500 --report report.json
 """
 
+from __future__ import annotations
+
 import argparse
 import json
+import sys
+import time
 from pathlib import Path
+from typing import Any, Iterable, TextIO
 
-import faiss
 import numpy as np
 
+from juthoor_datacore_lv0.index.sharded import (
+    IdMap,
+    ShardedIndex,
+    ensure_id_map,
+    exact_search,
+    read_meta,
+    recall_at_k,
+)
+
+
+def read_values(path: Path, field: str) -> list[str]:
+    """Non-empty lines of a text file, or ``field`` of each row of a JSONL file."""
+    values: list[str] = []
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = str(json.loads(line).get(field) or "").strip()
+            if line:
+                values.append(line)
+    return values
+
+
+def lemma_ids(lemmas: Iterable[str], lexicon: Path) -> dict[str, list[str]]:
+    """lemma -> ids of every lexicon row with that lemma (streamed, only requested lemmas kept)."""
+    wanted = {lemma: [] for lemma in lemmas}
+    with lexicon.open("r", encoding="utf-8", errors="replace") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            lemma = str(row.get("lemma") or "").strip()
+            if lemma in wanted and row.get("id"):
+                wanted[lemma].append(str(row["id"]))
+    return wanted
+
 
-def main() -> None:
-    ap = argparse.ArgumentParser(description="Search FAISS index with a query vector (placeholder).")
-    ap.add_argument("emb_dir", type=Path, help="Directory containing index.faiss and ids.json.")
-    ap.add_argument("--query", type=str, help="Comma-separated floats for a query vector.")
+def collect_queries(
+    args: argparse.Namespace,
+    emb_dir: Path,
+    id_map: IdMap,
+) -> tuple[list[dict[str, Any]], np.ndarray, list[str]]:
+    """``(labels, query matrix, warnings)``; labels carry the query id/lemma/row."""
+    warnings: list[str] = []
+    if args.query:
+        vec = np.asarray([[float(x) for x in args.query.split(",")]], dtype="float32")
+        return [{"query": "q0", "row": -1}], vec, warnings
+    if args.query_vectors:
+        mat = np.load(args.query_vectors).astype("float32", copy=False)
+        return [{"query": f"q{i}", "row": -1} for i in range(len(mat))], mat, warnings
+
+    labels: list[dict[str, Any]] = []
+    if args.ids:
+        labels = [{"query": i, "id": i} for i in read_values(args.ids, "id")]
+    elif args.lemmas:
+        lexicon = args.lexicon or _source_jsonl(emb_dir)
+        if lexicon is None:
+            raise SystemExit("--lemmas needs --lexicon (no source_jsonl in the embedding meta.json)")
+        for lemma, ids in lemma_ids(read_values(args.lemmas, "lemma"), lexicon).items():
+            if not ids:
+                warnings.append(f"lemma not in lexicon: {lemma}")
+            labels.extend({"query": lemma, "id": i} for i in ids)
+    else:
+        raise SystemExit("Provide --query, --query-vectors, --ids or --lemmas.")
+
+    rows = id_map.rows(label["id"] for label in labels)
+    for label, row in zip(labels, rows):
+        label["row"] = int(row)
+        if row < 0:
+            warnings.append(f"id not in index: {label['id']}")
+    labels = [label for label in labels if label["row"] >= 0]
+    vectors = np.load(emb_dir / "vectors.npy", mmap_mode="r")
+    found = np.asarray([label["row"] for label in labels], dtype="int64")
+    order = np.argsort(found, kind="stable")  # sorted reads from the memmap
+    mat = np.empty((len(found), vectors.shape[1]), dtype="float32")
+    mat[order] = vectors[found[order]]
+    return labels, mat, warnings
+
+
+def _source_jsonl(emb_dir: Path) -> Path | None:
+    meta_path = emb_dir / "meta.json"
+    if not meta_path.exists():
+        return None
+    src = json.loads(meta_path.read_text(encoding="utf-8")).get("source_jsonl")
+    return Path(src) if src and Path(src).exists() else None
+
+
+def write_neighbours(
+    out: TextIO,
+    labels: list[dict[str, Any]],
+    scores: np.ndarray,
+    rows: np.ndarray,
+    id_map: IdMap,
+    *,
+    k: int,
+    exclude_self: bool = False,
+) -> int:
+    """One JSONL line per query; returns the number of lines written."""
+    for label, score_row, id_row in zip(labels, scores, rows):
+        neighbours = []
+        for score, row in zip(score_row, id_row):
+            if row < 0 or (exclude_self and row == label["row"]):
+                continue
+            neighbours.append({"rank": len(neighbours) + 1, "id": id_map[int(row)], "score": round(float(score), 6)})
+            if len(neighbours) == k:
+                break
+        record = {key: value for key, value in label.items() if key != "row"}
+        record["neighbours"] = neighbours
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return len(labels)
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Batch nearest-neighbour search over a (sharded) FAISS index.")
+    ap.add_argument("index_dir", type=Path, help="Directory with index_meta.json and the index/shard files.")
+    ap.add_argument("--emb-dir", type=Path, default=None, help="Embedding dir for vector lookup (default: index source).")
+    ap.add_argument("--query", type=str, help="Comma-separated floats for a single query vector.")
+    ap.add_argument("--query-vectors", type=Path, help=".npy matrix of query vectors.")
+    ap.add_argument("--ids", type=Path, help="File of ids to use as queries.")
+    ap.add_argument("--lemmas", type=Path, help="File of lemmas to use as queries.")
+    ap.add_argument("--lexicon", type=Path, help="JSONL with lemma/id for --lemmas (default: meta.json source_jsonl).")
     ap.add_argument("--topk", type=int, default=5)
-    args = ap.parse_args()
+    ap.add_argument("--threads", type=int, default=1, help="Shards searched in parallel (default: 1).")
+    ap.add_argument("--params", default="", help="faiss ParameterSpace string, e.g. 'nprobe=32' or 'efSearch=128'.")
+    ap.add_argument("--exclude-self", action="store_true", help="Drop the query's own row from its neighbours.")
+    ap.add_argument("--out", type=Path, default=None, help="Output JSONL (default: stdout).")
+    ap.add_argument("--recall-sample", type=int, default=0, help="Measure recall@k on this many queries (exact search).")
+    ap.add_argument("--report", type=Path, default=None, help="Write timing/recall report JSON here.")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    meta = read_meta(args.index_dir)
+    emb_dir = args.emb_dir or Path(meta.get("source") or args.index_dir)
+    index = ShardedIndex.open(args.index_dir, params=args.params)
+    id_map = index.id_map if index.id_map is not None else ensure_id_map(emb_dir)
+    load_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    labels, queries, warnings = collect_queries(args, emb_dir, id_map)
+    if queries.shape[1] != meta["dim"]:
+        raise SystemExit(f"Query dim {queries.shape[1]} != index dim {meta['dim']}")
+    if meta.get("normalize"):
+        queries = queries / (np.linalg.norm(queries, axis=1, keepdims=True) + 1e-12)
+    lookup_s = time.perf_counter() - t0
+    for warning in warnings:
+        print(f"[warn] {warning}", file=sys.stderr)
+
+    k = args.topk + (1 if args.exclude_self else 0)
+    t0 = time.perf_counter()
+    scores, rows = index.search(queries, k, threads=args.threads)
+    search_s = time.perf_counter() - t0
+
+    out = args.out.open("w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        write_neighbours(out, labels, scores, rows, id_map, k=args.topk, exclude_self=args.exclude_self)
+    finally:
+        if args.out:
+            out.close()
 
-    ids = json.loads((args.emb_dir / "ids.json").read_text(encoding="utf-8"))
-    index = faiss.read_index(str(args.emb_dir / "index.faiss"))
+    report: dict[str, Any] = {
+        "index": str(args.index_dir),
+        "factory": meta.get("factory"),
+        "shards": len(meta["shards"]),
+        "ntotal": index.ntotal,
+        "queries": len(labels),
+        "topk": args.topk,
+        "threads": args.threads,
+        "params": args.params,
+        "load_s": round(load_s, 4),
+        "lookup_s": round(lookup_s, 4),
+        "search_s": round(search_s, 4),
+        "qps": round(len(labels) / search_s, 1) if search_s > 0 else None,
+        "missing": len(warnings),
+    }
+    if args.recall_sample and len(labels):
+        n = min(args.recall_sample, len(labels))
+        sample = np.random.default_rng(0).choice(len(labels), size=n, replace=False)
+        vectors = np.load(emb_dir / "vectors.npy", mmap_mode="r")
+        _, exact = exact_search(
+            vectors, queries[sample], k, metric=meta.get("metric", "ip"), normalize=bool(meta.get("normalize")),
+        )
+        report[f"recall@{args.topk}"] = round(recall_at_k(rows[sample], exact, k), 4)
+        report["recall_sample"] = n
 
-    if not args.query:
-        raise SystemExit("Provide --query as comma-separated floats.")
-    q = np.array([float(x) for x in args.query.split(",")], dtype="float32")
-    if q.shape[0] != index.d:
-        raise SystemExit(f"Query dim {q.shape[0]} != index dim {index.d}")
-    q = q.reshape(1, -1)
-    scores, idxs = index.search(q, args.topk)
-    for rank, (score, idx) in enumerate(zip(scores[0], idxs[0]), start=1):
-        if idx < 0 or idx >= len(ids):
-            continue
-        print(f"{rank}: id={ids[idx]} score={score}")
+    print(json.dumps(report), file=sys.stderr)
+    if args.report:
+        args.report.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
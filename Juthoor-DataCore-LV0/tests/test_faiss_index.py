@@ -0,0 +1,197 @@
+"""Tests for juthoor_datacore_lv0.index.sharded and tools.search_index."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from juthoor_datacore_lv0.index.sharded import (
+    IdMap,
+    ShardedIndex,
+    ensure_id_map,
+    exact_search,
+    load_id_map,
+    merge_topk,
+    plan_shards,
+    recall_at_k,
+    train_sample,
+    write_id_map,
+)
+from juthoor_datacore_lv0.tools.search_index import collect_queries, lemma_ids, read_values, write_neighbours
+
+
+def _unit(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    vecs = np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+    return vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+
+
+class BruteShard:
+    """Exact inner-product search with the faiss index interface."""
+
+    def __init__(self, vectors: np.ndarray) -> None:
+        self.vectors = vectors
+        self.ntotal = len(vectors)
+
+    def search(self, queries: np.ndarray, k: int):
+        scores = queries @ self.vectors.T
+        order = np.argsort(-scores, axis=1)[:, :k]
+        return np.take_along_axis(scores, order, axis=1), order
+
+
+def _emb_dir(tmp_path: Path, n: int = 40) -> Path:
+    emb = tmp_path / "emb"
+    emb.mkdir()
+    np.save(emb / "vectors.npy", _unit(n))
+    ids = [f"lat:{i}" for i in range(n)]
+    (emb / "ids.json").write_text(json.dumps(ids), encoding="utf-8")
+    lexicon = tmp_path / "lexicon.jsonl"
+    rows = [{"id": i, "lemma": f"w{int(i.split(':')[1]) % 20}"} for i in ids]
+    lexicon.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    (emb / "meta.json").write_text(json.dumps({"source_jsonl": str(lexicon)}), encoding="utf-8")
+    return emb
+
+
+# ── id maps and plans ────────────────────────────────────────────
+
+class TestIdMap:
+    def test_round_trip_unicode(self, tmp_path):
+        ids = ["ara:كتب", "lat:aqua", "x"]
+        id_map = load_id_map(write_id_map(ids, tmp_path / "ids.npy"))
+        assert [id_map[i] for i in range(3)] == ids
+        assert id_map.rows(["lat:aqua", "nope", "ara:كتب"]).tolist() == [1, -1, 0]
+        assert id_map.nbytes == 3 * len("ara:كتب".encode("utf-8"))
+
+    def test_ensure_converts_json_once(self, tmp_path):
+        emb = _emb_dir(tmp_path)
+        id_map = ensure_id_map(emb)
+        assert len(id_map) == 40 and id_map[7] == "lat:7"
+        assert (emb / "ids.npy").exists()
+
+
+def test_plan_shards():
+    assert plan_shards(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert plan_shards(10, 0) == [(0, 10)]
+    assert plan_shards(0, 4) == []
+
+
+def test_train_sample_is_sorted_subset():
+    vecs = np.arange(100, dtype="float32").reshape(50, 2)
+    sample = train_sample(vecs, 10, seed=1)
+    assert sample.shape == (10, 2) and np.all(np.diff(sample[:, 0]) > 0)
+    assert train_sample(vecs, 0).shape == (50, 2)
+
+
+# ── merging and search ───────────────────────────────────────────
+
+def test_merge_topk_orders_and_skips_missing():
+    a = (np.array([[0.9, 0.1]]), np.array([[3, -1]]))
+    b = (np.array([[0.5, 0.95]]), np.array([[7, 8]]))
+    scores, rows = merge_topk([a, b], 3)
+    assert rows.tolist() == [[8, 3, 7]]
+    _, rows = merge_topk([a, b], 2, largest=False)
+    assert rows.tolist() == [[7, 3]]
+
+
+def test_sharded_search_matches_exact():
+    vecs, queries = _unit(100), _unit(9, seed=1)
+    shards = [(BruteShard(vecs[s:e]), s) for s, e in plan_shards(100, 30)]
+    index = ShardedIndex(shards)
+    assert index.ntotal == 100
+    _, exact = exact_search(vecs, queries, 5, block=17)
+    for threads in (1, 3):
+        scores, rows = index.search(queries, 5, threads=threads, query_batch=4)
+        np.testing.assert_array_equal(rows, exact)
+        assert np.all(np.diff(scores, axis=1) <= 0)
+    assert recall_at_k(rows, exact, 5) == 1.0
+    assert recall_at_k(rows[:, ::-1][:, :2], exact, 2) == 0.0
+
+
+def test_search_pads_when_k_exceeds_ntotal():
+    index = ShardedIndex([(BruteShard(_unit(3)), 0)])
+    _, rows = index.search(_unit(2, seed=4), 5)
+    assert (rows[:, 3:] == -1).all() and (rows[:, :3] >= 0).all()
+
+
+def test_exact_search_l2_and_normalize():
+    vecs = np.array([[0, 0], [3, 0], [0, 1]], dtype="float32")
+    _, rows = exact_search(vecs, np.array([[2.5, 0]], dtype="float32"), 2, metric="l2")
+    assert rows.tolist() == [[1, 0]]
+    _, rows = exact_search(vecs * 10, np.array([[0.0, 1.0]], dtype="float32"), 1, normalize=True)
+    assert rows.tolist() == [[2]]
+
+
+# ── search tool helpers ──────────────────────────────────────────
+
+def test_read_values_text_and_jsonl(tmp_path):
+    txt = tmp_path / "q.txt"
+    txt.write_text("a\n\n b \n", encoding="utf-8")
+    jl = tmp_path / "q.jsonl"
+    jl.write_text('{"lemma": "x"}\n{"id": "y"}\n', encoding="utf-8")
+    assert read_values(txt, "id") == ["a", "b"]
+    assert read_values(jl, "lemma") == ["x"]
+
+
+def test_collect_queries_by_lemma_and_id(tmp_path):
+    emb = _emb_dir(tmp_path)
+    id_map = ensure_id_map(emb)
+    lemmas = tmp_path / "lemmas.txt"
+    lemmas.write_text("w3\nmissing\n", encoding="utf-8")
+    assert lemma_ids(["w3"], tmp_path / "lexicon.jsonl") == {"w3": ["lat:3", "lat:23"]}
+
+    args = argparse.Namespace(query=None, query_vectors=None, ids=None, lemmas=lemmas, lexicon=None)
+    labels, mat, warnings = collect_queries(args, emb, id_map)
+    assert [(l["query"], l["id"], l["row"]) for l in labels] == [("w3", "lat:3", 3), ("w3", "lat:23", 23)]
+    np.testing.assert_array_equal(mat, np.load(emb / "vectors.npy")[[3, 23]])
+    assert warnings == ["lemma not in lexicon: missing"]
+
+    ids = tmp_path / "ids.txt"
+    ids.write_text("lat:30\nlat:99\nlat:1\n", encoding="utf-8")
+    args = argparse.Namespace(query=None, query_vectors=None, ids=ids, lemmas=None, lexicon=None)
+    labels, mat, warnings = collect_queries(args, emb, id_map)
+    assert [l["row"] for l in labels] == [30, 1] and warnings == ["id not in index: lat:99"]
+
+
+def test_write_neighbours_excludes_self(tmp_path):
+    vecs = _unit(20)
+    id_map = IdMap(np.asarray([f"id{i}".encode() for i in range(20)]))
+    index = ShardedIndex([(BruteShard(vecs[:10]), 0), (BruteShard(vecs[10:]), 10)])
+    labels = [{"query": "id4", "id": "id4", "row": 4}]
+    scores, rows = index.search(vecs[[4]], 4)
+    out = io.StringIO()
+    write_neighbours(out, labels, scores, rows, id_map, k=3, exclude_self=True)
+    record = json.loads(out.getvalue())
+    assert record["query"] == "id4" and "row" not in record
+    assert [n["rank"] for n in record["neighbours"]] == [1, 2, 3]
+    assert "id4" not in [n["id"] for n in record["neighbours"]]
+
+
+# ── end to end with faiss ────────────────────────────────────────
+
+def test_build_merge_search_with_faiss(tmp_path):
+    pytest.importorskip("faiss")
+    from juthoor_datacore_lv0.index import build_faiss
+    from juthoor_datacore_lv0.tools import search_index
+
+    emb = _emb_dir(tmp_path, n=400)
+    assert build_faiss.main([str(emb), "--factory", "IVF4,Flat", "--shard-size", "150", "--train-size", "200"]) == 0
+    meta = json.loads((emb / "index_meta.json").read_text(encoding="utf-8"))
+    assert [s["start"] for s in meta["shards"]] == [0, 150, 300]
+
+    ids = tmp_path / "ids.txt"
+    ids.write_text("\n".join(f"lat:{i}" for i in range(0, 400, 7)), encoding="utf-8")
+    out, report = tmp_path / "nn.jsonl", tmp_path / "report.json"
+    argv = [str(emb), "--ids", str(ids), "--topk", "5", "--threads", "3", "--params", "nprobe=4",
+            "--out", str(out), "--recall-sample", "20", "--report", str(report)]
+    assert search_index.main(argv) == 0
+    first = json.loads(out.read_text(encoding="utf-8").splitlines()[0])
+    assert first["neighbours"][0]["id"] == "lat:0"
+    assert json.loads(report.read_text(encoding="utf-8"))["recall@5"] == 1.0
+
+    assert build_faiss.main([str(emb), "--merge-only", "--remove-shards"]) == 0
+    assert not list(emb.glob("shard_*.faiss"))
+    assert search_index.main(argv) == 0
@@ -168,16 +168,15 @@ def main():
     # ---- Compute embeddings ----
     print("\n[2/5] Computing semantic embeddings (BGE-M3)...")
     t0 = time.time()
-    from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Embedder
-    sem_embedder = BgeM3Embedder()
+    from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import get_embedder
+    sem_embedder = get_embedder("semantic")  # running embedding service if any, else local
     ar_sem = compute_embeddings(arabic, sem_embedder)
     en_sem = compute_embeddings(english, sem_embedder)
     print(f"  Done in {time.time() - t0:.1f}s  (Arabic: {ar_sem.shape}, English: {en_sem.shape})")
 
     print("\n[3/5] Computing form embeddings (ByT5)...")
     t0 = time.time()
-    from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import ByT5Embedder
-    form_embedder = ByT5Embedder()
+    form_embedder = get_embedder("form")
     ar_form = compute_embeddings(arabic, form_embedder)
     en_form = compute_embeddings(english, form_embedder)
     print(f"  Done in {time.time() - t0:.1f}s  (Arabic: {ar_form.shape}, English: {en_form.shape})")
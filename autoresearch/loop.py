@@ -23,6 +23,7 @@ import shutil
 import subprocess
 import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parent
@@ -48,6 +49,14 @@ def log(msg: str):
         f.write(line + "\n")
 
 
+@lru_cache(maxsize=None)
+def telemetry():
+    """LLM call recorder, created on first use (needs juthoor_cognatediscovery_lv2 installed)."""
+    from juthoor_cognatediscovery_lv2.discovery.llm_telemetry import TelemetryRecorder
+
+    return TelemetryRecorder.default("autoresearch_loop")
+
+
 def run_evaluation(permutations: int = 100) -> dict:
     """Run prepare.py and parse the JSON result."""
     cmd = [sys.executable, str(ROOT / "prepare.py"),
@@ -174,12 +183,16 @@ def _call_anthropic(prompt: str, model: str, api_key: str) -> str | None:
     try:
         import anthropic
         client = anthropic.Anthropic(api_key=api_key)
-        response = client.messages.create(
-            model=model,
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return _extract_python(response.content[0].text)
+        with telemetry().call(model=model, provider="anthropic") as call:
+            response = client.messages.create(
+                model=model,
+                max_tokens=4096,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            call.response(response.usage.input_tokens, response.usage.output_tokens)
+            code = _extract_python(response.content[0].text)
+            call.parsed(code is not None)
+        return code
     except Exception as e:
         log(f"  Anthropic API error: {e}")
         return None
@@ -189,12 +202,16 @@ def _call_openai(prompt: str, model: str, api_key: str) -> str | None:
     try:
         import openai
         client = openai.OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model=model,
-            max_tokens=4096,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return _extract_python(response.choices[0].message.content)
+        with telemetry().call(model=model, provider="openai") as call:
+            response = client.chat.completions.create(
+                model=model,
+                max_tokens=4096,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            call.response(response.usage.prompt_tokens, response.usage.completion_tokens)
+            code = _extract_python(response.choices[0].message.content)
+            call.parsed(code is not None)
+        return code
     except Exception as e:
         log(f"  OpenAI API error: {e}")
         return None
@@ -259,6 +276,7 @@ def main():
     parser.add_argument("--run-baseline", action="store_true",
                         help="Run baseline evaluation and exit")
     args = parser.parse_args()
+    telemetry()  # fail here, not on the first agent call, if the LV2 package is missing
 
     log(f"=== Autoresearch Loop Starting ===")
     log(f"  Model: {args.model}")
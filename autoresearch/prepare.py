@@ -363,8 +363,8 @@ def run_evaluation(n_permutations: int = 100, verbose: bool = False) -> dict:
     if verbose:
         print("\n[2/5] Computing semantic embeddings (BGE-M3)...")
     t0 = time.time()
-    from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import BgeM3Embedder
-    sem_embedder = BgeM3Embedder()
+    from juthoor_cognatediscovery_lv2.lv3.discovery.embedding_service import get_embedder
+    sem_embedder = get_embedder("semantic")  # running embedding service if any, else local
     ar_sem = compute_embeddings(arabic, sem_embedder)
     # Target semantic embeddings are cached (they never change)
     tgt_sem = compute_embeddings(target, sem_embedder, cache_key="tgt_sem_200")
@@ -374,8 +374,7 @@ def run_evaluation(n_permutations: int = 100, verbose: bool = False) -> dict:
     if verbose:
         print("\n[3/5] Computing form embeddings (ByT5)...")
     t0 = time.time()
-    from juthoor_cognatediscovery_lv2.lv3.discovery.embeddings import ByT5Embedder
-    form_embedder = ByT5Embedder()
+    form_embedder = get_embedder("form")
     # Form embeddings depend on lemma orthography only — cache both
     ar_form = compute_embeddings(arabic, form_embedder, cache_key="ar_form_50")
     tgt_form = compute_embeddings(target, form_embedder, cache_key="tgt_form_200")